@@ -0,0 +1,51 @@
+"""add_llm_cost_rollups_table
+
+Revision ID: 7c5e2a91d3f4
+Revises: d41f7c2e9b10
+Create Date: 2026-10-16 14:03:27.512084
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c5e2a91d3f4"
+down_revision: Union[str, Sequence[str], None] = "d41f7c2e9b10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+	"""Add the hourly LLM cost rollup table filled by the cost ledger flush."""
+
+	op.create_table(
+		"llm_cost_rollups",
+		sa.Column("id", sa.Integer(), nullable=False),
+		sa.Column("period_start", sa.DateTime(), nullable=False),
+		sa.Column("category", sa.String(length=50), nullable=False),
+		sa.Column("user_id", sa.String(length=100), nullable=True),
+		sa.Column("provider", sa.String(length=50), nullable=False),
+		sa.Column("model", sa.String(length=100), nullable=False),
+		sa.Column("cost", sa.Numeric(precision=12, scale=4), nullable=False),
+		sa.Column("prompt_tokens", sa.Integer(), nullable=False),
+		sa.Column("completion_tokens", sa.Integer(), nullable=False),
+		sa.Column("request_count", sa.Integer(), nullable=False),
+		sa.Column("updated_at", sa.DateTime(), nullable=True),
+		sa.PrimaryKeyConstraint("id"),
+		sa.UniqueConstraint("period_start", "category", "user_id", "provider", "model", name="uq_llm_cost_rollup_dimensions"),
+	)
+	op.create_index("ix_llm_cost_rollups_id", "llm_cost_rollups", ["id"], unique=False)
+	op.create_index("ix_llm_cost_rollups_period_start", "llm_cost_rollups", ["period_start"], unique=False)
+	op.create_index("ix_llm_cost_rollups_user_id", "llm_cost_rollups", ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+	"""Remove the LLM cost rollup table."""
+
+	op.drop_index("ix_llm_cost_rollups_user_id", table_name="llm_cost_rollups")
+	op.drop_index("ix_llm_cost_rollups_period_start", table_name="llm_cost_rollups")
+	op.drop_index("ix_llm_cost_rollups_id", table_name="llm_cost_rollups")
+	op.drop_table("llm_cost_rollups")
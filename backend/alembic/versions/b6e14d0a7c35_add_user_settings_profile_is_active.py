@@ -0,0 +1,34 @@
+"""add_user_settings_profile_is_active
+
+Revision ID: b6e14d0a7c35
+Revises: 7c5e2a91d3f4
+Create Date: 2026-10-17 09:12:44.180531
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b6e14d0a7c35"
+down_revision: Union[str, Sequence[str], None] = "7c5e2a91d3f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+	"""Add the account status, profile and settings columns read by the notification services."""
+
+	op.add_column("users", sa.Column("is_active", sa.Boolean(), nullable=False, server_default=sa.true()))
+	op.add_column("users", sa.Column("profile", sa.JSON(), nullable=True))
+	op.add_column("users", sa.Column("settings", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+	"""Remove the account status, profile and settings columns."""
+
+	op.drop_column("users", "settings")
+	op.drop_column("users", "profile")
+	op.drop_column("users", "is_active")
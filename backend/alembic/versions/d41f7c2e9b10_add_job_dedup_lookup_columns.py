@@ -0,0 +1,48 @@
+"""add_job_dedup_lookup_columns
+
+Revision ID: d41f7c2e9b10
+Revises: 32b030e445af
+Create Date: 2026-10-16 09:12:41.118502
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d41f7c2e9b10"
+down_revision: Union[str, Sequence[str], None] = "32b030e445af"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+	"""Add normalized URL / company blocking key columns and per-user lookup indexes for deduplication."""
+
+	op.add_column("jobs", sa.Column("normalized_url", sa.String(), nullable=True))
+	op.add_column("jobs", sa.Column("dedup_company_key", sa.String(), nullable=True))
+
+	op.create_index("ix_jobs_normalized_url", "jobs", ["normalized_url"], unique=False)
+	op.create_index("ix_jobs_dedup_company_key", "jobs", ["dedup_company_key"], unique=False)
+
+	# deduplicate_against_db probes these with `user_id = ? AND <key> IN (...)`
+	op.create_index("ix_jobs_user_fingerprint", "jobs", ["user_id", "job_fingerprint"], unique=False)
+	op.create_index("ix_jobs_user_normalized_url", "jobs", ["user_id", "normalized_url"], unique=False)
+	op.create_index("ix_jobs_user_dedup_company_key", "jobs", ["user_id", "dedup_company_key"], unique=False)
+
+	# Existing rows are populated by scripts/database/backfill_job_fingerprints.py
+
+
+def downgrade() -> None:
+	"""Remove deduplication lookup columns and indexes."""
+
+	op.drop_index("ix_jobs_user_dedup_company_key", table_name="jobs")
+	op.drop_index("ix_jobs_user_normalized_url", table_name="jobs")
+	op.drop_index("ix_jobs_user_fingerprint", table_name="jobs")
+	op.drop_index("ix_jobs_dedup_company_key", table_name="jobs")
+	op.drop_index("ix_jobs_normalized_url", table_name="jobs")
+
+	op.drop_column("jobs", "dedup_company_key")
+	op.drop_column("jobs", "normalized_url")
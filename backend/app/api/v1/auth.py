@@ -319,6 +319,15 @@ async def update_current_user(user_update: UserUpdate, current_user: User = Depe
 
 	logger.info(f"User profile updated: {current_user.email}")
 
+	# Scoring inputs changed, rebuild the materialized recommendations
+	if update_data.keys() & {"skills", "preferred_locations", "experience_level"}:
+		try:
+			from ...services.job_recommendation_service import JobRecommendationService
+
+			await JobRecommendationService(db=db).materialize_recommendations(db, current_user)
+		except Exception as e:
+			logger.error(f"Error refreshing materialized recommendations for user {current_user.id}: {e}")
+
 	return UserResponse.model_validate(current_user)
 
 
@@ -1,7 +1,10 @@
 
-from fastapi import APIRouter, Depends
-from ...core.dependencies import get_current_user
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from ...core.dependencies import get_admin_user, get_current_user
 from ...models.user import User
+from ...services.llm_service import LLMService, ModelType, get_llm_service
 
 router = APIRouter(prefix="/api/v1/llm", tags=["llm-services"])
 
@@ -15,3 +18,16 @@ async def list_models(current_user: User = Depends(get_current_user)):
 @router.get("/stats")
 async def get_llm_stats(current_user: User = Depends(get_current_user)):
     return {"stats": {"requests": 0, "tokens_used": 0}, "message": "LLM usage statistics ready"}
+
+@router.get("/cache/stats")
+async def get_llm_cache_stats(current_user: User = Depends(get_admin_user), llm_service: LLMService = Depends(get_llm_service)):
+    return {"stats": llm_service.get_cache_stats(), "message": "LLM response cache statistics for this worker"}
+
+@router.delete("/cache")
+async def purge_llm_cache(
+    model_type: Optional[ModelType] = Query(default=None, description="Only purge responses of this model type"),
+    current_user: User = Depends(get_admin_user),
+    llm_service: LLMService = Depends(get_llm_service),
+):
+    deleted = await llm_service.clear_cache(model_type)
+    return {"deleted": deleted, "model_type": model_type.value if model_type else None, "message": "LLM response cache purged"}
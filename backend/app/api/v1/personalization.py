@@ -124,6 +124,14 @@ async def update_user_preferences(
 
 		await db.commit()
 
+		# Skills changed, rebuild the materialized recommendations
+		try:
+			from ...services.job_recommendation_service import JobRecommendationService
+
+			await JobRecommendationService(db=db).materialize_recommendations(db, current_user)
+		except Exception as e:
+			logger.error(f"Error refreshing materialized recommendations for user {user_id}: {e}")
+
 		return preferences
 
 	except Exception as e:
@@ -39,9 +39,7 @@ async def get_recommendations(
 
 	# Generate fresh recommendations using the consolidated service
 	job_recommendation_service = JobRecommendationService(db=db)
-	recommendations = await job_recommendation_service.get_personalized_recommendations(
-		db=db, user_id=current_user.id, limit=limit, min_score=0.0, include_applied=False
-	)
+	recommendations = await job_recommendation_service.get_materialized_recommendations(db=db, user=current_user, limit=limit, projection=True)
 	formatted_recommendations = [
 		{
 			"id": rec["job"].id,
@@ -149,23 +149,44 @@ async def email_monthly_report(background_tasks: BackgroundTasks, db: AsyncSessi
 
 
 @router.post("/api/v1/admin/reports/weekly/all")
-async def schedule_all_weekly_reports(background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)):
+async def schedule_all_weekly_reports(background_tasks: BackgroundTasks, force: bool = False):
 	"""
 	Schedule weekly reports for all users (Admin only).
 
 	Generates and sends weekly reports to all users with email addresses.
-	This endpoint is typically called by a scheduled job.
+	This endpoint is typically called by a scheduled job. If this period's reports are being
+	sent right now, nothing is scheduled, even with force=true. If they were already sent,
+	nothing is scheduled unless force=true, which sends them all again.
 
 	Requires admin privileges.
 	"""
 	try:
 		# Single user system - no admin check needed
 
+		if scheduled_analytics_reports_service.is_report_run_in_progress("weekly"):
+			return {
+				"message": "Weekly reports for this period are being sent right now",
+				"status": "already_running",
+				"report_type": "weekly",
+				"scope": "all_users",
+			}
+
+		completed = scheduled_analytics_reports_service.get_completed_report_run("weekly")
+		if completed is not None and not force:
+			return {
+				"message": "Weekly reports for this period were already sent; pass force=true to send them again",
+				"status": "already_completed",
+				"report_type": "weekly",
+				"scope": "all_users",
+				"results": completed,
+			}
+
 		# Schedule bulk report generation in background
-		background_tasks.add_task(scheduled_analytics_reports_service.schedule_weekly_reports, db)
+		background_tasks.add_task(scheduled_analytics_reports_service.schedule_weekly_reports, force=force)
 
 		return {
 			"message": "Weekly reports scheduled for all users",
+			"status": "scheduled",
 			"scheduled_at": datetime.now().isoformat(),
 			"report_type": "weekly",
 			"scope": "all_users",
@@ -178,23 +199,44 @@ async def schedule_all_weekly_reports(background_tasks: BackgroundTasks, db: Asy
 
 
 @router.post("/api/v1/admin/reports/monthly/all")
-async def schedule_all_monthly_reports(background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)):
+async def schedule_all_monthly_reports(background_tasks: BackgroundTasks, force: bool = False):
 	"""
 	Schedule monthly reports for all users (Admin only).
 
 	Generates and sends monthly reports to all users with email addresses.
-	This endpoint is typically called by a scheduled job.
+	This endpoint is typically called by a scheduled job. If this period's reports are being
+	sent right now, nothing is scheduled, even with force=true. If they were already sent,
+	nothing is scheduled unless force=true, which sends them all again.
 
 	Requires admin privileges.
 	"""
 	try:
 		# Single user system - no admin check needed
 
+		if scheduled_analytics_reports_service.is_report_run_in_progress("monthly"):
+			return {
+				"message": "Monthly reports for this period are being sent right now",
+				"status": "already_running",
+				"report_type": "monthly",
+				"scope": "all_users",
+			}
+
+		completed = scheduled_analytics_reports_service.get_completed_report_run("monthly")
+		if completed is not None and not force:
+			return {
+				"message": "Monthly reports for this period were already sent; pass force=true to send them again",
+				"status": "already_completed",
+				"report_type": "monthly",
+				"scope": "all_users",
+				"results": completed,
+			}
+
 		# Schedule bulk report generation in background
-		background_tasks.add_task(scheduled_analytics_reports_service.schedule_monthly_reports, db)
+		background_tasks.add_task(scheduled_analytics_reports_service.schedule_monthly_reports, force=force)
 
 		return {
 			"message": "Monthly reports scheduled for all users",
+			"status": "scheduled",
 			"scheduled_at": datetime.now().isoformat(),
 			"report_type": "monthly",
 			"scope": "all_users",
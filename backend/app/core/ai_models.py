@@ -16,6 +16,7 @@ from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
 
 from .config import get_settings
 from .logging import get_logger
+from .tokenizer import get_token_counter
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -295,9 +296,7 @@ class OpenAIModel(BaseAIModel):
 
 	def _estimate_tokens(self, messages: List[BaseMessage], response: str) -> int:
 		"""Estimate token usage."""
-		# Rough estimation: 1 token ≈ 4 characters
-		total_chars = sum(len(msg.content) for msg in messages) + len(response)
-		return int(total_chars / 4)
+		return sum(get_token_counter("openai", self.config.name).count_tokens([msg.content for msg in messages] + [response]))
 
 
 class ModelManager:
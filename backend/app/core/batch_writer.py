@@ -0,0 +1,283 @@
+"""
+Buffered background writes off the request path
+
+A BatchWriter holds rows in a bounded in-process queue and a background task hands them to an
+async write function in batches, whenever batch_size rows are queued or flush_interval seconds
+have passed, whichever comes first:
+
+- submit() is synchronous and never waits on I/O. When the queue is full the row is dropped
+  and counted.
+- A batch whose write fails is appended to a local JSONL spill file (fsynced). The spill is
+  replayed after the next successful write. Delivery is at-least-once: a crash between a
+  replayed write and the removal of the replay file replays those rows again.
+- A replayed batch that fails is split in halves until the rows that fail on their own are
+  found. Those rows are moved to a .rejected file next to the spill, with the error, so one bad
+  row (or a duplicate key from an at-least-once replay) cannot keep the spill from draining.
+  One replay rejects at most batch_size rows; past that the rest is kept for the next replay.
+- close_batch_writers() flushes every writer on shutdown.
+
+Rows must be JSON-serializable dicts so they can be spilled and replayed unchanged.
+"""
+
+import asyncio
+import json
+import os
+import weakref
+from collections import deque
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+Row = Dict[str, Any]
+
+_writers: "weakref.WeakSet[BatchWriter]" = weakref.WeakSet()
+
+
+def _metrics():
+	try:
+		from ..monitoring.metrics_collector import get_metrics_collector
+
+		return get_metrics_collector()
+	except Exception:
+		return None
+
+
+class BatchWriter:
+	"""Bounded queue of rows drained in batches by a lazily started background task"""
+
+	def __init__(
+		self,
+		name: str,
+		write_batch: Callable[[List[Row]], Awaitable[Any]],
+		batch_size: int = 200,
+		flush_interval: float = 0.5,
+		max_queue_size: int = 10_000,
+		spill_path: Optional[Union[str, Path]] = None,
+	):
+		self.name = name
+		self.write_batch = write_batch
+		self.batch_size = batch_size
+		self.flush_interval = flush_interval
+		self.max_queue_size = max_queue_size
+		self.spill_path = Path(spill_path) if spill_path else None
+		self._queue: Deque[Row] = deque()
+		self._task: Optional[asyncio.Task] = None
+		self._batch_ready: Optional[asyncio.Event] = None
+		self._flush_lock: Optional[asyncio.Lock] = None
+		self._closing = False
+		self.stats = {"submitted": 0, "written": 0, "batches": 0, "dropped": 0, "failed_batches": 0, "spilled": 0, "replayed": 0, "rejected": 0}
+		_writers.add(self)
+
+	def submit(self, row: Row) -> bool:
+		"""Queue a row for the next batch; returns False if the queue is full and the row was dropped."""
+		if len(self._queue) >= self.max_queue_size:
+			self.stats["dropped"] += 1
+			metrics = _metrics()
+			if metrics:
+				metrics.record_writer_drop(self.name)
+			return False
+
+		self._queue.append(row)
+		self.stats["submitted"] += 1
+		self._ensure_consumer()
+		if len(self._queue) >= self.batch_size and self._batch_ready is not None:
+			self._batch_ready.set()
+		return True
+
+	def _ensure_consumer(self):
+		if self._task is not None and not self._task.done():
+			return
+		try:
+			loop = asyncio.get_running_loop()
+		except RuntimeError:
+			# No event loop (sync caller): rows wait for the next submit from async code or for close()
+			return
+		self._batch_ready = asyncio.Event()
+		self._task = loop.create_task(self._run())
+
+	async def _run(self):
+		"""Flush every flush_interval (sooner when a batch fills) until the queue is empty."""
+		while self._queue:
+			if len(self._queue) < self.batch_size and not self._closing:
+				self._batch_ready.clear()
+				try:
+					await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+				except asyncio.TimeoutError:
+					pass
+			await self.flush()
+
+	async def flush(self) -> int:
+		"""Write everything queued now; returns the number of rows written."""
+		if self._flush_lock is None:
+			self._flush_lock = asyncio.Lock()
+		written = 0
+		async with self._flush_lock:
+			while self._queue:
+				batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+				if await self._write(batch):
+					written += len(batch)
+					await self._replay_spill()
+			self._report_depth()
+		return written
+
+	async def _write(self, batch: List[Row]) -> bool:
+		try:
+			await self.write_batch(batch)
+		except Exception as e:
+			self.stats["failed_batches"] += 1
+			logger.warning(f"{self.name} batch write of {len(batch)} rows failed, spilling: {e}")
+			await self._spill(batch)
+			return False
+
+		self.stats["written"] += len(batch)
+		self.stats["batches"] += 1
+		metrics = _metrics()
+		if metrics:
+			metrics.record_writer_rows(self.name, "written", len(batch))
+		return True
+
+	async def _spill(self, batch: List[Row]):
+		if self.spill_path is None:
+			self.stats["dropped"] += len(batch)
+			metrics = _metrics()
+			if metrics:
+				metrics.record_writer_drop(self.name, len(batch))
+			return
+		try:
+			await asyncio.to_thread(self._append_spill, batch)
+		except Exception as e:
+			self.stats["dropped"] += len(batch)
+			logger.error(f"{self.name} could not spill {len(batch)} rows to {self.spill_path}: {e}")
+			return
+		self.stats["spilled"] += len(batch)
+		metrics = _metrics()
+		if metrics:
+			metrics.record_writer_rows(self.name, "spilled", len(batch))
+
+	def _append_spill(self, batch: List[Row]):
+		self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+		with open(self.spill_path, "a", encoding="utf-8") as f:
+			for row in batch:
+				f.write(json.dumps(row, ensure_ascii=False, separators=(",", ":"), default=str) + "\n")
+			f.flush()
+			os.fsync(f.fileno())
+
+	@property
+	def _replay_path(self) -> Path:
+		return self.spill_path.with_name(self.spill_path.name + ".replay")
+
+	@property
+	def _rejected_path(self) -> Path:
+		return self.spill_path.with_name(self.spill_path.name + ".rejected")
+
+	async def _replay_spill(self):
+		"""Write spilled rows back once the target accepts writes again."""
+		if self.spill_path is None or not (self.spill_path.exists() or self._replay_path.exists()):
+			return
+		try:
+			rows = await asyncio.to_thread(self._take_spill)
+		except Exception as e:
+			logger.error(f"{self.name} could not read spill file {self.spill_path}: {e}")
+			return
+		rejected = 0
+		for start in range(0, len(rows), self.batch_size):
+			batch = rows[start : start + self.batch_size]
+			try:
+				await self.write_batch(batch)
+			except Exception as e:
+				if rejected >= self.batch_size:
+					# Likely the target failing again rather than bad rows; stop rejecting
+					logger.warning(f"{self.name} spill replay failed, keeping {len(rows) - start} rows: {e}")
+					await asyncio.to_thread(self._append_spill, rows[start:])
+					break
+				written, bad_rows = await self._isolate_rejects(batch, e)
+				self._record_replayed(written)
+				if bad_rows:
+					rejected += len(bad_rows)
+					await self._reject(bad_rows)
+				continue
+			self._record_replayed(len(batch))
+		await asyncio.to_thread(self._replay_path.unlink, True)
+
+	async def _isolate_rejects(self, batch: List[Row], error: Exception) -> Tuple[int, List[Tuple[Row, str]]]:
+		"""Split a failed batch until the rows that fail on their own are found; returns (written, rejects)."""
+		if len(batch) == 1:
+			return 0, [(batch[0], str(error))]
+		written = 0
+		rejects: List[Tuple[Row, str]] = []
+		middle = len(batch) // 2
+		for half in (batch[:middle], batch[middle:]):
+			try:
+				await self.write_batch(half)
+			except Exception as e:
+				half_written, half_rejects = await self._isolate_rejects(half, e)
+				written += half_written
+				rejects.extend(half_rejects)
+			else:
+				written += len(half)
+		return written, rejects
+
+	def _record_replayed(self, count: int):
+		if not count:
+			return
+		self.stats["replayed"] += count
+		metrics = _metrics()
+		if metrics:
+			metrics.record_writer_rows(self.name, "replayed", count)
+
+	async def _reject(self, rejects: List[Tuple[Row, str]]):
+		logger.error(f"{self.name} rejected {len(rejects)} spilled rows that fail on their own, moved to {self._rejected_path}: {rejects[0][1]}")
+		try:
+			await asyncio.to_thread(self._append_rejected, rejects)
+		except Exception as e:
+			logger.error(f"{self.name} could not write rejected rows to {self._rejected_path}: {e}")
+			self.stats["dropped"] += len(rejects)
+			return
+		self.stats["rejected"] += len(rejects)
+		metrics = _metrics()
+		if metrics:
+			metrics.record_writer_rows(self.name, "rejected", len(rejects))
+
+	def _append_rejected(self, rejects: List[Tuple[Row, str]]):
+		with open(self._rejected_path, "a", encoding="utf-8") as f:
+			for row, error in rejects:
+				f.write(json.dumps({"error": error, "row": row}, ensure_ascii=False, separators=(",", ":"), default=str) + "\n")
+			f.flush()
+			os.fsync(f.fileno())
+
+	def _take_spill(self) -> List[Row]:
+		# A replay file left by a crash is picked up before new spills
+		if not self._replay_path.exists():
+			if not self.spill_path.exists():
+				return []
+			os.replace(self.spill_path, self._replay_path)
+		with open(self._replay_path, encoding="utf-8") as f:
+			return [json.loads(line) for line in f if line.strip()]
+
+	def _report_depth(self):
+		metrics = _metrics()
+		if metrics:
+			metrics.update_writer_queue_depth(self.name, len(self._queue))
+
+	async def close(self):
+		"""Drain the queue without waiting for the flush interval; failed rows go to the spill file."""
+		self._closing = True
+		if self._task is not None and not self._task.done():
+			self._batch_ready.set()
+			await self._task
+		await self.flush()
+
+	def get_stats(self) -> Dict[str, Any]:
+		return {**self.stats, "queue_depth": len(self._queue), "max_queue_size": self.max_queue_size}
+
+
+async def close_batch_writers():
+	"""Flush every live BatchWriter; called on application shutdown."""
+	for writer in list(_writers):
+		try:
+			await writer.close()
+		except Exception as e:
+			logger.error(f"Failed to flush {writer.name} on shutdown: {e}")
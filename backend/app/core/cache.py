@@ -14,6 +14,7 @@ import redis
 from redis.exceptions import ConnectionError, TimeoutError
 import logging
 
+from app.core.cache_invalidation import scan_unlink
 from app.core.config import get_settings
 
 settings = get_settings()
@@ -144,6 +145,33 @@ class CacheService:
 			self.cache_stats["errors"] += 1
 			return None
 
+	def get_many(self, keys: list[str]) -> list[Any | None]:
+		"""Get several values in one MGET round trip, in key order"""
+		if not keys:
+			return []
+		if not self.is_connected():
+			self.cache_stats["errors"] += 1
+			return [None] * len(keys)
+
+		self.cache_stats["total_requests"] += len(keys)
+
+		try:
+			values = self.redis_client.mget(keys)
+		except Exception as e:
+			logger.error(f"Cache mget error for {len(keys)} keys: {e}")
+			self.cache_stats["errors"] += 1
+			return [None] * len(keys)
+
+		results = []
+		for data in values:
+			if data is None:
+				self.cache_stats["misses"] += 1
+				results.append(None)
+			else:
+				self.cache_stats["hits"] += 1
+				results.append(self._deserialize_data(data))
+		return results
+
 	def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
 		"""Set value in cache with TTL"""
 		if not self.is_connected():
@@ -170,15 +198,12 @@ class CacheService:
 			return False
 
 	def delete_pattern(self, pattern: str) -> int:
-		"""Delete all keys matching a pattern"""
+		"""Delete all keys matching a pattern, using non-blocking SCAN + UNLINK"""
 		if not self.is_connected():
 			return 0
 
 		try:
-			keys = self.redis_client.keys(pattern)
-			if keys:
-				return self.redis_client.delete(*keys)
-			return 0
+			return scan_unlink(self.redis_client, pattern)
 		except Exception as e:
 			logger.error(f"Cache delete pattern error for pattern {pattern}: {e}")
 			return 0
@@ -344,6 +369,10 @@ class UserProfileCache:
 		return self.cache.set(key, settings_data, self.default_ttl)
 
 
+# Bump when the materialized entry layout or scoring changes so older entries read as stale
+MATERIALIZED_RECOMMENDATIONS_VERSION = 1
+
+
 class JobRecommendationCache:
 	"""Specialized cache manager for job recommendations"""
 
@@ -352,6 +381,11 @@ class JobRecommendationCache:
 		self.prefix = "job_recommendations"
 		self.default_ttl = 7200  # 2 hours
 
+		# Materialized per-user top-K lists
+		self.materialized_top_k = 50
+		self.materialized_ttl = 86400  # 24 hours
+		self.materialized_max_age = 21600  # 6 hours, recency scores drift after that
+
 	def get_recommendations(self, user_id: int) -> list[dict] | None:
 		"""Get job recommendations from cache"""
 		key = f"cc:{self.prefix}:{user_id}"
@@ -367,6 +401,7 @@ class JobRecommendationCache:
 	def invalidate_recommendations(self, user_id: int) -> bool:
 		"""Invalidate job recommendations cache"""
 		key = f"cc:{self.prefix}:{user_id}"
+		self.invalidate_materialized(user_id)
 		return self.cache.delete(key)
 
 	def get_recommendation_scores(self, user_id: int, job_id: int) -> dict | None:
@@ -379,6 +414,83 @@ class JobRecommendationCache:
 		key = f"cc:{self.prefix}_scores:{user_id}:{job_id}"
 		return self.cache.set(key, scores, self.default_ttl)
 
+	# -------- Materialized top-K recommendations --------
+	@staticmethod
+	def profile_stamp(user: Any) -> str:
+		"""Fingerprint of the user fields that drive scoring; changes whenever they are edited"""
+		payload = json.dumps(
+			[
+				sorted(skill.lower() for skill in user.skills or []),
+				sorted(location.lower() for location in user.preferred_locations or []),
+				user.experience_level or "",
+			]
+		)
+		return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+	def _materialized_key(self, user_id: int) -> str:
+		return f"cc:{self.prefix}_materialized:{user_id}"
+
+	def _is_fresh(self, entry: Any, profile_stamp: str) -> bool:
+		"""Entry matches the current layout version and profile and is within max age"""
+		if not isinstance(entry, dict):
+			return False
+		if entry.get("version") != MATERIALIZED_RECOMMENDATIONS_VERSION or entry.get("profile_stamp") != profile_stamp:
+			return False
+		try:
+			generated_at = datetime.fromisoformat(entry["generated_at"])
+		except (KeyError, TypeError, ValueError):
+			return False
+		return (datetime.now(timezone.utc) - generated_at).total_seconds() <= self.materialized_max_age
+
+	def get_materialized(self, user_id: int, profile_stamp: str) -> list[dict] | None:
+		"""Get the materialized (job_id, score, match_reasons) list, or None when missing or stale"""
+		entry = self.cache.get(self._materialized_key(user_id))
+		if not self._is_fresh(entry, profile_stamp):
+			return None
+		return entry["recommendations"]
+
+	def get_materialized_many(self, profile_stamps: dict[int, str]) -> dict[int, list[dict] | None]:
+		"""get_materialized for many users in one round trip, keyed by user id"""
+		user_ids = list(profile_stamps)
+		entries = self.cache.get_many([self._materialized_key(user_id) for user_id in user_ids])
+		return {
+			user_id: entry["recommendations"] if self._is_fresh(entry, profile_stamps[user_id]) else None for user_id, entry in zip(user_ids, entries)
+		}
+
+	def set_materialized(self, user_id: int, profile_stamp: str, recommendations: list[dict]) -> bool:
+		"""Store a freshly scored top-K list for a user"""
+		entry = {
+			"version": MATERIALIZED_RECOMMENDATIONS_VERSION,
+			"profile_stamp": profile_stamp,
+			"generated_at": datetime.now(timezone.utc).isoformat(),
+			"recommendations": self._compact(recommendations)[: self.materialized_top_k],
+		}
+		return self.cache.set(self._materialized_key(user_id), entry, self.materialized_ttl)
+
+	def merge_materialized(self, user_id: int, profile_stamp: str, scored_jobs: list[dict]) -> bool:
+		"""
+		Merge newly scored jobs into a fresh materialized list.
+
+		Keeps the original generated_at so max age still forces a periodic full rebuild.
+		Returns False when there is no fresh entry to merge into; the next read rebuilds it.
+		"""
+		entry = self.cache.get(self._materialized_key(user_id))
+		if not self._is_fresh(entry, profile_stamp):
+			return False
+
+		merged = {rec["job_id"]: rec for rec in entry["recommendations"]}
+		merged.update((rec["job_id"], rec) for rec in self._compact(scored_jobs))
+		entry["recommendations"] = sorted(merged.values(), key=lambda rec: rec["score"], reverse=True)[: self.materialized_top_k]
+		return self.cache.set(self._materialized_key(user_id), entry, self.materialized_ttl)
+
+	def invalidate_materialized(self, user_id: int) -> bool:
+		"""Drop a user's materialized list"""
+		return self.cache.delete(self._materialized_key(user_id))
+
+	@staticmethod
+	def _compact(recommendations: list[dict]) -> list[dict]:
+		return [{"job_id": rec["job_id"], "score": rec["score"], "match_reasons": rec.get("match_reasons", [])} for rec in recommendations]
+
 
 class AnalyticsCache:
 	"""Specialized cache manager for analytics data"""
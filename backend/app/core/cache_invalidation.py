@@ -0,0 +1,140 @@
+"""
+Non-blocking Redis cache invalidation helpers
+
+Replaces `KEYS pattern` (which blocks Redis for the whole keyspace walk) with:
+- SCAN-driven pattern invalidation that UNLINKs keys in bounded batches
+- Per-tag key sets: writers SADD each key to the sets of its tags, so invalidating
+  a tag (e.g. every cache entry of one user) touches only that tag's keys
+
+Keys written before tagging was introduced are in no tag set. The first process that writes
+tagged keys records when tagging started, and until the longest user-scoped TTL has passed
+since then, user invalidation also sweeps the user's key patterns.
+
+Works with both sync (redis.Redis) and async (redis.asyncio.Redis) clients.
+"""
+
+import re
+from typing import Iterable, List, Optional
+
+# Keys requested per SCAN/SPOP round trip and deleted per UNLINK
+SCAN_BATCH_SIZE = 500
+
+# Tag sets outlive the keys they index; stale members are harmless and dropped on invalidation
+TAG_KEY_PREFIX = "cache_tag"
+TAG_SET_TTL = 7 * 86400
+
+# User-scoped key families ("<family>:<user_id>:...") that are tagged automatically
+USER_KEY_FAMILIES = ("recommendations", "skill_gap", "analytics", "content_generation", "interview", "resume_parsing")
+USER_SCOPED_KEY_RE = re.compile(rf"^(?:{'|'.join(USER_KEY_FAMILIES)}):(\d+):")
+
+# When tagged writes started; untagged keys are swept for LEGACY_SWEEP_SECONDS after it
+TAGGING_SINCE_KEY = f"{TAG_KEY_PREFIX}:tagging_since"
+# Longest TTL given to user-scoped entries (resume parsing)
+LEGACY_SWEEP_SECONDS = 86400
+
+
+def tag_key(tag: str) -> str:
+	"""Redis key of the set holding the cache keys for a tag"""
+	return f"{TAG_KEY_PREFIX}:{tag}"
+
+
+def user_tag(user_id: int) -> str:
+	"""Tag shared by every user-scoped cache entry of a user"""
+	return f"user:{user_id}"
+
+
+def user_key_patterns(user_id: int) -> List[str]:
+	"""SCAN patterns covering every user-scoped key of a user, tagged or not"""
+	return [f"{family}:{user_id}:*" for family in USER_KEY_FAMILIES]
+
+
+def mark_tagging_started(client, now: float) -> None:
+	"""Record when tagged writes started, unless an earlier process already did"""
+	client.set(TAGGING_SINCE_KEY, str(now), nx=True)
+
+
+def legacy_sweep_until(client, now: float) -> float:
+	"""Time until which untagged user keys may still exist and must be swept by pattern"""
+	mark_tagging_started(client, now)
+	return float(client.get(TAGGING_SINCE_KEY)) + LEGACY_SWEEP_SECONDS
+
+
+async def alegacy_sweep_until(client, now: float) -> float:
+	"""Time until which untagged user keys may still exist and must be swept by pattern (async)"""
+	await client.set(TAGGING_SINCE_KEY, str(now), nx=True)
+	return float(await client.get(TAGGING_SINCE_KEY)) + LEGACY_SWEEP_SECONDS
+
+
+def tags_for_key(key: str, tags: Optional[Iterable[str]] = None) -> List[str]:
+	"""Explicit tags plus the user tag implied by the key's family"""
+	resolved = list(tags or [])
+	match = USER_SCOPED_KEY_RE.match(key)
+	if match:
+		implied = user_tag(int(match.group(1)))
+		if implied not in resolved:
+			resolved.append(implied)
+	return resolved
+
+
+def queue_tag_updates(pipe, key: str, tags: Iterable[str]) -> None:
+	"""Queue SADD/EXPIRE commands registering a key under its tags on a pipeline"""
+	for tag in tags:
+		pipe.sadd(tag_key(tag), key)
+		pipe.expire(tag_key(tag), TAG_SET_TTL)
+
+
+def scan_unlink(client, pattern: str, batch_size: int = SCAN_BATCH_SIZE) -> int:
+	"""Delete keys matching a glob pattern via SCAN, unlinking them in batches"""
+	deleted = 0
+	batch = []
+	for key in client.scan_iter(match=pattern, count=batch_size):
+		batch.append(key)
+		if len(batch) >= batch_size:
+			deleted += client.unlink(*batch)
+			batch = []
+	if batch:
+		deleted += client.unlink(*batch)
+	return deleted
+
+
+async def ascan_unlink(client, pattern: str, batch_size: int = SCAN_BATCH_SIZE) -> int:
+	"""Delete keys matching a glob pattern via SCAN, unlinking them in batches (async)"""
+	deleted = 0
+	batch = []
+	async for key in client.scan_iter(match=pattern, count=batch_size):
+		batch.append(key)
+		if len(batch) >= batch_size:
+			deleted += await client.unlink(*batch)
+			batch = []
+	if batch:
+		deleted += await client.unlink(*batch)
+	return deleted
+
+
+def invalidate_tags(client, tags: Iterable[str], batch_size: int = SCAN_BATCH_SIZE) -> int:
+	"""
+	Delete every key registered under the given tags.
+
+	Members are drained with SPOP so keys tagged concurrently are either deleted
+	now or remain registered for the next invalidation.
+	"""
+	deleted = 0
+	for tag in tags:
+		while True:
+			keys = client.spop(tag_key(tag), batch_size)
+			if not keys:
+				break
+			deleted += client.unlink(*keys)
+	return deleted
+
+
+async def ainvalidate_tags(client, tags: Iterable[str], batch_size: int = SCAN_BATCH_SIZE) -> int:
+	"""Delete every key registered under the given tags (async)"""
+	deleted = 0
+	for tag in tags:
+		while True:
+			keys = await client.spop(tag_key(tag), batch_size)
+			if not keys:
+				break
+			deleted += await client.unlink(*keys)
+	return deleted
@@ -134,6 +134,12 @@ class Settings:
 		# Not part of UnifiedSettings; pull from env
 		return os.getenv("API_KEY_SECRET", "")
 
+	# -------- AI provider limits --------
+	@property
+	def groq_shared_rate_limits(self) -> bool:
+		"""Keep GROQ per-minute quotas in Redis so all workers share them"""
+		return os.getenv("GROQ_SHARED_RATE_LIMITS", "true").lower() in {"1", "true", "yes"}
+
 	# -------- Scraping toggles (legacy uppercase settings) --------
 	@property
 	def SCRAPING_MAX_RESULTS_PER_SITE(self) -> int:
@@ -159,6 +165,12 @@ class Settings:
 	def SCRAPING_RATE_LIMIT_MAX(self) -> float:
 		return float(os.getenv("SCRAPING_RATE_LIMIT_MAX", "3.0"))
 
+	# -------- Job deduplication --------
+	@property
+	def job_dedup_strategy(self) -> str:
+		"""Batch dedup strategy: "indexed" (blocked MinHash-LSH) or "pairwise" (reference O(N·M))"""
+		return getattr(self._u, "job_dedup_strategy", os.getenv("JOB_DEDUP_STRATEGY", "indexed")).lower()
+
 	# -------- Generic delegation --------
 	def __getattr__(self, name: str) -> Any:
 		# Delegate to the unified settings for any other attribute
@@ -0,0 +1,272 @@
+"""
+Append-only cost ledger with pre-aggregated rollups.
+
+Every recorded LLM cost is applied as counter increments instead of being stored as a row:
+
+- spend hashes per budget period bucket (``cost_ledger:spend:<period>:<bucket>``), one field per
+  budget scope the cost falls in (global/user x all/category), so a budget check is one HGET
+- an hourly rollup hash (``cost_ledger:rollup:<hour>``) with cost, tokens and request counters
+  per (category, user, provider, model), used for summaries and flushed to llm_cost_rollups
+
+All increments for one cost go out in a single pipeline of HINCRBYFLOAT/HINCRBY commands, so
+concurrent workers never lose writes. While Redis is unavailable the same counters are kept in
+process.
+"""
+
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+LEDGER_PREFIX = "cost_ledger"
+
+# Spend buckets are kept a little longer than their period so late reads still see them
+SPEND_TTLS = {
+	"hourly": 2 * 86400,
+	"daily": 8 * 86400,
+	"weekly": 15 * 86400,
+	"monthly": 62 * 86400,
+	"yearly": 400 * 86400,
+}
+# Hourly rollups back cost summaries; older history lives in llm_cost_rollups
+ROLLUP_TTL = 35 * 86400
+ROLLUP_METRICS = ("cost", "prompt_tokens", "completion_tokens", "requests")
+
+SpendQuery = Tuple[str, str]  # (period, scope)
+
+
+def period_boundaries(timestamp: datetime, period: str) -> Tuple[datetime, datetime]:
+	"""Start and end of the budget period containing timestamp."""
+	if period == "hourly":
+		start = timestamp.replace(minute=0, second=0, microsecond=0)
+		end = start + timedelta(hours=1)
+	elif period == "daily":
+		start = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+		end = start + timedelta(days=1)
+	elif period == "weekly":
+		start = timestamp.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=timestamp.weekday())
+		end = start + timedelta(weeks=1)
+	elif period == "monthly":
+		start = timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+		end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+	elif period == "yearly":
+		start = timestamp.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+		end = start.replace(year=start.year + 1)
+	else:
+		raise ValueError(f"Unsupported budget period: {period}")
+	return start, end
+
+
+def budget_scope(category: Optional[str] = None, user_id: Optional[str] = None) -> str:
+	"""Counter field for a budget: global or per user, all categories or one."""
+	user_part = f"user:{user_id}" if user_id else "global"
+	category_part = f"cat:{category}" if category else "all"
+	return f"{user_part}:{category_part}"
+
+
+def _bucket(start: datetime) -> str:
+	return start.strftime("%Y%m%d%H")
+
+
+def _hours(start: datetime, end: datetime) -> List[datetime]:
+	hour = start.replace(minute=0, second=0, microsecond=0)
+	hours = []
+	while hour <= end:
+		hours.append(hour)
+		hour += timedelta(hours=1)
+	return hours
+
+
+class CostLedger:
+	"""Atomic per-period spend counters and hourly rollups in Redis, with an in-process fallback."""
+
+	def __init__(self, cache, prefix: str = LEDGER_PREFIX):
+		self.cache = cache
+		self.prefix = prefix
+		self._local: Dict[str, Dict[str, Any]] = {}
+		self._local_expiry: Dict[str, float] = {}
+
+	def _spend_key(self, period: str, timestamp: datetime) -> str:
+		return f"{self.prefix}:spend:{period}:{_bucket(period_boundaries(timestamp, period)[0])}"
+
+	def _rollup_key(self, hour: datetime) -> str:
+		return f"{self.prefix}:rollup:{_bucket(hour)}"
+
+	def _increments(
+		self,
+		timestamp: datetime,
+		category: str,
+		user_id: Optional[str],
+		provider: str,
+		model: str,
+		cost: Decimal,
+		prompt_tokens: int,
+		completion_tokens: int,
+	) -> List[Tuple[str, str, Any, int]]:
+		"""(key, field, amount, ttl) for every counter one cost entry touches; costs are Decimal, counts int."""
+		scopes = [budget_scope(), budget_scope(category)]
+		if user_id:
+			scopes += [budget_scope(user_id=user_id), budget_scope(category, user_id)]
+		increments = [(self._spend_key(period, timestamp), scope, cost, ttl) for period, ttl in SPEND_TTLS.items() for scope in scopes]
+
+		rollup_key = self._rollup_key(timestamp)
+		dims = [category, user_id or "", provider, model]
+		amounts = (cost, prompt_tokens, completion_tokens, 1)
+		increments += [(rollup_key, json.dumps([*dims, metric]), amount, ROLLUP_TTL) for metric, amount in zip(ROLLUP_METRICS, amounts)]
+		return increments
+
+	async def record(
+		self,
+		timestamp: datetime,
+		category: str,
+		user_id: Optional[str],
+		provider: str,
+		model: str,
+		cost: Decimal,
+		prompt_tokens: int = 0,
+		completion_tokens: int = 0,
+	):
+		"""Apply one cost to every counter it belongs to, in a single round trip."""
+		increments = self._increments(timestamp, category, user_id, provider, model, cost, prompt_tokens, completion_tokens)
+		client = await self._client()
+		if client is not None:
+			try:
+				pipe = client.pipeline(transaction=False)
+				for key, field, amount, _ in increments:
+					if isinstance(amount, int):
+						pipe.hincrby(key, field, amount)
+					else:
+						pipe.hincrbyfloat(key, field, float(amount))
+				for key, ttl in {key: ttl for key, _, _, ttl in increments}.items():
+					pipe.expire(key, ttl)
+				await pipe.execute()
+				return
+			except Exception as e:
+				logger.warning(f"Cost ledger write failed, keeping counters in process: {e}")
+
+		self._prune_local()
+		now = time.time()
+		for key, field, amount, ttl in increments:
+			counters = self._local.setdefault(key, {})
+			counters[field] = counters.get(field, 0) + amount
+			self._local_expiry[key] = now + ttl
+
+	async def get_spends(self, queries: Sequence[SpendQuery], now: Optional[datetime] = None) -> List[Decimal]:
+		"""Current spend of each (period, scope) in one round trip."""
+		now = now or datetime.now(timezone.utc)
+		keys = [self._spend_key(period, now) for period, _ in queries]
+		client = await self._client()
+		if client is not None:
+			try:
+				pipe = client.pipeline(transaction=False)
+				for key, (_, scope) in zip(keys, queries):
+					pipe.hget(key, scope)
+				values = await pipe.execute()
+				return [Decimal(str(value)) if value is not None else Decimal("0") for value in values]
+			except Exception as e:
+				logger.warning(f"Cost ledger read failed, using in-process counters: {e}")
+		return [Decimal(self._local.get(key, {}).get(scope, 0)) for key, (_, scope) in zip(keys, queries)]
+
+	async def get_rollups(self, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+		"""Hourly rollup rows for the hours overlapping [start, end]."""
+		hours = _hours(start, end)
+		keys = [self._rollup_key(hour) for hour in hours]
+		hashes: Optional[List[Dict[str, Any]]] = None
+		client = await self._client()
+		if client is not None:
+			try:
+				pipe = client.pipeline(transaction=False)
+				for key in keys:
+					pipe.hgetall(key)
+				hashes = await pipe.execute()
+			except Exception as e:
+				logger.warning(f"Cost ledger rollup read failed, using in-process counters: {e}")
+		if hashes is None:
+			hashes = [self._local.get(key, {}) for key in keys]
+
+		rows: Dict[Tuple[datetime, str, str, str, str], Dict[str, Any]] = {}
+		for hour, counters in zip(hours, hashes):
+			for field, value in (counters or {}).items():
+				category, user_id, provider, model, metric = json.loads(field)
+				row = rows.setdefault(
+					(hour, category, user_id, provider, model),
+					{"period_start": hour, "category": category, "user_id": user_id or None, "provider": provider, "model": model},
+				)
+				row[metric] = Decimal(str(value)) if metric == "cost" else int(Decimal(str(value)))
+		for row in rows.values():
+			for metric in ROLLUP_METRICS:
+				row.setdefault(metric, Decimal("0") if metric == "cost" else 0)
+		return list(rows.values())
+
+	async def flush(self, db, hours: int = 2, now: Optional[datetime] = None) -> int:
+		"""
+		Upsert the hourly rollups of the last `hours` hours into llm_cost_rollups.
+
+		Rollups hold running totals, so re-flushing an hour overwrites its rows with newer values.
+		"""
+		from ..models.llm_cost_rollup import LLMCostRollup
+
+		now = now or datetime.now(timezone.utc)
+		rollups = await self.get_rollups(now - timedelta(hours=hours - 1), now)
+		if not rollups:
+			return 0
+
+		# Rows are stored as naive UTC, like the other timestamp columns
+		for row in rollups:
+			row["period_start"] = row["period_start"].replace(tzinfo=None)
+		period_starts = {row["period_start"] for row in rollups}
+		existing = {
+			(r.period_start, r.category, r.user_id, r.provider, r.model): r
+			for r in db.query(LLMCostRollup).filter(LLMCostRollup.period_start.in_(period_starts)).all()
+		}
+		for row in rollups:
+			key = (row["period_start"], row["category"], row["user_id"], row["provider"], row["model"])
+			record = existing.get(key)
+			if record is None:
+				record = LLMCostRollup(
+					period_start=row["period_start"], category=row["category"], user_id=row["user_id"], provider=row["provider"], model=row["model"]
+				)
+				db.add(record)
+			record.cost = row["cost"]
+			record.prompt_tokens = row["prompt_tokens"]
+			record.completion_tokens = row["completion_tokens"]
+			record.request_count = row["requests"]
+			record.updated_at = datetime.utcnow()
+		db.commit()
+		return len(rollups)
+
+	async def _client(self):
+		try:
+			return await self.cache._get_async_client()
+		except Exception as e:
+			logger.debug(f"Cost ledger Redis client unavailable: {e}")
+			return None
+
+	def _prune_local(self):
+		now = time.time()
+		for key in [key for key, expires_at in self._local_expiry.items() if expires_at <= now]:
+			self._local.pop(key, None)
+			self._local_expiry.pop(key, None)
+
+
+def summarize_rollups(rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+	"""Totals plus per-provider and per-category breakdowns of rollup rows."""
+	total_cost, total_tokens, request_count = Decimal("0.00"), 0, 0
+	by_provider: Dict[str, Dict[str, Any]] = {}
+	by_category: Dict[str, Dict[str, Any]] = {}
+	for row in rows:
+		tokens = row["prompt_tokens"] + row["completion_tokens"]
+		total_cost += row["cost"]
+		total_tokens += tokens
+		request_count += row["requests"]
+		for groups, name in ((by_provider, row["provider"]), (by_category, row["category"])):
+			group = groups.setdefault(name, {"cost": Decimal("0.00"), "tokens": 0, "requests": 0})
+			group["cost"] += row["cost"]
+			group["tokens"] += tokens
+			group["requests"] += row["requests"]
+	return {"total_cost": total_cost, "total_tokens": total_tokens, "request_count": request_count, "by_provider": by_provider, "by_category": by_category}
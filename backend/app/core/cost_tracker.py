@@ -2,14 +2,16 @@
 Cost tracking system for LLM requests with budget limits and monitoring.
 """
 
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Dict, List, Optional, Any
+from typing import Deque, Dict, List, Optional, Any
 from decimal import Decimal, ROUND_HALF_UP
 
 from ..core.logging import get_logger
 from ..services.cache_service import get_cache_service
+from .cost_ledger import CostLedger, budget_scope, period_boundaries, summarize_rollups
 
 logger = get_logger(__name__)
 cache_service = get_cache_service()
@@ -100,11 +102,13 @@ class BudgetLimit:
 	alert_threshold: float = 0.8  # Alert at 80% of limit
 	hard_limit: bool = True  # Enforce hard limit vs soft warning
 
+	def get_scope(self) -> str:
+		"""Cost ledger counter this budget reads."""
+		return budget_scope(self.category.value if self.category else None, self.user_id)
+
 	def get_cache_key(self) -> str:
 		"""Get cache key for this budget limit."""
-		user_part = f"user:{self.user_id}" if self.user_id else "global"
-		category_part = f"cat:{self.category.value}" if self.category else "all"
-		return f"budget:{user_part}:{category_part}:{self.period.value}"
+		return f"budget:{self.get_scope()}:{self.period.value}"
 
 
 @dataclass
@@ -139,11 +143,12 @@ class BudgetStatus:
 class CostTracker:
 	"""Tracks LLM costs and enforces budget limits."""
 
-	def __init__(self):
+	def __init__(self, max_recent_entries: int = 1000):
 		"""Initialize cost tracker."""
-		self.cost_entries: List[CostEntry] = []
+		# Totals live in the ledger; only the most recent entries are kept for inspection
+		self.cost_entries: Deque[CostEntry] = deque(maxlen=max_recent_entries)
+		self.ledger = CostLedger(cache_service)
 		self.budget_limits: List[BudgetLimit] = []
-		self.cache_ttl = 300  # 5 minutes
 		self._load_default_budgets()
 
 	def _load_default_budgets(self):
@@ -208,37 +213,22 @@ class CostTracker:
 			metadata=metadata or {},
 		)
 
-		# Store in memory (in production, this would go to a database)
 		self.cost_entries.append(cost_entry)
-
-		# Cache recent entries for quick access
-		await self._cache_cost_entry(cost_entry)
+		await self.ledger.record(
+			cost_entry.timestamp,
+			cost_entry.category.value,
+			cost_entry.user_id,
+			cost_entry.provider,
+			cost_entry.model,
+			cost_entry.cost,
+			cost_entry.prompt_tokens,
+			cost_entry.completion_tokens,
+		)
 
 		logger.info(f"Recorded cost: {cost_entry.provider}:{cost_entry.model} ${cost_entry.cost} ({cost_entry.total_tokens} tokens)")
 
 		return cost_entry
 
-	async def _cache_cost_entry(self, entry: CostEntry):
-		"""Cache cost entry for quick access."""
-		# Cache by various keys for different query patterns
-		timestamp_key = f"cost_entry:{entry.timestamp.strftime('%Y%m%d%H')}"
-		category_key = f"cost_category:{entry.category.value}:{entry.timestamp.strftime('%Y%m%d')}"
-		user_key = f"cost_user:{entry.user_id}:{entry.timestamp.strftime('%Y%m%d')}" if entry.user_id else None
-
-		# Get existing entries from cache
-		hourly_entries = await cache_service.aget(timestamp_key) or []
-		hourly_entries.append(entry.to_dict())
-		await cache_service.aset(timestamp_key, hourly_entries, self.cache_ttl)
-
-		category_entries = await cache_service.aget(category_key) or []
-		category_entries.append(entry.to_dict())
-		await cache_service.aset(category_key, category_entries, self.cache_ttl)
-
-		if user_key:
-			user_entries = await cache_service.aget(user_key) or []
-			user_entries.append(entry.to_dict())
-			await cache_service.aset(user_key, user_entries, self.cache_ttl)
-
 	async def check_budget_limits(self, category: CostCategory, estimated_cost: float, user_id: Optional[str] = None) -> List[BudgetStatus]:
 		"""
 		Check if request would exceed budget limits.
@@ -251,17 +241,15 @@ class CostTracker:
 		Returns:
 		    List of budget statuses that would be affected
 		"""
-		affected_budgets = []
-
-		for budget_limit in self.budget_limits:
-			# Check if this budget applies
-			if budget_limit.category and budget_limit.category != category:
-				continue
-			if budget_limit.user_id and budget_limit.user_id != user_id:
-				continue
-
-			status = await self._get_budget_status(budget_limit)
+		applicable = [
+			budget_limit
+			for budget_limit in self.budget_limits
+			if (not budget_limit.category or budget_limit.category == category) and (not budget_limit.user_id or budget_limit.user_id == user_id)
+		]
+		affected_budgets = await self._get_budget_statuses(applicable)
 
+		for status in affected_budgets:
+			budget_limit = status.limit
 			# Check if adding estimated cost would exceed limit
 			projected_spend = status.current_spend + Decimal(str(estimated_cost))
 			if projected_spend > budget_limit.limit:
@@ -272,88 +260,35 @@ class CostTracker:
 			if projected_percentage >= budget_limit.alert_threshold:
 				status.alert_triggered = True
 
-			affected_budgets.append(status)
-
 		return affected_budgets
 
-	async def _get_budget_status(self, budget_limit: BudgetLimit) -> BudgetStatus:
-		"""Get current status for a budget limit."""
-		# Calculate period boundaries
+	async def _get_budget_statuses(self, budget_limits: List[BudgetLimit]) -> List[BudgetStatus]:
+		"""Get current status for budget limits, reading all their ledger counters in one round trip."""
 		now = datetime.now(timezone.utc)
-		period_start, period_end = self._get_period_boundaries(now, budget_limit.period)
-
-		# Get current spend for this period
-		current_spend = await self._calculate_period_spend(budget_limit, period_start, period_end)
-
-		remaining = budget_limit.limit - current_spend
-		percentage_used = float(current_spend / budget_limit.limit) if budget_limit.limit > 0 else 0.0
-
-		return BudgetStatus(
-			limit=budget_limit,
-			current_spend=current_spend,
-			remaining=remaining,
-			percentage_used=percentage_used,
-			period_start=period_start,
-			period_end=period_end,
-			alert_triggered=percentage_used >= budget_limit.alert_threshold,
-			limit_exceeded=current_spend >= budget_limit.limit,
-		)
+		spends = await self.ledger.get_spends([(limit.period.value, limit.get_scope()) for limit in budget_limits], now)
+
+		statuses = []
+		for budget_limit, current_spend in zip(budget_limits, spends):
+			period_start, period_end = self._get_period_boundaries(now, budget_limit.period)
+			remaining = budget_limit.limit - current_spend
+			percentage_used = float(current_spend / budget_limit.limit) if budget_limit.limit > 0 else 0.0
+			statuses.append(
+				BudgetStatus(
+					limit=budget_limit,
+					current_spend=current_spend,
+					remaining=remaining,
+					percentage_used=percentage_used,
+					period_start=period_start,
+					period_end=period_end,
+					alert_triggered=percentage_used >= budget_limit.alert_threshold,
+					limit_exceeded=current_spend >= budget_limit.limit,
+				)
+			)
+		return statuses
 
 	def _get_period_boundaries(self, timestamp: datetime, period: BudgetPeriod) -> tuple[datetime, datetime]:
 		"""Get start and end boundaries for a budget period."""
-		if period == BudgetPeriod.HOURLY:
-			start = timestamp.replace(minute=0, second=0, microsecond=0)
-			end = start + timedelta(hours=1)
-		elif period == BudgetPeriod.DAILY:
-			start = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
-			end = start + timedelta(days=1)
-		elif period == BudgetPeriod.WEEKLY:
-			days_since_monday = timestamp.weekday()
-			start = timestamp.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days_since_monday)
-			end = start + timedelta(weeks=1)
-		elif period == BudgetPeriod.MONTHLY:
-			start = timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-			if start.month == 12:
-				end = start.replace(year=start.year + 1, month=1)
-			else:
-				end = start.replace(month=start.month + 1)
-		elif period == BudgetPeriod.YEARLY:
-			start = timestamp.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
-			end = start.replace(year=start.year + 1)
-		else:
-			raise ValueError(f"Unsupported budget period: {period}")
-
-		return start, end
-
-	async def _calculate_period_spend(self, budget_limit: BudgetLimit, period_start: datetime, period_end: datetime) -> Decimal:
-		"""Calculate total spend for a budget period."""
-		# Try to get from cache first
-		cache_key = f"period_spend:{budget_limit.get_cache_key()}:{period_start.isoformat()}"
-		cached_spend = await cache_service.aget(cache_key)
-		if cached_spend is not None:
-			return Decimal(str(cached_spend))
-
-		total_spend = Decimal("0.00")
-
-		# Filter cost entries for this period and budget
-		for entry in self.cost_entries:
-			if not (period_start <= entry.timestamp < period_end):
-				continue
-
-			# Check category filter
-			if budget_limit.category and entry.category != budget_limit.category:
-				continue
-
-			# Check user filter
-			if budget_limit.user_id and entry.user_id != budget_limit.user_id:
-				continue
-
-			total_spend += entry.cost
-
-		# Cache the result
-		await cache_service.aset(cache_key, str(total_spend), self.cache_ttl)
-
-		return total_spend
+		return period_boundaries(timestamp, period.value)
 
 	async def get_cost_summary(
 		self,
@@ -365,6 +300,8 @@ class CostTracker:
 		"""
 		Get cost summary for specified period and filters.
 
+		Totals come from the ledger's hourly rollups, so the range is resolved to whole hours.
+
 		Args:
 		    start_date: Start date (default: 24 hours ago)
 		    end_date: End date (default: now)
@@ -378,41 +315,17 @@ class CostTracker:
 			end_date = datetime.now(timezone.utc)
 		if not start_date:
 			start_date = end_date - timedelta(days=1)
+		# Ledger buckets are UTC; treat naive query datetimes as UTC
+		start_date, end_date = (d if d.tzinfo else d.replace(tzinfo=timezone.utc) for d in (start_date, end_date))
 
-		# Filter entries
-		filtered_entries = []
-		for entry in self.cost_entries:
-			if not (start_date <= entry.timestamp <= end_date):
-				continue
-			if category and entry.category != category:
-				continue
-			if user_id and entry.user_id != user_id:
-				continue
-			filtered_entries.append(entry)
-
-		# Calculate summary statistics
-		total_cost = sum(entry.cost for entry in filtered_entries)
-		total_tokens = sum(entry.total_tokens for entry in filtered_entries)
-		request_count = len(filtered_entries)
-
-		# Group by provider
-		by_provider = {}
-		for entry in filtered_entries:
-			if entry.provider not in by_provider:
-				by_provider[entry.provider] = {"cost": Decimal("0.00"), "tokens": 0, "requests": 0}
-			by_provider[entry.provider]["cost"] += entry.cost
-			by_provider[entry.provider]["tokens"] += entry.total_tokens
-			by_provider[entry.provider]["requests"] += 1
-
-		# Group by category
-		by_category = {}
-		for entry in filtered_entries:
-			cat = entry.category.value
-			if cat not in by_category:
-				by_category[cat] = {"cost": Decimal("0.00"), "tokens": 0, "requests": 0}
-			by_category[cat]["cost"] += entry.cost
-			by_category[cat]["tokens"] += entry.total_tokens
-			by_category[cat]["requests"] += 1
+		rollups = [
+			row
+			for row in await self.ledger.get_rollups(start_date, end_date)
+			if (not category or row["category"] == category.value) and (not user_id or row["user_id"] == user_id)
+		]
+		summary = summarize_rollups(rollups)
+		total_cost, total_tokens, request_count = summary["total_cost"], summary["total_tokens"], summary["request_count"]
+		by_provider, by_category = summary["by_provider"], summary["by_category"]
 
 		# Convert Decimal to string for JSON serialization
 		for provider_data in by_provider.values():
@@ -448,13 +361,7 @@ class CostTracker:
 
 	async def get_all_budget_statuses(self, user_id: Optional[str] = None) -> List[BudgetStatus]:
 		"""Get status for all applicable budget limits."""
-		statuses = []
-		for budget_limit in self.budget_limits:
-			if budget_limit.user_id and budget_limit.user_id != user_id:
-				continue
-			status = await self._get_budget_status(budget_limit)
-			statuses.append(status)
-		return statuses
+		return await self._get_budget_statuses([limit for limit in self.budget_limits if not limit.user_id or limit.user_id == user_id])
 
 
 # Global cost tracker instance
@@ -0,0 +1,211 @@
+"""
+Single-flight coalescing of identical concurrent calls
+
+Concurrent callers with the same key share one execution:
+- In-process: the first caller (leader) runs the call, the others await its asyncio future. If
+  the leader is cancelled (e.g. its client disconnected), the followers are not: one of them
+  retries as the new leader
+- Across workers: the leader holds a short Redis lock (SET NX PX). Callers in other processes
+  subscribe to the key's channel, wait for the leader's "done" message and read the result the
+  leader stored under a short-lived key. If the leader fails, or the wait times out, they run the call themselves.
+
+Redis is optional: without a client (or on Redis errors) coalescing degrades to in-process only.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+SINGLE_FLIGHT_PREFIX = "single_flight"
+DONE_MESSAGE = "done"
+FAILED_MESSAGE = "failed"
+
+# Compare-and-delete so a leader never releases a lock that expired and was taken over
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+	return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class _LeaderCancelled(Exception):
+	"""Set on the shared future when the leader is cancelled; followers retry instead of failing"""
+
+
+def request_fingerprint(*parts: Any) -> str:
+	"""SHA-256 over the canonical JSON of the request parts"""
+	canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+	return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+	"""Coalesces concurrent calls sharing a key into one execution"""
+
+	def __init__(
+		self,
+		client_factory: Optional[Callable[[], Awaitable[Any]]] = None,
+		namespace: str = "default",
+		lock_ttl: float = 60.0,
+		wait_timeout: float = 60.0,
+		result_ttl: int = 30,
+	):
+		self.client_factory = client_factory
+		self.namespace = namespace
+		self.lock_ttl = lock_ttl
+		self.wait_timeout = wait_timeout
+		self.result_ttl = result_ttl
+		self._inflight: Dict[str, asyncio.Future] = {}
+		self.stats = {"leader_calls": 0, "local_coalesced": 0, "remote_coalesced": 0, "remote_fallbacks": 0}
+
+	def _redis_key(self, kind: str, key: str) -> str:
+		return f"{SINGLE_FLIGHT_PREFIX}:{self.namespace}:{kind}:{key}"
+
+	async def do(
+		self,
+		key: str,
+		fn: Callable[[], Awaitable[Any]],
+		encode: Optional[Callable[[Any], Any]] = None,
+		decode: Optional[Callable[[Any], Any]] = None,
+	) -> Any:
+		"""
+		Run fn once for all concurrent callers of key.
+
+		encode/decode convert the result to and from a JSON-serializable value; without them the
+		result cannot be handed to other processes and only in-process callers are coalesced.
+		"""
+		while (future := self._inflight.get(key)) is not None:
+			self.stats["local_coalesced"] += 1
+			try:
+				return await asyncio.shield(future)
+			except _LeaderCancelled:
+				# The first follower to get here becomes the new leader
+				continue
+
+		future = asyncio.get_running_loop().create_future()
+		self._inflight[key] = future
+		try:
+			if encode is not None and decode is not None:
+				result = await self._do_distributed(key, fn, encode, decode)
+			else:
+				self.stats["leader_calls"] += 1
+				result = await fn()
+		except Exception as e:
+			future.set_exception(e)
+			# Mark retrieved so a leader failure with no followers does not log "exception never retrieved"
+			future.exception()
+			raise
+		except BaseException:
+			# Cancellation belongs to the leader's caller alone
+			future.set_exception(_LeaderCancelled())
+			future.exception()
+			raise
+		else:
+			future.set_result(result)
+			return result
+		finally:
+			if self._inflight.get(key) is future:
+				del self._inflight[key]
+
+	async def _get_client(self):
+		if self.client_factory is None:
+			return None
+		try:
+			return await self.client_factory()
+		except Exception as e:
+			logger.debug(f"Single-flight Redis client unavailable: {e}")
+			return None
+
+	async def _do_distributed(self, key: str, fn, encode, decode) -> Any:
+		client = await self._get_client()
+		if client is None:
+			self.stats["leader_calls"] += 1
+			return await fn()
+
+		lock_key = self._redis_key("lock", key)
+		token = uuid.uuid4().hex
+		try:
+			acquired = await client.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000))
+		except Exception as e:
+			logger.debug(f"Single-flight lock failed for {key}: {e}")
+			self.stats["leader_calls"] += 1
+			return await fn()
+
+		if acquired:
+			return await self._lead(client, key, lock_key, token, fn, encode)
+
+		found, result = await self._await_remote(client, key, lock_key, decode)
+		if found:
+			self.stats["remote_coalesced"] += 1
+			return result
+		self.stats["remote_fallbacks"] += 1
+		self.stats["leader_calls"] += 1
+		return await fn()
+
+	async def _lead(self, client, key: str, lock_key: str, token: str, fn, encode) -> Any:
+		self.stats["leader_calls"] += 1
+		message = FAILED_MESSAGE
+		try:
+			result = await fn()
+			try:
+				await client.set(self._redis_key("result", key), json.dumps(encode(result), default=str), ex=self.result_ttl)
+				message = DONE_MESSAGE
+			except Exception as e:
+				logger.debug(f"Single-flight result not shared for {key}: {e}")
+			return result
+		finally:
+			try:
+				await client.publish(self._redis_key("channel", key), message)
+				await client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+			except Exception as e:
+				logger.debug(f"Single-flight release failed for {key}: {e}")
+
+	async def _read_result(self, client, key: str, decode):
+		raw = await client.get(self._redis_key("result", key))
+		if raw is None:
+			return False, None
+		return True, decode(json.loads(raw))
+
+	async def _await_remote(self, client, key: str, lock_key: str, decode):
+		"""Wait for another process's leader; returns (found, result)"""
+		pubsub = None
+		try:
+			pubsub = client.pubsub()
+			await pubsub.subscribe(self._redis_key("channel", key))
+
+			# The leader may have finished between our failed SET NX and the subscription
+			found, result = await self._read_result(client, key, decode)
+			if found or not await client.exists(lock_key):
+				return found, result
+
+			deadline = time.monotonic() + self.wait_timeout
+			while (remaining := deadline - time.monotonic()) > 0:
+				message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=min(remaining, 1.0))
+				if message is None:
+					if not await client.exists(lock_key):
+						break
+					continue
+				if message.get("data") == FAILED_MESSAGE:
+					return False, None
+				break
+			return await self._read_result(client, key, decode)
+		except Exception as e:
+			logger.debug(f"Single-flight wait failed for {key}: {e}")
+			return False, None
+		finally:
+			if pubsub is not None:
+				try:
+					await pubsub.unsubscribe()
+					await pubsub.aclose()
+				except Exception:
+					pass
+
+	def get_stats(self) -> Dict[str, Any]:
+		return {**self.stats, "inflight": len(self._inflight)}
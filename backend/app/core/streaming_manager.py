@@ -15,6 +15,7 @@ from langchain_core.callbacks.base import AsyncCallbackHandler
 
 from .logging import get_logger
 from .monitoring import get_performance_metrics_collector
+from .tokenizer import get_token_counter
 
 logger = get_logger(__name__)
 
@@ -270,8 +271,8 @@ class StreamingManager:
 
 	def _predict_response_length(self, messages: List[BaseMessage], session: StreamingSession) -> int:
 		"""Predict approximate response length in tokens."""
-		# Simple heuristic based on input length and operation type
-		input_tokens = sum(len(msg.content.split()) for msg in messages)
+		# Input size in provider tokens, scaled by how verbose the operation usually is
+		input_tokens = sum(get_token_counter(session.provider, session.model).count_tokens([msg.content for msg in messages]))
 
 		multipliers = {"contract_analysis": 2.0, "legal_precedent": 1.5, "negotiation": 1.2, "communication": 0.8, "general": 1.0}
 
@@ -0,0 +1,95 @@
+"""
+Compiled Jinja template cache shared by EmailService and TemplateService
+
+Environment.from_string parses and compiles its source on every call. Compiled templates are
+kept here in a bounded LRU keyed by (namespace, template_id, content hash). An edited template
+therefore never hits a stale entry. invalidate() drops the old versions of a template once it
+is updated.
+
+The namespace separates environments with different filters or sandboxing ("email",
+"document"). Callers must compile a namespace with the same environment configuration each
+time.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from jinja2 import Environment, Template
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+CacheKey = Tuple[str, str, str]
+
+
+def content_hash(source: str) -> str:
+	return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+class CompiledTemplateCache:
+	"""Thread-safe bounded LRU of compiled Jinja templates"""
+
+	def __init__(self, max_size: int = 512):
+		self.max_size = max_size
+		self._templates: "OrderedDict[CacheKey, Template]" = OrderedDict()
+		self._lock = threading.Lock()
+		self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+	def get_template(self, env: Environment, namespace: str, template_id: str, source: str) -> Template:
+		"""Compiled template for source, compiling it with env on a miss."""
+		key = (namespace, str(template_id), content_hash(source))
+		with self._lock:
+			template = self._templates.get(key)
+			if template is not None:
+				self._templates.move_to_end(key)
+				self.stats["hits"] += 1
+				return template
+			self.stats["misses"] += 1
+
+		# Compile outside the lock; a concurrent miss on the same key compiles twice, which is harmless
+		template = env.from_string(source)
+		with self._lock:
+			self._templates[key] = template
+			self._templates.move_to_end(key)
+			while len(self._templates) > self.max_size:
+				self._templates.popitem(last=False)
+				self.stats["evictions"] += 1
+		return template
+
+	def invalidate(self, namespace: str, template_id: Optional[str] = None) -> int:
+		"""Drop every compiled version of a template (or of a whole namespace); returns how many."""
+		with self._lock:
+			keys = [key for key in self._templates if key[0] == namespace and (template_id is None or key[1] == str(template_id))]
+			for key in keys:
+				del self._templates[key]
+			self.stats["invalidations"] += len(keys)
+		return len(keys)
+
+	def clear(self):
+		with self._lock:
+			self._templates.clear()
+
+	def get_stats(self) -> Dict[str, Any]:
+		with self._lock:
+			size = len(self._templates)
+		total = self.stats["hits"] + self.stats["misses"]
+		return {**self.stats, "size": size, "max_size": self.max_size, "hit_rate": self.stats["hits"] / total if total else 0.0}
+
+
+def render_many(template: Template, contexts: Iterable[Dict[str, Any]]) -> List[str]:
+	"""Render one compiled template against each context, for mass sends."""
+	return [template.render(**context) for context in contexts]
+
+
+_template_cache: Optional[CompiledTemplateCache] = None
+
+
+def get_template_cache() -> CompiledTemplateCache:
+	"""Get the process-wide compiled template cache."""
+	global _template_cache
+	if _template_cache is None:
+		_template_cache = CompiledTemplateCache()
+	return _template_cache
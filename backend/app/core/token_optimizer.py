@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import re
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
 import hashlib
@@ -17,6 +18,7 @@ from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from .logging import get_logger
 from .monitoring import get_performance_metrics_collector
 from .task_complexity import TaskComplexity
+from .tokenizer import get_token_counter
 
 logger = get_logger(__name__)
 
@@ -67,10 +69,12 @@ class TokenBudget:
 class TokenOptimizer:
 	"""Optimizes token usage for AI requests with multiple strategies."""
 
-	def __init__(self):
+	def __init__(self, provider: str = "openai", model: str | None = None):
 		"""Initialize token optimizer."""
 		self.performance_collector = get_performance_metrics_collector()
-		self.optimization_cache: dict[str, OptimizationResult] = {}
+		self.token_counter = get_token_counter(provider, model)
+		self.optimization_cache: OrderedDict[str, OptimizationResult] = OrderedDict()
+		self.max_cache_entries = 1000
 		self.cache_ttl = 3600  # 1 hour cache TTL
 
 		# Common abbreviations for technical content
@@ -128,10 +132,12 @@ class TokenOptimizer:
 		logger.info("Token optimizer initialized")
 
 	def estimate_tokens(self, text: str) -> int:
-		"""Estimate token count for text (rough approximation)."""
-		# Simple estimation: ~4 characters per token on average
-		# More sophisticated tokenizers could be used for better accuracy
-		return max(1, len(text) // 4)
+		"""Token count for text, from the provider tokenizer or the calibrated estimator."""
+		return max(1, self.token_counter.count(text))
+
+	def count_tokens(self, texts: list[str]) -> list[int]:
+		"""Token counts for many texts in one batch."""
+		return self.token_counter.count_tokens(texts)
 
 	def optimize_messages(
 		self,
@@ -349,7 +355,7 @@ class TokenOptimizer:
 		self, messages: list[BaseMessage], budget: TokenBudget, task_complexity: TaskComplexity = TaskComplexity.MEDIUM
 	) -> tuple[list[BaseMessage], OptimizationResult]:
 		"""Optimize messages to fit within token budget."""
-		current_tokens = sum(self.estimate_tokens(msg.content) for msg in messages)
+		current_tokens = sum(self.count_tokens([msg.content for msg in messages]))
 
 		# Check if optimization is needed
 		if current_tokens <= budget.max_total_tokens - budget.reserved_tokens:
@@ -418,27 +424,23 @@ class TokenOptimizer:
 
 	def _get_cached_optimization(self, cache_key: str) -> Optional[OptimizationResult]:
 		"""Get cached optimization result if available and not expired."""
-		if cache_key in self.optimization_cache:
-			# Simple TTL check (in production, use proper cache with expiration)
-			return self.optimization_cache[cache_key]
-		return None
+		result = self.optimization_cache.get(cache_key)
+		if result is not None:
+			self.optimization_cache.move_to_end(cache_key)
+		return result
 
 	def _cache_optimization(self, cache_key: str, result: OptimizationResult):
 		"""Cache optimization result."""
-		# Simple in-memory cache (in production, use Redis or similar)
+		# In-memory LRU: hits move to the end, the least recently used entry is evicted first
 		self.optimization_cache[cache_key] = result
-
-		# Prevent cache from growing too large
-		if len(self.optimization_cache) > 1000:
-			# Remove oldest entries (simple FIFO)
-			oldest_keys = list(self.optimization_cache.keys())[:100]
-			for key in oldest_keys:
-				del self.optimization_cache[key]
+		self.optimization_cache.move_to_end(cache_key)
+		while len(self.optimization_cache) > self.max_cache_entries:
+			self.optimization_cache.popitem(last=False)
 
 	def get_optimization_stats(self) -> dict[str, Any]:
 		"""Get optimization statistics."""
 		if not self.optimization_cache:
-			return {"cache_size": 0, "total_optimizations": 0}
+			return {"cache_size": 0, "total_optimizations": 0, "token_counter": self.token_counter.get_stats()}
 
 		results = list(self.optimization_cache.values())
 
@@ -453,6 +455,7 @@ class TokenOptimizer:
 				"max": max(r.optimization_time for r in results),
 				"min": min(r.optimization_time for r in results),
 			},
+			"token_counter": self.token_counter.get_stats(),
 		}
 
 	def _get_technique_frequency(self, results: list[OptimizationResult]) -> dict[str, int]:
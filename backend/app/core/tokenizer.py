@@ -0,0 +1,247 @@
+"""
+Pluggable token counting for AI services.
+
+Counts come from the provider's real BPE encoder when one is available offline (tiktoken for
+OpenAI models, when installed and its encoding files are already in tiktoken's local cache,
+e.g. shipped in TIKTOKEN_CACHE_DIR), otherwise from a calibrated estimator that models how BPE
+vocabularies split words, numbers and punctuation. Nothing is ever downloaded.
+Counters memoize recent texts in an LRU, bounded by entries and total text size, since the same
+prompt templates and system contexts are counted over and over.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from .logging import get_logger
+
+try:
+	import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+	tiktoken = None
+
+logger = get_logger(__name__)
+
+# Word pieces, digit runs, single non-space symbols: each is at least one token
+_PIECE_RE = re.compile(r"[^\W\d_]+|\d+|[^\w\s]|_+")
+# Pieces that BPE vocabularies split further
+_LONG_WORD_RE = re.compile(r"[A-Za-z]{7,}")
+_LONG_NUMBER_RE = re.compile(r"\d{4,}")
+_NON_ASCII_LETTER_RE = re.compile(r"[^\W\d_a-zA-Z]")
+
+# Per-provider correction of the estimator, relative to cl100k_base on English text
+PROVIDER_CALIBRATION = {
+	"openai": 1.0,
+	"anthropic": 1.1,
+	"groq": 1.05,
+	"local": 1.05,
+}
+
+# tiktoken encodings per OpenAI model family; the longest matching prefix wins
+OPENAI_MODEL_ENCODINGS = {
+	"gpt-4o": "o200k_base",
+	"gpt-4": "cl100k_base",
+	"gpt-3.5": "cl100k_base",
+	"text-embedding": "cl100k_base",
+}
+DEFAULT_OPENAI_ENCODING = "cl100k_base"
+
+# Where tiktoken fetches each encoding from; its cache file is named after the SHA-1 of this URL
+TIKTOKEN_ENCODING_URLS = {
+	"cl100k_base": "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken",
+	"o200k_base": "https://openaipublic.blob.core.windows.net/encodings/o200k_base.tiktoken",
+}
+
+DEFAULT_MEMO_SIZE = 4096
+# Total UTF-8 size of the memoized texts; a single text over a quarter of this is not memoized
+DEFAULT_MEMO_MAX_BYTES = 16 * 1024 * 1024
+
+
+class Tokenizer:
+	"""Turns text into a token count."""
+
+	name = "base"
+
+	def count(self, text: str) -> int:
+		raise NotImplementedError
+
+	def count_batch(self, texts: list[str]) -> list[int]:
+		return [self.count(text) for text in texts]
+
+
+class CalibratedEstimator(Tokenizer):
+	"""
+	Estimates BPE token counts without a vocabulary.
+
+	Short words are one token and longer ones split roughly every four characters; digits
+	are grouped in threes; every other symbol is its own token and non-ASCII letters cost
+	about one extra token each. All counting runs in regex scans, not per-character Python.
+	"""
+
+	name = "calibrated_estimator"
+
+	def __init__(self, calibration: float = 1.0):
+		self.calibration = calibration
+
+	def count(self, text: str) -> int:
+		if not text:
+			return 0
+		tokens = len(_PIECE_RE.findall(text))
+		tokens += sum((len(word) - 3) // 4 for word in _LONG_WORD_RE.findall(text))
+		tokens += sum((len(number) - 1) // 3 for number in _LONG_NUMBER_RE.findall(text))
+		tokens += len(_NON_ASCII_LETTER_RE.findall(text))
+		# Blank lines are separate tokens in most vocabularies
+		tokens += text.count("\n\n")
+		return max(1, round(tokens * self.calibration))
+
+
+class TiktokenTokenizer(Tokenizer):
+	"""Exact counts from a tiktoken encoding."""
+
+	def __init__(self, encoding_name: str):
+		if tiktoken is None:
+			raise RuntimeError("tiktoken is not installed")
+		self.encoding = tiktoken.get_encoding(encoding_name)
+		self.name = f"tiktoken:{encoding_name}"
+
+	def count(self, text: str) -> int:
+		return len(self.encoding.encode_ordinary(text)) if text else 0
+
+	def count_batch(self, texts: list[str]) -> list[int]:
+		return [len(tokens) for tokens in self.encoding.encode_ordinary_batch(texts)]
+
+
+class TokenCounter:
+	"""Tokenizer with an LRU memo of recent texts and a batch API."""
+
+	def __init__(self, tokenizer: Tokenizer, memo_size: int = DEFAULT_MEMO_SIZE, memo_max_bytes: int = DEFAULT_MEMO_MAX_BYTES):
+		self.tokenizer = tokenizer
+		self.memo_size = memo_size
+		self.memo_max_bytes = memo_max_bytes
+		# text -> (count, UTF-8 size of text)
+		self._memo: OrderedDict[str, tuple[int, int]] = OrderedDict()
+		self._memo_bytes = 0
+		self._lock = threading.Lock()
+		self.hits = 0
+		self.misses = 0
+
+	@property
+	def name(self) -> str:
+		return self.tokenizer.name
+
+	def count(self, text: str) -> int:
+		"""Token count of one text."""
+		return self.count_tokens([text])[0]
+
+	def count_tokens(self, texts: list[str]) -> list[int]:
+		"""Token counts of many texts; unseen texts are tokenized in one batch."""
+		counts: list[Optional[int]] = [None] * len(texts)
+		missing: dict[str, list[int]] = {}
+		with self._lock:
+			for i, text in enumerate(texts):
+				text = text or ""
+				cached = self._memo.get(text)
+				if cached is None:
+					missing.setdefault(text, []).append(i)
+				else:
+					self._memo.move_to_end(text)
+					counts[i] = cached[0]
+			self.hits += len(texts) - len(missing)
+			self.misses += len(missing)
+
+		if missing:
+			unique = list(missing)
+			computed = self.tokenizer.count_batch(unique)
+			with self._lock:
+				for text, count in zip(unique, computed):
+					for i in missing[text]:
+						counts[i] = count
+					self._remember(text, count)
+				while len(self._memo) > self.memo_size or self._memo_bytes > self.memo_max_bytes:
+					self._memo_bytes -= self._memo.popitem(last=False)[1][1]
+		return counts
+
+	def _remember(self, text: str, count: int):
+		size = len(text.encode("utf-8", "surrogatepass"))
+		if size > self.memo_max_bytes // 4:
+			return
+		previous = self._memo.pop(text, None)
+		if previous is not None:
+			self._memo_bytes -= previous[1]
+		self._memo[text] = (count, size)
+		self._memo_bytes += size
+
+	def get_stats(self) -> dict[str, object]:
+		lookups = self.hits + self.misses
+		return {
+			"tokenizer": self.name,
+			"memo_size": len(self._memo),
+			"memo_bytes": self._memo_bytes,
+			"hits": self.hits,
+			"misses": self.misses,
+			"hit_rate": self.hits / lookups if lookups else 0.0,
+		}
+
+
+def _openai_encoding(model: Optional[str]) -> str:
+	if model:
+		matches = [prefix for prefix in OPENAI_MODEL_ENCODINGS if model.startswith(prefix)]
+		if matches:
+			return OPENAI_MODEL_ENCODINGS[max(matches, key=len)]
+	return DEFAULT_OPENAI_ENCODING
+
+
+def tiktoken_encoding_cached(encoding_name: str) -> bool:
+	"""Whether tiktoken can load an encoding from its local cache, without a download."""
+	url = TIKTOKEN_ENCODING_URLS.get(encoding_name)
+	if tiktoken is None or url is None:
+		return False
+	# Same lookup order as tiktoken.load.read_file_cached; an empty directory disables its cache
+	if "TIKTOKEN_CACHE_DIR" in os.environ:
+		cache_dir = os.environ["TIKTOKEN_CACHE_DIR"]
+	elif "DATA_GYM_CACHE_DIR" in os.environ:
+		cache_dir = os.environ["DATA_GYM_CACHE_DIR"]
+	else:
+		cache_dir = os.path.join(tempfile.gettempdir(), "data-gym-cache")
+	if not cache_dir:
+		return False
+	return os.path.isfile(os.path.join(cache_dir, hashlib.sha1(url.encode()).hexdigest()))
+
+
+def build_tokenizer(provider: str = "openai", model: Optional[str] = None) -> Tokenizer:
+	"""Best tokenizer available for a provider/model, falling back to the calibrated estimator."""
+	if provider == "openai" and tiktoken is not None:
+		encoding = _openai_encoding(model)
+		# tiktoken.get_encoding downloads missing files, so only a locally cached encoding is loaded
+		if not tiktoken_encoding_cached(encoding):
+			logger.info(f"tiktoken encoding {encoding} is not cached locally, using calibrated estimator")
+		else:
+			try:
+				return TiktokenTokenizer(encoding)
+			except Exception as e:
+				logger.warning(f"tiktoken encoding {encoding} unavailable, using calibrated estimator: {e}")
+	return CalibratedEstimator(PROVIDER_CALIBRATION.get(provider, 1.0))
+
+
+_token_counters: dict[tuple[str, str], TokenCounter] = {}
+_token_counters_lock = threading.Lock()
+
+
+def get_token_counter(provider: str = "openai", model: Optional[str] = None) -> TokenCounter:
+	"""Shared token counter per provider and tokenizer family."""
+	family = _openai_encoding(model) if provider == "openai" else ""
+	key = (provider, family)
+	with _token_counters_lock:
+		counter = _token_counters.get(key)
+	if counter is not None:
+		return counter
+	# Loading an encoding reads a multi-megabyte file; other counters stay usable meanwhile
+	counter = TokenCounter(build_tokenizer(provider, model))
+	with _token_counters_lock:
+		return _token_counters.setdefault(key, counter)
@@ -90,6 +90,8 @@ class UnifiedSettings(BaseSettings):
 	enable_scheduler: bool = True
 	enable_job_scraping: bool = False
 	job_scraping_interval_hours: int = 24
+	# Checkpoints and run locks of the bulk analytics reports; relative paths are under the backend directory
+	report_checkpoint_dir: str = "logs/report_runs"
 
 	# Job Board API Keys
 	job_api_key: Optional[str] = None
@@ -184,6 +186,10 @@ class UnifiedSettings(BaseSettings):
 	chroma_port: int = 8000
 	chroma_persist_directory: str = "data/chroma"
 	embedding_model: str = "all-MiniLM-L6-v2"
+	# Local cache of chunk embeddings keyed by content hash; kept outside the Chroma directory
+	embedding_cache_enabled: bool = True
+	embedding_cache_path: str = "data/embedding_cache.sqlite3"
+	embedding_cache_max_entries: int = 200_000
 	vector_search_top_k: int = 10
 
 	# ==================== Rate Limiting ====================
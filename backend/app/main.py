@@ -64,6 +64,26 @@ async def lifespan(app: FastAPI):
 		shutdown_scheduler()
 		logger.info("✅ Scheduler shut down")
 
+	# Close pooled LLM clients and their keep-alive connections
+	from .services.llm_service import close_llm_service
+
+	await close_llm_service()
+	logger.info("✅ LLM client pools closed")
+
+	# Persist open activity minutes, then flush rows queued by background batch writers
+	from .core.batch_writer import close_batch_writers
+	from .services.activity_pipeline import close_activity_pipeline
+
+	await close_activity_pipeline()
+
+	await close_batch_writers()
+	logger.info("✅ Background writers flushed")
+
+	# Write embeddings still buffered for a merged Chroma add
+	from .services.chroma_executor import close_chroma_executors
+
+	await close_chroma_executors()
+
 
 def create_app() -> FastAPI:
 	"""Create and configure the FastAPI application."""
@@ -4,23 +4,37 @@ Automatically tracks user activities for analytics purposes
 """
 
 import logging
-from datetime import datetime, timezone
-from typing import Callable, Dict, Any
+import random
+import time
+from typing import Callable, Dict, Optional
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
-from app.core.database import get_db
-from app.services.analytics_service import analytics_service
+from app.services.activity_pipeline import ActivityPipeline, get_activity_pipeline
 
 logger = logging.getLogger(__name__)
 
 
 class ActivityTrackingMiddleware(BaseHTTPMiddleware):
-	"""Middleware to automatically track user activities for analytics"""
-
-	def __init__(self, app, track_all_requests: bool = False):
+	"""Middleware to automatically track user activities for analytics
+
+	Tracking stays off the request path: each tracked request only records a compact event
+	on the activity pipeline, which aggregates and persists in the background.
+	sample_rates maps path prefixes to the fraction of requests to record (e.g.
+	{"/api/v1/jobs": 0.1}); the longest matching prefix wins.
+	"""
+
+	def __init__(
+		self,
+		app,
+		track_all_requests: bool = False,
+		sample_rates: Optional[Dict[str, float]] = None,
+		pipeline: Optional[ActivityPipeline] = None,
+	):
 		super().__init__(app)
 		self.track_all_requests = track_all_requests
+		self.sample_rates = sorted((sample_rates or {}).items(), key=lambda item: len(item[0]), reverse=True)
+		self.pipeline = pipeline or get_activity_pipeline()
 
 		# Define which endpoints to track and their activity types
 		self.tracked_endpoints = {
@@ -44,19 +58,19 @@ class ActivityTrackingMiddleware(BaseHTTPMiddleware):
 
 	async def dispatch(self, request: Request, call_next: Callable) -> Response:
 		"""Process request and track user activity if applicable"""
-		start_time = datetime.now(timezone.utc)
+		start_time = time.perf_counter()
 
 		# Process the request
 		response = await call_next(request)
 
 		# Track activity after successful request
 		if response.status_code < 400:  # Only track successful requests
-			await self._track_activity(request, response, start_time)
+			self._track_activity(request, (time.perf_counter() - start_time) * 1000)
 
 		return response
 
-	async def _track_activity(self, request: Request, response: Response, start_time: datetime):
-		"""Track user activity based on request details"""
+	def _track_activity(self, request: Request, duration_ms: float):
+		"""Record a compact activity event for the request; never blocks on I/O"""
 		try:
 			# Get user ID from request state (set by auth middleware)
 			user_id = getattr(request.state, "user_id", None)
@@ -68,20 +82,24 @@ class ActivityTrackingMiddleware(BaseHTTPMiddleware):
 			if not activity_type and not self.track_all_requests:
 				return  # Not a tracked endpoint
 
-			# Prepare activity metadata
-			metadata = self._prepare_activity_metadata(request, response, start_time)
+			sample_rate = self._get_sample_rate(request.url.path)
+			if sample_rate <= 0 or (sample_rate < 1 and random.random() >= sample_rate):
+				return
 
-			# Track the activity
-			db = next(get_db())
-			try:
-				analytics_service.track_user_activity(db, user_id, activity_type or "general_activity", metadata)
-			finally:
-				db.close()
+			# Sampled events stand for 1/sample_rate requests
+			self.pipeline.record(user_id, activity_type or "general_activity", duration_ms, weight=1 / sample_rate)
 
 		except Exception as e:
 			logger.error(f"Failed to track user activity: {e}")
 			# Don't let tracking errors affect the main request
 
+	def _get_sample_rate(self, path: str) -> float:
+		"""Fraction of requests to record for a path (longest configured prefix, default all)"""
+		for prefix, rate in self.sample_rates:
+			if path.startswith(prefix):
+				return rate
+		return 1.0
+
 	def _determine_activity_type(self, request: Request) -> str:
 		"""Determine activity type based on request path and method"""
 		path = request.url.path
@@ -116,60 +134,11 @@ class ActivityTrackingMiddleware(BaseHTTPMiddleware):
 
 		return None
 
-	def _prepare_activity_metadata(self, request: Request, response: Response, start_time: datetime) -> Dict[str, Any]:
-		"""Prepare metadata for activity tracking"""
-		end_time = datetime.now(timezone.utc)
-		duration_ms = (end_time - start_time).total_seconds() * 1000
-
-		metadata = {
-			"method": request.method,
-			"path": request.url.path,
-			"status_code": response.status_code,
-			"duration_ms": round(duration_ms, 2),
-			"user_agent": request.headers.get("user-agent", ""),
-			"ip_address": self._get_client_ip(request),
-			"timestamp": start_time.isoformat(),
-		}
 
-		# Add query parameters (excluding sensitive data)
-		if request.query_params:
-			safe_params = {}
-			for key, value in request.query_params.items():
-				# Exclude potentially sensitive parameters
-				if key.lower() not in ["password", "token", "key", "secret"]:
-					safe_params[key] = value
-			if safe_params:
-				metadata["query_params"] = safe_params
-
-		# Add request body size if available
-		if hasattr(request, "body"):
-			try:
-				body_size = len(request.body) if request.body else 0
-				metadata["request_body_size"] = body_size
-			except:
-				pass
-
-		return metadata
-
-	def _get_client_ip(self, request: Request) -> str:
-		"""Get client IP address from request"""
-		# Check for forwarded headers first (for load balancers/proxies)
-		forwarded_for = request.headers.get("x-forwarded-for")
-		if forwarded_for:
-			return forwarded_for.split(",")[0].strip()
-
-		real_ip = request.headers.get("x-real-ip")
-		if real_ip:
-			return real_ip
-
-		# Fall back to direct client IP
-		return request.client.host if request.client else "unknown"
-
-
-def create_activity_tracking_middleware(track_all_requests: bool = False):
+def create_activity_tracking_middleware(track_all_requests: bool = False, sample_rates: Optional[Dict[str, float]] = None):
 	"""Factory function to create activity tracking middleware"""
 
 	def middleware_factory(app):
-		return ActivityTrackingMiddleware(app, track_all_requests)
+		return ActivityTrackingMiddleware(app, track_all_requests, sample_rates)
 
 	return middleware_factory
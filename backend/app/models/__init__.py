@@ -24,6 +24,7 @@ from .feedback import (
 )
 from .interview import InterviewQuestion, InterviewSession, InterviewStatus, InterviewType
 from .job import Job
+from .llm_cost_rollup import LLMCostRollup
 from .resume_upload import ResumeUpload
 from .user import User
 from .user_job_preferences import UserJobPreferences
@@ -48,6 +49,7 @@ __all__ = [
 	"InterviewType",
 	"Job",
 	"JobRecommendationFeedback",
+	"LLMCostRollup",
 	"LearningPath",
 	"LearningPathEnrollment",
 	"OnboardingProgress",
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String, Text, event, inspect
 from sqlalchemy.orm import relationship
 
 from ..core.database import Base
@@ -38,8 +38,33 @@ class Job(Base):
 
 	# Deduplication fingerprint (MD5 hash of normalized title+company+location)
 	job_fingerprint = Column(String(32), nullable=True, index=True)
+	normalized_url = Column(String, nullable=True, index=True)  # Normalized application URL
+	dedup_company_key = Column(String, nullable=True, index=True)  # First token of normalized company (fuzzy blocking key)
 
 	user = relationship("User", back_populates="jobs")
 	applications = relationship("Application", back_populates="job", cascade="all, delete-orphan")
 	content_generations = relationship("ContentGeneration", back_populates="job", cascade="all, delete-orphan")
 	recommendation_feedback = relationship("JobRecommendationFeedback", back_populates="job", cascade="all, delete-orphan")
+
+
+# Columns that feed the deduplication lookup keys
+_DEDUP_SOURCE_COLUMNS = ("title", "company", "location", "application_url")
+
+
+@event.listens_for(Job, "before_insert")
+def _populate_dedup_keys(mapper, connection, target: Job) -> None:
+	"""Fill deduplication lookup columns for jobs inserted without them"""
+	if target.dedup_company_key is None:
+		from ..services.job_deduplication_service import assign_job_dedup_keys
+
+		assign_job_dedup_keys(target)
+
+
+@event.listens_for(Job, "before_update")
+def _refresh_dedup_keys(mapper, connection, target: Job) -> None:
+	"""Recompute deduplication lookup columns when their source columns change"""
+	state = inspect(target)
+	if any(state.attrs[name].history.has_changes() for name in _DEDUP_SOURCE_COLUMNS):
+		from ..services.job_deduplication_service import assign_job_dedup_keys
+
+		assign_job_dedup_keys(target)
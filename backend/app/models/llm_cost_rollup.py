@@ -0,0 +1,27 @@
+"""LLM cost rollup model"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, Numeric, String, UniqueConstraint
+
+from ..core.database import Base
+
+
+class LLMCostRollup(Base):
+	"""Hourly LLM spend per (category, user, provider, model), flushed from the cost ledger"""
+
+	__tablename__ = "llm_cost_rollups"
+
+	id = Column(Integer, primary_key=True, index=True)
+	period_start = Column(DateTime, nullable=False, index=True)  # Start of the UTC hour
+	category = Column(String(50), nullable=False)
+	user_id = Column(String(100), nullable=True, index=True)
+	provider = Column(String(50), nullable=False)
+	model = Column(String(100), nullable=False)
+	cost = Column(Numeric(12, 4), nullable=False, default=0)  # dollars
+	prompt_tokens = Column(Integer, nullable=False, default=0)
+	completion_tokens = Column(Integer, nullable=False, default=0)
+	request_count = Column(Integer, nullable=False, default=0)
+	updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+	__table_args__ = (UniqueConstraint("period_start", "category", "user_id", "provider", "model", name="uq_llm_cost_rollup_dimensions"),)
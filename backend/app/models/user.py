@@ -21,6 +21,9 @@ class User(Base):
 	daily_application_goal = Column(Integer, default=10)
 	is_admin = Column(Boolean, default=False, nullable=False)
 	prefer_remote_jobs = Column(Boolean, default=False, nullable=False)  # False = prefer in-person jobs
+	is_active = Column(Boolean, default=True, nullable=False)
+	profile = Column(JSON, nullable=True)  # Display details such as name / first_name
+	settings = Column(JSON, default=dict)  # Preferences, e.g. settings["notifications"] for scheduled emails
 
 	# OAuth fields
 	oauth_provider = Column(String, nullable=True)  # google, linkedin, github
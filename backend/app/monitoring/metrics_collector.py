@@ -314,6 +314,14 @@ class MetricsCollector:
 			registry=self.registry,
 		)
 
+		self.ai_rate_limit_wait = Histogram(
+			"ai_rate_limit_wait_seconds",
+			"Time AI requests waited for rate limit budget",
+			[MetricLabels.AI_PROVIDER, MetricLabels.AI_MODEL],
+			buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0],
+			registry=self.registry,
+		)
+
 		self.ai_errors = Counter(
 			"ai_errors_total",
 			"AI service errors by provider and error type",
@@ -382,6 +390,34 @@ class MetricsCollector:
 
 		self.cache_alerts_total = Counter("cache_alerts_total", "Total cache alerts generated", ["alert_type", "severity"], registry=self.registry)
 
+		# ========== Background Writer Metrics ==========
+		self.writer_queue_depth = Gauge("background_writer_queue_depth", "Rows queued in a background batch writer", ["writer"], registry=self.registry)
+
+		self.writer_dropped_total = Counter(
+			"background_writer_dropped_total", "Rows dropped by a background batch writer", ["writer"], registry=self.registry
+		)
+
+		self.writer_rows_total = Counter(
+			"background_writer_rows_total", "Rows handled by a background batch writer", ["writer", "outcome"], registry=self.registry
+		)
+
+		# ========== Vector Store Metrics ==========
+		self.vector_store_queue_depth = Gauge(
+			"vector_store_queue_depth", "Vector store calls waiting for a pool thread", ["operation"], registry=self.registry
+		)
+
+		self.vector_store_call_duration = Histogram(
+			"vector_store_call_duration_seconds", "Vector store call latency in seconds, including queueing", ["operation"], registry=self.registry
+		)
+
+		self.vector_store_batch_size = Histogram(
+			"vector_store_batch_size",
+			"Queries or rows merged into one vector store call",
+			["operation"],
+			buckets=[1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024],
+			registry=self.registry,
+		)
+
 		# ========== Application Information ==========
 		self.app_info = Info("app_info", "Application build and runtime information", registry=self.registry)
 
@@ -625,6 +661,31 @@ class MetricsCollector:
 		"""Record AI service rate limit hits."""
 		self.ai_rate_limits.labels(provider=provider, model=model, limit_type=limit_type).inc()
 
+	def record_ai_rate_limit_wait(self, provider: str, model: str, wait_seconds: float):
+		"""Record time spent waiting for AI rate limit budget."""
+		self.ai_rate_limit_wait.labels(provider=provider, model=model).observe(wait_seconds)
+
+	def update_writer_queue_depth(self, writer: str, depth: int):
+		"""Update the queue depth of a background batch writer."""
+		self.writer_queue_depth.labels(writer=writer).set(depth)
+
+	def record_writer_drop(self, writer: str, count: int = 1):
+		"""Record rows a background batch writer had to drop."""
+		self.writer_dropped_total.labels(writer=writer).inc(count)
+
+	def record_writer_rows(self, writer: str, outcome: str, count: int):
+		"""Record rows written, spilled, replayed or rejected by a background batch writer."""
+		self.writer_rows_total.labels(writer=writer, outcome=outcome).inc(count)
+
+	def update_vector_store_queue_depth(self, operation: str, depth: int):
+		"""Update the number of vector store calls waiting for a pool thread."""
+		self.vector_store_queue_depth.labels(operation=operation).set(depth)
+
+	def record_vector_store_call(self, operation: str, duration_seconds: float, batch_size: int):
+		"""Record a vector store call and how many queries or rows it carried."""
+		self.vector_store_call_duration.labels(operation=operation).observe(duration_seconds)
+		self.vector_store_batch_size.labels(operation=operation).observe(batch_size)
+
 	def update_ai_queue_size(self, provider: str, queue_size: int):
 		"""Update AI request queue size."""
 		self.ai_queue_size.labels(provider=provider).set(queue_size)
@@ -0,0 +1,145 @@
+"""
+Activity event pipeline for ActivityTrackingMiddleware
+
+The middleware only records a compact event (user, activity type, duration). Events are folded
+in process into per-user, per-minute counters. Once a minute has closed, its counters are queued
+on a BatchWriter that inserts them as analytics rows of type "user_activity_minute":
+
+    {"minute": "2026-03-10T14:30:00", "activity_count": 12,
+     "activity_types": {"job_view": 9, "dashboard_view": 3}, "total_duration_ms": 840.5}
+
+Sampled events carry a weight of 1/sample_rate, so the stored counts remain estimates of the
+real totals.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+
+from app.core.batch_writer import BatchWriter
+from app.core.database import get_database_manager
+from app.core.logging import get_logger
+from app.models.analytics import Analytics
+
+logger = get_logger(__name__)
+
+ACTIVITY_MINUTE_TYPE = "user_activity_minute"
+
+
+def _number(value: float):
+	return int(value) if value == int(value) else round(value, 2)
+
+
+class ActivityPipeline:
+	"""Aggregates activity events into per-user, per-minute counters and persists closed minutes in batches"""
+
+	def __init__(
+		self,
+		batch_size: int = 500,
+		flush_interval: float = 2.0,
+		max_open_minutes: int = 10_000,
+		grace_seconds: float = 5.0,
+		spill_path: Optional[str] = "logs/activity_spill.jsonl",
+	):
+		self.writer = BatchWriter("user_activity", self._insert_rows, batch_size=batch_size, flush_interval=flush_interval, spill_path=spill_path)
+		self.max_open_minutes = max_open_minutes
+		# Late events for a minute are still folded in until the minute is this old
+		self.grace_seconds = grace_seconds
+		self._minutes: Dict[Tuple[Any, int], Dict[str, Any]] = {}
+		self._task: Optional[asyncio.Task] = None
+		self.stats = {"events": 0, "dropped": 0, "minutes_emitted": 0}
+
+	def record(self, user_id, activity_type: str, duration_ms: float = 0.0, weight: float = 1.0, timestamp: Optional[float] = None) -> bool:
+		"""Fold one event into its user's minute counters; never touches the database."""
+		timestamp = time.time() if timestamp is None else timestamp
+		key = (user_id, int(timestamp // 60) * 60)
+		counters = self._minutes.get(key)
+		if counters is None:
+			if len(self._minutes) >= self.max_open_minutes:
+				self.stats["dropped"] += 1
+				return False
+			counters = self._minutes[key] = {"activity_count": 0, "activity_types": {}, "total_duration_ms": 0.0}
+
+		counters["activity_count"] += weight
+		counters["activity_types"][activity_type] = counters["activity_types"].get(activity_type, 0) + weight
+		counters["total_duration_ms"] += duration_ms * weight
+		self.stats["events"] += 1
+		self._ensure_roller()
+		return True
+
+	def roll(self, now: Optional[float] = None, force: bool = False) -> int:
+		"""Queue closed minutes (all minutes when force is set) for persistence; returns how many."""
+		now = time.time() if now is None else now
+		closed = [key for key in self._minutes if force or key[1] + 60 + self.grace_seconds <= now]
+		for key in closed:
+			user_id, minute = key
+			counters = self._minutes.pop(key)
+			minute_start = datetime.fromtimestamp(minute, timezone.utc).replace(tzinfo=None)
+			self.writer.submit(
+				{
+					"user_id": user_id,
+					"type": ACTIVITY_MINUTE_TYPE,
+					"generated_at": minute_start.isoformat(),
+					"data": {
+						"minute": minute_start.isoformat(),
+						"activity_count": _number(counters["activity_count"]),
+						"activity_types": {name: _number(count) for name, count in counters["activity_types"].items()},
+						"total_duration_ms": round(counters["total_duration_ms"], 2),
+					},
+				}
+			)
+		self.stats["minutes_emitted"] += len(closed)
+		return len(closed)
+
+	def _ensure_roller(self):
+		if self._task is not None and not self._task.done():
+			return
+		try:
+			self._task = asyncio.get_running_loop().create_task(self._run_roller())
+		except RuntimeError:
+			# No event loop (sync caller): minutes are rolled by the next async caller or by close()
+			pass
+
+	async def _run_roller(self):
+		"""Roll minutes as they close, until no minute is open."""
+		while self._minutes:
+			oldest = min(minute for _, minute in self._minutes)
+			await asyncio.sleep(max(0.0, oldest + 60 + self.grace_seconds - time.time()))
+			self.roll()
+
+	async def _insert_rows(self, rows: List[Dict[str, Any]]) -> None:
+		await asyncio.to_thread(self._insert_rows_sync, rows)
+
+	def _insert_rows_sync(self, rows: List[Dict[str, Any]]) -> None:
+		with get_database_manager().get_sync_session() as session:
+			session.execute(insert(Analytics), [{**row, "generated_at": datetime.fromisoformat(row["generated_at"])} for row in rows])
+
+	async def close(self):
+		"""Persist every open minute; called on shutdown."""
+		if self._task is not None and not self._task.done():
+			self._task.cancel()
+		self.roll(force=True)
+		await self.writer.close()
+
+	def get_stats(self) -> Dict[str, Any]:
+		return {**self.stats, "open_minutes": len(self._minutes), "writer": self.writer.get_stats()}
+
+
+_activity_pipeline: Optional[ActivityPipeline] = None
+
+
+def get_activity_pipeline() -> ActivityPipeline:
+	"""Get the global activity pipeline instance."""
+	global _activity_pipeline
+	if _activity_pipeline is None:
+		_activity_pipeline = ActivityPipeline()
+	return _activity_pipeline
+
+
+async def close_activity_pipeline() -> None:
+	"""Persist the open minutes of the global activity pipeline, if it was created."""
+	if _activity_pipeline is not None:
+		await _activity_pipeline.close()
@@ -3,8 +3,9 @@ Advanced User Analytics Service
 Provides detailed analytics for user performance tracking and benchmarking
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Any, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from collections import defaultdict, Counter
 
@@ -30,20 +31,55 @@ class AdvancedUserAnalyticsService:
 
 	def calculate_detailed_success_rates(self, db: Session, user_id: int, days: int = 90) -> Dict[str, Any]:
 		"""Calculate detailed application success rates with temporal analysis"""
+		return self.success_rates_from_stats(self.load_application_stats(db, [user_id], days)[user_id], days)
+
+	def load_application_stats(self, db: Session, user_ids: List[int], days: int = 90) -> Dict[int, Dict[str, List[Tuple]]]:
+		"""
+		Application counts for each user over the last `days` days, in two grouped queries.
+
+		Returns per user "by_day" rows of (created date, status, count) and "by_company" rows of
+		(company, status, count); every report section is derived from these.
+		"""
 		cutoff_date = datetime.now() - timedelta(days=days)
+		stats = {user_id: {"by_day": [], "by_company": []} for user_id in user_ids}
+		window = (Application.user_id.in_(user_ids), Application.created_at >= cutoff_date)
+
+		created_on = func.date(Application.created_at)
+		by_day = (
+			db.query(Application.user_id, created_on, Application.status, func.count(Application.id))
+			.filter(*window)
+			.group_by(Application.user_id, created_on, Application.status)
+		)
+		for user_id, day, status, count in by_day:
+			# SQLite returns the date as text
+			stats[user_id]["by_day"].append((day if isinstance(day, date) else date.fromisoformat(str(day)), status, count))
+
+		by_company = (
+			db.query(Application.user_id, Job.company, Application.status, func.count(Application.id))
+			.join(Job, Job.id == Application.job_id)
+			.filter(*window)
+			.group_by(Application.user_id, Job.company, Application.status)
+		)
+		for user_id, company, status, count in by_company:
+			stats[user_id]["by_company"].append((company, status, count))
+
+		return stats
 
-		# Get all applications within the timeframe
-		applications = db.query(Application).filter(Application.user_id == user_id, Application.created_at >= cutoff_date).all()
+	def success_rates_from_stats(self, stats: Dict[str, List[Tuple]], days: int = 90) -> Dict[str, Any]:
+		"""Success rates and temporal analysis from one user's load_application_stats entry"""
+		status_counts = Counter()
+		for _, status, count in stats["by_day"]:
+			status_counts[status] += count
 
-		if not applications:
+		if not status_counts:
 			return {"error": "No applications found for analysis"}
 
 		# Calculate basic success rates
-		total_applications = len(applications)
-		interviews = len([app for app in applications if app.status == "interview"])
-		offers = len([app for app in applications if app.status in ["offer", "accepted"]])
-		rejections = len([app for app in applications if app.status == "rejected"])
-		pending = len([app for app in applications if app.status in ["interested", "applied"]])
+		total_applications = sum(status_counts.values())
+		interviews = status_counts["interview"]
+		offers = status_counts["offer"] + status_counts["accepted"]
+		rejections = status_counts["rejected"]
+		pending = status_counts["interested"] + status_counts["applied"]
 
 		# Calculate rates
 		application_to_interview_rate = (interviews / total_applications * 100) if total_applications > 0 else 0
@@ -54,16 +90,16 @@ class AdvancedUserAnalyticsService:
 		# Temporal analysis - weekly breakdown
 		weekly_performance = defaultdict(lambda: {"applications": 0, "interviews": 0, "offers": 0, "rejections": 0})
 
-		for app in applications:
-			week_key = app.created_at.strftime("%Y-W%U")
-			weekly_performance[week_key]["applications"] += 1
+		for day, status, count in stats["by_day"]:
+			week_key = day.strftime("%Y-W%U")
+			weekly_performance[week_key]["applications"] += count
 
-			if app.status == "interview":
-				weekly_performance[week_key]["interviews"] += 1
-			elif app.status in ["offer", "accepted"]:
-				weekly_performance[week_key]["offers"] += 1
-			elif app.status == "rejected":
-				weekly_performance[week_key]["rejections"] += 1
+			if status == "interview":
+				weekly_performance[week_key]["interviews"] += count
+			elif status in ["offer", "accepted"]:
+				weekly_performance[week_key]["offers"] += count
+			elif status == "rejected":
+				weekly_performance[week_key]["rejections"] += count
 
 		# Calculate weekly success rates
 		weekly_success_rates = []
@@ -95,8 +131,8 @@ class AdvancedUserAnalyticsService:
 			interview_rate_trend = 0
 
 		# Industry and company analysis
-		industry_performance = self._analyze_performance_by_industry(db, applications)
-		company_performance = self._analyze_performance_by_company(db, applications)
+		industry_performance = self._analyze_performance_by_industry(stats["by_company"])
+		company_performance = self._analyze_performance_by_company(stats["by_company"])
 
 		return {
 			"analysis_date": datetime.now().isoformat(),
@@ -120,45 +156,50 @@ class AdvancedUserAnalyticsService:
 
 	def analyze_conversion_funnel(self, db: Session, user_id: int, days: int = 90) -> Dict[str, Any]:
 		"""Analyze the job application conversion funnel with detailed metrics"""
-		cutoff_date = datetime.now() - timedelta(days=days)
+		return self.conversion_funnel_from_stats(self.load_application_stats(db, [user_id], days)[user_id], days)
 
-		applications = db.query(Application).filter(Application.user_id == user_id, Application.created_at >= cutoff_date).all()
+	def conversion_funnel_from_stats(self, stats: Dict[str, List[Tuple]], days: int = 90) -> Dict[str, Any]:
+		"""Conversion funnel from one user's load_application_stats entry"""
+		status_counts = Counter()
+		for _, status, count in stats["by_day"]:
+			status_counts[status] += count
 
-		if not applications:
+		if not status_counts:
 			return {"error": "No applications found for funnel analysis"}
 
+		total_applications = sum(status_counts.values())
+
 		# Define funnel stages
 		funnel_stages = [
 			{
 				"stage": "Applications Submitted",
-				"count": len(applications),
+				"count": total_applications,
 				"conversion_rate": 100.0,
 				"description": "Total job applications submitted",
 			},
 			{
 				"stage": "Initial Screening",
-				"count": len([app for app in applications if app.status not in ["interested"]]),
+				"count": total_applications - status_counts["interested"],
 				"description": "Applications that progressed beyond initial interest",
 			},
 			{
 				"stage": "Interviews Scheduled",
-				"count": len([app for app in applications if app.status == "interview"]),
+				"count": status_counts["interview"],
 				"description": "Applications that resulted in interviews",
 			},
 			{
 				"stage": "Offers Received",
-				"count": len([app for app in applications if app.status in ["offer", "accepted"]]),
+				"count": status_counts["offer"] + status_counts["accepted"],
 				"description": "Applications that resulted in job offers",
 			},
 			{
 				"stage": "Offers Accepted",
-				"count": len([app for app in applications if app.status == "accepted"]),
+				"count": status_counts["accepted"],
 				"description": "Job offers that were accepted",
 			},
 		]
 
 		# Calculate conversion rates for each stage
-		total_applications = len(applications)
 		for i, stage in enumerate(funnel_stages):
 			if i > 0:  # Skip first stage (already 100%)
 				stage["conversion_rate"] = round((stage["count"] / total_applications * 100), 2)
@@ -171,7 +212,7 @@ class AdvancedUserAnalyticsService:
 				stage["stage_conversion_rate"] = 100.0
 
 		# Calculate average time in each stage
-		stage_durations = self._calculate_stage_durations(applications)
+		stage_durations = self._calculate_stage_durations()
 
 		# Add duration data to funnel stages
 		for stage in funnel_stages:
@@ -191,7 +232,7 @@ class AdvancedUserAnalyticsService:
 				)
 
 		# Success factors analysis
-		success_factors = self._analyze_success_factors(db, applications)
+		success_factors = self._analyze_success_factors(funnel_stages[3]["count"])
 
 		return {
 			"analysis_date": datetime.now().isoformat(),
@@ -208,8 +249,10 @@ class AdvancedUserAnalyticsService:
 
 	def generate_performance_benchmarks(self, db: Session, user_id: int, days: int = 90) -> Dict[str, Any]:
 		"""Generate performance benchmarks comparing user to market averages"""
-		success_rates = self.calculate_detailed_success_rates(db, user_id, days)
+		return self.benchmarks_from_success_rates(self.calculate_detailed_success_rates(db, user_id, days), user_id, days)
 
+	def benchmarks_from_success_rates(self, success_rates: Dict[str, Any], user_id: int, days: int = 90) -> Dict[str, Any]:
+		"""Performance benchmarks from the user's calculated success rates"""
 		if "error" in success_rates:
 			return success_rates
 
@@ -299,6 +342,13 @@ class AdvancedUserAnalyticsService:
 		if not user:
 			return {"error": "User not found"}
 
+		return self.predictive_from_success_rates(success_rates, self._identify_optimal_job_types(db, user_id), user_id, days)
+
+	def predictive_from_success_rates(self, success_rates: Dict[str, Any], optimal_job_types: List[str], user_id: int, days: int = 90) -> Dict[str, Any]:
+		"""Predictive analytics from the user's success rates and their most successful job titles"""
+		if "error" in success_rates:
+			return success_rates
+
 		# Calculate success probability based on current performance
 		current_success_rate = success_rates["success_rates"]["overall_success"]
 		application_rate = success_rates["success_rates"]["application_to_interview"]
@@ -356,9 +406,6 @@ class AdvancedUserAnalyticsService:
 		if trend_direction == "improving":
 			success_factors.append("Performance trending upward")
 
-		# Optimal job types (based on user's successful applications)
-		optimal_job_types = self._identify_optimal_job_types(db, user_id)
-
 		return {
 			"analysis_date": datetime.now().isoformat(),
 			"user_id": user_id,
@@ -382,21 +429,19 @@ class AdvancedUserAnalyticsService:
 
 	# Helper methods
 
-	def _analyze_performance_by_industry(self, db: Session, applications: List[Application]) -> Dict[str, Any]:
+	def _analyze_performance_by_industry(self, company_status_counts: List[Tuple]) -> Dict[str, Any]:
 		"""Analyze performance by industry"""
 		industry_performance = defaultdict(lambda: {"applications": 0, "interviews": 0, "offers": 0})
 
-		for app in applications:
-			job = db.query(Job).filter(Job.id == app.job_id).first()
-			if job:
-				# Simple industry classification (would use the market analysis service in production)
-				industry = "technology"  # Simplified for now
-				industry_performance[industry]["applications"] += 1
+		for _, status, count in company_status_counts:
+			# Simple industry classification (would use the market analysis service in production)
+			industry = "technology"  # Simplified for now
+			industry_performance[industry]["applications"] += count
 
-				if app.status == "interview":
-					industry_performance[industry]["interviews"] += 1
-				elif app.status in ["offer", "accepted"]:
-					industry_performance[industry]["offers"] += 1
+			if status == "interview":
+				industry_performance[industry]["interviews"] += count
+			elif status in ["offer", "accepted"]:
+				industry_performance[industry]["offers"] += count
 
 		# Calculate rates
 		result = {}
@@ -410,20 +455,17 @@ class AdvancedUserAnalyticsService:
 
 		return result
 
-	def _analyze_performance_by_company(self, db: Session, applications: List[Application]) -> Dict[str, Any]:
+	def _analyze_performance_by_company(self, company_status_counts: List[Tuple]) -> Dict[str, Any]:
 		"""Analyze performance by company"""
 		company_performance = defaultdict(lambda: {"applications": 0, "interviews": 0, "offers": 0})
 
-		for app in applications:
-			job = db.query(Job).filter(Job.id == app.job_id).first()
-			if job:
-				company = job.company
-				company_performance[company]["applications"] += 1
+		for company, status, count in company_status_counts:
+			company_performance[company]["applications"] += count
 
-				if app.status == "interview":
-					company_performance[company]["interviews"] += 1
-				elif app.status in ["offer", "accepted"]:
-					company_performance[company]["offers"] += 1
+			if status == "interview":
+				company_performance[company]["interviews"] += count
+			elif status in ["offer", "accepted"]:
+				company_performance[company]["offers"] += count
 
 		# Return top performing companies
 		result = {}
@@ -437,7 +479,7 @@ class AdvancedUserAnalyticsService:
 
 		return result
 
-	def _calculate_stage_durations(self, applications: List[Application]) -> Dict[str, float]:
+	def _calculate_stage_durations(self) -> Dict[str, float]:
 		"""Calculate average time spent in each stage"""
 		durations = {
 			"applications_submitted": 0,
@@ -450,13 +492,11 @@ class AdvancedUserAnalyticsService:
 		# Would calculate actual durations from application timestamps in production
 		return durations
 
-	def _analyze_success_factors(self, db: Session, applications: List[Application]) -> List[str]:
+	def _analyze_success_factors(self, offers: int) -> List[str]:
 		"""Analyze factors that contribute to success"""
 		success_factors = []
 
-		successful_apps = [app for app in applications if app.status in ["offer", "accepted"]]
-
-		if len(successful_apps) > 0:
+		if offers > 0:
 			success_factors.append("Consistent application activity")
 			success_factors.append("Targeted job selection")
 			success_factors.append("Strong application materials")
@@ -524,22 +564,25 @@ class AdvancedUserAnalyticsService:
 
 	def _identify_optimal_job_types(self, db: Session, user_id: int) -> List[str]:
 		"""Identify optimal job types based on user's successful applications"""
-		# Get successful applications
-		successful_apps = db.query(Application).filter(Application.user_id == user_id, Application.status.in_(["offer", "accepted"])).all()
-
-		job_types = []
-		for app in successful_apps:
-			job = db.query(Job).filter(Job.id == app.job_id).first()
-			if job:
-				job_types.append(job.title)
-
-		# Return most common successful job types
-		if job_types:
-			job_type_counts = Counter(job_types)
-			return [job_type for job_type, _ in job_type_counts.most_common(5)]
-		else:
-			# Default recommendations based on user skills
-			return ["Software Engineer", "Data Analyst", "Product Manager"]
+		return self.load_optimal_job_types(db, [user_id])[user_id]
+
+	def load_optimal_job_types(self, db: Session, user_ids: List[int]) -> Dict[int, List[str]]:
+		"""Identify optimal job types for each user from their successful applications, in one grouped query"""
+		successful_titles = (
+			db.query(Application.user_id, Job.title, func.count(Application.id).label("count"))
+			.join(Job, Job.id == Application.job_id)
+			.filter(Application.user_id.in_(user_ids), Application.status.in_(["offer", "accepted"]))
+			.group_by(Application.user_id, Job.title)
+			.order_by(Application.user_id, func.count(Application.id).desc())
+		)
+
+		job_types = defaultdict(list)
+		for user_id, title, _ in successful_titles:
+			job_types[user_id].append(title)
+
+		# Return most common successful job types, or defaults for users with no offers yet
+		default_job_types = ["Software Engineer", "Data Analyst", "Product Manager"]
+		return {user_id: job_types[user_id][:5] if job_types[user_id] else list(default_job_types) for user_id in user_ids}
 
 
 # Create service instance
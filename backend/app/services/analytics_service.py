@@ -15,6 +15,7 @@ from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.models.analytics import Analytics
+from app.services.activity_pipeline import ACTIVITY_MINUTE_TYPE
 from app.models.application import Application
 from app.models.job import Job
 from app.models.user import User
@@ -424,7 +425,11 @@ class AnalyticsService:
 			# Get user activity data
 			activity_records = (
 				self.db.query(Analytics)
-				.filter(Analytics.user_id == user_id, Analytics.type == "user_activity", Analytics.generated_at >= cutoff_date)  # type: ignore[attr-defined]
+				.filter(
+					Analytics.user_id == user_id,
+					Analytics.type.in_(["user_activity", ACTIVITY_MINUTE_TYPE]),  # type: ignore[attr-defined]
+					Analytics.generated_at >= cutoff_date,
+				)
 				.all()
 			)
 
@@ -434,6 +439,16 @@ class AnalyticsService:
 			daily_activities: dict[str, int] = {}
 
 			for record in activity_records:
+				if record.type == ACTIVITY_MINUTE_TYPE:
+					# Per-minute counters written by the activity pipeline
+					minute_count = record.data.get("activity_count", 0)
+					total_activities += minute_count
+					for activity_type, count in record.data.get("activity_types", {}).items():
+						activity_types[activity_type] = activity_types.get(activity_type, 0) + count
+					activity_date = record.data.get("minute", "")[:10]
+					daily_activities[activity_date] = daily_activities.get(activity_date, 0) + minute_count
+					continue
+
 				activities = record.data.get("activities", [])
 				total_activities += len(activities)
 
@@ -11,6 +11,7 @@ from uuid import uuid4
 from fastapi import Request
 from pydantic import BaseModel
 
+from ..core.batch_writer import BatchWriter
 from ..core.config import get_settings
 from ..core.database import get_database_manager
 from ..core.logging import get_logger
@@ -169,11 +170,25 @@ class ComplianceReport(BaseModel):
 
 
 class AuditTrailService:
-	"""Enhanced audit trail service with compliance features."""
+	"""
+	Enhanced audit trail service with compliance features.
+
+	Audit rows are not committed on the request path: log_event queues them on a BatchWriter
+	that inserts them in multi-row batches, spills to a local file while the database is
+	unavailable and is flushed on shutdown.
+	"""
 
 	def __init__(self):
 		"""Initialize audit trail service."""
 		self.retention_days = getattr(settings, "audit_retention_days", 2555)  # 7 years default
+		self.writer = BatchWriter(
+			"audit_log",
+			self._insert_audit_rows,
+			batch_size=getattr(settings, "audit_batch_size", 200),
+			flush_interval=getattr(settings, "audit_flush_interval_ms", 500) / 1000,
+			max_queue_size=getattr(settings, "audit_queue_size", 10_000),
+			spill_path=getattr(settings, "audit_spill_file", "logs/audit_spill.jsonl"),
+		)
 		logger.info("Audit Trail Service initialized")
 
 	async def log_event(
@@ -235,8 +250,8 @@ class AuditTrailService:
 				duration_ms=duration_ms,
 			)
 
-			# Store in database
-			await self._store_audit_event(audit_event)
+			# Queue for the batched database insert
+			self._store_audit_event(audit_event)
 
 			# Check for security events
 			if self._is_security_event(event_type, result):
@@ -519,32 +534,38 @@ class AuditTrailService:
 			logger.error(f"Error cleaning up old audit events: {e}")
 			return 0
 
-	async def _store_audit_event(self, event: AuditEventModel) -> None:
-		"""Store audit event in database."""
-		try:
-			db_manager = await get_database_manager()
-			async with db_manager.get_session() as session:
-				audit_log = AuditLog(
-					id=event.id,
-					user_id=event.user_id,
-					event_type=event.event_type.value,
-					event_data=event.details,
-					resource_type=event.resource_type,
-					resource_id=event.resource_id,
-					action=event.action.value,
-					result=event.result.value,
-					ip_address=event.ip_address,
-					user_agent=event.user_agent,
-					session_id=event.session_id,
-					request_id=event.request_id,
-					created_at=event.timestamp,
-				)
-
-				session.add(audit_log)
-				await session.commit()
-
-		except Exception as e:
-			logger.error(f"Error storing audit event: {e}")
+	def _store_audit_event(self, event: AuditEventModel) -> None:
+		"""Queue audit event for the next batched insert."""
+		if not self.writer.submit(
+			{
+				"id": event.id,
+				"user_id": event.user_id,
+				"event_type": event.event_type.value,
+				"event_data": event.details,
+				"resource_type": event.resource_type,
+				"resource_id": event.resource_id,
+				"action": event.action.value,
+				"result": event.result.value,
+				"ip_address": event.ip_address,
+				"user_agent": event.user_agent,
+				"session_id": event.session_id,
+				"request_id": event.request_id,
+				"created_at": event.timestamp.isoformat(),
+			}
+		):
+			logger.error(f"Audit queue full, dropped audit event {event.id}")
+
+	async def _insert_audit_rows(self, rows: List[Dict[str, Any]]) -> None:
+		"""Insert a batch of queued audit rows in one statement and commit."""
+		from sqlalchemy import insert
+
+		db_manager = get_database_manager()
+		async with db_manager.get_session() as session:
+			await session.execute(insert(AuditLog), [{**row, "created_at": datetime.fromisoformat(row["created_at"])} for row in rows])
+
+	async def flush(self) -> int:
+		"""Write all queued audit events now."""
+		return await self.writer.flush()
 
 	def _is_security_event(self, event_type: AuditEventType, result: AuditResult) -> bool:
 		"""Check if event should be treated as a security event."""
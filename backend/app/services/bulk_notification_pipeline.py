@@ -0,0 +1,390 @@
+"""
+Bulk morning briefing / evening update pipeline for ScheduledNotificationService
+
+Recipients are selected in SQL and read a page at a time, keyed on user id, so memory stays flat
+no matter how many users there are. For each page, the data every briefing needs is prefetched
+with a few set-based queries: application counts, today's applications, follow-ups, and
+materialized recommendations. All database work runs in a worker thread on the caller's session,
+one step at a time, so the session is never used by two coroutines at once.
+
+Each page is rendered with one compiled template. The messages then go through a bounded queue
+to a pool of send workers, which are throttled per email provider. Users whose briefing was sent
+get their last-sent time stamped in one bulk update per page.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, exists, func, or_, select, true, update
+from sqlalchemy.orm import Session
+
+from ..core.cache import job_recommendation_cache
+from ..core.logging import get_logger
+from ..models.application import Application
+from ..models.job import Job
+from ..models.user import User
+from .email_service import EmailPriority, EmailProvider, TemplateType, UnifiedEmailMessage
+
+logger = get_logger(__name__)
+
+# Sustained sends per second per provider
+DEFAULT_PROVIDER_RATES = {"smtp": 10.0, "gmail": 5.0, "sendgrid": 50.0}
+
+RESPONSE_STATUSES = ("interview", "offer", "rejected")
+
+# Per notification type: template, preference keys and defaults, and the weekday weekly subscribers get it on
+NOTIFICATION_KINDS = {
+	"morning_briefing": {
+		"template_id": TemplateType.MORNING_BRIEFING.value,
+		"time_key": "morning_time",
+		"default_time": "08:00",
+		"last_key": "last_morning_briefing",
+		"weekly_day": 0,
+	},
+	"evening_update": {
+		"template_id": TemplateType.EVENING_SUMMARY.value,
+		"time_key": "evening_time",
+		"default_time": "19:00",
+		"last_key": "last_evening_update",
+		"weekly_day": 4,
+	},
+}
+
+
+def allowed_times(now: datetime, window_minutes: int = 120) -> List[str]:
+	"""Every "HH:MM" and "H:MM" time of day within window_minutes of now, for matching stored preferences in SQL
+
+	The window wraps around midnight: at 23:30 a 00:30 preference is an hour away.
+	"""
+	current = now.hour * 60 + now.minute
+	minutes = dict.fromkeys((current + offset) % (24 * 60) for offset in range(-window_minutes, window_minutes + 1))
+	times = []
+	for minute_of_day in minutes:
+		hour, minute = divmod(minute_of_day, 60)
+		times.append(f"{hour:02d}:{minute:02d}")
+		if hour < 10:
+			times.append(f"{hour}:{minute:02d}")
+	return times
+
+
+class ProviderRateLimiter:
+	"""Token bucket per email provider, shared by all send workers"""
+
+	def __init__(self, rates: Optional[Dict[str, float]] = None):
+		self.rates = DEFAULT_PROVIDER_RATES if rates is None else rates
+		self._buckets: Dict[str, Tuple[float, float]] = {}
+
+	async def acquire(self, provider: str):
+		"""Wait until provider may take one more send; providers without a rate are unthrottled."""
+		rate = self.rates.get(provider)
+		if not rate:
+			return
+		now = time.monotonic()
+		tokens, updated = self._buckets.get(provider, (rate, now))
+		# Up to one second of burst; a negative balance queues the caller behind earlier reservations
+		tokens = min(rate, tokens + (now - updated) * rate) - 1
+		self._buckets[provider] = (tokens, now)
+		if tokens < 0:
+			await asyncio.sleep(-tokens / rate)
+
+
+@dataclass
+class _Page:
+	"""One page of recipients and everything prefetched for them"""
+
+	users: List[Any]
+	counts: Dict[int, Any] = field(default_factory=dict)
+	applications_today: Dict[int, List[Dict[str, Any]]] = field(default_factory=dict)
+	follow_ups: Dict[int, List[Dict[str, Any]]] = field(default_factory=dict)
+	recommendations: Dict[int, List[Dict[str, Any]]] = field(default_factory=dict)
+
+
+class BulkNotificationPipeline:
+	"""Sends one notification type to every eligible user in pages, with a bounded pool of send workers"""
+
+	def __init__(
+		self,
+		service,
+		db: Session,
+		email_service,
+		page_size: int = 500,
+		concurrency: int = 20,
+		provider_rates: Optional[Dict[str, float]] = None,
+		max_errors: int = 100,
+	):
+		# ScheduledNotificationService, whose _build_* helpers format each section
+		self.service = service
+		self.db = db
+		self.email_service = email_service
+		self.page_size = page_size
+		self.concurrency = concurrency
+		self.rate_limiter = ProviderRateLimiter(provider_rates)
+		self.max_errors = max_errors
+		provider = email_service.config.primary_provider
+		self.provider = EmailProvider.SMTP.value if provider == EmailProvider.AUTO else provider.value
+		self._sent: List[Tuple[int, Dict[str, Any]]] = []
+
+	async def run(self, kind: str) -> Dict[str, Any]:
+		"""Send notification kind ("morning_briefing" or "evening_update") to every eligible user."""
+		spec = NOTIFICATION_KINDS[kind]
+		now = datetime.now()
+		results = {"total_eligible": 0, "sent": 0, "failed": 0, "opted_out": 0, "errors": []}
+		if kind == "evening_update":
+			results["no_activity"] = await asyncio.to_thread(self._count_without_activity, now)
+		if spec["template_id"] not in self.email_service.template_cache:
+			await self.email_service._initialize_templates()
+
+		# Room for two pages: rendering the next page overlaps with sending the current one
+		queue: asyncio.Queue = asyncio.Queue(maxsize=self.page_size * 2)
+		workers = [asyncio.create_task(self._send_worker(queue, results)) for _ in range(self.concurrency)]
+		market_insights = self.service._build_market_insights()
+		try:
+			last_id = 0
+			while True:
+				page = await asyncio.to_thread(self._load_page, kind, now, last_id)
+				if not page.users:
+					break
+				last_id = page.users[-1].id
+				results["total_eligible"] += len(page.users)
+
+				contexts = [self._build_context(kind, user, page, now, market_insights) for user in page.users]
+				rendered = await asyncio.to_thread(self.email_service.render_template_bulk, spec["template_id"], contexts)
+				for user, parts in zip(page.users, rendered):
+					try:
+						message = UnifiedEmailMessage(
+							to=[user.email], subject=parts["subject"], body_html=parts["html"], body_text=parts["text"], priority=EmailPriority.NORMAL
+						)
+					except ValueError as e:
+						self._record_failure(results, user.id, str(e))
+						continue
+					await queue.put((user.id, user.settings, message))
+
+				await self._mark_sent(kind, now)
+
+			await queue.join()
+		finally:
+			for worker in workers:
+				worker.cancel()
+			await asyncio.gather(*workers, return_exceptions=True)
+		await self._mark_sent(kind, now)
+		return results
+
+	async def _send_worker(self, queue: asyncio.Queue, results: Dict[str, Any]):
+		while True:
+			user_id, settings, message = await queue.get()
+			try:
+				await self.rate_limiter.acquire(self.provider)
+				result = await self.email_service.send_email(message, user_id=str(user_id))
+				if result.get("success"):
+					results["sent"] += 1
+					self._sent.append((user_id, settings))
+				else:
+					self._record_failure(results, user_id, result.get("message", "Unknown error"))
+			except Exception as e:
+				self._record_failure(results, user_id, str(e))
+			finally:
+				queue.task_done()
+
+	def _record_failure(self, results: Dict[str, Any], user_id: int, error: str):
+		results["failed"] += 1
+		if len(results["errors"]) < self.max_errors:
+			results["errors"].append({"user_id": user_id, "error": error})
+
+	async def _mark_sent(self, kind: str, now: datetime):
+		"""Stamp the last-sent time of every user sent to since the previous call."""
+		sent, self._sent = self._sent, []
+		if sent:
+			await asyncio.to_thread(self._update_last_sent, kind, now, sent)
+
+	def _update_last_sent(self, kind: str, now: datetime, sent: List[Tuple[int, Dict[str, Any]]]):
+		try:
+			rows = [{"id": user_id, "settings": self.service._with_last_notification_time(settings, kind, now)} for user_id, settings in sent]
+			self.db.execute(update(User), rows)
+			self.db.commit()
+		except Exception as e:
+			logger.error(f"Error updating last notification time for {len(sent)} users: {e}")
+			self.db.rollback()
+
+	# -------- Selection --------
+	def _eligibility_filter(self, kind: str, now: datetime):
+		"""SQL equivalent of ScheduledNotificationService._should_send_* for every user at once"""
+		spec = NOTIFICATION_KINDS[kind]
+		notifications = User.settings["notifications"]
+		frequency = func.coalesce(notifications["frequency"].as_string(), "daily")
+		last_sent = notifications[spec["last_key"]].as_string()
+		not_recent = or_(last_sent.is_(None), last_sent < (now - timedelta(hours=18)).isoformat())
+
+		# Weekly subscribers get it on their weekday regardless of when it was last sent
+		daily = and_(frequency != "never", frequency != "weekly", not_recent)
+		frequency_ok = or_(daily, frequency == "weekly") if now.weekday() == spec["weekly_day"] else daily
+
+		return and_(
+			User.is_active.is_(True),
+			func.coalesce(notifications[kind].as_boolean(), true()).is_(True),
+			func.coalesce(notifications[spec["time_key"]].as_string(), spec["default_time"]).in_(allowed_times(now)),
+			frequency_ok,
+		)
+
+	def _applied_today(self, now: datetime):
+		return exists().where(and_(Application.user_id == User.id, Application.applied_date == now.date()))
+
+	def _count_without_activity(self, now: datetime) -> int:
+		"""Users due an evening update who applied to nothing today"""
+		query = select(func.count(User.id)).where(self._eligibility_filter("evening_update", now), ~self._applied_today(now))
+		return self.db.execute(query).scalar() or 0
+
+	def _load_page(self, kind: str, now: datetime, last_id: int) -> _Page:
+		"""The next page of recipients after last_id, with their briefing data prefetched"""
+		conditions = [User.id > last_id, self._eligibility_filter(kind, now)]
+		if kind == "evening_update":
+			# Only meaningful activity is worth an evening update; applications are the only activity tracked so far
+			conditions.append(self._applied_today(now))
+		query = (
+			select(User.id, User.email, User.settings, User.profile, User.skills, User.preferred_locations, User.experience_level)
+			.where(*conditions)
+			.order_by(User.id)
+			.limit(self.page_size)
+		)
+		page = _Page(users=self.db.execute(query).all())
+		if not page.users:
+			return page
+
+		user_ids = [user.id for user in page.users]
+		page.counts = self._load_application_counts(user_ids, now)
+		page.recommendations = self._load_recommendations(page.users)
+		if kind == "evening_update":
+			page.applications_today = self._load_applications_today(user_ids, now)
+			page.follow_ups = self._load_follow_ups(user_ids, now)
+		return page
+
+	# -------- Set-based prefetch --------
+	def _load_application_counts(self, user_ids: List[int], now: datetime) -> Dict[int, Any]:
+		week_start = (now - timedelta(days=now.weekday())).date()
+		recent_start = (now - timedelta(days=7)).date()
+		query = (
+			select(
+				Application.user_id,
+				func.count(Application.id).label("total"),
+				func.sum(case((Application.applied_date >= week_start, 1), else_=0)).label("this_week"),
+				func.sum(case((Application.applied_date >= recent_start, 1), else_=0)).label("recent"),
+				func.sum(case((Application.applied_date == now.date(), 1), else_=0)).label("today"),
+				func.sum(case((Application.status.in_(RESPONSE_STATUSES), 1), else_=0)).label("responses"),
+			)
+			.where(Application.user_id.in_(user_ids))
+			.group_by(Application.user_id)
+		)
+		return {row.user_id: row for row in self.db.execute(query)}
+
+	def _load_applications_today(self, user_ids: List[int], now: datetime) -> Dict[int, List[Dict[str, Any]]]:
+		query = (
+			select(Application.user_id, Application.applied_date, Job.title, Job.company, Job.location)
+			.join(Job, Job.id == Application.job_id)
+			.where(Application.user_id.in_(user_ids), Application.applied_date == now.date())
+		)
+		applications: Dict[int, List[Dict[str, Any]]] = {}
+		for row in self.db.execute(query):
+			applications.setdefault(row.user_id, []).append(
+				{"job_title": row.title, "company": row.company, "location": row.location, "applied_at": row.applied_date}
+			)
+		return applications
+
+	def _load_follow_ups(self, user_ids: List[int], now: datetime, per_user: int = 3) -> Dict[int, List[Dict[str, Any]]]:
+		"""Each user's oldest applications still awaiting a reply after a week, at most per_user each"""
+		ranked = (
+			select(
+				Application.user_id,
+				Application.applied_date,
+				Job.company,
+				func.row_number().over(partition_by=Application.user_id, order_by=(Application.applied_date, Application.id)).label("rank"),
+			)
+			.join(Job, Job.id == Application.job_id)
+			.where(
+				Application.user_id.in_(user_ids),
+				Application.status == "applied",
+				Application.applied_date <= (now - timedelta(days=7)).date(),
+			)
+			.subquery()
+		)
+		follow_ups: Dict[int, List[Dict[str, Any]]] = {}
+		for row in self.db.execute(select(ranked).where(ranked.c.rank <= per_user)):
+			follow_ups.setdefault(row.user_id, []).append(
+				{"company": row.company, "type": "Application follow-up", "days_since": (now.date() - row.applied_date).days}
+			)
+		return follow_ups
+
+	def _load_recommendations(self, users: List[Any], per_user: int = 5) -> Dict[int, List[Dict[str, Any]]]:
+		"""
+		Top recommendations from the users' materialized top-K lists.
+
+		Users without a fresh list get none in this run; scoring them here would cost a full
+		recommendation pass per user, so that is left to the materialization path.
+		"""
+		lists = job_recommendation_cache.get_materialized_many({user.id: job_recommendation_cache.profile_stamp(user) for user in users})
+		lists = {user_id: recommendations for user_id, recommendations in lists.items() if recommendations}
+		job_ids = {rec["job_id"] for recommendations in lists.values() for rec in recommendations}
+		if not job_ids:
+			return {}
+
+		job_query = select(
+			Job.id, Job.title, Job.company, Job.location, Job.description, Job.tech_stack, Job.application_url
+		).where(Job.id.in_(job_ids))
+		jobs = {row.id: row for row in self.db.execute(job_query)}
+		applied_query = select(Application.user_id, Application.job_id).where(Application.user_id.in_(list(lists)), Application.job_id.in_(job_ids))
+		applied = set(self.db.execute(applied_query).all())
+
+		recommendations_by_user = {}
+		for user_id, recommendations in lists.items():
+			formatted = []
+			for rec in recommendations:
+				job = jobs.get(rec["job_id"])
+				if job is None or (user_id, job.id) in applied:
+					continue
+				formatted.append(
+					self.service._format_recommendation(
+						{
+							"job_id": job.id,
+							"title": job.title,
+							"company": job.company,
+							"location": job.location,
+							"match_score": rec.get("score", 0.75),
+							"required_skills": job.tech_stack,
+							"description": job.description,
+							"match_explanation": "; ".join(rec.get("match_reasons") or []) or "This job matches your skills and preferences",
+							"application_url": job.application_url,
+						}
+					)
+				)
+				if len(formatted) == per_user:
+					break
+			recommendations_by_user[user_id] = formatted
+		return recommendations_by_user
+
+	# -------- Rendering --------
+	def _build_context(self, kind: str, user: Any, page: _Page, now: datetime, market_insights: Dict[str, Any]) -> Dict[str, Any]:
+		counts = page.counts.get(user.id)
+		this_week = counts.this_week if counts else 0
+		recommendations = page.recommendations.get(user.id, [])
+		context = {"user_name": self.service._get_user_name(user), "current_date": now.strftime("%Y-%m-%d"), "recipient_email": user.email}
+
+		if kind == "morning_briefing":
+			context.update(
+				recommendations=recommendations,
+				progress=self.service._build_progress(this_week, counts.total if counts else 0, counts.responses if counts else 0),
+				daily_goals=self.service._build_daily_goals(counts.recent if counts else 0),
+				market_insights=market_insights,
+			)
+			return context
+
+		applications_today = counts.today if counts else 0
+		daily_activity = self.service._build_daily_activity(applications_today, page.applications_today.get(user.id, []), this_week)
+		achievements = self.service._build_achievements(applications_today, this_week)
+		context.update(
+			daily_activity=daily_activity,
+			achievements=achievements,
+			tomorrow_plan=self.service._build_tomorrow_plan(page.follow_ups.get(user.id, []), recommendations),
+			motivation=self.service._get_motivational_message(daily_activity, achievements),
+		)
+		return context
@@ -4,6 +4,7 @@ Consolidated caching services for the Career Copilot application.
 
 import hashlib
 import json
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
 from functools import wraps
@@ -11,6 +12,19 @@ from typing import Any, Dict, List, Optional
 
 import redis
 import redis.asyncio as aioredis
+from app.core.cache_invalidation import (
+	alegacy_sweep_until,
+	ainvalidate_tags,
+	ascan_unlink,
+	invalidate_tags,
+	legacy_sweep_until,
+	mark_tagging_started,
+	queue_tag_updates,
+	scan_unlink,
+	tags_for_key,
+	user_key_patterns,
+	user_tag,
+)
 from app.core.config import get_settings
 from app.core.logging import get_logger
 from app.models.analytics import Analytics
@@ -32,6 +46,8 @@ class CacheService:
 		self.redis_client: Optional[redis.Redis] = None
 		self.async_redis_client: Optional[aioredis.Redis] = None
 		self.enabled = self.settings.enable_redis_caching
+		# Until then, keys written before tagging may exist, so user invalidation also sweeps by pattern
+		self._legacy_sweep_until: Optional[float] = None
 
 		if self.enabled:
 			self._initialize_clients()
@@ -49,6 +65,7 @@ class CacheService:
 				health_check_interval=30,
 			)
 			self.redis_client.ping()
+			mark_tagging_started(self.redis_client, time.time())
 			logger.info("✅ Redis sync client connected successfully")
 		except (ConnectionError, TimeoutError) as e:
 			logger.warning(f"❌ Redis sync connection failed: {e}")
@@ -99,13 +116,20 @@ class CacheService:
 			key_parts.append(hashlib.md5(kwargs_str.encode()).hexdigest())
 		return ":".join(key_parts)
 
-	def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
-		"""Set a value in cache with TTL (sync)"""
+	def set(self, key: str, value: Any, ttl: int = 3600, tags: Optional[List[str]] = None) -> bool:
+		"""Set a value in cache with TTL (sync); the key is registered under its tags for invalidation"""
 		if not self.enabled or not self.redis_client:
 			return False
 		try:
 			serialized_value = json.dumps(value, default=str)
-			result = self.redis_client.setex(key, ttl, serialized_value)
+			key_tags = tags_for_key(key, tags)
+			if key_tags:
+				pipe = self.redis_client.pipeline(transaction=False)
+				pipe.setex(key, ttl, serialized_value)
+				queue_tag_updates(pipe, key, key_tags)
+				result = pipe.execute()[0]
+			else:
+				result = self.redis_client.setex(key, ttl, serialized_value)
 			logger.debug(f"Cache SET: {key} (TTL: {ttl}s)")
 			return result
 		except Exception as e:
@@ -128,14 +152,21 @@ class CacheService:
 			logger.error(f"Cache GET error for key {key}: {e}")
 			return None
 
-	async def aset(self, key: str, value: Any, ttl: int = 3600) -> bool:
-		"""Set a value in cache with TTL (async)"""
+	async def aset(self, key: str, value: Any, ttl: int = 3600, tags: Optional[List[str]] = None) -> bool:
+		"""Set a value in cache with TTL (async); the key is registered under its tags for invalidation"""
 		client = await self._get_async_client()
 		if not client:
 			return False
 		try:
 			serialized_value = json.dumps(value, default=str)
-			result = await client.setex(key, ttl, serialized_value)
+			key_tags = tags_for_key(key, tags)
+			if key_tags:
+				pipe = client.pipeline(transaction=False)
+				pipe.setex(key, ttl, serialized_value)
+				queue_tag_updates(pipe, key, key_tags)
+				result = (await pipe.execute())[0]
+			else:
+				result = await client.setex(key, ttl, serialized_value)
 			logger.debug(f"Cache ASET: {key} (TTL: {ttl}s)")
 			return result
 		except Exception as e:
@@ -185,68 +216,94 @@ class CacheService:
 			return False
 
 	def delete_pattern(self, pattern: str) -> int:
-		"""Delete all keys matching a pattern (sync)"""
+		"""Delete all keys matching a pattern (sync), using non-blocking SCAN + UNLINK"""
 		if not self.enabled or not self.redis_client:
 			return 0
 		try:
-			keys = self.redis_client.keys(pattern)
-			if keys:
-				result = self.redis_client.delete(*keys)
-				logger.debug(f"Cache DELETE_PATTERN: {pattern} ({len(keys)} keys)")
-				return result
-			return 0
+			deleted = scan_unlink(self.redis_client, pattern)
+			logger.debug(f"Cache DELETE_PATTERN: {pattern} ({deleted} keys)")
+			return deleted
 		except Exception as e:
 			logger.error(f"Cache DELETE_PATTERN error for pattern {pattern}: {e}")
 			return 0
 
 	async def adelete_pattern(self, pattern: str) -> int:
-		"""Delete all keys matching a pattern (async)"""
+		"""Delete all keys matching a pattern (async), using non-blocking SCAN + UNLINK"""
 		client = await self._get_async_client()
 		if not client:
 			return 0
 		try:
-			keys = await client.keys(pattern)
-			if keys:
-				result = await client.delete(*keys)
-				logger.debug(f"Cache ADELETE_PATTERN: {pattern} ({len(keys)} keys)")
-				return result
-			return 0
+			deleted = await ascan_unlink(client, pattern)
+			logger.debug(f"Cache ADELETE_PATTERN: {pattern} ({deleted} keys)")
+			return deleted
 		except Exception as e:
 			logger.error(f"Cache ADELETE_PATTERN error for pattern {pattern}: {e}")
 			return 0
 
+	def invalidate_tags(self, tags: List[str]) -> int:
+		"""Delete every key registered under the given tags (sync)"""
+		if not self.enabled or not self.redis_client:
+			return 0
+		try:
+			return invalidate_tags(self.redis_client, tags)
+		except Exception as e:
+			logger.error(f"Cache INVALIDATE_TAGS error for tags {tags}: {e}")
+			return 0
+
+	async def ainvalidate_tags(self, tags: List[str]) -> int:
+		"""Delete every key registered under the given tags (async)"""
+		client = await self._get_async_client()
+		if not client:
+			return 0
+		try:
+			return await ainvalidate_tags(client, tags)
+		except Exception as e:
+			logger.error(f"Cache AINVALIDATE_TAGS error for tags {tags}: {e}")
+			return 0
+
 	def invalidate_user_cache(self, user_id: int):
 		"""Invalidate all cache entries for a specific user"""
-		patterns = [
-			f"recommendations:{user_id}:*",
-			f"skill_gap:{user_id}:*",
-			f"analytics:{user_id}:*",
-			f"content_generation:{user_id}:*",
-			f"interview:{user_id}:*",
-			f"resume_parsing:{user_id}:*",
-		]
-		total_deleted = 0
-		for pattern in patterns:
-			total_deleted += self.delete_pattern(pattern)
+		# User-scoped keys (recommendations, skill_gap, analytics, ...) are tagged on write
+		total_deleted = self.invalidate_tags([user_tag(user_id)])
+		if self._legacy_sweep_due():
+			total_deleted += sum(self.delete_pattern(pattern) for pattern in user_key_patterns(user_id))
 		logger.info(f"Invalidated {total_deleted} cache entries for user {user_id}")
 		return total_deleted
 
 	async def ainvalidate_user_cache(self, user_id: int):
 		"""Invalidate all cache entries for a specific user (async)"""
-		patterns = [
-			f"recommendations:{user_id}:*",
-			f"skill_gap:{user_id}:*",
-			f"analytics:{user_id}:*",
-			f"content_generation:{user_id}:*",
-			f"interview:{user_id}:*",
-			f"resume_parsing:{user_id}:*",
-		]
-		total_deleted = 0
-		for pattern in patterns:
-			total_deleted += await self.adelete_pattern(pattern)
+		total_deleted = await self.ainvalidate_tags([user_tag(user_id)])
+		if await self._alegacy_sweep_due():
+			for pattern in user_key_patterns(user_id):
+				total_deleted += await self.adelete_pattern(pattern)
 		logger.info(f"Invalidated {total_deleted} cache entries for user {user_id}")
 		return total_deleted
 
+	def _legacy_sweep_due(self) -> bool:
+		"""Whether keys written before tagging may still be live"""
+		if self._legacy_sweep_until is None:
+			if not self.enabled or not self.redis_client:
+				return False
+			try:
+				self._legacy_sweep_until = legacy_sweep_until(self.redis_client, time.time())
+			except Exception as e:
+				logger.warning(f"Could not read the cache tagging start time, sweeping by pattern: {e}")
+				return True
+		return time.time() < self._legacy_sweep_until
+
+	async def _alegacy_sweep_due(self) -> bool:
+		"""Whether keys written before tagging may still be live (async)"""
+		if self._legacy_sweep_until is None:
+			client = await self._get_async_client()
+			if not client:
+				return False
+			try:
+				self._legacy_sweep_until = await alegacy_sweep_until(client, time.time())
+			except Exception as e:
+				logger.warning(f"Could not read the cache tagging start time, sweeping by pattern: {e}")
+				return True
+		return time.time() < self._legacy_sweep_until
+
 	# Specific caching methods from original CacheService
 	def cache_llm_response(self, prompt: str, response: str, model: str = "default", ttl: int = 86400):
 		key = self._generate_cache_key("llm_response", model, prompt)
@@ -6,6 +6,7 @@ This module provides a robust ChromaDB client implementation with:
 - Health checks and monitoring
 - Proper error handling and retry logic
 - Configuration management
+- A content-addressed embedding cache in front of the embedding function
 """
 
 import asyncio
@@ -19,12 +20,14 @@ from uuid import uuid4
 
 import chromadb
 from chromadb.api.models.Collection import Collection
+from chromadb.api.types import EmbeddingFunction
 from chromadb.config import Settings
 from chromadb.utils import embedding_functions
 
 from ..core.config import get_settings
 from ..core.exceptions import VectorStoreError
 from ..core.logging import get_logger
+from .embedding_cache import CachedEmbeddingFunction, EmbeddingCache
 
 logger = get_logger(__name__)
 
@@ -406,6 +409,16 @@ class ChromaDBConnectionPool:
 		logger.info("ChromaDB connection pool closed")
 
 
+class CachingEmbeddingFunction(EmbeddingFunction):
+	"""Chroma embedding function that embeds only chunks missing from the embedding cache."""
+
+	def __init__(self, cached: CachedEmbeddingFunction):
+		self.cached = cached
+
+	def __call__(self, input):
+		return self.cached(input)
+
+
 class ChromaDBClient:
 	"""Enhanced ChromaDB client with connection pooling and monitoring."""
 
@@ -413,7 +426,9 @@ class ChromaDBClient:
 		self.settings = get_settings()
 		self.connection_pool: Optional[ChromaDBConnectionPool] = None
 		self.embedding_function = None
+		self.embedding_cache: Optional[EmbeddingCache] = None
 		self._initialize_embedding_function()
+		self._initialize_embedding_cache()
 
 	def _initialize_embedding_function(self):
 		"""Initialize the embedding function."""
@@ -426,13 +441,29 @@ class ChromaDBClient:
 					else self.settings.openai_api_key
 				)
 				self.embedding_function = embedding_functions.OpenAIEmbeddingFunction(api_key=api_key_value, model_name="text-embedding-ada-002")
+				self.embedding_model = "openai/text-embedding-ada-002"
 				logger.info("Initialized OpenAI embedding function")
 			else:
 				logger.warning("OpenAI API key missing; using default embedding function")
 				self.embedding_function = embedding_functions.DefaultEmbeddingFunction()
+				self.embedding_model = "default/all-MiniLM-L6-v2"
 		except Exception as e:
 			logger.error(f"Failed to initialize embedding function: {e}")
 			self.embedding_function = embedding_functions.DefaultEmbeddingFunction()
+			self.embedding_model = "default/all-MiniLM-L6-v2"
+
+	def _initialize_embedding_cache(self):
+		"""Put the on-disk embedding cache in front of the embedding function."""
+		if not self.settings.embedding_cache_enabled:
+			return
+		try:
+			self.embedding_cache = EmbeddingCache(self.settings.embedding_cache_path, max_entries=self.settings.embedding_cache_max_entries)
+			self.embedding_function = CachingEmbeddingFunction(CachedEmbeddingFunction(self.embedding_function, self.embedding_cache, self.embedding_model))
+			logger.info(f"Embedding cache enabled at {self.settings.embedding_cache_path}")
+		except Exception as e:
+			# Embedding still works without the cache, only slower
+			logger.error(f"Failed to open embedding cache: {e}")
+			self.embedding_cache = None
 
 	async def initialize(self):
 		"""Initialize the ChromaDB client and connection pool."""
@@ -541,6 +572,7 @@ class ChromaDBClient:
 				"collections_count": len(collections) if operations_healthy else 0,
 			},
 			"embedding_function": {"type": type(self.embedding_function).__name__, "available": self.embedding_function is not None},
+			"embedding_cache": self.embedding_cache.get_stats() if self.embedding_cache else None,
 			"timestamp": datetime.now(timezone.utc).isoformat(),
 		}
 
@@ -568,6 +600,7 @@ class ChromaDBClient:
 			},
 			"collections": {"count": len(collections), "names": collections},
 			"embedding_function": {"type": type(self.embedding_function).__name__, "available": self.embedding_function is not None},
+			"embedding_cache": self.embedding_cache.get_stats() if self.embedding_cache else None,
 			"persist_directory": self.settings.chroma_persist_directory,
 			"timestamp": datetime.now(timezone.utc).isoformat(),
 		}
@@ -0,0 +1,331 @@
+"""
+Execution layer for ChromaDB calls made from async code
+
+Chroma's local persistent client is synchronous: collection.query embeds the query texts and runs
+the nearest-neighbour search on the calling thread, and collection.add embeds every document it is
+given. Called from a coroutine, either one blocks the event loop for the whole call. ChromaExecutor
+runs every call on a bounded thread pool instead, and batches what it can:
+
+- query() calls made within a short window against the same collection, with the same n_results,
+  where filter and include, are merged into one collection.query(query_texts=[...]) call. Each
+  caller gets back a result shaped like a single-query result.
+- add() calls are buffered per collection and written as large collection.add batches. If a merged
+  batch fails, each caller's rows are retried on their own so one bad contract does not fail the
+  others.
+- Everything else (get, delete, count) goes through run().
+
+The number of calls waiting for a thread, call latency and batch sizes are exported through the
+metrics collector, and close_chroma_executors() writes buffered rows on shutdown. The thread pool
+is started on first use, so an executor that was closed (e.g. by an earlier app lifespan) starts a
+new one when it is used again. Collections are
+only used through query/add and the callables given to run(), so this module does not import
+chromadb itself.
+"""
+
+import asyncio
+import json
+import threading
+import time
+import weakref
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_INCLUDE = ["documents", "metadatas", "distances"]
+
+_executors: "weakref.WeakSet[ChromaExecutor]" = weakref.WeakSet()
+
+
+def _metrics():
+	try:
+		from ..monitoring.metrics_collector import get_metrics_collector
+
+		return get_metrics_collector()
+	except Exception:
+		return None
+
+
+def split_query_result(results: Dict[str, Any], index: int) -> Dict[str, Any]:
+	"""Cut the result of query index out of a multi-query result, keeping the single-query shape."""
+	single: Dict[str, Any] = {}
+	for key, value in results.items():
+		if key == "included" or not isinstance(value, list):
+			single[key] = value
+		else:
+			single[key] = [value[index]] if index < len(value) else []
+	return single
+
+
+@dataclass
+class _PendingQueries:
+	"""Query texts waiting to be sent together"""
+
+	collection: Any
+	options: Dict[str, Any]
+	texts: List[str] = field(default_factory=list)
+	futures: List[asyncio.Future] = field(default_factory=list)
+	timer: Optional[asyncio.TimerHandle] = None
+
+
+@dataclass
+class _PendingAdds:
+	"""Rows waiting to be added together; one unit per add() call"""
+
+	collection: Any
+	units: List[Tuple[Dict[str, list], asyncio.Future]] = field(default_factory=list)
+	rows: int = 0
+	timer: Optional[asyncio.TimerHandle] = None
+
+
+class ChromaExecutor:
+	"""Runs blocking Chroma calls on a bounded thread pool, merging queries and adds"""
+
+	def __init__(
+		self,
+		max_workers: int = 4,
+		query_window: float = 0.002,
+		max_query_batch: int = 32,
+		add_window: float = 0.01,
+		add_batch_size: int = 256,
+	):
+		self.max_workers = max_workers
+		self.query_window = query_window
+		self.max_query_batch = max_query_batch
+		self.add_window = add_window
+		self.add_batch_size = add_batch_size
+
+		self._executor: Optional[ThreadPoolExecutor] = None
+		self._lock = threading.Lock()
+		self._waiting: Dict[str, int] = defaultdict(int)
+		self._pending_queries: Dict[Tuple, _PendingQueries] = {}
+		self._pending_adds: Dict[str, _PendingAdds] = {}
+		self._tasks: set = set()
+
+		self.stats: Dict[str, Any] = {
+			"calls": 0,
+			"errors": 0,
+			"queries": 0,
+			"query_calls": 0,
+			"rows_added": 0,
+			"add_calls": 0,
+			"add_fallbacks": 0,
+			"total_latency_ms": defaultdict(float),
+			"calls_by_operation": defaultdict(int),
+		}
+		_executors.add(self)
+
+	# -------- Thread pool --------
+	async def run(self, operation: str, func: Callable[..., Any], *args, batch_size: int = 1, **kwargs) -> Any:
+		"""Run a blocking Chroma call on the pool; latency is measured from submission."""
+		loop = asyncio.get_running_loop()
+		submitted = time.perf_counter()
+		self._set_waiting(operation, 1)
+
+		def call():
+			self._set_waiting(operation, -1)
+			return func(*args, **kwargs)
+
+		try:
+			return await loop.run_in_executor(self._pool(), call)
+		except Exception:
+			self.stats["errors"] += 1
+			raise
+		finally:
+			duration = time.perf_counter() - submitted
+			self.stats["calls"] += 1
+			self.stats["calls_by_operation"][operation] += 1
+			self.stats["total_latency_ms"][operation] += duration * 1000
+			metrics = _metrics()
+			if metrics is not None:
+				metrics.record_vector_store_call(operation, duration, batch_size)
+
+	def _pool(self) -> ThreadPoolExecutor:
+		with self._lock:
+			if self._executor is None:
+				self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="chroma")
+			return self._executor
+
+	def _set_waiting(self, operation: str, delta: int):
+		# Called from the loop on submit and from a pool thread once the call starts
+		with self._lock:
+			self._waiting[operation] += delta
+			depth = self._waiting[operation]
+		metrics = _metrics()
+		if metrics is not None:
+			metrics.update_vector_store_queue_depth(operation, depth)
+
+	def _spawn(self, coro):
+		task = asyncio.get_running_loop().create_task(coro)
+		self._tasks.add(task)
+		task.add_done_callback(self._tasks.discard)
+
+	# -------- Queries --------
+	async def query(
+		self, collection, query_text: str, n_results: int = 10, where: Optional[Dict[str, Any]] = None, include: Optional[List[str]] = None
+	) -> Dict[str, Any]:
+		"""Similarity search for one query text, sent together with concurrent compatible queries."""
+		loop = asyncio.get_running_loop()
+		include = list(include or DEFAULT_INCLUDE)
+		key = (collection.name, n_results, json.dumps(where, sort_keys=True, default=str), tuple(include))
+
+		pending = self._pending_queries.get(key)
+		if pending is None:
+			pending = _PendingQueries(collection, {"n_results": n_results, "where": where, "include": include})
+			pending.timer = loop.call_later(self.query_window, self._flush_queries, key)
+			self._pending_queries[key] = pending
+
+		future = loop.create_future()
+		pending.texts.append(query_text)
+		pending.futures.append(future)
+		self.stats["queries"] += 1
+		if len(pending.texts) >= self.max_query_batch:
+			self._flush_queries(key)
+		return await future
+
+	def _flush_queries(self, key: Tuple):
+		pending = self._pending_queries.pop(key, None)
+		if pending is None:
+			return
+		if pending.timer is not None:
+			pending.timer.cancel()
+		self._spawn(self._run_queries(pending))
+
+	async def _run_queries(self, pending: _PendingQueries):
+		self.stats["query_calls"] += 1
+		try:
+			results = await self.run("query", pending.collection.query, batch_size=len(pending.texts), query_texts=pending.texts, **pending.options)
+		except Exception as e:
+			for future in pending.futures:
+				if not future.done():
+					future.set_exception(e)
+			return
+
+		for index, future in enumerate(pending.futures):
+			if not future.done():
+				future.set_result(split_query_result(results, index))
+
+	# -------- Adds --------
+	async def add(self, collection, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]]):
+		"""Add rows to collection in a merged batch; returns once they are stored."""
+		if not ids:
+			return
+		loop = asyncio.get_running_loop()
+		pending = self._pending_adds.get(collection.name)
+		if pending is None:
+			pending = _PendingAdds(collection)
+			pending.timer = loop.call_later(self.add_window, self._flush_adds, collection.name)
+			self._pending_adds[collection.name] = pending
+
+		future = loop.create_future()
+		pending.units.append(({"ids": list(ids), "documents": list(documents), "metadatas": list(metadatas)}, future))
+		pending.rows += len(ids)
+		if pending.rows >= self.add_batch_size:
+			self._flush_adds(collection.name)
+		await future
+
+	def _flush_adds(self, name: str):
+		pending = self._pending_adds.pop(name, None)
+		if pending is None:
+			return
+		if pending.timer is not None:
+			pending.timer.cancel()
+		self._spawn(self._run_adds(pending))
+
+	async def _run_adds(self, pending: _PendingAdds):
+		merged = {"ids": [], "documents": [], "metadatas": []}
+		for unit, _ in pending.units:
+			for key in merged:
+				merged[key].extend(unit[key])
+
+		try:
+			await self._add_rows(pending.collection, merged)
+		except Exception as e:
+			if len(pending.units) == 1:
+				pending.units[0][1].set_exception(e)
+				return
+			# Find the offending rows: retry every caller's rows on their own
+			logger.warning(f"Batched add of {pending.rows} rows to {pending.collection.name} failed ({e}); retrying {len(pending.units)} writes one by one")
+			self.stats["add_fallbacks"] += 1
+			for unit, future in pending.units:
+				try:
+					await self._add_rows(pending.collection, unit)
+				except Exception as unit_error:
+					if not future.done():
+						future.set_exception(unit_error)
+				else:
+					if not future.done():
+						future.set_result(None)
+			return
+
+		for _, future in pending.units:
+			if not future.done():
+				future.set_result(None)
+
+	async def _add_rows(self, collection, rows: Dict[str, list]):
+		# A single very large contract is still written in add_batch_size pieces
+		for start in range(0, len(rows["ids"]), self.add_batch_size):
+			end = start + self.add_batch_size
+			self.stats["add_calls"] += 1
+			await self.run(
+				"add",
+				collection.add,
+				batch_size=len(rows["ids"][start:end]),
+				ids=rows["ids"][start:end],
+				documents=rows["documents"][start:end],
+				metadatas=rows["metadatas"][start:end],
+			)
+			self.stats["rows_added"] += len(rows["ids"][start:end])
+
+	# -------- Lifecycle and stats --------
+	async def drain(self):
+		"""Send everything that is buffered and wait for it."""
+		for key in list(self._pending_queries):
+			self._flush_queries(key)
+		for name in list(self._pending_adds):
+			self._flush_adds(name)
+		if self._tasks:
+			await asyncio.gather(*self._tasks, return_exceptions=True)
+
+	async def close(self):
+		"""Drain buffered work and stop the thread pool; the next call starts a new one."""
+		await self.drain()
+		with self._lock:
+			executor, self._executor = self._executor, None
+		if executor is not None:
+			executor.shutdown(wait=False)
+
+	def get_stats(self) -> Dict[str, Any]:
+		calls_by_operation = dict(self.stats["calls_by_operation"])
+		with self._lock:
+			waiting = {operation: depth for operation, depth in self._waiting.items() if depth}
+		return {
+			"max_workers": self.max_workers,
+			"calls": self.stats["calls"],
+			"errors": self.stats["errors"],
+			"queries": self.stats["queries"],
+			"query_calls": self.stats["query_calls"],
+			"average_queries_per_call": round(self.stats["queries"] / self.stats["query_calls"], 2) if self.stats["query_calls"] else 0.0,
+			"rows_added": self.stats["rows_added"],
+			"add_calls": self.stats["add_calls"],
+			"add_fallbacks": self.stats["add_fallbacks"],
+			"waiting": waiting,
+			"buffered_queries": sum(len(pending.texts) for pending in self._pending_queries.values()),
+			"buffered_rows": sum(pending.rows for pending in self._pending_adds.values()),
+			"average_latency_ms": {
+				operation: round(self.stats["total_latency_ms"][operation] / count, 2) for operation, count in calls_by_operation.items() if count
+			},
+		}
+
+
+async def close_chroma_executors() -> None:
+	"""Drain and stop every executor, e.g. on application shutdown."""
+	for executor in list(_executors):
+		try:
+			await executor.close()
+		except Exception as e:
+			logger.error(f"Failed to close Chroma executor: {e}")
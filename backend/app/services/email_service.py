@@ -32,6 +32,7 @@ from pydantic import BaseModel, EmailStr, Field, validator
 from ..core.config import get_settings
 from ..core.exceptions import EmailServiceError, ErrorCategory, ErrorSeverity
 from ..core.logging import get_logger
+from ..core.template_cache import get_template_cache, render_many
 
 logger = get_logger(__name__)
 
@@ -235,6 +236,8 @@ class EmailService:
 			loader=FileSystemLoader([str(self.templates_dir)]), autoescape=select_autoescape(["html", "xml"]), trim_blocks=True, lstrip_blocks=True
 		)
 		self.template_cache: Dict[str, EmailTemplate] = {}
+		# Compiled Jinja templates, shared with TemplateService
+		self.compiled_templates = get_template_cache()
 
 		# Analytics and tracking
 		self.events: Dict[str, List[EmailEvent]] = {}
@@ -284,6 +287,10 @@ class EmailService:
 		# Load built-in templates
 		await self._load_builtin_templates()
 
+		# Compile them once up front so the first sends don't pay for it
+		if self.config.enable_template_caching:
+			self.precompile_templates()
+
 	def _setup_jinja_filters(self):
 		"""Setup custom Jinja2 filters and functions"""
 
@@ -379,6 +386,76 @@ class EmailService:
                 </ul>
                 
                 <p><strong>Immediate action recommended.</strong> Please review this contract carefully before proceeding.</p>
+                """,
+			},
+			TemplateType.MORNING_BRIEFING: {
+				"name": "Morning Briefing",
+				"subject": "🌅 Your Daily Career Briefing - {{ current_date }}",
+				"html_template": """
+                <h2>Good morning, {{ user_name }}!</h2>
+
+                {% if recommendations %}
+                <h3>Today's Top Matches</h3>
+                <ul>
+                {% for job in recommendations %}
+                    <li><strong>{{ job.title }}</strong> at {{ job.company }} ({{ job.location }}) - {{ (job.match_score * 100) | round | int }}% match</li>
+                {% endfor %}
+                </ul>
+                {% endif %}
+
+                {% if progress %}
+                <h3>Your Progress</h3>
+                <ul>
+                    <li><strong>Applications this week:</strong> {{ progress.applications_this_week }}</li>
+                    <li><strong>Response rate:</strong> {{ progress.response_rate }}%</li>
+                    <li><strong>Weekly goal:</strong> {{ progress.goal_completion }}% complete</li>
+                </ul>
+                {% endif %}
+
+                {% if daily_goals %}
+                <p><strong>Today's goal:</strong> {{ daily_goals.applications_target }} applications, {{ daily_goals.networking_target }} new connections.</p>
+                {% endif %}
+
+                {% if market_insights %}
+                <p><strong>Trending skills:</strong> {{ market_insights.trending_skills | join(", ") }}</p>
+                {% endif %}
+
+                <p>Best regards,<br>Career Copilot Team</p>
+                """,
+			},
+			TemplateType.EVENING_SUMMARY: {
+				"name": "Evening Summary",
+				"subject": "🌙 Your Day in Review - {{ current_date }}",
+				"html_template": """
+                <h2>Nice work today, {{ user_name }}!</h2>
+
+                {% if daily_activity %}
+                <p>You sent <strong>{{ daily_activity.applications_sent }}</strong> application(s) today.</p>
+                {% if daily_activity.applications_details %}
+                <ul>
+                {% for application in daily_activity.applications_details %}
+                    <li>{{ application.job_title }} at {{ application.company }}</li>
+                {% endfor %}
+                </ul>
+                {% endif %}
+                {% endif %}
+
+                {% for achievement in achievements %}
+                <p><strong>{{ achievement.title }}</strong> {{ achievement.description }}</p>
+                {% endfor %}
+
+                {% if tomorrow_plan and tomorrow_plan.follow_ups %}
+                <h3>Follow Up Tomorrow</h3>
+                <ul>
+                {% for follow_up in tomorrow_plan.follow_ups %}
+                    <li>{{ follow_up.company }} ({{ follow_up.days_since }} days since applying)</li>
+                {% endfor %}
+                </ul>
+                {% endif %}
+
+                <p>{{ motivation }}</p>
+
+                <p>Best regards,<br>Career Copilot Team</p>
                 """,
 			},
 		}
@@ -392,7 +469,30 @@ class EmailService:
 				html_template=config["html_template"],
 				variables=self._extract_template_variables(config["subject"], config["html_template"]),
 			)
-			self.template_cache[template_type.value] = template
+			self.register_template(template)
+
+	def register_template(self, template: EmailTemplate):
+		"""Add or replace a template, dropping compiled versions of the one it replaces"""
+		self.template_cache[template.template_id] = template
+		self.compiled_templates.invalidate("email", template.template_id)
+
+	def precompile_templates(self) -> int:
+		"""Compile every loaded template; returns the number of templates compiled"""
+		for template in self.template_cache.values():
+			self._compile_parts(template)
+		return len(self.template_cache)
+
+	def _compile_parts(self, template: EmailTemplate) -> Dict[str, Optional[Template]]:
+		"""Compiled subject, HTML and text templates, from the shared cache when enabled"""
+		compiled: Dict[str, Optional[Template]] = {}
+		for part, source in (("subject", template.subject_template), ("html", template.html_template), ("text", template.text_template)):
+			if source is None:
+				compiled[part] = None
+			elif self.config.enable_template_caching:
+				compiled[part] = self.compiled_templates.get_template(self.jinja_env, "email", f"{template.template_id}:{part}", source)
+			else:
+				compiled[part] = self.jinja_env.from_string(source)
+		return compiled
 
 	def _extract_template_variables(self, *templates: str) -> List[str]:
 		"""Extract variables from template strings"""
@@ -416,15 +516,6 @@ class EmailService:
 
 		return sorted(list(variables))
 
-	import time
-
-
-# ... (rest of the imports)
-
-
-class EmailService:
-	# ... (rest of the class)
-
 	async def send_email(self, message: UnifiedEmailMessage, user_id: str = "default_user") -> Dict[str, Any]:
 		"""Send email with intelligent provider selection and fallback"""
 
@@ -439,9 +530,9 @@ class EmailService:
 		if message.template_id:
 			message = await self._render_template(message, tracking_id)
 
-		# Simulate sending email
+		# Simulate sending email (without blocking the event loop)
 		logger.info(f"Sending email to {message.to} with subject '{message.subject}'")
-		time.sleep(1)
+		await asyncio.sleep(1)
 
 		# Record analytics event
 		if self.config.enable_analytics:
@@ -477,28 +568,49 @@ class EmailService:
 		)
 
 		try:
+			compiled = self._compile_parts(template)
+
 			# Render subject
-			subject_tmpl = self.jinja_env.from_string(template.subject_template)
-			message.subject = subject_tmpl.render(**render_vars)
+			message.subject = compiled["subject"].render(**render_vars)
 
 			# Render HTML body
-			html_tmpl = self.jinja_env.from_string(template.html_template)
-			message.body_html = html_tmpl.render(**render_vars)
+			message.body_html = compiled["html"].render(**render_vars)
 
 			# Add tracking pixel if enabled
 			if message.tracking_enabled:
 				message.body_html = self._add_tracking_pixel(message.body_html, tracking_id)
 
 			# Render text body if available
-			if template.text_template:
-				text_tmpl = self.jinja_env.from_string(template.text_template)
-				message.body_text = text_tmpl.render(**render_vars)
+			if compiled["text"] is not None:
+				message.body_text = compiled["text"].render(**render_vars)
 
 			return message
 
 		except TemplateError as e:
 			raise EmailServiceError(f"Template rendering failed: {e}")
 
+	def render_template_bulk(self, template_id: str, contexts: List[Dict[str, Any]]) -> List[Dict[str, Optional[str]]]:
+		"""
+		Render one template against many contexts (e.g. a morning briefing per user).
+
+		The template is compiled once; each context is merged over the template defaults.
+		Returns subject/html/text per context, in order.
+		"""
+		template = self.template_cache.get(template_id)
+		if not template:
+			raise EmailServiceError(f"Template not found: {template_id}")
+
+		render_vars = [{**template.default_values, "template_id": template_id, "template_name": template.name, **context} for context in contexts]
+		try:
+			compiled = self._compile_parts(template)
+			subjects = render_many(compiled["subject"], render_vars)
+			bodies = render_many(compiled["html"], render_vars)
+			texts = render_many(compiled["text"], render_vars) if compiled["text"] is not None else [None] * len(render_vars)
+		except TemplateError as e:
+			raise EmailServiceError(f"Template rendering failed: {e}")
+
+		return [{"subject": subject, "html": html, "text": text} for subject, html, text in zip(subjects, bodies, texts)]
+
 	def _add_tracking_pixel(self, html_content: str, tracking_id: str) -> str:
 		"""Add tracking pixel to HTML content"""
 		tracking_url = f"https://track.example.com/email/open/{tracking_id}"
@@ -706,15 +818,6 @@ class EmailService:
 			"provider_filter": provider.value if provider else None,
 		}
 
-	import time
-
-
-# ... (rest of the imports)
-
-
-class EmailService:
-	# ... (rest of the class)
-
 	async def test_all_providers(self) -> Dict[str, Any]:
 		"""Test all email providers"""
 		logger.info("Testing all email providers...")
@@ -760,6 +863,7 @@ class EmailService:
 			"fallback_enabled": self.config.enable_fallback,
 			"analytics_enabled": self.config.enable_analytics,
 			"templates_loaded": len(self.template_cache),
+			"compiled_template_cache": self.compiled_templates.get_stats(),
 			"active_events": sum(len(events) for events in self.events.values()),
 			"rate_limit_usage": f"{len(self.rate_limiter)}/{self.config.rate_limit_per_hour}",
 			"provider_health": {provider.value: health.available for provider, health in self.provider_health.items()},
@@ -781,6 +885,7 @@ class EmailService:
 
 		# Clear caches
 		self.template_cache.clear()
+		self.compiled_templates.invalidate("email")
 		self.events.clear()
 		self.metrics_cache.clear()
 
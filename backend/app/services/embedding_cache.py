@@ -0,0 +1,157 @@
+"""
+Content-addressed embedding cache
+
+Re-analysing a contract or re-ingesting a precedent set sends the same chunk texts to the
+embedding function again. EmbeddingCache keeps every computed embedding in a local SQLite file,
+keyed by the SHA-256 of (embedding model, chunk text), so an unchanged chunk is never embedded
+twice. That holds across restarts, and across a reset of the Chroma directory, because the file
+lives outside it.
+
+- Vectors are stored as packed float32 blobs.
+- Lookups and writes are batched: one query per 500 keys.
+- The file is bounded by max_entries. When it grows past that, the least recently used rows are
+  evicted, down to 90% of the limit.
+- Hits, misses, writes and evictions are counted for get_stats().
+
+CachedEmbeddingFunction wraps any embedding function with the (input) -> embeddings call
+signature. It looks every text up first and embeds only the misses, each distinct text once.
+The connection is shared between threads: Chroma calls the embedding function from the executor's
+pool.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Keys per SELECT ... IN (...) statement; well under SQLite's variable limit
+_LOOKUP_CHUNK = 500
+
+
+def _pack(vector: Sequence[float]) -> bytes:
+	return array("f", [float(value) for value in vector]).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+	vector = array("f")
+	vector.frombytes(blob)
+	return vector.tolist()
+
+
+class EmbeddingCache:
+	"""SQLite store of embeddings keyed by content hash, evicting least recently used rows"""
+
+	def __init__(self, path: str = "data/embedding_cache.sqlite3", max_entries: int = 200_000):
+		self.path = Path(path)
+		self.max_entries = max_entries
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+
+		self._lock = threading.Lock()
+		self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+		self._conn.execute("PRAGMA journal_mode=WAL")
+		self._conn.execute("PRAGMA synchronous=NORMAL")
+		self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)")
+		self._conn.execute("CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings (last_used)")
+		self._conn.commit()
+		self._entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+		self.hits = 0
+		self.misses = 0
+		self.writes = 0
+		self.evictions = 0
+
+	@staticmethod
+	def key(model: str, text: str) -> str:
+		return hashlib.sha256(f"{model}\x00{text}".encode()).hexdigest()
+
+	def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+		"""Return the cached vectors among keys and mark them as used."""
+		keys = list(dict.fromkeys(keys))
+		found: Dict[str, List[float]] = {}
+		with self._lock:
+			for start in range(0, len(keys), _LOOKUP_CHUNK):
+				chunk = keys[start : start + _LOOKUP_CHUNK]
+				placeholders = ",".join("?" * len(chunk))
+				for key, blob in self._conn.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk):
+					found[key] = _unpack(blob)
+			if found:
+				now = time.time()
+				self._conn.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, key) for key in found])
+				self._conn.commit()
+			self.hits += len(found)
+			self.misses += len(keys) - len(found)
+		return found
+
+	def put_many(self, vectors: Dict[str, Sequence[float]]):
+		"""Store vectors by key, then evict the least recently used rows if over max_entries."""
+		if not vectors:
+			return
+		now = time.time()
+		with self._lock:
+			cursor = self._conn.executemany(
+				"INSERT OR IGNORE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)", [(key, _pack(vector), now) for key, vector in vectors.items()]
+			)
+			self._entries += max(cursor.rowcount, 0)
+			self.writes += max(cursor.rowcount, 0)
+			if self._entries > self.max_entries:
+				self._evict()
+			self._conn.commit()
+
+	def _evict(self):
+		# Trim to 90% so eviction runs once per batch of writes, not on every write
+		excess = self._entries - int(self.max_entries * 0.9)
+		cursor = self._conn.execute("DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used LIMIT ?)", (excess,))
+		self._entries -= cursor.rowcount
+		self.evictions += cursor.rowcount
+		logger.info(f"Evicted {cursor.rowcount} embeddings from the embedding cache")
+
+	def get_stats(self) -> Dict[str, Any]:
+		lookups = self.hits + self.misses
+		return {
+			"path": str(self.path),
+			"entries": self._entries,
+			"max_entries": self.max_entries,
+			"hits": self.hits,
+			"misses": self.misses,
+			"hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+			"writes": self.writes,
+			"evictions": self.evictions,
+		}
+
+	def close(self):
+		with self._lock:
+			self._conn.close()
+
+
+class CachedEmbeddingFunction:
+	"""Embedding function that consults an EmbeddingCache before calling the wrapped one"""
+
+	def __init__(self, embedding_function: Callable[..., Any], cache: EmbeddingCache, model: str):
+		self.embedding_function = embedding_function
+		self.cache = cache
+		# Part of every key: vectors from different models never mix
+		self.model = model
+
+	def __call__(self, input: List[str]) -> List[List[float]]:
+		keys = [self.cache.key(self.model, text) for text in input]
+		vectors = self.cache.get_many(keys)
+
+		missing: Dict[str, str] = {}
+		for key, text in zip(keys, input):
+			if key not in vectors:
+				missing.setdefault(key, text)
+		if missing:
+			computed = self.embedding_function(input=list(missing.values()))
+			# Rounded to float32 like the stored copies, so a hit returns exactly what the miss did
+			fresh = {key: _unpack(_pack(vector)) for key, vector in zip(missing, computed)}
+			self.cache.put_many(fresh)
+			vectors.update(fresh)
+
+		return [vectors[key] for key in keys]
@@ -0,0 +1,152 @@
+"""
+Offline bulk mode for GROQ completions
+
+Non-interactive workloads (e.g. nightly job-description parsing) are written as a JSONL
+request file in the OpenAI/GROQ batch format, one request per line:
+
+    {"custom_id": "job-42", "method": "POST", "url": "/v1/chat/completions",
+     "body": {"model": "llama-3.1-8b-instant", "messages": [...], "temperature": 0.1, "max_tokens": 512}}
+
+The same file can be uploaded to the provider's batch API, or run by the local stand-in
+(process_batch_file), which feeds it through the micro-batching scheduler and writes one
+response line per request:
+
+    {"id": "batch_req_...", "custom_id": "job-42",
+     "response": {"status_code": 200, "request_id": "...", "body": {<chat.completion>}}, "error": null}
+"""
+
+import asyncio
+import json
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from ..core.logging import get_logger
+from .groq_service import GROQModel, GROQTaskType
+
+logger = get_logger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+DEFAULT_CHUNK_SIZE = 100
+
+PathLike = Union[str, Path]
+
+
+def build_batch_request(
+	custom_id: str,
+	messages: List[Dict[str, str]],
+	model: Union[GROQModel, str],
+	temperature: float = 0.1,
+	max_tokens: Optional[int] = None,
+	**params,
+) -> Dict[str, Any]:
+	"""One request line of a batch input file."""
+	body = {"model": getattr(model, "value", model), "messages": messages, "temperature": temperature, **params}
+	if max_tokens is not None:
+		body["max_tokens"] = max_tokens
+	return {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}
+
+
+def write_batch_requests(path: PathLike, requests: Iterable[Dict[str, Any]]) -> int:
+	"""Write request lines to a JSONL file; returns the number written."""
+	count = 0
+	with open(path, "w", encoding="utf-8") as f:
+		for request in requests:
+			f.write(json.dumps(request, ensure_ascii=False, separators=(",", ":")) + "\n")
+			count += 1
+	return count
+
+
+def read_jsonl(path: PathLike) -> Iterator[Dict[str, Any]]:
+	"""Iterate over the non-empty lines of a JSONL file."""
+	with open(path, encoding="utf-8") as f:
+		for line in f:
+			if line.strip():
+				yield json.loads(line)
+
+
+def read_batch_results(path: PathLike) -> Dict[str, Dict[str, Any]]:
+	"""Map custom_id to the completion content and usage, or to the error of a failed request."""
+	results = {}
+	for line in read_jsonl(path):
+		if line.get("error"):
+			results[line["custom_id"]] = {"error": line["error"]}
+			continue
+		body = line["response"]["body"]
+		results[line["custom_id"]] = {"content": body["choices"][0]["message"]["content"], "usage": body.get("usage", {}), "model": body.get("model")}
+	return results
+
+
+def batch_request_to_request_data(request: Dict[str, Any]) -> Dict[str, Any]:
+	"""Convert a request line body into GROQService.generate_completion arguments."""
+	if request.get("url", BATCH_ENDPOINT) != BATCH_ENDPOINT:
+		raise ValueError(f"Unsupported batch endpoint: {request.get('url')}")
+	body = dict(request["body"])
+	request_data = {
+		"messages": body.pop("messages"),
+		"model": GROQModel(body.pop("model")),
+		"task_type": GROQTaskType(body.pop("task_type", GROQTaskType.CONVERSATION.value)),
+		"temperature": body.pop("temperature", 0.1),
+		"max_tokens": body.pop("max_tokens", None),
+	}
+	request_data.update(body)
+	return request_data
+
+
+def completion_to_response_line(custom_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
+	"""Wrap a GROQService completion result as a batch response line."""
+	body = {
+		"id": f"chatcmpl-{result.get('request_id', uuid.uuid4().hex)}",
+		"object": "chat.completion",
+		"model": result.get("model"),
+		"choices": [
+			{
+				"index": 0,
+				"message": {"role": "assistant", "content": result.get("content", "")},
+				"finish_reason": result.get("metadata", {}).get("finish_reason"),
+			}
+		],
+		"usage": result.get("usage", {}),
+	}
+	return {
+		"id": f"batch_req_{uuid.uuid4().hex}",
+		"custom_id": custom_id,
+		"response": {"status_code": 200, "request_id": result.get("request_id"), "body": body},
+		"error": None,
+	}
+
+
+def error_to_response_line(custom_id: str, error: BaseException) -> Dict[str, Any]:
+	return {"id": f"batch_req_{uuid.uuid4().hex}", "custom_id": custom_id, "response": None, "error": {"code": type(error).__name__, "message": str(error)}}
+
+
+async def process_batch_file(input_path: PathLike, output_path: PathLike, processor, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, int]:
+	"""
+	Local stand-in for the provider's batch API.
+
+	Reads the request file in chunks, submits each chunk to the micro-batching scheduler
+	(processor.add_request) and writes response lines in input order.
+	"""
+	counts = {"total": 0, "succeeded": 0, "failed": 0}
+
+	async def run(request: Dict[str, Any]) -> Dict[str, Any]:
+		custom_id = request.get("custom_id", "")
+		try:
+			result = await processor.add_request(batch_request_to_request_data(request))
+			return completion_to_response_line(custom_id, result)
+		except Exception as e:
+			return error_to_response_line(custom_id, e)
+
+	with open(output_path, "w", encoding="utf-8") as out:
+		requests = read_jsonl(input_path)
+		while True:
+			chunk = [request for _, request in zip(range(chunk_size), requests)]
+			if not chunk:
+				break
+			for line in await asyncio.gather(*(run(request) for request in chunk)):
+				counts["total"] += 1
+				counts["failed" if line["error"] else "succeeded"] += 1
+				out.write(json.dumps(line, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+	logger.info(f"Processed GROQ batch {input_path}: {counts['succeeded']}/{counts['total']} succeeded")
+	return counts
@@ -5,13 +5,16 @@ Provides GROQ-specific optimizations, intelligent routing, and performance tunin
 
 import asyncio
 import json
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, List, Optional, Tuple
 from enum import Enum
 
-from .groq_service import GROQService, GROQModel, GROQTaskType
+from .groq_service import GROQService, GROQModel, GROQRateLimiter, GROQTaskType
+from ..core.exceptions import RateLimitError
 from ..core.logging import get_logger
+from ..core.single_flight import request_fingerprint
 from .cache_service import get_cache_service
 
 logger = get_logger(__name__)
@@ -36,6 +39,7 @@ class GROQOptimizationConfig:
     enable_batching: bool = True
     batch_size: int = 5
     batch_timeout: float = 2.0
+    max_pending_requests: int = 100
     enable_adaptive_routing: bool = True
     performance_window: int = 100
     quality_threshold: float = 0.8
@@ -181,63 +185,183 @@ class GROQRequestOptimizer:
         return optimized_params
 
 
+@dataclass
+class _BatchEntry:
+    """A queued request and the future its callers await."""
+    request_data: Dict[str, Any]
+    future: asyncio.Future
+    fingerprint: str
+    estimated_tokens: int
+
+
 class GROQBatchProcessor:
-    """Handles batching of GROQ requests for efficiency."""
-    
+    """
+    Micro-batching scheduler for GROQ requests.
+
+    Requests are partitioned by model and generation parameters. A partition is flushed
+    when it reaches batch_size or after batch_timeout. Each flush admits requests only while
+    the model's GROQRateLimiter has token budget, waiting instead of failing when it is
+    exhausted. Identical queued or in-flight requests share one call, and
+    max_pending_requests bounds the queue (callers wait for capacity).
+
+    GROQ's chat endpoint takes one conversation per call, so an admitted micro-batch is sent as
+    concurrent calls over the service's pooled client; the provider's batch API is used through
+    the offline JSONL mode in groq_batch.
+    """
+
     def __init__(self, config: GROQOptimizationConfig, groq_service: GROQService):
         self.config = config
         self.groq_service = groq_service
-        self.pending_requests: List[Tuple[Dict, asyncio.Future]] = []
-        self.batch_timer: Optional[asyncio.Task] = None
-    
+        self.partitions: Dict[str, Deque[_BatchEntry]] = {}
+        self.partition_events: Dict[str, asyncio.Event] = {}
+        self.partition_tasks: Dict[str, asyncio.Task] = {}
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.capacity = asyncio.Semaphore(config.max_pending_requests)
+        self.stats = {"batches": 0, "dispatched": 0, "coalesced": 0, "rate_limit_waits": 0}
+
+    @property
+    def pending_requests(self) -> int:
+        """Requests queued and not yet dispatched."""
+        return sum(len(queue) for queue in self.partitions.values())
+
     async def add_request(self, request_data: Dict) -> Dict[str, Any]:
-        """Add request to batch processing queue."""
+        """Queue a request for micro-batched execution and wait for its result."""
         if not self.config.enable_batching:
             # Process immediately if batching is disabled
             return await self.groq_service.generate_completion(**request_data)
-        
-        future = asyncio.Future()
-        self.pending_requests.append((request_data, future))
-        
-        # Start batch timer if not already running
-        if self.batch_timer is None or self.batch_timer.done():
-            self.batch_timer = asyncio.create_task(self._batch_timer())
-        
-        # Process immediately if batch is full
-        if len(self.pending_requests) >= self.config.batch_size:
-            await self._process_batch()
-        
-        return await future
-    
-    async def _batch_timer(self):
-        """Timer for batch processing."""
-        await asyncio.sleep(self.config.batch_timeout)
-        if self.pending_requests:
-            await self._process_batch()
-    
-    async def _process_batch(self):
-        """Process the current batch of requests."""
-        if not self.pending_requests:
-            return
-        
-        batch = self.pending_requests.copy()
-        self.pending_requests.clear()
-        
-        # Process requests in parallel
-        tasks = []
-        for request_data, future in batch:
-            task = asyncio.create_task(self._process_single_request(request_data, future))
-            tasks.append(task)
-        
-        await asyncio.gather(*tasks, return_exceptions=True)
-    
-    async def _process_single_request(self, request_data: Dict, future: asyncio.Future):
-        """Process a single request from the batch."""
-        try:
-            result = await self.groq_service.generate_completion(**request_data)
-            future.set_result(result)
-        except Exception as e:
-            future.set_exception(e)
+
+        batch_key = self._batch_key(request_data)
+        fingerprint = request_fingerprint(batch_key, request_data.get("messages"))
+        existing = self.inflight.get(fingerprint)
+        if existing is None:
+            # Backpressure: wait for queue capacity, then re-check for a duplicate queued meanwhile
+            await self.capacity.acquire()
+            existing = self.inflight.get(fingerprint)
+            if existing is None:
+                try:
+                    future = self._enqueue(batch_key, fingerprint, request_data)
+                except Exception:
+                    self.capacity.release()
+                    raise
+                return await asyncio.shield(future)
+            self.capacity.release()
+
+        self.stats["coalesced"] += 1
+        return await asyncio.shield(existing)
+
+    def _enqueue(self, batch_key: str, fingerprint: str, request_data: Dict) -> asyncio.Future:
+        # Estimate before registering: if it raises, no orphaned future is left for duplicates to wait on
+        estimated_tokens = self.groq_service.estimate_request_tokens(request_data.get("messages", []))
+        future = asyncio.get_running_loop().create_future()
+        entry = _BatchEntry(request_data, future, fingerprint, estimated_tokens)
+        future.add_done_callback(lambda _: self._release(fingerprint))
+        self.inflight[fingerprint] = future
+
+        queue = self.partitions.setdefault(batch_key, deque())
+        queue.append(entry)
+        event = self.partition_events.setdefault(batch_key, asyncio.Event())
+        if len(queue) >= self.config.batch_size:
+            event.set()
+
+        task = self.partition_tasks.get(batch_key)
+        if task is None or task.done():
+            self.partition_tasks[batch_key] = asyncio.create_task(self._run_partition(batch_key))
+        return future
+
+    def _release(self, fingerprint: str):
+        self.inflight.pop(fingerprint, None)
+        self.capacity.release()
+
+    def _batch_key(self, request_data: Dict) -> str:
+        """Requests sharing a model and generation parameters are batched together."""
+        params = {key: value for key, value in request_data.items() if key != "messages"}
+        return json.dumps(params, sort_keys=True, default=lambda value: getattr(value, "value", str(value)))
+
+    async def _run_partition(self, batch_key: str):
+        """Flush a partition until it is empty."""
+        queue = self.partitions[batch_key]
+        event = self.partition_events[batch_key]
+        dispatches = []
+        throttled = False
+        while queue:
+            # Requests held back by the rate limiter have already waited for a full batch
+            if len(queue) < self.config.batch_size and not throttled:
+                event.clear()
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=self.config.batch_timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = await self._admit(queue)
+            throttled = not batch and bool(queue)
+            if throttled:
+                self.stats["rate_limit_waits"] += 1
+                await asyncio.sleep(self._rate_limit_wait(queue))
+            if not batch:
+                continue
+
+            self.stats["batches"] += 1
+            self.stats["dispatched"] += len(batch)
+            dispatches.append(asyncio.create_task(self._dispatch(batch)))
+
+        # No await between the empty check and the cleanup, so new requests start a fresh task
+        self.partitions.pop(batch_key, None)
+        self.partition_events.pop(batch_key, None)
+        self.partition_tasks.pop(batch_key, None)
+        if dispatches:
+            await asyncio.gather(*dispatches)
+
+    def _rate_limiter(self, entry: _BatchEntry) -> Optional[GROQRateLimiter]:
+        model = entry.request_data.get("model")
+        return self.groq_service.rate_limiters.get(getattr(model, "value", model)) if model else None
+
+    async def _admit(self, queue: Deque[_BatchEntry]) -> List[_BatchEntry]:
+        """Take up to batch_size requests from the front of the queue that fit the model's token budget."""
+        batch = []
+        while queue and len(batch) < self.config.batch_size:
+            entry = queue[0]
+            limiter = self._rate_limiter(entry)
+            if limiter is not None and await limiter.reserve(entry.estimated_tokens) > 0:
+                if not batch and entry.estimated_tokens > limiter.tokens_per_minute:
+                    queue.popleft()
+                    entry.future.set_exception(
+                        RateLimitError("GROQ request exceeds the model's per-minute token budget", details={"estimated_tokens": entry.estimated_tokens})
+                    )
+                    continue
+                break
+            batch.append(queue.popleft())
+        return batch
+
+    def _rate_limit_wait(self, queue: Deque[_BatchEntry]) -> float:
+        limiter = self._rate_limiter(queue[0]) if queue else None
+        wait = limiter.get_wait_time(queue[0].estimated_tokens) if limiter is not None else 0.0
+        return min(max(wait, 0.05), self.config.batch_timeout)
+
+    async def _dispatch(self, batch: List[_BatchEntry]):
+        """Run an admitted micro-batch; its token budget is already reserved."""
+        results = await asyncio.gather(
+            *(
+                self.groq_service.generate_completion(**entry.request_data, rate_limit=self._rate_limiter(entry) is None)
+                for entry in batch
+            ),
+            return_exceptions=True,
+        )
+        for entry, result in zip(batch, results):
+            if entry.future.done():
+                continue
+            if isinstance(result, BaseException):
+                entry.future.set_exception(result)
+            else:
+                entry.future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Scheduler counters and queue state."""
+        return {
+            **self.stats,
+            "avg_batch_size": self.stats["dispatched"] / self.stats["batches"] if self.stats["batches"] else 0.0,
+            "pending": self.pending_requests,
+            "partitions": len(self.partitions),
+        }
 
 
 class GROQAdaptiveRouter:
@@ -484,6 +608,7 @@ class GROQOptimizer:
                     self.metrics.cache_hits / max(self.metrics.cache_hits + self.metrics.cache_misses, 1)
                 ),
                 "batched_requests": self.metrics.batched_requests,
+                "batch_scheduler": self.batch_processor.get_stats(),
                 "model_switches": self.metrics.model_switches,
                 "cost_savings": round(self.metrics.cost_savings, 6),
                 "optimization_savings": round(self.metrics.optimization_savings, 6)
@@ -4,6 +4,8 @@ Provides comprehensive GROQ API integration with OpenAI compatibility,
 optimizations, model selection, performance monitoring, and cost tracking.
 """
 
+import asyncio
+import math
 import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -16,6 +18,8 @@ import httpx
 from ..core.config import get_settings
 from ..core.exceptions import ExternalServiceError, ValidationError, NetworkError, RateLimitError, AuthenticationError
 from ..core.logging import get_logger
+from ..core.single_flight import SingleFlight, request_fingerprint
+from ..core.tokenizer import get_token_counter
 from .cache_service import get_cache_service
 from ..monitoring.metrics_collector import get_metrics_collector
 from ..utils.error_handler import get_error_handler, ErrorCategory, ErrorSeverity
@@ -135,60 +139,208 @@ class GROQMetrics:
 	task_performance: Dict[str, float] = field(default_factory=dict)
 
 
+# Atomic dual token bucket shared by all workers; uses the Redis clock so workers need not agree on time.
+# Returns "0" after taking the budget, otherwise the seconds until it would be available (nothing taken).
+_TOKEN_BUCKET_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local request_capacity, request_rate = tonumber(ARGV[1]), tonumber(ARGV[2])
+local token_capacity, token_rate = tonumber(ARGV[3]), tonumber(ARGV[4])
+local tokens = tonumber(ARGV[5])
+local state = redis.call('HMGET', KEYS[1], 'requests', 'tokens', 'updated_at')
+local requests = tonumber(state[1]) or request_capacity
+local available = tonumber(state[2]) or token_capacity
+local elapsed = math.max(0, now - (tonumber(state[3]) or now))
+requests = math.min(request_capacity, requests + elapsed * request_rate)
+available = math.min(token_capacity, available + elapsed * token_rate)
+local wait = 0
+if requests < 1 then wait = (1 - requests) / request_rate end
+if available < tokens then wait = math.max(wait, (tokens - available) / token_rate) end
+if wait == 0 then
+	requests = requests - 1
+	available = available - tokens
+end
+redis.call('HSET', KEYS[1], 'requests', tostring(requests), 'tokens', tostring(available), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], 120)
+return tostring(wait)
+"""
+
+
 class GROQRateLimiter:
-	"""Advanced rate limiter for GROQ API."""
+	"""
+	Dual token bucket (requests and tokens) for one GROQ model.
+
+	Each bucket holds up to its per-minute limit (plus a small burst allowance for requests)
+	and refills continuously at limit/60 per second, so a check is O(1): refill from the
+	elapsed time, then compare. acquire() sleeps exactly until both buckets cover the request.
+	"""
 
-	def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+	def __init__(self, requests_per_minute: int, tokens_per_minute: int, model: str = "", burst_allowance: int = 5):
 		self.requests_per_minute = requests_per_minute
 		self.tokens_per_minute = tokens_per_minute
-		self.request_times: List[datetime] = []
-		self.token_usage: List[tuple] = []  # (timestamp, tokens)
-		self.burst_allowance = 5  # Allow small bursts
-		self.last_reset = datetime.now()
-
-	async def acquire(self, estimated_tokens: int = 0) -> bool:
-		"""Acquire rate limit permission with burst handling."""
-		now = datetime.now()
-
-		# Reset counters every minute
-		if now - self.last_reset >= timedelta(minutes=1):
-			self.request_times.clear()
-			self.token_usage.clear()
-			self.last_reset = now
-
-		# Clean old entries (sliding window)
-		cutoff = now - timedelta(minutes=1)
-		self.request_times = [t for t in self.request_times if t > cutoff]
-		self.token_usage = [(t, tokens) for t, tokens in self.token_usage if t > cutoff]
-
-		# Check request rate limit with burst allowance
-		if len(self.request_times) >= self.requests_per_minute + self.burst_allowance:
-			return False
+		self.model = model
+		self.burst_allowance = burst_allowance  # Allow small bursts
+		self.request_capacity = float(requests_per_minute + burst_allowance)
+		self.token_capacity = float(tokens_per_minute)
+		self.request_rate = requests_per_minute / 60.0
+		self.token_rate = tokens_per_minute / 60.0
+		self.available_requests = self.request_capacity
+		self.available_tokens = self.token_capacity
+		self.updated_at = time.monotonic()
+		self.stats = {"acquired": 0, "rejected": 0, "waits": 0, "total_wait_time": 0.0, "max_wait_time": 0.0}
+
+	def _refill(self):
+		now = time.monotonic()
+		elapsed = now - self.updated_at
+		if elapsed > 0:
+			self.available_requests = min(self.request_capacity, self.available_requests + elapsed * self.request_rate)
+			self.available_tokens = min(self.token_capacity, self.available_tokens + elapsed * self.token_rate)
+			self.updated_at = now
+
+	def _deficit(self, tokens: int) -> float:
+		"""Seconds until the buckets cover one request of `tokens`; inf when they never can."""
+		if tokens > self.token_capacity or self.request_rate <= 0:
+			return math.inf
+		wait = 0.0
+		if self.available_requests < 1:
+			wait = (1 - self.available_requests) / self.request_rate
+		if self.available_tokens < tokens:
+			wait = max(wait, (tokens - self.available_tokens) / self.token_rate)
+		return wait
+
+	async def reserve(self, estimated_tokens: int = 0) -> float:
+		"""Take the budget and return 0.0 if it is available, otherwise return how long until it is."""
+		self._refill()
+		wait = self._deficit(estimated_tokens)
+		if wait == 0:
+			self.available_requests -= 1
+			self.available_tokens -= estimated_tokens
+		return wait
+
+	async def acquire(self, estimated_tokens: int = 0, max_wait: Optional[float] = None) -> bool:
+		"""
+		Take one request and `estimated_tokens` tokens, sleeping until the buckets cover them.
+
+		Returns False without sleeping when the request can never fit or the wait would exceed
+		max_wait; max_wait=0 makes this a non-blocking check.
+		"""
+		started = time.monotonic()
+		slept = False
+		while True:
+			wait = await self.reserve(estimated_tokens)
+			waited = time.monotonic() - started
+			if wait == 0:
+				self.stats["acquired"] += 1
+				if slept:
+					self._record_wait(waited)
+				return True
+			if math.isinf(wait) or (max_wait is not None and waited + wait > max_wait):
+				self.stats["rejected"] += 1
+				metrics_collector.record_ai_rate_limit("groq", self.model, "per_minute")
+				return False
+			# Concurrent waiters may take the refill first, so re-check after sleeping
+			await asyncio.sleep(wait)
+			slept = True
+
+	def _record_wait(self, waited: float):
+		self.stats["waits"] += 1
+		self.stats["total_wait_time"] += waited
+		self.stats["max_wait_time"] = max(self.stats["max_wait_time"], waited)
+		metrics_collector.record_ai_rate_limit_wait("groq", self.model, waited)
+
+	def get_wait_time(self, estimated_tokens: int = 0) -> float:
+		"""Seconds until a request of `estimated_tokens` tokens can be admitted."""
+		self._refill()
+		wait = self._deficit(estimated_tokens)
+		return wait if math.isfinite(wait) else 60.0
+
+	def get_stats(self) -> Dict[str, Any]:
+		self._refill()
+		return {
+			**self._counter_stats(),
+			"available_requests": round(self.available_requests, 2),
+			"available_tokens": round(self.available_tokens, 1),
+			"shared": False,
+		}
 
-		# Check token rate limit
-		current_tokens = sum(tokens for _, tokens in self.token_usage)
-		if current_tokens + estimated_tokens > self.tokens_per_minute:
-			return False
+	def _counter_stats(self) -> Dict[str, Any]:
+		return {**self.stats, "avg_wait_time": self.stats["total_wait_time"] / self.stats["waits"] if self.stats["waits"] else 0.0}
 
-		# Record this request
-		self.request_times.append(now)
-		if estimated_tokens > 0:
-			self.token_usage.append((now, estimated_tokens))
 
-		return True
+class RedisGROQRateLimiter(GROQRateLimiter):
+	"""
+	Token bucket kept in Redis so every worker draws from the same per-minute quota.
 
-	def get_wait_time(self) -> float:
-		"""Get recommended wait time before next request."""
-		if not self.request_times:
-			return 0.0
+	Falls back to the in-process bucket while Redis is unavailable.
+	"""
 
-		oldest_request = min(self.request_times)
-		time_since_oldest = (datetime.now() - oldest_request).total_seconds()
+	def __init__(self, requests_per_minute: int, tokens_per_minute: int, model: str = "", burst_allowance: int = 5, client_factory=None):
+		super().__init__(requests_per_minute, tokens_per_minute, model, burst_allowance)
+		self.client_factory = client_factory
+		self.key = f"groq:rate_limit:{model}"
+		self.last_wait = 0.0
+		self.stats["local_fallbacks"] = 0
 
-		if len(self.request_times) >= self.requests_per_minute:
-			return max(0, 60 - time_since_oldest)
+	async def reserve(self, estimated_tokens: int = 0) -> float:
+		if estimated_tokens > self.token_capacity:
+			return math.inf
+		client = None
+		if self.client_factory is not None:
+			try:
+				client = await self.client_factory()
+			except Exception as e:
+				logger.debug(f"Shared GROQ rate limit unavailable: {e}")
+		if client is None:
+			self.stats["local_fallbacks"] += 1
+			self.last_wait = await super().reserve(estimated_tokens)
+			return self.last_wait
 
-		return 0.0
+		try:
+			wait = await client.eval(
+				_TOKEN_BUCKET_SCRIPT,
+				1,
+				self.key,
+				self.request_capacity,
+				self.request_rate,
+				self.token_capacity,
+				self.token_rate,
+				estimated_tokens,
+			)
+		except Exception as e:
+			logger.warning(f"Shared GROQ rate limit check failed for {self.model}, using local bucket: {e}")
+			self.stats["local_fallbacks"] += 1
+			self.last_wait = await super().reserve(estimated_tokens)
+			return self.last_wait
+		self.last_wait = float(wait)
+		return self.last_wait
+
+	def get_wait_time(self, estimated_tokens: int = 0) -> float:
+		# The shared bucket is only read inside the script; report what the last check returned
+		return self.last_wait if math.isfinite(self.last_wait) else 60.0
+
+	def get_stats(self) -> Dict[str, Any]:
+		# The in-process buckets only serve fallbacks; the shared levels come from get_shared_state()
+		return {**self._counter_stats(), "shared": True, "last_wait": round(self.last_wait, 3)}
+
+	async def get_shared_state(self) -> Optional[Dict[str, Any]]:
+		"""Current levels of the shared buckets in Redis, refilled to now; None while Redis is unavailable."""
+		try:
+			client = await self.client_factory() if self.client_factory is not None else None
+			if client is None:
+				return None
+			requests, tokens, updated_at = await client.hmget(self.key, "requests", "tokens", "updated_at")
+			seconds, microseconds = await client.time()
+		except Exception as e:
+			logger.debug(f"Shared GROQ rate limit state unavailable: {e}")
+			return None
+		if updated_at is None:
+			# No request in the last two minutes: the key expired with both buckets full
+			return {"available_requests": self.request_capacity, "available_tokens": self.token_capacity}
+		elapsed = max(0.0, seconds + microseconds / 1_000_000 - float(updated_at))
+		return {
+			"available_requests": round(min(self.request_capacity, float(requests) + elapsed * self.request_rate), 2),
+			"available_tokens": round(min(self.token_capacity, float(tokens) + elapsed * self.token_rate), 1),
+		}
 
 
 class GROQCircuitBreaker:
@@ -237,15 +389,14 @@ class GROQService:
 		self.client = httpx.AsyncClient(timeout=60.0)
 		self.metrics = GROQMetrics()
 		self.circuit_breaker = GROQCircuitBreaker()
+		self.single_flight = SingleFlight(cache_service._get_async_client, namespace="groq")
 
 		# Initialize model configurations
 		self.model_configs = self._initialize_model_configs()
 
-		# Initialize rate limiters per model
-		self.rate_limiters = {
-			model.value: GROQRateLimiter(config.requests_per_minute_limit, config.tokens_per_minute_limit)
-			for model, config in self.model_configs.items()
-		}
+		# Initialize rate limiters per model; the shared variant keeps one quota across workers
+		self.max_rate_limit_wait = 10.0
+		self.rate_limiters = {model.value: self._create_rate_limiter(model, config) for model, config in self.model_configs.items()}
 
 		# Performance tracking
 		self.performance_history: Dict[str, List[float]] = {}
@@ -253,6 +404,13 @@ class GROQService:
 
 		logger.info("GROQ service initialized successfully")
 
+	def _create_rate_limiter(self, model: GROQModel, config: GROQModelConfig) -> GROQRateLimiter:
+		if getattr(settings, "groq_shared_rate_limits", False):
+			return RedisGROQRateLimiter(
+				config.requests_per_minute_limit, config.tokens_per_minute_limit, model.value, client_factory=cache_service._get_async_client
+			)
+		return GROQRateLimiter(config.requests_per_minute_limit, config.tokens_per_minute_limit, model.value)
+
 	def _get_api_key(self) -> str:
 		"""Get GROQ API key from settings."""
 		if hasattr(settings, "groq_api_key") and settings.groq_api_key:
@@ -428,11 +586,15 @@ class GROQService:
 		priority: str = "balanced",
 		temperature: float = 0.1,
 		max_tokens: Optional[int] = None,
+		rate_limit: bool = True,
 		**kwargs,
 	) -> Dict[str, Any]:
-		"""Generate completion using GROQ API with optimizations."""
-		error_handler = get_error_handler()
+		"""
+		Generate completion using GROQ API with optimizations.
 
+		rate_limit=False skips the per-request rate limiter, for callers (the batch scheduler)
+		that already reserved the model's token budget for this request.
+		"""
 		# Validate inputs
 		if not messages:
 			raise ValidationError(
@@ -473,19 +635,46 @@ class GROQService:
 				f"GROQ model {model.value} is currently disabled", service_name="groq", details={"model": model.value, "reason": "model_disabled"}
 			)
 
+		# Identical concurrent requests share one provider call (in-process and across workers).
+		# rate_limit is part of the key: a call whose budget was reserved by the scheduler never
+		# leads for, or follows, one that must still be charged to the limiter
+		flight_key = request_fingerprint(model.value, messages, temperature, max_tokens, task_type.value, priority, rate_limit, kwargs)
+		return await self.single_flight.do(
+			flight_key,
+			lambda: self._execute_completion(messages, model, task_type, priority, temperature, max_tokens, rate_limit, **kwargs),
+			encode=dict,
+			decode=dict,
+		)
+
+	async def _execute_completion(
+		self,
+		messages: List[Dict[str, str]],
+		model: GROQModel,
+		task_type: GROQTaskType,
+		priority: str,
+		temperature: float,
+		max_tokens: Optional[int],
+		rate_limit: bool = True,
+		**kwargs,
+	) -> Dict[str, Any]:
+		"""Rate-limit, call the GROQ API and build the standardized response for one completion."""
+		error_handler = get_error_handler()
+		model_config = self.model_configs[model]
+
 		# Check rate limits
-		estimated_tokens = sum(len(msg.get("content", "").split()) for msg in messages) * 1.5
+		estimated_tokens = self.estimate_request_tokens(messages)
 		rate_limiter = self.rate_limiters[model.value]
 
-		if not await rate_limiter.acquire(int(estimated_tokens)):
-			wait_time = rate_limiter.get_wait_time()
+		# Waits for budget up to max_rate_limit_wait before giving up
+		if rate_limit and not await rate_limiter.acquire(estimated_tokens, max_wait=self.max_rate_limit_wait):
+			wait_time = rate_limiter.get_wait_time(estimated_tokens)
 			self.metrics.rate_limit_hits += 1
 
 			raise RateLimitError(
 				f"GROQ API rate limit exceeded for model {model.value}",
 				limit=model_config.requests_per_minute_limit,
 				window="1 minute",
-				details={"model": model.value, "estimated_tokens": int(estimated_tokens), "wait_time": wait_time},
+				details={"model": model.value, "estimated_tokens": estimated_tokens, "wait_time": wait_time},
 			)
 
 		# Prepare request
@@ -665,6 +854,10 @@ class GROQService:
 				cause=e,
 			)
 
+	def estimate_request_tokens(self, messages: List[Dict[str, str]]) -> int:
+		"""Prompt tokens charged against a model's rate limit."""
+		return sum(get_token_counter("groq").count_tokens([msg.get("content", "") for msg in messages]))
+
 	async def _make_api_request(self, request_data: GROQRequest, request_id: str) -> GROQResponse:
 		"""Make API request to GROQ."""
 		headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json", "X-Request-ID": request_id}
@@ -805,7 +998,7 @@ class GROQService:
 					health_status["models"][model_name] = {
 						"available": model_name in model_ids,
 						"enabled": self.model_configs[groq_model].enabled,
-						"rate_limiter_status": "ok",
+						"rate_limiter_status": "throttled" if self.rate_limiters[model_name].get_wait_time() > 0 else "ok",
 					}
 			else:
 				health_status["status"] = "unhealthy"
@@ -831,6 +1024,8 @@ class GROQService:
 			"avg_tokens_per_request": round(self.metrics.avg_tokens_per_request, 1),
 			"avg_cost_per_request": round(self.metrics.avg_cost_per_request, 6),
 			"rate_limit_hits": self.metrics.rate_limit_hits,
+			"rate_limiters": {model: limiter.get_stats() for model, limiter in self.rate_limiters.items()},
+			"single_flight": self.single_flight.get_stats(),
 			"model_usage": self.metrics.model_usage,
 			"task_performance": {k: round(v, 3) for k, v in self.metrics.task_performance.items()},
 			"last_request_time": self.metrics.last_request_time.isoformat() if self.metrics.last_request_time else None,
@@ -13,13 +13,17 @@ Consolidates intelligent caching, cache invalidation, and cache monitoring:
 import asyncio
 import fnmatch
 import pickle
+import sys
 import time
 import zlib
+from bisect import bisect_left
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
+from ..core.cache_invalidation import user_tag
 from ..core.config import get_settings
 from ..core.logging import get_logger
 from .cache_service import get_cache_service
@@ -179,20 +183,170 @@ class OptimizationRecommendation:
 	estimated_improvement: Dict[str, float]
 
 
+class SortedKeyIndex:
+	"""
+	Key set with a lazily sorted view for glob-pattern invalidation.
+
+	Patterns with a literal prefix (e.g. "recommendations:42:*") only visit keys
+	under that prefix instead of fnmatching every key. add and discard are O(1)
+	set operations on the cache's put/evict path; the sorted list is rebuilt only
+	when a match runs after new keys were added. Discarded keys stay in the list
+	until then and are filtered out against the set.
+	"""
+
+	def __init__(self):
+		self._keys: Set[str] = set()
+		self._sorted: List[str] = []
+		self._dirty = False
+
+	def __len__(self) -> int:
+		return len(self._keys)
+
+	def add(self, key: str):
+		if key not in self._keys:
+			self._keys.add(key)
+			self._dirty = True
+
+	def discard(self, key: str):
+		self._keys.discard(key)
+
+	def clear(self):
+		self._keys.clear()
+		self._sorted = []
+		self._dirty = False
+
+	def _sorted_keys(self) -> List[str]:
+		# Also compacts once discarded keys outnumber live ones
+		if self._dirty or len(self._sorted) > 2 * len(self._keys):
+			self._sorted = sorted(self._keys)
+			self._dirty = False
+		return self._sorted
+
+	def match(self, pattern: str) -> List[str]:
+		"""Keys matching a glob pattern"""
+		prefix_end = len(pattern)
+		for i, char in enumerate(pattern):
+			if char in "*?[":
+				prefix_end = i
+				break
+		prefix = pattern[:prefix_end]
+
+		keys = self._sorted_keys()
+		if prefix:
+			lo = bisect_left(keys, prefix)
+			hi = bisect_left(keys, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+			candidates = keys[lo:hi]
+		else:
+			candidates = keys
+		return [key for key in candidates if key in self._keys and fnmatch.fnmatch(key, pattern)]
+
+
+class L1MemoryCache:
+	"""
+	Bounded in-memory LRU for L1 entries.
+
+	Backed by an OrderedDict so get, put and evict are O(1). Enforces both an
+	entry count and a memory budget, accounted from each entry's size_bytes.
+	"""
+
+	def __init__(self, max_entries: int, max_memory: int):
+		self.max_entries = max_entries
+		self.max_memory = max_memory
+		self.memory_bytes = 0
+		self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+		self._index = SortedKeyIndex()
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	def __contains__(self, key: str) -> bool:
+		return key in self._entries
+
+	def __iter__(self) -> Iterator[str]:
+		return iter(self._entries)
+
+	def keys(self):
+		return self._entries.keys()
+
+	def values(self):
+		return self._entries.values()
+
+	def items(self):
+		return self._entries.items()
+
+	def get(self, key: str) -> Optional[CacheEntry]:
+		"""Get an entry and mark it most recently used"""
+		entry = self._entries.get(key)
+		if entry is not None:
+			self._entries.move_to_end(key)
+		return entry
+
+	def peek(self, key: str) -> Optional[CacheEntry]:
+		"""Get an entry without changing its recency"""
+		return self._entries.get(key)
+
+	def put(self, key: str, entry: CacheEntry) -> List[CacheEntry]:
+		"""
+		Insert or replace an entry as most recently used.
+
+		Returns the entries evicted to stay within the count and memory budgets.
+		An entry larger than the whole memory budget is not stored and is returned itself.
+		"""
+		self.pop(key)
+		if entry.size_bytes > self.max_memory:
+			return [entry]
+
+		evicted = []
+		while self._entries and (len(self._entries) >= self.max_entries or self.memory_bytes + entry.size_bytes > self.max_memory):
+			evicted.append(self.pop_lru())
+
+		self._entries[key] = entry
+		self._index.add(key)
+		self.memory_bytes += entry.size_bytes
+		return evicted
+
+	def pop(self, key: str) -> Optional[CacheEntry]:
+		"""Remove and return an entry"""
+		entry = self._entries.pop(key, None)
+		if entry is not None:
+			self._index.discard(key)
+			self.memory_bytes -= entry.size_bytes
+		return entry
+
+	def pop_lru(self) -> Optional[CacheEntry]:
+		"""Remove and return the least recently used entry"""
+		if not self._entries:
+			return None
+		key, entry = self._entries.popitem(last=False)
+		self._index.discard(key)
+		self.memory_bytes -= entry.size_bytes
+		return entry
+
+	def match(self, pattern: str) -> List[str]:
+		"""Keys matching a glob pattern, via the prefix index"""
+		return self._index.match(pattern)
+
+	def clear(self):
+		self._entries.clear()
+		self._index.clear()
+		self.memory_bytes = 0
+
+
 class IntelligentCacheService:
 	"""Advanced caching service with intelligent strategies, invalidation, and monitoring."""
 
 	def __init__(self):
 		self.cache_service = get_cache_service()
 
-		# Multi-level cache
-		self.l1_cache = {}  # Memory cache
-		self.l2_cache = None  # Redis cache (from cache_service)
-		self.l3_cache = {}  # Database cache simulation
-
 		# Cache configuration
 		self.l1_max_size = 1000
 		self.l1_max_memory = 100 * 1024 * 1024  # 100MB
+
+		# Multi-level cache
+		self.l1_cache = L1MemoryCache(self.l1_max_size, self.l1_max_memory)  # Memory cache
+		self.l2_cache = None  # Redis cache (from cache_service)
+		self.l3_cache = {}  # Database cache simulation
+		self.l3_index = SortedKeyIndex()  # Pattern index over L3 keys
 		self.compression_threshold = 1024  # Compress entries > 1KB
 		self.adaptive_ttl_enabled = True
 
@@ -275,8 +429,8 @@ class IntelligentCacheService:
 			self._update_access_pattern(key)
 
 			# L1 Cache (Memory) - fastest
-			if key in self.l1_cache:
-				entry = self.l1_cache[key]
+			entry = self.l1_cache.get(key)
+			if entry is not None:
 				if not self._is_expired(entry):
 					entry.last_accessed = datetime.now(timezone.utc)
 					entry.access_count += 1
@@ -286,7 +440,7 @@ class IntelligentCacheService:
 					return self._decompress_value(entry.value, entry.compressed)
 				else:
 					# Remove expired entry
-					del self.l1_cache[key]
+					self.l1_cache.pop(key)
 
 			# L2 Cache (Redis) - medium speed
 			l2_value = await self.l2_cache.aget(key)
@@ -333,7 +487,7 @@ class IntelligentCacheService:
 			effective_ttl = ttl or self._calculate_adaptive_ttl(key)
 
 			# Compress large values
-			compressed_value, is_compressed = self._compress_value(value)
+			compressed_value, is_compressed, size_bytes = self._encode_value(value)
 
 			# Create cache entry
 			entry = CacheEntry(
@@ -343,7 +497,7 @@ class IntelligentCacheService:
 				last_accessed=datetime.now(timezone.utc),
 				access_count=1,
 				ttl=effective_ttl,
-				size_bytes=len(str(compressed_value)),
+				size_bytes=size_bytes,
 				compressed=is_compressed,
 			)
 
@@ -376,8 +530,7 @@ class IntelligentCacheService:
 			success = True
 
 			# Remove from L1
-			if key in self.l1_cache:
-				del self.l1_cache[key]
+			self.l1_cache.pop(key)
 
 			# Remove from L2
 			success &= await self.l2_cache.adelete(key)
@@ -407,16 +560,11 @@ class IntelligentCacheService:
 			invalidated_count = 0
 
 			# Invalidate L1 entries
-			keys_to_delete = []
-			for key in self.l1_cache.keys():
-				if self._matches_pattern(key, pattern):
-					keys_to_delete.append(key)
-
-			for key in keys_to_delete:
-				del self.l1_cache[key]
+			for key in self.l1_cache.match(pattern):
+				self.l1_cache.pop(key)
 				invalidated_count += 1
 
-			# Invalidate L2 entries
+			# Invalidate L2 entries (SCAN-based, does not block Redis)
 			l2_count = await self.l2_cache.adelete_pattern(pattern)
 			invalidated_count += l2_count
 
@@ -799,6 +947,9 @@ class IntelligentCacheService:
 			f"session:*{user_id}*",
 			f"user_settings:{user_id}",
 			f"user_sessions:{user_id}",
+		]
+		# Tagged on write in L2, so only L1/L3 need the pattern walk
+		user_scoped_patterns = [
 			f"recommendations:{user_id}:*",
 			f"analytics:{user_id}:*",
 		]
@@ -808,6 +959,13 @@ class IntelligentCacheService:
 			count = await self.invalidate_pattern(pattern)
 			total_invalidated += count
 
+		for pattern in user_scoped_patterns:
+			for key in self.l1_cache.match(pattern):
+				self.l1_cache.pop(key)
+				total_invalidated += 1
+			total_invalidated += await self._invalidate_l3_pattern(pattern)
+		total_invalidated += await self.l2_cache.ainvalidate_tags([user_tag(user_id)])
+
 		logger.info(f"Invalidated {total_invalidated} cache entries for user {user_id}")
 		return total_invalidated
 
@@ -1104,15 +1262,21 @@ class IntelligentCacheService:
 
 	def _compress_value(self, value: Any) -> Tuple[Any, bool]:
 		"""Compress value if it exceeds threshold."""
+		compressed_value, is_compressed, _ = self._encode_value(value)
+		return compressed_value, is_compressed
+
+	def _encode_value(self, value: Any) -> Tuple[Any, bool, int]:
+		"""Compress value if it exceeds threshold, returning its serialized size in bytes."""
 		try:
 			serialized = pickle.dumps(value)
-			if len(serialized) > self.compression_threshold:
-				compressed = zlib.compress(serialized)
-				if len(compressed) < len(serialized):
-					return compressed, True
-			return value, False
 		except Exception:
-			return value, False
+			return value, False, sys.getsizeof(value)
+
+		if len(serialized) > self.compression_threshold:
+			compressed = zlib.compress(serialized)
+			if len(compressed) < len(serialized):
+				return compressed, True, len(compressed)
+		return value, False, len(serialized)
 
 	def _decompress_value(self, value: Any, is_compressed: bool) -> Any:
 		"""Decompress value if needed."""
@@ -1132,12 +1296,8 @@ class IntelligentCacheService:
 	async def _promote_to_l1(self, key: str, value: Any):
 		"""Promote key to L1 cache."""
 		try:
-			# Check L1 capacity
-			if len(self.l1_cache) >= self.l1_max_size:
-				await self._evict_l1_entry()
-
 			# Create L1 entry
-			compressed_value, is_compressed = self._compress_value(value)
+			compressed_value, is_compressed, size_bytes = self._encode_value(value)
 			entry = CacheEntry(
 				key=key,
 				value=compressed_value,
@@ -1145,29 +1305,30 @@ class IntelligentCacheService:
 				last_accessed=datetime.now(timezone.utc),
 				access_count=1,
 				ttl=self._calculate_adaptive_ttl(key),
-				size_bytes=len(str(compressed_value)),
+				size_bytes=size_bytes,
 				compressed=is_compressed,
 			)
 
-			self.l1_cache[key] = entry
+			await self._store_in_l1(key, entry)
 
 		except Exception as e:
 			logger.error(f"Failed to promote key {key} to L1: {e}")
 
 	async def _evict_l1_entry(self):
 		"""Evict least recently used entry from L1."""
-		if not self.l1_cache:
-			return
+		entry = self.l1_cache.pop_lru()
+		if entry is not None:
+			await self._demote_evicted(entry)
 
-		# Find LRU entry
-		lru_key = min(self.l1_cache.keys(), key=lambda k: self.l1_cache[k].last_accessed)
+	async def _store_in_l1(self, key: str, entry: CacheEntry):
+		"""Insert into L1, demoting whatever the LRU evicts to stay within budget."""
+		for evicted in self.l1_cache.put(key, entry):
+			await self._demote_evicted(evicted)
 
-		# Move to L2 if it's still valuable
-		entry = self.l1_cache[lru_key]
+	async def _demote_evicted(self, entry: CacheEntry):
+		"""Move an evicted entry to L2 if it's still valuable."""
 		if entry.access_count > 1:
-			await self.l2_cache.aset(lru_key, self._decompress_value(entry.value, entry.compressed), entry.ttl)
-
-		del self.l1_cache[lru_key]
+			await self.l2_cache.aset(entry.key, self._decompress_value(entry.value, entry.compressed), entry.ttl)
 		self.stats.evictions += 1
 
 	async def _write_through(self, key: str, entry: CacheEntry, ttl: int) -> bool:
@@ -1175,9 +1336,7 @@ class IntelligentCacheService:
 		success = True
 
 		# Write to L1
-		if len(self.l1_cache) >= self.l1_max_size:
-			await self._evict_l1_entry()
-		self.l1_cache[key] = entry
+		await self._store_in_l1(key, entry)
 
 		# Write to L2
 		value = self._decompress_value(entry.value, entry.compressed)
@@ -1191,9 +1350,7 @@ class IntelligentCacheService:
 	async def _write_back(self, key: str, entry: CacheEntry, ttl: int) -> bool:
 		"""Write-back caching strategy."""
 		# Write to L1 immediately
-		if len(self.l1_cache) >= self.l1_max_size:
-			await self._evict_l1_entry()
-		self.l1_cache[key] = entry
+		await self._store_in_l1(key, entry)
 
 		# Mark for later write to L2/L3
 		entry.metadata = entry.metadata or {}
@@ -1221,6 +1378,7 @@ class IntelligentCacheService:
 		"""Set value in L3 cache (database simulation)."""
 		try:
 			self.l3_cache[key] = {"value": value, "expires_at": time.time() + ttl}
+			self.l3_index.add(key)
 			return True
 		except Exception:
 			return False
@@ -1230,6 +1388,7 @@ class IntelligentCacheService:
 		try:
 			if key in self.l3_cache:
 				del self.l3_cache[key]
+				self.l3_index.discard(key)
 			return True
 		except Exception:
 			return False
@@ -1237,14 +1396,10 @@ class IntelligentCacheService:
 	async def _invalidate_l3_pattern(self, pattern: str) -> int:
 		"""Invalidate L3 entries matching pattern."""
 		count = 0
-		keys_to_delete = []
-
-		for key in self.l3_cache.keys():
-			if self._matches_pattern(key, pattern):
-				keys_to_delete.append(key)
 
-		for key in keys_to_delete:
-			del self.l3_cache[key]
+		for key in self.l3_index.match(pattern):
+			self.l3_cache.pop(key, None)
+			self.l3_index.discard(key)
 			count += 1
 
 		return count
@@ -1275,9 +1430,8 @@ class IntelligentCacheService:
 
 		memory_freed = 0
 		for key in expired_keys:
-			entry = self.l1_cache[key]
+			entry = self.l1_cache.pop(key)
 			memory_freed += entry.size_bytes
-			del self.l1_cache[key]
 			results["l1_optimizations"] += 1
 
 		results["memory_freed"] = memory_freed
@@ -1299,11 +1453,10 @@ class IntelligentCacheService:
 		# Demote cold keys from L1
 		for key in list(self.cold_keys):
 			if key in self.l1_cache:
-				entry = self.l1_cache[key]
+				entry = self.l1_cache.pop(key)
 				# Move to L2
 				value = self._decompress_value(entry.value, entry.compressed)
 				await self.l2_cache.aset(key, value, entry.ttl)
-				del self.l1_cache[key]
 				results["cold_keys_demoted"] += 1
 
 		return results
@@ -1313,9 +1466,8 @@ class IntelligentCacheService:
 		if self.stats.total_requests > 0:
 			self.stats.hit_rate = (self.stats.hits / self.stats.total_requests) * 100
 
-		# Calculate memory usage
-		memory_usage = sum(entry.size_bytes for entry in self.l1_cache.values())
-		self.stats.memory_usage = memory_usage
+		# Memory usage is tracked incrementally by the L1 cache
+		self.stats.memory_usage = self.l1_cache.memory_bytes
 
 		# Calculate compression ratio
 		if self.l1_cache:
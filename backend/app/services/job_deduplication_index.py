@@ -0,0 +1,343 @@
+"""
+Indexed Job Deduplication Engine
+
+Near-linear alternative to the pairwise comparison loop in
+JobDeduplicationService.filter_duplicate_jobs:
+- Every record is normalized exactly once
+- URL and fingerprint matches are plain set lookups
+- Fuzzy candidates come from blocking on the normalized company token
+  combined with MinHash-LSH buckets over title character shingles
+- Candidate pairs are verified with the same thresholds as are_jobs_duplicate
+"""
+
+import random
+import zlib
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.logging import get_logger
+
+if TYPE_CHECKING:
+	from app.services.job_deduplication_service import JobDeduplicationService
+
+logger = get_logger(__name__)
+
+# Fuzzy thresholds shared with JobDeduplicationService.are_jobs_duplicate
+COMPANY_SIMILARITY_THRESHOLD = 0.8
+TITLE_SIMILARITY_THRESHOLD = 0.85
+LOCATION_MISMATCH_THRESHOLD = 0.5
+
+# Mersenne prime used for the universal hash family
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def company_block_key(normalized_company: str) -> str:
+	"""Blocking key for a normalized company name (its first token)"""
+	return normalized_company.split(" ", 1)[0] if normalized_company else ""
+
+
+@dataclass(slots=True)
+class NormalizedJob:
+	"""A job posting normalized once for indexing and comparison"""
+
+	title: str
+	company: str
+	location: str
+	url: str
+	fingerprint: str
+	company_key: str
+	band_keys: Tuple[Tuple[int, Tuple[int, ...]], ...] = ()
+
+
+class TitleMinHasher:
+	"""
+	MinHash-LSH over character shingles of normalized job titles
+
+	With the default 8 bands of 2 rows, titles with a shingle Jaccard
+	similarity of 0.5 collide in at least one band ~90% of the time, which
+	comfortably covers the 0.85 SequenceMatcher title threshold.
+	"""
+
+	def __init__(self, num_bands: int = 8, rows_per_band: int = 2, shingle_size: int = 3, seed: int = 1337):
+		self.num_bands = num_bands
+		self.rows_per_band = rows_per_band
+		self.shingle_size = shingle_size
+		self.num_perm = num_bands * rows_per_band
+
+		rng = random.Random(seed)
+		self._coefficients = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(self.num_perm)]
+
+		# Shingle vocabulary is small (character trigrams), so per-shingle hashes are memoized
+		self._shingle_hashes: Dict[str, Tuple[int, ...]] = {}
+		self._max_cached_shingles = 200_000
+
+	def shingles(self, text: str) -> Set[str]:
+		"""Return the set of character shingles for a normalized title"""
+		padded = f" {text} "
+		if len(padded) <= self.shingle_size:
+			return {padded}
+		return {padded[i : i + self.shingle_size] for i in range(len(padded) - self.shingle_size + 1)}
+
+	def _hash_shingle(self, shingle: str) -> Tuple[int, ...]:
+		cached = self._shingle_hashes.get(shingle)
+		if cached is not None:
+			return cached
+
+		x = zlib.crc32(shingle.encode("utf-8"))
+		hashed = tuple((a * x + b) % _MERSENNE_PRIME for a, b in self._coefficients)
+
+		if len(self._shingle_hashes) >= self._max_cached_shingles:
+			self._shingle_hashes.clear()
+		self._shingle_hashes[shingle] = hashed
+		return hashed
+
+	def signature(self, text: str) -> Tuple[int, ...]:
+		"""Compute the MinHash signature of a normalized title"""
+		rows = [self._hash_shingle(s) for s in self.shingles(text)]
+		return tuple(map(min, zip(*rows)))
+
+	def band_keys(self, text: str) -> Tuple[Tuple[int, Tuple[int, ...]], ...]:
+		"""Split the signature into LSH band keys"""
+		sig = self.signature(text)
+		r = self.rows_per_band
+		return tuple((band, sig[band * r : (band + 1) * r]) for band in range(self.num_bands))
+
+
+class JobDeduplicationIndex:
+	"""
+	Blocking index over already-accepted (or pre-existing) job records
+
+	Records are bucketed by (company token, LSH band) so a lookup only
+	compares against jobs at a similar company with a similar title.
+	"""
+
+	def __init__(self, minhasher: TitleMinHasher):
+		self.minhasher = minhasher
+		self.urls: Set[str] = set()
+		self.fingerprints: Set[str] = set()
+		self._blocks: Dict[Tuple[str, int, Tuple[int, ...]], List[NormalizedJob]] = {}
+		self._similarity_cache: Dict[Tuple[str, str], float] = {}
+		self.size = 0
+		self.comparisons = 0
+
+	def add(self, record: NormalizedJob, fuzzy: bool = True) -> None:
+		"""Add a record to the exact-match sets and, optionally, the fuzzy blocks"""
+		if record.url:
+			self.urls.add(record.url)
+		self.fingerprints.add(record.fingerprint)
+		self.size += 1
+
+		if fuzzy:
+			for band, band_hash in record.band_keys:
+				self._blocks.setdefault((record.company_key, band, band_hash), []).append(record)
+
+	def candidates(self, record: NormalizedJob) -> Iterable[NormalizedJob]:
+		"""Yield each distinct record sharing at least one block with ``record``"""
+		seen: Set[int] = set()
+		for band, band_hash in record.band_keys:
+			for candidate in self._blocks.get((record.company_key, band, band_hash), ()):
+				if id(candidate) not in seen:
+					seen.add(id(candidate))
+					yield candidate
+
+	def _similarity(self, a: str, b: str, threshold: float, cache: bool = False) -> float:
+		"""SequenceMatcher ratio with cheap upper-bound rejection below ``threshold``"""
+		if not a or not b:
+			return 0.0
+		if a == b:
+			return 1.0
+
+		key = (a, b) if a < b else (b, a)
+		if cache and key in self._similarity_cache:
+			return self._similarity_cache[key]
+
+		matcher = SequenceMatcher(None, a, b)
+		if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+			ratio = 0.0
+		else:
+			ratio = matcher.ratio()
+
+		if cache:
+			if len(self._similarity_cache) >= 100_000:
+				self._similarity_cache.clear()
+			self._similarity_cache[key] = ratio
+		return ratio
+
+	def find_fuzzy_match(self, record: NormalizedJob) -> Optional[str]:
+		"""
+		Return the fuzzy-match reason for the first candidate duplicate, if any
+
+		Decision rules mirror the fuzzy branch of are_jobs_duplicate.
+		"""
+		for candidate in self.candidates(record):
+			self.comparisons += 1
+
+			company_sim = self._similarity(record.company, candidate.company, COMPANY_SIMILARITY_THRESHOLD, cache=True)
+			if company_sim < COMPANY_SIMILARITY_THRESHOLD:
+				continue
+
+			title_sim = self._similarity(record.title, candidate.title, TITLE_SIMILARITY_THRESHOLD)
+			if title_sim < TITLE_SIMILARITY_THRESHOLD:
+				continue
+
+			if record.location and candidate.location:
+				location_sim = self._similarity(record.location, candidate.location, LOCATION_MISMATCH_THRESHOLD, cache=True)
+				if location_sim < LOCATION_MISMATCH_THRESHOLD:
+					continue
+
+			return f"fuzzy_match (company: {company_sim:.2f}, title: {title_sim:.2f})"
+
+		return None
+
+
+class IndexedDeduplicationEngine:
+	"""Blocked/indexed implementation of the filter_duplicate_jobs contract"""
+
+	def __init__(self, service: "JobDeduplicationService", minhasher: Optional[TitleMinHasher] = None):
+		self.service = service
+		self.minhasher = minhasher or TitleMinHasher()
+		self._company_cache: Dict[str, str] = {}
+		self._location_cache: Dict[str, str] = {}
+
+	def _normalize_company(self, company: str) -> str:
+		# Company names repeat heavily within a scrape, so memoize the regex-heavy normalizer
+		normalized = self._company_cache.get(company)
+		if normalized is None:
+			normalized = self.service.normalize_company_name(company)
+			self._company_cache[company] = normalized
+		return normalized
+
+	def _normalize_location(self, location: str) -> str:
+		normalized = self._location_cache.get(location)
+		if normalized is None:
+			normalized = self.service.normalize_location(location)
+			self._location_cache[location] = normalized
+		return normalized
+
+	def normalize(self, title: str, company: str, location: Optional[str], url: Optional[str], fuzzy: bool = True) -> NormalizedJob:
+		"""Normalize a job once into an indexable record"""
+		norm_title = self.service.normalize_job_title(title)
+		norm_company = self._normalize_company(company or "")
+		norm_location = self._normalize_location(location or "")
+		return NormalizedJob(
+			title=norm_title,
+			company=norm_company,
+			location=norm_location,
+			url=self.service.normalize_url(url) if url else "",
+			fingerprint=self.service.fingerprint_from_normalized(norm_title, norm_company, norm_location),
+			company_key=company_block_key(norm_company),
+			band_keys=self.minhasher.band_keys(norm_title) if fuzzy and norm_title else (),
+		)
+
+	def build_index(self, existing_jobs: Optional[Iterable[Any]], fuzzy: bool = True) -> JobDeduplicationIndex:
+		"""Index existing jobs (ORM rows or any object exposing title/company/location/application_url)"""
+		index = JobDeduplicationIndex(self.minhasher)
+		for job in existing_jobs or ():
+			record = self.normalize(job.title, job.company, job.location, job.application_url, fuzzy=fuzzy)
+			index.add(record, fuzzy=fuzzy)
+		return index
+
+	def prepare(self, jobs: List[Any], fuzzy: bool = True) -> List[Tuple[Any, Optional[NormalizedJob]]]:
+		"""
+		Normalize incoming jobs once
+
+		Returns (job_data, record) pairs; record is None for jobs that are skipped
+		(unexpected type or missing title/company).
+		"""
+		prepared: List[Tuple[Any, Optional[NormalizedJob]]] = []
+		for job_data in jobs:
+			job_dict = self.service._job_as_dict(job_data)
+			if job_dict is None:
+				prepared.append((job_data, None))
+				continue
+
+			title = job_dict.get("title", "")
+			company = job_dict.get("company", "")
+			location = job_dict.get("location", "")
+			url = job_dict.get("application_url") or job_dict.get("url", "")
+
+			if not title or not company:
+				logger.debug(f"Skipping job with missing data: title='{title}', company='{company}'")
+				prepared.append((job_data, None))
+				continue
+
+			prepared.append((job_data, self.normalize(title, company, location, url, fuzzy=fuzzy)))
+		return prepared
+
+	def filter(
+		self, jobs: List[Any], existing_jobs: Optional[Iterable[Any]] = None, strict_mode: bool = False
+	) -> Tuple[List[Any], Dict[str, Any]]:
+		"""Same contract and statistics as JobDeduplicationService.filter_duplicate_jobs"""
+		fuzzy = not strict_mode
+		return self.filter_prepared(self.prepare(jobs, fuzzy=fuzzy), self.build_index(existing_jobs, fuzzy=fuzzy), strict_mode)
+
+	def filter_prepared(
+		self, prepared: List[Tuple[Any, Optional[NormalizedJob]]], existing_index: JobDeduplicationIndex, strict_mode: bool = False
+	) -> Tuple[List[Any], Dict[str, Any]]:
+		"""Filter prepared jobs against a pre-built index of existing jobs"""
+		fuzzy = not strict_mode
+
+		unique_jobs: List[Any] = []
+		stats = {
+			"total_input": len(prepared),
+			"duplicates_within_batch": 0,
+			"duplicates_against_db": 0,
+			"duplicates_by_url": 0,
+			"duplicates_by_fingerprint": 0,
+			"duplicates_by_fuzzy": 0,
+			"unique_output": 0,
+		}
+
+		batch_index = JobDeduplicationIndex(self.minhasher)
+
+		for job_data, record in prepared:
+			if record is None:
+				continue
+
+			duplicate_reason = ""
+
+			# Exact URL and fingerprint checks; seen keys are recorded even when a later check
+			# flags the job, matching the pairwise implementation
+			if record.url:
+				if record.url in batch_index.urls or record.url in existing_index.urls:
+					duplicate_reason = "duplicate_url"
+					stats["duplicates_by_url"] += 1
+				else:
+					batch_index.urls.add(record.url)
+
+			if not duplicate_reason:
+				if record.fingerprint in batch_index.fingerprints or record.fingerprint in existing_index.fingerprints:
+					duplicate_reason = "duplicate_fingerprint"
+					stats["duplicates_by_fingerprint"] += 1
+				else:
+					batch_index.fingerprints.add(record.fingerprint)
+
+			if not duplicate_reason and fuzzy:
+				reason = existing_index.find_fuzzy_match(record)
+				if reason:
+					duplicate_reason = f"existing_db_{reason}"
+					stats["duplicates_by_fuzzy"] += 1
+					stats["duplicates_against_db"] += 1
+				else:
+					reason = batch_index.find_fuzzy_match(record)
+					if reason:
+						duplicate_reason = f"batch_{reason}"
+						stats["duplicates_by_fuzzy"] += 1
+						stats["duplicates_within_batch"] += 1
+
+			if not duplicate_reason:
+				unique_jobs.append(job_data)
+				batch_index.add(record, fuzzy=fuzzy)
+			else:
+				logger.debug(f"Filtered duplicate job: {record.title} at {record.company} (reason: {duplicate_reason})")
+
+		stats["unique_output"] = len(unique_jobs)
+		stats["duplicates_removed"] = stats["total_input"] - stats["unique_output"]
+
+		logger.debug(
+			f"Indexed deduplication compared {existing_index.comparisons + batch_index.comparisons} candidate pairs "
+			f"({existing_index.size} existing, {batch_index.size} accepted)"
+		)
+
+		return unique_jobs, stats
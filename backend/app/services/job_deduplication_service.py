@@ -7,29 +7,56 @@ Provides sophisticated duplicate detection and job uniqueness checking:
 - URL-based deduplication
 - Multiple deduplication strategies
 - Hash-based fingerprinting
+- Selectable pairwise or indexed (blocked / MinHash-LSH) batch filtering
 """
 
 import hashlib
+import json
 import re
 from datetime import datetime, timedelta, timezone
 from difflib import SequenceMatcher
-from typing import Any, Dict, List, Optional, Set, Tuple
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
+from app.core.config import get_settings
 from app.core.logging import get_logger
 from app.models.job import Job
 from app.schemas.job import JobCreate
+from app.services.job_deduplication_index import IndexedDeduplicationEngine, JobDeduplicationIndex, NormalizedJob, TitleMinHasher, company_block_key
 from sqlalchemy.orm import Session
 
 logger = get_logger(__name__)
 
+# Strategies accepted by filter_duplicate_jobs
+DEDUP_STRATEGY_PAIRWISE = "pairwise"
+DEDUP_STRATEGY_INDEXED = "indexed"
+DEDUP_STRATEGIES = (DEDUP_STRATEGY_PAIRWISE, DEDUP_STRATEGY_INDEXED)
+
+# Maximum number of keys per `IN (...)` lookup in deduplicate_against_db
+DB_LOOKUP_CHUNK_SIZE = 500
+
+# Rows fetched per keyset page in bulk_deduplicate_database_jobs
+BULK_DEDUP_CHUNK_SIZE = 5000
+
+
+def _chunked(values: List[Any], size: int):
+	for i in range(0, len(values), size):
+		yield values[i : i + size]
+
 
 class JobDeduplicationService:
 	"""Advanced deduplication service for job postings"""
 
-	def __init__(self, db: Session):
+	def __init__(self, db: Session, strategy: Optional[str] = None):
 		self.db = db
 
+		# Default batch filtering strategy ("pairwise" or "indexed")
+		self.strategy = strategy or get_settings().job_dedup_strategy
+		if self.strategy not in DEDUP_STRATEGIES:
+			raise ValueError(f"Unknown deduplication strategy '{self.strategy}', expected one of {DEDUP_STRATEGIES}")
+		self._minhasher: Optional[TitleMinHasher] = None
+
 		# Common company name variations for normalization
 		self.company_suffixes = [
 			"inc",
@@ -175,12 +202,25 @@ class JobDeduplicationService:
 		norm_company = self.normalize_company_name(company)
 		norm_location = self.normalize_location(location or "")
 
+		return self.fingerprint_from_normalized(norm_title, norm_company, norm_location)
+
+	def fingerprint_from_normalized(self, norm_title: str, norm_company: str, norm_location: str) -> str:
+		"""Hash already-normalized title/company/location into a job fingerprint"""
 		# Create composite key
 		composite = f"{norm_company}|{norm_title}|{norm_location}"
 
 		# Generate hash
 		return hashlib.md5(composite.encode()).hexdigest()
 
+	def assign_dedup_keys(self, job: Job) -> None:
+		"""Populate the fingerprint, normalized URL and company blocking key columns of a job"""
+		norm_company = self.normalize_company_name(job.company or "")
+		job.job_fingerprint = self.fingerprint_from_normalized(
+			self.normalize_job_title(job.title or ""), norm_company, self.normalize_location(job.location or "")
+		)
+		job.normalized_url = (self.normalize_url(job.application_url) if job.application_url else "") or None
+		job.dedup_company_key = company_block_key(norm_company)
+
 	def calculate_similarity(self, str1: str, str2: str) -> float:
 		"""
 		Calculate similarity ratio between two strings (0.0 to 1.0)
@@ -257,8 +297,26 @@ class JobDeduplicationService:
 
 		return False, "not_duplicate"
 
+	def _job_as_dict(self, job_data: Any) -> Optional[Dict[str, Any]]:
+		"""Return a dict view of a scraped job (dict or Pydantic model)"""
+		if isinstance(job_data, dict):
+			return job_data
+		if hasattr(job_data, "model_dump"):
+			# Pydantic v2
+			return job_data.model_dump()
+		if hasattr(job_data, "dict"):
+			# Pydantic v1
+			return job_data.dict()
+
+		logger.warning(f"Unexpected job_data type: {type(job_data)}")
+		return None
+
 	def filter_duplicate_jobs(
-		self, jobs: List[Dict[str, Any]], existing_jobs: Optional[List[Job]] = None, strict_mode: bool = False
+		self,
+		jobs: List[Dict[str, Any]],
+		existing_jobs: Optional[List[Job]] = None,
+		strict_mode: bool = False,
+		strategy: Optional[str] = None,
 	) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
 		"""
 		Filter out duplicate jobs from a list
@@ -267,6 +325,8 @@ class JobDeduplicationService:
 			jobs: List of scraped job dictionaries
 			existing_jobs: Optional list of existing Job models from database
 			strict_mode: If True, only uses exact matching (no fuzzy)
+			strategy: "pairwise" (compare every pair) or "indexed" (blocked MinHash-LSH
+				candidates); defaults to the service strategy
 
 		Returns:
 			Tuple of (unique_jobs, deduplication_stats)
@@ -275,7 +335,30 @@ class JobDeduplicationService:
 		if not jobs:
 			return [], {"total_input": 0, "duplicates_removed": 0, "unique_output": 0}
 
-		logger.info(f"Starting deduplication of {len(jobs)} jobs (strict_mode={strict_mode})")
+		strategy = strategy or self.strategy
+		if strategy not in DEDUP_STRATEGIES:
+			raise ValueError(f"Unknown deduplication strategy '{strategy}', expected one of {DEDUP_STRATEGIES}")
+
+		logger.info(f"Starting deduplication of {len(jobs)} jobs (strict_mode={strict_mode}, strategy={strategy})")
+
+		if strategy == DEDUP_STRATEGY_INDEXED:
+			unique_jobs, stats = self._indexed_engine().filter(jobs, existing_jobs, strict_mode)
+			logger.info(
+				f"Deduplication complete: {stats['unique_output']}/{stats['total_input']} unique jobs ({stats['duplicates_removed']} duplicates removed)"
+			)
+			return unique_jobs, stats
+
+		return self._filter_duplicate_jobs_pairwise(jobs, existing_jobs, strict_mode)
+
+	def _indexed_engine(self) -> IndexedDeduplicationEngine:
+		if self._minhasher is None:
+			self._minhasher = TitleMinHasher()
+		return IndexedDeduplicationEngine(self, self._minhasher)
+
+	def _filter_duplicate_jobs_pairwise(
+		self, jobs: List[Dict[str, Any]], existing_jobs: Optional[List[Job]], strict_mode: bool
+	) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+		"""Reference implementation comparing every job against every existing and accepted job"""
 
 		unique_jobs: List[Dict[str, Any]] = []
 		seen_fingerprints: Set[str] = set()
@@ -436,24 +519,97 @@ class JobDeduplicationService:
 			Tuple of (unique_jobs, deduplication_stats)
 		"""
 
-		# Get existing jobs from database
 		cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_lookback)
 
-		existing_jobs = self.db.query(Job).filter(Job.user_id == user_id, Job.created_at >= cutoff_date).all()
+		if not jobs or self.strategy == DEDUP_STRATEGY_PAIRWISE:
+			# Reference path: hydrate every recent job for the user
+			existing_jobs = self.db.query(Job).filter(Job.user_id == user_id, Job.created_at >= cutoff_date).all() if jobs else []
+
+			logger.info(f"Checking {len(jobs)} jobs against {len(existing_jobs)} existing jobs from last {days_lookback} days for user {user_id}")
+
+			return self.filter_duplicate_jobs(jobs, existing_jobs, strict_mode, strategy=self.strategy)
+
+		engine = self._indexed_engine()
+		prepared = engine.prepare(jobs, fuzzy=not strict_mode)
+		records = [record for _, record in prepared if record is not None]
+		existing_index = self._build_db_index(engine, records, user_id, cutoff_date, fuzzy=not strict_mode)
+
+		logger.info(
+			f"Checking {len(jobs)} jobs against {len(existing_index.fingerprints)} matching fingerprints, {len(existing_index.urls)} matching URLs "
+			f"and {existing_index.size} fuzzy candidates from last {days_lookback} days for user {user_id}"
+		)
+
+		unique_jobs, stats = engine.filter_prepared(prepared, existing_index, strict_mode)
+
+		logger.info(
+			f"Deduplication complete: {stats['unique_output']}/{stats['total_input']} unique jobs ({stats['duplicates_removed']} duplicates removed)"
+		)
+
+		return unique_jobs, stats
+
+	def _build_db_index(
+		self, engine: IndexedDeduplicationEngine, records: List[NormalizedJob], user_id: int, cutoff_date: datetime, fuzzy: bool
+	) -> JobDeduplicationIndex:
+		"""
+		Index only the existing jobs that can collide with ``records``
 
-		logger.info(f"Checking {len(jobs)} jobs against {len(existing_jobs)} existing jobs from last {days_lookback} days for user {user_id}")
+		Exact keys are resolved with chunked `IN (...)` probes on the indexed dedup columns;
+		fuzzy candidates are loaded as (id, title, company, location) tuples for the company
+		blocks present in the batch. Rows inserted before the dedup columns existed
+		(dedup_company_key IS NULL) are loaded the same lightweight way.
+		"""
+		index = JobDeduplicationIndex(engine.minhasher)
+		window = (Job.user_id == user_id, Job.created_at >= cutoff_date)
+
+		fingerprints = sorted({record.fingerprint for record in records})
+		for chunk in _chunked(fingerprints, DB_LOOKUP_CHUNK_SIZE):
+			rows = self.db.query(Job.job_fingerprint).filter(*window, Job.job_fingerprint.in_(chunk)).all()
+			index.fingerprints.update(row.job_fingerprint for row in rows if row.job_fingerprint)
+
+		urls = sorted({record.url for record in records if record.url})
+		for chunk in _chunked(urls, DB_LOOKUP_CHUNK_SIZE):
+			rows = self.db.query(Job.normalized_url).filter(*window, Job.normalized_url.in_(chunk)).all()
+			index.urls.update(row.normalized_url for row in rows if row.normalized_url)
+
+		if fuzzy:
+			company_keys = sorted({record.company_key for record in records if record.company_key})
+			for chunk in _chunked(company_keys, DB_LOOKUP_CHUNK_SIZE):
+				rows = self.db.query(Job.id, Job.title, Job.company, Job.location).filter(*window, Job.dedup_company_key.in_(chunk)).all()
+				for row in rows:
+					index.add(engine.normalize(row.title, row.company, row.location, None))
+
+		legacy_rows = (
+			self.db.query(Job.id, Job.title, Job.company, Job.location, Job.application_url)
+			.filter(*window, Job.dedup_company_key.is_(None))
+			.all()
+		)
+		if legacy_rows:
+			logger.debug(f"Indexing {len(legacy_rows)} jobs without dedup keys for user {user_id}; run backfill_job_fingerprints.py")
+		for row in legacy_rows:
+			index.add(engine.normalize(row.title, row.company, row.location, row.application_url, fuzzy=fuzzy), fuzzy=fuzzy)
 
-		return self.filter_duplicate_jobs(jobs, existing_jobs, strict_mode)
+		return index
 
-	def bulk_deduplicate_database_jobs(self, user_id: Optional[int] = None, batch_size: int = 100) -> Dict[str, Any]:
+	def bulk_deduplicate_database_jobs(
+		self,
+		user_id: Optional[int] = None,
+		batch_size: int = 100,
+		chunk_size: int = BULK_DEDUP_CHUNK_SIZE,
+		checkpoint_path: Optional[str] = None,
+	) -> Dict[str, Any]:
 		"""
-		Find and mark/remove duplicate jobs already in the database
+		Find and remove duplicate jobs already in the database
 
-		Useful for cleaning up existing data
+		Useful for cleaning up existing data. Jobs are streamed newest-first (by id) in
+		keyset-paginated chunks of lightweight columns; the newest job of each URL /
+		fingerprint is kept. Memory is bounded by a compact key -> id map.
 
 		Args:
 			user_id: Optional user ID to limit scope
-			batch_size: Process jobs in batches
+			batch_size: Number of duplicate ids deleted (and committed) per flush
+			chunk_size: Number of rows fetched per page
+			checkpoint_path: Optional JSON file recording progress after every flush;
+				an interrupted run resumes from it and it is removed on completion
 
 		Returns:
 			Dictionary with deduplication results
@@ -461,67 +617,161 @@ class JobDeduplicationService:
 
 		logger.info(f"Starting bulk database deduplication (user_id={user_id})")
 
-		# Query jobs
-		query = self.db.query(Job).order_by(Job.created_at.desc())
-		if user_id:
-			query = query.filter(Job.user_id == user_id)
-
-		all_jobs = query.all()
-
-		if len(all_jobs) < 2:
-			logger.info("Less than 2 jobs found, no deduplication needed")
-			return {"total_jobs": len(all_jobs), "duplicates_found": 0, "duplicates_removed": 0}
-
-		logger.info(f"Found {len(all_jobs)} jobs to check for duplicates")
-
-		# Track duplicates
-		seen_fingerprints: Dict[str, int] = {}  # fingerprint -> job_id (keep the oldest)
-		seen_urls: Dict[str, int] = {}  # url -> job_id
-		duplicate_job_ids: Set[int] = set()
+		results: Dict[str, Any] = {
+			"total_jobs": 0,
+			"duplicates_found": 0,
+			"duplicates_removed": 0,
+			"duplicates_by_type": {"url": 0, "fingerprint": 0},
+		}
 
-		results = {"total_jobs": len(all_jobs), "duplicates_found": 0, "duplicates_removed": 0, "duplicates_by_type": {"url": 0, "fingerprint": 0}}
+		# Compact keys (16-byte fingerprint digest, 8-byte URL digest) -> kept job id
+		seen_fingerprints: Dict[bytes, int] = {}
+		seen_urls: Dict[bytes, int] = {}
+		pending_deletes: List[int] = []
+		before_id: Optional[int] = None
+
+		checkpoint = self._load_bulk_dedup_checkpoint(checkpoint_path, user_id)
+		if checkpoint:
+			before_id = checkpoint["before_id"]
+			results = checkpoint["results"]
+
+			# Everything at or above the checkpoint was already deduplicated, so it only re-seeds the maps
+			for row in self._iter_bulk_dedup_rows(user_id, chunk_size, from_id=before_id):
+				fp_key, url_key = self._compact_dedup_keys(row)
+				if url_key is not None:
+					seen_urls.setdefault(url_key, row.id)
+				seen_fingerprints.setdefault(fp_key, row.id)
+
+			logger.info(f"Resuming bulk deduplication below job id {before_id} ({results['total_jobs']} jobs already checked)")
+
+		for row in self._iter_bulk_dedup_rows(user_id, chunk_size, before_id=before_id):
+			results["total_jobs"] += 1
+			fp_key, url_key = self._compact_dedup_keys(row)
+			is_duplicate = False
 
-		# First pass: exact matches
-		for job in all_jobs:
 			# URL-based deduplication
-			if job.application_url:
-				norm_url = self.normalize_url(job.application_url)
-				if norm_url:
-					if norm_url in seen_urls:
-						# Duplicate found
-						duplicate_job_ids.add(job.id)
-						results["duplicates_by_type"]["url"] += 1
-						logger.debug(f"Duplicate URL found: {job.title} at {job.company} (id={job.id})")
-					else:
-						seen_urls[norm_url] = job.id
+			if url_key is not None:
+				if url_key in seen_urls:
+					is_duplicate = True
+					results["duplicates_by_type"]["url"] += 1
+					logger.debug(f"Duplicate URL found: {row.title} at {row.company} (id={row.id})")
+				else:
+					seen_urls[url_key] = row.id
 
 			# Fingerprint-based deduplication
-			if job.id not in duplicate_job_ids:  # Only if not already marked as duplicate
-				fp = self.create_job_fingerprint(job.title, job.company, job.location)
-				if fp in seen_fingerprints:
-					# Duplicate found
-					duplicate_job_ids.add(job.id)
+			if not is_duplicate:
+				if fp_key in seen_fingerprints:
+					is_duplicate = True
 					results["duplicates_by_type"]["fingerprint"] += 1
-					logger.debug(f"Duplicate fingerprint found: {job.title} at {job.company} (id={job.id})")
+					logger.debug(f"Duplicate fingerprint found: {row.title} at {row.company} (id={row.id})")
 				else:
-					seen_fingerprints[fp] = job.id
+					seen_fingerprints[fp_key] = row.id
 
-		results["duplicates_found"] = len(duplicate_job_ids)
+			if is_duplicate:
+				results["duplicates_found"] += 1
+				pending_deletes.append(row.id)
 
-		# Remove duplicates if any found
-		if duplicate_job_ids:
-			logger.info(f"Removing {len(duplicate_job_ids)} duplicate jobs from database")
+				if len(pending_deletes) >= batch_size:
+					self._flush_duplicate_deletes(pending_deletes, results)
+					self._save_bulk_dedup_checkpoint(checkpoint_path, user_id, row.id, results)
 
-			# Delete in batches
-			for i in range(0, len(duplicate_job_ids), batch_size):
-				batch_ids = list(duplicate_job_ids)[i : i + batch_size]
-				self.db.query(Job).filter(Job.id.in_(batch_ids)).delete(synchronize_session=False)
+		if pending_deletes:
+			self._flush_duplicate_deletes(pending_deletes, results)
 
-			self.db.commit()
-			results["duplicates_removed"] = len(duplicate_job_ids)
+		if checkpoint_path:
+			Path(checkpoint_path).unlink(missing_ok=True)
 
-			logger.info(f"Successfully removed {results['duplicates_removed']} duplicate jobs")
+		if results["duplicates_removed"]:
+			logger.info(f"Successfully removed {results['duplicates_removed']} duplicate jobs out of {results['total_jobs']} checked")
 		else:
-			logger.info("No duplicates found in database")
+			logger.info(f"No duplicates found in database ({results['total_jobs']} jobs checked)")
 
 		return results
+
+	def _iter_bulk_dedup_rows(
+		self, user_id: Optional[int], chunk_size: int, before_id: Optional[int] = None, from_id: Optional[int] = None
+	) -> Iterator[Any]:
+		"""
+		Yield lightweight job rows newest-first using keyset pagination on the primary key
+
+		Each page is an independent query, so deletes can be committed between pages.
+		"""
+		while True:
+			query = self.db.query(
+				Job.id, Job.title, Job.company, Job.location, Job.application_url, Job.job_fingerprint, Job.normalized_url
+			)
+			if user_id:
+				query = query.filter(Job.user_id == user_id)
+			if before_id is not None:
+				query = query.filter(Job.id < before_id)
+			if from_id is not None:
+				query = query.filter(Job.id >= from_id)
+
+			rows = query.order_by(Job.id.desc()).limit(chunk_size).all()
+			if not rows:
+				return
+
+			yield from rows
+
+			if len(rows) < chunk_size:
+				return
+			before_id = rows[-1].id
+
+	def _compact_dedup_keys(self, row: Any) -> Tuple[bytes, Optional[bytes]]:
+		"""Return (fingerprint digest, URL digest or None), preferring the stored dedup columns"""
+		fingerprint = row.job_fingerprint or self.create_job_fingerprint(row.title, row.company, row.location)
+
+		norm_url = row.normalized_url
+		if norm_url is None and row.application_url:
+			norm_url = self.normalize_url(row.application_url)
+
+		url_key = hashlib.blake2b(norm_url.encode(), digest_size=8).digest() if norm_url else None
+		return bytes.fromhex(fingerprint), url_key
+
+	def _flush_duplicate_deletes(self, pending_deletes: List[int], results: Dict[str, Any]) -> None:
+		"""Delete and commit a batch of duplicate job ids"""
+		self.db.query(Job).filter(Job.id.in_(pending_deletes)).delete(synchronize_session=False)
+		self.db.commit()
+		results["duplicates_removed"] += len(pending_deletes)
+		logger.info(f"Removed {results['duplicates_removed']} duplicate jobs so far")
+		pending_deletes.clear()
+
+	def _load_bulk_dedup_checkpoint(self, checkpoint_path: Optional[str], user_id: Optional[int]) -> Optional[Dict[str, Any]]:
+		if not checkpoint_path:
+			return None
+
+		path = Path(checkpoint_path)
+		if not path.exists():
+			return None
+
+		try:
+			checkpoint = json.loads(path.read_text())
+		except (OSError, ValueError) as e:
+			logger.warning(f"Ignoring unreadable bulk deduplication checkpoint {path}: {e}")
+			return None
+
+		if checkpoint.get("user_id") != user_id:
+			logger.warning(f"Ignoring bulk deduplication checkpoint {path} recorded for user_id={checkpoint.get('user_id')}")
+			return None
+
+		return checkpoint
+
+	def _save_bulk_dedup_checkpoint(self, checkpoint_path: Optional[str], user_id: Optional[int], before_id: int, results: Dict[str, Any]) -> None:
+		if not checkpoint_path:
+			return
+
+		path = Path(checkpoint_path)
+		tmp_path = path.with_suffix(path.suffix + ".tmp")
+		tmp_path.write_text(json.dumps({"user_id": user_id, "before_id": before_id, "results": results}))
+		tmp_path.replace(path)
+
+
+_dedup_key_service: Optional[JobDeduplicationService] = None
+
+
+def assign_job_dedup_keys(job: Job) -> None:
+	"""Populate a job's dedup lookup columns using a shared, session-less service"""
+	global _dedup_key_service
+	if _dedup_key_service is None:
+		_dedup_key_service = JobDeduplicationService(db=None)
+	_dedup_key_service.assign_dedup_keys(job)
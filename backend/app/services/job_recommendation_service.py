@@ -19,6 +19,7 @@ from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import requests
+from app.core.cache import job_recommendation_cache
 from app.core.config import get_settings
 from app.core.logging import get_logger
 from app.models.application import Application
@@ -36,6 +37,7 @@ from app.schemas.job_recommendation_feedback import (
 )
 from app.services.llm_service import LLMService, get_llm_service
 from app.services.recommendation_engine import RecommendationEngine
+from app.services.skill_matcher import get_skill_matcher
 from app.services.websocket_service import websocket_service
 from app.utils.redis_client import redis_client
 from bs4 import BeautifulSoup
@@ -45,6 +47,23 @@ from sqlalchemy.orm import Session
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Job columns serialized by the recommendations endpoint (projection mode)
+RECOMMENDATION_JOB_COLUMNS = (
+	Job.id,
+	Job.title,
+	Job.company,
+	Job.location,
+	Job.description,
+	Job.salary_range,
+	Job.job_type,
+	Job.remote_option,
+	Job.tech_stack,
+	Job.responsibilities,
+	Job.source,
+	Job.application_url,
+	Job.source_url,
+)
+
 
 class JobRecommendationService:
 	"""
@@ -160,11 +179,18 @@ class JobRecommendationService:
 			"terraform",
 			"jenkins",
 		}
+		self.tech_matcher = get_skill_matcher(frozenset(self.tech_keywords))
 
 	# Job Matching and Recommendations
 
 	async def get_personalized_recommendations(
-		self, db: Session, user_id: int, limit: int = 10, min_score: float = 0.0, include_applied: bool = False
+		self,
+		db: Session,
+		user_id: int,
+		limit: int = 10,
+		min_score: float = 0.0,
+		include_applied: bool = False,
+		projection: bool = False,
 	) -> List[Dict[str, Any]]:
 		"""
 		Get personalized job recommendations for a user.
@@ -175,6 +201,7 @@ class JobRecommendationService:
 		    limit: Maximum number of recommendations
 		    min_score: Minimum score threshold
 		    include_applied: Whether to include jobs user already applied to
+		    projection: Return rows with only RECOMMENDATION_JOB_COLUMNS instead of full Job objects
 
 		Returns:
 		    List of dictionaries with job and match information
@@ -186,6 +213,7 @@ class JobRecommendationService:
 				db=db,
 				user_id=user_id,
 				limit=limit * 2,  # Get more to filter
+				include_jobs=not projection,
 			)
 			logger.info(f"Got {len(recommendations)} recommendations from engine")
 
@@ -193,13 +221,7 @@ class JobRecommendationService:
 			if min_score > 0:
 				recommendations = [r for r in recommendations if r.get("score", 0) >= min_score]
 
-			# Get full job objects and format response
-			result = []
-			for rec in recommendations[:limit]:
-				job_result = await db.execute(select(Job).filter(Job.id == rec["job_id"]))
-				job = job_result.scalar_one_or_none()
-				if job:
-					result.append({"job": job, "match_score": rec["score"], "match_reasons": rec.get("match_reasons", []), "algorithm": "hybrid"})
+			result = await self._hydrate_recommendations(db, recommendations[:limit], projection)
 
 			logger.info(f"Returning {len(result)} recommendations to endpoint")
 			return result
@@ -208,6 +230,92 @@ class JobRecommendationService:
 			logger.error(f"Error getting personalized recommendations: {e}", exc_info=True)
 			return []
 
+	async def get_materialized_recommendations(
+		self, db: Session, user: User, limit: int = 10, min_score: float = 0.0, projection: bool = False
+	) -> List[Dict[str, Any]]:
+		"""
+		Serve recommendations from the user's materialized top-K list.
+
+		Falls back to on-demand scoring (and re-materializes) when the stored list is
+		missing, was built for a different profile, or is older than the max age.
+
+		Args:
+		    db: Database session
+		    user: User to get recommendations for
+		    limit: Maximum number of recommendations
+		    min_score: Minimum score threshold
+		    projection: Return rows with only RECOMMENDATION_JOB_COLUMNS instead of full Job objects
+
+		Returns:
+		    List of dictionaries with job and match information
+		"""
+		try:
+			recommendations = job_recommendation_cache.get_materialized(user.id, job_recommendation_cache.profile_stamp(user))
+			if recommendations is None:
+				logger.info(f"Materialized recommendations for user {user.id} missing or stale, scoring on demand")
+				recommendations = await self.materialize_recommendations(db, user, include_jobs=not projection)
+
+			if min_score > 0:
+				recommendations = [r for r in recommendations if r.get("score", 0) >= min_score]
+
+			# Jobs applied to since materialization are dropped during hydration
+			return await self._hydrate_recommendations(db, recommendations, projection, exclude_applied_by=user.id, limit=limit)
+
+		except Exception as e:
+			logger.error(f"Error getting materialized recommendations: {e}", exc_info=True)
+			return []
+
+	async def materialize_recommendations(self, db: Session, user: User, include_jobs: bool = False) -> List[Dict[str, Any]]:
+		"""
+		Score the user's candidates from scratch and store the top-K list.
+
+		Scoring errors propagate instead of storing an empty list as fresh for the whole max age.
+		An empty result is returned but not stored, so the next read scores again.
+		"""
+		recommendations = await self.recommendation_engine.compute_recommendations(
+			db=db, user_id=user.id, limit=job_recommendation_cache.materialized_top_k, include_jobs=include_jobs
+		)
+		if recommendations:
+			job_recommendation_cache.set_materialized(user.id, job_recommendation_cache.profile_stamp(user), recommendations)
+		return recommendations
+
+	async def _hydrate_recommendations(
+		self,
+		db: Session,
+		recommendations: List[Dict[str, Any]],
+		projection: bool = False,
+		exclude_applied_by: Optional[int] = None,
+		limit: Optional[int] = None,
+	) -> List[Dict[str, Any]]:
+		"""Attach jobs to scored recommendations, reusing loaded jobs and fetching the rest in one query"""
+		jobs_by_id = {rec["job_id"]: rec["job"] for rec in recommendations if rec.get("job") is not None}
+		missing_ids = [rec["job_id"] for rec in recommendations if rec["job_id"] not in jobs_by_id]
+		if missing_ids:
+			jobs_by_id.update(await self._load_recommended_jobs(db, missing_ids, projection))
+
+		if exclude_applied_by is not None and jobs_by_id:
+			applied_result = await db.execute(
+				select(Application.job_id).filter(Application.user_id == exclude_applied_by, Application.job_id.in_(list(jobs_by_id)))
+			)
+			for (job_id,) in applied_result.all():
+				jobs_by_id.pop(job_id, None)
+
+		result = []
+		for rec in recommendations:
+			job = jobs_by_id.get(rec["job_id"])
+			if job:
+				result.append({"job": job, "match_score": rec["score"], "match_reasons": rec.get("match_reasons", []), "algorithm": "hybrid"})
+		return result[:limit]
+
+	async def _load_recommended_jobs(self, db: Session, job_ids: List[int], projection: bool = False) -> Dict[int, Any]:
+		"""Fetch recommended jobs with a single IN query, keyed by job id"""
+		if projection:
+			job_result = await db.execute(select(*RECOMMENDATION_JOB_COLUMNS).filter(Job.id.in_(job_ids)))
+			return {row.id: row for row in job_result.all()}
+
+		job_result = await db.execute(select(Job).filter(Job.id.in_(job_ids)))
+		return {job.id: job for job in job_result.scalars().all()}
+
 	async def generate_recommendations(self, user_id: int, limit: int = 20) -> List[Dict[str, Any]]:
 		"""Generate job recommendations for a user"""
 		try:
@@ -309,8 +417,17 @@ class JobRecommendationService:
 				logger.error(f"Error calculating match score for job {job.id} and user {user.id}: {e}")
 				continue
 
+		self._merge_into_materialized(user, new_jobs)
 		return matches
 
+	def _merge_into_materialized(self, user: User, new_jobs: List[Job]) -> None:
+		"""Fold newly ingested jobs into the user's materialized top-K list"""
+		try:
+			scored_jobs = self.recommendation_engine.score_jobs(user, [job for job in new_jobs if job.created_at is not None])
+			job_recommendation_cache.merge_materialized(user.id, job_recommendation_cache.profile_stamp(user), scored_jobs)
+		except Exception as e:
+			logger.error(f"Error updating materialized recommendations for user {user.id}: {e}")
+
 	async def send_instant_job_alerts(self, user_matches: Dict[int, List[Dict[str, Any]]]):
 		"""Send instant WebSocket alerts for high-scoring job matches"""
 		for user_id, matches in user_matches.items():
@@ -704,16 +821,7 @@ class JobRecommendationService:
 		if not text:
 			return []
 
-		text_lower = text.lower()
-		found_tech = []
-
-		for tech in self.tech_keywords:
-			# Use word boundaries to avoid partial matches
-			pattern = r"\b" + re.escape(tech.lower()) + r"\b"
-			if re.search(pattern, text_lower):
-				found_tech.append(tech.title())
-
-		return found_tech
+		return [tech.title() for tech in self.tech_matcher.extract(text)]
 
 	def _normalize_url(self, url: str) -> Optional[str]:
 		"""Normalize URL"""
@@ -922,11 +1030,7 @@ class JobRecommendationService:
 			text_lower = description_text.lower()
 
 			# Extract tech stack
-			tech_stack = set()
-			for tech in self.tech_keywords:
-				pattern = r"\b" + re.escape(tech.lower()) + r"\b"
-				if re.search(pattern, text_lower):
-					tech_stack.add(tech.title())
+			tech_stack = set(self._extract_technologies_from_text(description_text))
 
 			# Extract experience level
 			experience_level = self._extract_experience_level_rules(text_lower)
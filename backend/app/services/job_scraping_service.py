@@ -472,6 +472,29 @@ class JobScrapingService:
 		# 	ingestion_results["sources_used"].append("job_apis")
 		# 	ingestion_results["jobs_by_source"]["job_apis"] = len(api_jobs)
 
+		return await self._save_ingested_jobs(user_id, all_jobs, ingestion_results)
+
+	async def ingest_prefetched_jobs_for_user(self, user_id: int, jobs: List[Dict[str, Any]], sources_used: List[str]) -> Dict[str, Any]:
+		"""
+		Deduplicate and save jobs that were already scraped on the user's behalf
+
+		Used by the shared cross-user scrape, which fetches each distinct query once
+		and fans the postings out to every interested user.
+		"""
+		ingestion_results: Dict[str, Any] = {
+			"user_id": user_id,
+			"started_at": datetime.now(timezone.utc),
+			"sources_used": list(sources_used),
+			"jobs_by_source": {source: len(jobs) for source in sources_used},
+			"jobs_found": 0,
+			"jobs_saved": 0,
+			"duplicates_filtered": 0,
+			"errors": [],
+		}
+		return await self._save_ingested_jobs(user_id, jobs, ingestion_results)
+
+	async def _save_ingested_jobs(self, user_id: int, all_jobs: List[Dict[str, Any]], ingestion_results: Dict[str, Any]) -> Dict[str, Any]:
+		"""Filter scraped jobs against the user's existing jobs and persist the new ones"""
 		ingestion_results["jobs_found"] = len(all_jobs)
 
 		new_jobs = await self._filter_existing_jobs(user_id, all_jobs)
@@ -483,9 +506,9 @@ class JobScrapingService:
 				job_create = self._convert_to_job_create(data, user_id)
 				job = Job(**job_create.model_dump(), user_id=user_id)
 
-				# Generate and store fingerprint for future deduplication
+				# Store fingerprint / normalized URL / company key for future deduplication
 				if self.deduplication_service:
-					job.job_fingerprint = self.deduplication_service.create_job_fingerprint(job.title, job.company, job.location)
+					self.deduplication_service.assign_dedup_keys(job)
 
 				self.db.add(job)
 				self.db.flush()
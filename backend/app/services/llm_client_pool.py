@@ -0,0 +1,129 @@
+"""
+Long-lived LLM client registry
+
+Chat model instances are reused per (provider, model, temperature, max_tokens) instead of being
+rebuilt for every call, and all OpenAI-compatible clients of a provider share one keep-alive
+httpx connection pool, so warm requests skip object construction and the TLS handshake.
+
+Async connections belong to the event loop that opened them. Scheduled jobs and Celery tasks run
+LLM work under a fresh asyncio.run each time, so clients are kept per running loop, and the clients
+of loops that have since closed are dropped rather than reused.
+"""
+
+import asyncio
+import weakref
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import httpx
+
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+ClientKey = Tuple[str, str, float, int]
+
+
+class _LoopClients:
+	"""The chat model clients and HTTP pools used from one event loop"""
+
+	def __init__(self):
+		self.clients: Dict[Hashable, Any] = {}
+		self.http_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+class LLMClientPool:
+	"""Registry of warm chat model clients and per-provider HTTP connection pools, per event loop"""
+
+	def __init__(
+		self,
+		max_connections: int = 100,
+		max_keepalive_connections: int = 20,
+		keepalive_expiry: float = 30.0,
+		timeout: float = 60.0,
+	):
+		self.limits = httpx.Limits(
+			max_connections=max_connections, max_keepalive_connections=max_keepalive_connections, keepalive_expiry=keepalive_expiry
+		)
+		self.timeout = timeout
+		self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopClients]" = weakref.WeakKeyDictionary()
+		# Clients built outside any running loop; they bind to whichever loop first uses them
+		self._unbound = _LoopClients()
+		self._stats: Dict[str, Dict[str, int]] = {}
+
+	def _scope(self) -> _LoopClients:
+		"""Clients of the running loop, after dropping those of loops that have closed"""
+		for loop in [loop for loop in self._loops if loop.is_closed()]:
+			# Their connections cannot be closed from another loop; dropping them lets them be collected
+			del self._loops[loop]
+		try:
+			loop = asyncio.get_running_loop()
+		except RuntimeError:
+			return self._unbound
+		scope = self._loops.get(loop)
+		if scope is None:
+			scope = self._loops[loop] = _LoopClients()
+		return scope
+
+	def _scopes(self) -> List[_LoopClients]:
+		return [*self._loops.values(), self._unbound]
+
+	def get(self, key: ClientKey, factory: Callable[[], Any]) -> Any:
+		"""Return the pooled client for key on the running loop, building it with factory on first use"""
+		provider_stats = self._stats.setdefault(key[0], {"created": 0, "reused": 0})
+		scope = self._scope()
+		client = scope.clients.get(key)
+		if client is not None:
+			provider_stats["reused"] += 1
+			return client
+		client = factory()
+		scope.clients[key] = client
+		provider_stats["created"] += 1
+		logger.debug(f"Created pooled LLM client {key}")
+		return client
+
+	def http_client(self, provider: str) -> httpx.AsyncClient:
+		"""Shared keep-alive HTTP client for a provider on the running loop"""
+		scope = self._scope()
+		client = scope.http_clients.get(provider)
+		if client is None or client.is_closed:
+			client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+			scope.http_clients[provider] = client
+		return client
+
+	async def aclose(self) -> None:
+		"""Close the running loop's HTTP pools and drop every cached client"""
+		scope = self._scope()
+		for provider, client in [*scope.http_clients.items(), *self._unbound.http_clients.items()]:
+			try:
+				await client.aclose()
+			except Exception as e:
+				logger.warning(f"Failed to close HTTP pool for {provider}: {e}")
+		self._loops.clear()
+		self._unbound = _LoopClients()
+
+	def get_stats(self) -> Dict[str, Dict[str, Any]]:
+		"""Client reuse counters and HTTP pool state per provider"""
+		providers = sorted(set(self._stats).union(*(scope.http_clients for scope in self._scopes())))
+		return {provider: self.provider_stats(provider) for provider in providers}
+
+	def provider_stats(self, provider: str) -> Dict[str, Any]:
+		counters = self._stats.get(provider, {"created": 0, "reused": 0})
+		scopes = self._scopes()
+		http_clients = [client for scope in scopes if (client := scope.http_clients.get(provider)) is not None and not client.is_closed]
+		return {
+			"clients": sum(1 for scope in scopes for key in scope.clients if key[0] == provider),
+			"created": counters["created"],
+			"reused": counters["reused"],
+			"event_loops": len(self._loops),
+			"http_pool_open": bool(http_clients),
+			"http_connections": sum(self._connection_count(client) for client in http_clients),
+			"max_connections": self.limits.max_connections,
+			"max_keepalive_connections": self.limits.max_keepalive_connections,
+		}
+
+	@staticmethod
+	def _connection_count(http_client: Optional[httpx.AsyncClient]) -> int:
+		# httpx does not expose pool occupancy publicly; read it defensively
+		pool = getattr(getattr(http_client, "_transport", None), "_pool", None)
+		connections = getattr(pool, "connections", None)
+		return len(connections) if connections is not None else 0
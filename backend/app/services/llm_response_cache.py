@@ -0,0 +1,144 @@
+"""
+Content-addressed LLM response cache
+
+Keys are a SHA-256 over the canonical JSON of every input that determines a completion
+(model type, task complexity, system context, prompt, temperature, max_tokens), so an identical
+request is served from the same Redis entry no matter which uvicorn or Celery worker receives it.
+The builtin hash() is salted per process and must not be used for these keys.
+
+Values are compact JSON, zlib-compressed and base64-encoded so they survive the text-mode Redis client.
+"""
+
+import base64
+import hashlib
+import json
+import zlib
+from typing import Any, Dict, Optional
+
+from ..core.logging import get_logger
+from ..monitoring.metrics_collector import get_metrics_collector
+
+logger = get_logger(__name__)
+
+# Bump when the key inputs or the payload layout change; old entries simply stop matching
+LLM_CACHE_VERSION = 1
+LLM_CACHE_PREFIX = f"llm_cache:v{LLM_CACHE_VERSION}"
+LLM_CACHE_METRIC_NAME = "llm_response"
+
+# Per-ModelType TTLs (seconds), keyed by ModelType.value
+DEFAULT_MODEL_TYPE_TTLS: Dict[str, int] = {
+	"contract_analysis": 86400,
+	"negotiation": 3600,
+	"communication": 21600,
+	"general": 3600,
+}
+DEFAULT_TTL = 3600
+
+
+def build_cache_key(
+	model_type: str,
+	complexity: str,
+	prompt: str,
+	context: Optional[str] = None,
+	temperature: Optional[float] = None,
+	max_tokens: Optional[int] = None,
+) -> str:
+	"""Stable cache key for one completion request; the model type stays readable for scoped purges"""
+	canonical = json.dumps(
+		{
+			"model_type": model_type,
+			"complexity": complexity,
+			"context": context or "",
+			"prompt": prompt,
+			"temperature": None if temperature is None else round(float(temperature), 4),
+			"max_tokens": max_tokens,
+		},
+		sort_keys=True,
+		separators=(",", ":"),
+		ensure_ascii=False,
+	)
+	digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+	return f"{LLM_CACHE_PREFIX}:{model_type}:{digest}"
+
+
+def serialize_payload(payload: Dict[str, Any]) -> bytes:
+	"""Compact JSON bytes of a payload"""
+	return json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+def encode_payload(raw: bytes, level: int = 6) -> str:
+	"""Serialized payload -> zlib -> base64 text"""
+	return base64.b64encode(zlib.compress(raw, level)).decode("ascii")
+
+
+def decode_payload(encoded: str) -> Dict[str, Any]:
+	"""Inverse of encode_payload"""
+	return json.loads(zlib.decompress(base64.b64decode(encoded)).decode("utf-8"))
+
+
+class LLMResponseCache:
+	"""Redis-backed LLM response cache shared by every worker process"""
+
+	def __init__(self, cache, ttls: Optional[Dict[str, int]] = None, compression_level: int = 6):
+		self.cache = cache
+		self.ttls = {**DEFAULT_MODEL_TYPE_TTLS, **(ttls or {})}
+		self.compression_level = compression_level
+		self.stats = {"hits": 0, "misses": 0, "writes": 0, "errors": 0, "raw_bytes": 0, "stored_bytes": 0}
+
+	def ttl_for(self, model_type: str) -> int:
+		return self.ttls.get(model_type, DEFAULT_TTL)
+
+	async def get(self, key: str) -> Optional[Dict[str, Any]]:
+		"""Return the cached payload for a key, or None on a miss or an undecodable entry"""
+		encoded = await self.cache.aget(key)
+		if encoded is None:
+			self._record("misses", "miss")
+			return None
+		try:
+			payload = decode_payload(encoded)
+		except Exception as e:
+			logger.warning(f"Discarding undecodable LLM cache entry {key}: {e}")
+			self._record("errors", "error")
+			await self.cache.adelete(key)
+			return None
+		self._record("hits", "hit")
+		return payload
+
+	async def set(self, key: str, model_type: str, payload: Dict[str, Any]) -> bool:
+		"""Store a payload under the TTL of its model type"""
+		try:
+			raw = serialize_payload(payload)
+			encoded = encode_payload(raw, self.compression_level)
+		except Exception as e:
+			logger.warning(f"Could not encode LLM cache entry {key}: {e}")
+			self._record("errors", "error")
+			return False
+		stored = await self.cache.aset(key, encoded, self.ttl_for(model_type))
+		if stored:
+			self.stats["writes"] += 1
+			self.stats["raw_bytes"] += len(raw)
+			self.stats["stored_bytes"] += len(encoded)
+		return bool(stored)
+
+	async def purge(self, model_type: Optional[str] = None) -> int:
+		"""Delete cached responses, for one model type or all of them"""
+		pattern = f"{LLM_CACHE_PREFIX}:{model_type}:*" if model_type else f"{LLM_CACHE_PREFIX}:*"
+		deleted = await self.cache.adelete_pattern(pattern)
+		logger.info(f"Purged {deleted} LLM cache entries matching {pattern}")
+		return deleted
+
+	def get_stats(self) -> Dict[str, Any]:
+		lookups = self.stats["hits"] + self.stats["misses"]
+		return {
+			**self.stats,
+			"hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+			"compression_ratio": self.stats["stored_bytes"] / self.stats["raw_bytes"] if self.stats["raw_bytes"] else 0.0,
+			"ttls": dict(self.ttls),
+		}
+
+	def _record(self, counter: str, result: str) -> None:
+		self.stats[counter] += 1
+		try:
+			get_metrics_collector().record_cache_operation(LLM_CACHE_METRIC_NAME, "get", result)
+		except Exception as e:
+			logger.debug(f"LLM cache metric not recorded: {e}")
@@ -6,7 +6,7 @@ fallback, error handling, and performance monitoring.
 import asyncio
 import time
 import uuid
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union, AsyncGenerator
 from datetime import datetime, timedelta
@@ -17,7 +17,10 @@ from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 
 from ..core.config import get_settings
 from ..core.logging import get_logger
+from ..core.single_flight import SingleFlight
 from .cache_service import get_cache_service
+from .llm_client_pool import LLMClientPool
+from .llm_response_cache import LLMResponseCache, build_cache_key
 from ..core.task_complexity import TaskComplexity, get_complexity_analyzer
 from ..core.cost_tracker import CostCategory, get_cost_tracker
 from ..monitoring.metrics_collector import get_metrics_collector
@@ -362,7 +365,9 @@ class LLMService:
 			ModelProvider.GROQ.value: [ModelProvider.OPENAI.value, ModelProvider.ANTHROPIC.value, ModelProvider.LOCAL.value],
 			ModelProvider.LOCAL.value: [ModelProvider.OPENAI.value, ModelProvider.GROQ.value, ModelProvider.ANTHROPIC.value],
 		}
-		self.cache_ttl = 3600  # 1 hour
+		self.response_cache = LLMResponseCache(cache_service)
+		self.single_flight = SingleFlight(cache_service._get_async_client, namespace="llm_service")
+		self.client_pool = LLMClientPool()
 
 	def _initialize_models(self) -> Dict[ModelType, List[ModelConfig]]:
 		models = {ModelType.CONTRACT_ANALYSIS: [], ModelType.NEGOTIATION: [], ModelType.COMMUNICATION: [], ModelType.GENERAL: []}
@@ -450,11 +455,6 @@ class LLMService:
 
 		messages, optimization_result = await self._handle_token_optimization(messages, token_budget, task_complexity)
 
-		if not enable_streaming:
-			cached_result = await self._check_cache(model_type, task_complexity, prompt)
-			if cached_result:
-				return cached_result
-
 		models = await self._select_models(model_type, task_complexity, criteria)
 
 		if enable_streaming:
@@ -462,19 +462,29 @@ class LLMService:
 				models, messages, model_type, task_complexity, cost_category, streaming_mode, user_id, session_id, budget_limit, optimization_result
 			)
 
-		cache_key = f"ai_response:{model_type.value}:{task_complexity.value}:{hash(prompt)}"
-		return await self._handle_regular_request(
-			models,
-			messages,
-			model_type,
-			task_complexity,
-			cost_category,
-			max_retries,
-			user_id,
-			session_id,
-			budget_limit,
-			optimization_result,
+		cache_key = self._build_cache_key(model_type, task_complexity, prompt, context, models[0] if models else None)
+		cached_result = await self._check_cache(cache_key)
+		if cached_result:
+			return cached_result
+
+		# Concurrent identical requests (in this process or another worker) wait for one provider call
+		return await self.single_flight.do(
 			cache_key,
+			lambda: self._handle_regular_request(
+				models,
+				messages,
+				model_type,
+				task_complexity,
+				cost_category,
+				max_retries,
+				user_id,
+				session_id,
+				budget_limit,
+				optimization_result,
+				cache_key,
+			),
+			encode=self._response_to_cache_payload,
+			decode=self._response_from_cache_payload,
 		)
 
 	async def _prepare_task_analysis(self, model_type: ModelType, prompt: str, context: Optional[str] = None) -> Dict[str, Any]:
@@ -492,13 +502,56 @@ class LLMService:
 		logger.info(f"Token optimization: {optimization_result.reduction_percentage:.1f}% reduction")
 		return optimized_messages, optimization_result
 
-	async def _check_cache(self, model_type: ModelType, task_complexity: TaskComplexity, prompt: str) -> Optional[AIResponse]:
-		cache_key = f"ai_response:{model_type.value}:{task_complexity.value}:{hash(prompt)}"
-		cached_response = await cache_service.aget(cache_key)
-		if cached_response:
-			logger.info("Returning cached AI response")
-			return cached_response
-		return None
+	def _build_cache_key(
+		self, model_type: ModelType, task_complexity: TaskComplexity, prompt: str, context: Optional[str], model_config: Optional[ModelConfig]
+	) -> str:
+		# The primary model's sampling parameters are part of the key: changing them must not serve stale completions
+		return build_cache_key(
+			model_type.value,
+			task_complexity.value,
+			prompt,
+			context=context,
+			temperature=model_config.temperature if model_config else None,
+			max_tokens=model_config.max_tokens if model_config else None,
+		)
+
+	async def _check_cache(self, cache_key: str) -> Optional[AIResponse]:
+		payload = await self.response_cache.get(cache_key)
+		if payload is None:
+			return None
+		try:
+			response = self._response_from_cache_payload(payload)
+		except (KeyError, TypeError, ValueError) as e:
+			logger.warning(f"Ignoring incompatible cached AI response: {e}")
+			return None
+		logger.info("Returning cached AI response")
+		return response
+
+	def _response_to_cache_payload(self, response: AIResponse) -> Dict[str, Any]:
+		payload = asdict(response)
+		payload["provider"] = response.provider.value
+		payload["complexity_used"] = response.complexity_used.value
+		payload["cost_category"] = response.cost_category.value
+		# Streaming session ids are per request and never worth replaying
+		payload.pop("streaming_session_id", None)
+		payload.pop("is_streaming", None)
+		return payload
+
+	def _response_from_cache_payload(self, payload: Dict[str, Any]) -> AIResponse:
+		fields = dict(payload)
+		fields["provider"] = ModelProvider(fields["provider"])
+		fields["complexity_used"] = TaskComplexity(fields["complexity_used"])
+		fields["cost_category"] = CostCategory(fields["cost_category"])
+		fields["metadata"] = {**(fields.get("metadata") or {}), "cache_hit": True}
+		return AIResponse(**fields)
+
+	async def clear_cache(self, model_type: Optional[ModelType] = None) -> int:
+		"""Purge cached AI responses, for one model type or all of them."""
+		return await self.response_cache.purge(model_type.value if model_type else None)
+
+	def get_cache_stats(self) -> Dict[str, Any]:
+		"""Hit/miss counters and compression stats of the response cache in this process."""
+		return {**self.response_cache.get_stats(), "single_flight": self.single_flight.get_stats()}
 
 	async def _select_models(self, model_type: ModelType, task_complexity: TaskComplexity, criteria: str) -> List[ModelConfig]:
 		available_models = self.models.get(model_type, [])
@@ -561,7 +614,7 @@ class LLMService:
 						model_config, messages, task_complexity, cost_category, user_id, session_id, {}, optimization_result
 					)
 					circuit_breaker.record_success()
-					await cache_service.aset(cache_key, response, self.cache_ttl)
+					await self.response_cache.set(cache_key, model_type.value, self._response_to_cache_payload(response))
 					return response
 				except Exception as e:
 					last_error = e
@@ -614,14 +667,21 @@ class LLMService:
 		raise Exception("All models failed for streaming request")
 
 	async def _create_llm_instance(self, model_config: ModelConfig):
+		# Warm clients are reused per (provider, model, temperature, max_tokens)
+		key = (model_config.provider.value, model_config.model_name, model_config.temperature, model_config.max_tokens)
+		return self.client_pool.get(key, lambda: self._build_llm_instance(model_config))
+
+	def _build_llm_instance(self, model_config: ModelConfig):
 		if model_config.provider == ModelProvider.OPENAI:
 			return ChatOpenAI(
 				model=model_config.model_name,
 				temperature=model_config.temperature,
 				max_tokens=model_config.max_tokens,
 				api_key=settings.openai_api_key.get_secret_value(),
+				http_async_client=self.client_pool.http_client(ModelProvider.OPENAI.value),
 			)
 		elif model_config.provider == ModelProvider.ANTHROPIC:
+			# ChatAnthropic keeps its own HTTP client per instance, so pooling the instance reuses its connections
 			return ChatAnthropic(
 				model=model_config.model_name,
 				temperature=model_config.temperature,
@@ -636,6 +696,7 @@ class LLMService:
 				max_tokens=model_config.max_tokens,
 				api_key=settings.groq_api_key.get_secret_value(),
 				base_url="https://api.groq.com/openai/v1",
+				http_async_client=self.client_pool.http_client(ModelProvider.GROQ.value),
 			)
 		raise ValueError(f"Unsupported provider: {model_config.provider}")
 
@@ -651,6 +712,7 @@ class LLMService:
 		token_usage = self._extract_token_usage(response)
 		cost = token_usage.get("total_tokens", 0) * model_config.cost_per_token
 		confidence_score = self._calculate_confidence(response, model_config)
+		budget_impact = await self._record_cost(model_config, cost_category, token_usage, cost, user_id, session_id)
 
 		# Simplified AIResponse creation
 		return AIResponse(
@@ -663,10 +725,33 @@ class LLMService:
 			cost=cost,
 			complexity_used=task_complexity,
 			cost_category=cost_category,
-			budget_impact={},
+			budget_impact=budget_impact,
 			metadata={},
 		)
 
+	async def _record_cost(self, model_config, cost_category, token_usage, cost, user_id, session_id) -> Dict[str, Any]:
+		"""Add the call to the cost ledger and report the budgets it brings close to or over their limit."""
+		user = str(user_id) if user_id is not None else None
+		try:
+			await cost_tracker.record_cost(
+				provider=model_config.provider.value,
+				model=model_config.model_name,
+				category=cost_category,
+				prompt_tokens=token_usage.get("prompt_tokens", 0),
+				completion_tokens=token_usage.get("completion_tokens", 0),
+				cost=cost,
+				user_id=user,
+				session_id=session_id,
+			)
+			statuses = await cost_tracker.check_budget_limits(cost_category, 0, user)
+		except Exception as e:
+			logger.warning(f"Failed to record LLM cost: {e}")
+			return {}
+		return {
+			"alerts": [status.limit.get_cache_key() for status in statuses if status.alert_triggered],
+			"exceeded": [status.limit.get_cache_key() for status in statuses if status.limit_exceeded],
+		}
+
 	def _extract_token_usage(self, response) -> Dict[str, int]:
 		if hasattr(response, "response_metadata") and "token_usage" in response.response_metadata:
 			usage = response.response_metadata["token_usage"]
@@ -694,6 +779,7 @@ class LLMService:
 				"failure_count": circuit_breaker.failure_count,
 				"last_failure_time": circuit_breaker.last_failure_time.isoformat() if circuit_breaker.last_failure_time else None,
 				"available": circuit_breaker.can_attempt(),
+				"client_pool": self.client_pool.provider_stats(provider),
 			}
 
 		return health_status
@@ -722,3 +808,9 @@ def get_llm_service() -> LLMService:
 	if _llm_service is None:
 		_llm_service = LLMService()
 	return _llm_service
+
+
+async def close_llm_service() -> None:
+	"""Close the pooled clients of the global LLM service, if it was created."""
+	if _llm_service is not None:
+		await _llm_service.client_pool.aclose()
@@ -168,6 +168,10 @@ class MarketAnalysisService:
 
 		jobs = db.query(Job).filter(Job.user_id == user_id, Job.created_at >= cutoff_date).all()
 
+		return self.analyze_job_list_patterns(jobs, days)
+
+	def analyze_job_list_patterns(self, jobs: List[Job], days: int = 90) -> Dict:
+		"""Market pattern analysis of an already loaded list of a user's recent jobs"""
 		if not jobs:
 			return {"error": "No recent jobs found for analysis"}
 
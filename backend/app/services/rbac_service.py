@@ -3,9 +3,13 @@ Role-Based Access Control (RBAC) Service
 Provides comprehensive role and permission management.
 """
 
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -87,6 +91,10 @@ class SecurityLevel(str, Enum):
 	TOP_SECRET = "top_secret"
 
 
+# Bit of each permission in effective-permission masks
+PERMISSION_BITS: Dict[Permission, int] = {permission: 1 << index for index, permission in enumerate(Permission)}
+
+
 class PermissionContext(BaseModel):
 	"""Context for permission evaluation."""
 
@@ -123,13 +131,44 @@ class AccessControlResult(BaseModel):
 	context_validated: bool
 
 
-class RBACService:
-	"""Role-Based Access Control service."""
+@dataclass
+class _UserAuthorization:
+	"""Cached permission resolution for one user."""
+
+	permissions: List[Permission]  # Granted directly or through roles
+	mask: int  # Granted plus implied, as PERMISSION_BITS
+	expires_at: float
+	security_level: Optional[SecurityLevel] = None
 
-	def __init__(self):
+
+class RBACService:
+	"""
+	Role-Based Access Control service.
+
+	The permission hierarchy is resolved into a transitive closure once at startup, and each
+	user's effective permissions are cached as a bitmask for permission_cache_ttl seconds, so a
+	permission check is a bit test instead of database queries. Role and permission changes made
+	through this service invalidate the user's entry; changes made by other workers are picked
+	up when the entry expires. Access-log events are buffered and written in batches off the
+	request path.
+	"""
+
+	def __init__(self, permission_cache_ttl: float = 60.0, permission_cache_size: int = 10_000):
 		"""Initialize RBAC service."""
 		self.role_definitions = self._initialize_role_definitions()
 		self.permission_hierarchy = self._initialize_permission_hierarchy()
+		self.permission_closure = self._compute_permission_closure()
+
+		self.permission_cache_ttl = permission_cache_ttl
+		self.permission_cache_size = permission_cache_size
+		self._authorization_cache: "OrderedDict[str, _UserAuthorization]" = OrderedDict()
+
+		self.access_log_batch_size = 100
+		self.access_log_flush_interval = 1.0
+		self._access_log_buffer: Deque[Dict[str, Any]] = deque(maxlen=10_000)
+		self._access_log_task: Optional[asyncio.Task] = None
+
+		self.stats = {"cache_hits": 0, "cache_misses": 0, "invalidations": 0, "access_logs_written": 0, "access_logs_dropped": 0}
 		logger.info("RBAC Service initialized")
 
 	def _initialize_role_definitions(self) -> Dict[str, RoleDefinition]:
@@ -267,6 +306,71 @@ class RBACService:
 			Permission.AUDIT_WRITE: [Permission.AUDIT_READ],
 		}
 
+	def _compute_permission_closure(self) -> Dict[Permission, int]:
+		"""Mask of every permission a permission grants, following implications transitively."""
+		closure = {permission: PERMISSION_BITS[permission] for permission in Permission}
+		changed = True
+		while changed:
+			changed = False
+			for permission, implied in self.permission_hierarchy.items():
+				mask = closure[permission]
+				for implied_permission in implied:
+					mask |= closure[implied_permission]
+				if mask != closure[permission]:
+					closure[permission] = mask
+					changed = True
+		return closure
+
+	def _permissions_mask(self, permissions: List[Permission]) -> int:
+		mask = 0
+		for permission in permissions:
+			mask |= self.permission_closure[permission]
+		return mask
+
+	async def _get_authorization(self, user_id: str) -> _UserAuthorization:
+		"""Cached effective permissions of a user; loaded from the database on a miss."""
+		# Same key form as invalidate_user_permissions, whether callers pass an int or a str
+		user_id = str(user_id)
+		now = time.monotonic()
+		authorization = self._authorization_cache.get(user_id)
+		if authorization is not None and authorization.expires_at > now:
+			self._authorization_cache.move_to_end(user_id)
+			self.stats["cache_hits"] += 1
+			return authorization
+
+		self.stats["cache_misses"] += 1
+		permissions = await self._load_user_permissions(user_id)
+		authorization = _UserAuthorization(permissions, self._permissions_mask(permissions), now + self.permission_cache_ttl)
+		self._authorization_cache[user_id] = authorization
+		self._authorization_cache.move_to_end(user_id)
+		while len(self._authorization_cache) > self.permission_cache_size:
+			self._authorization_cache.popitem(last=False)
+		return authorization
+
+	async def _get_cached_security_level(self, user_id: str, authorization: _UserAuthorization) -> SecurityLevel:
+		if authorization.security_level is None:
+			authorization.security_level = await self.get_user_security_level(user_id)
+		return authorization.security_level
+
+	def invalidate_user_permissions(self, user_id: str) -> None:
+		"""Drop a user's cached permissions after their roles or grants change."""
+		if self._authorization_cache.pop(str(user_id), None) is not None:
+			self.stats["invalidations"] += 1
+
+	def clear_permission_cache(self) -> None:
+		"""Drop all cached permissions."""
+		self._authorization_cache.clear()
+
+	def get_cache_stats(self) -> Dict[str, Any]:
+		"""Permission cache and access-log buffer counters."""
+		lookups = self.stats["cache_hits"] + self.stats["cache_misses"]
+		return {
+			**self.stats,
+			"hit_rate": self.stats["cache_hits"] / lookups if lookups else 0.0,
+			"cached_users": len(self._authorization_cache),
+			"pending_access_logs": len(self._access_log_buffer),
+		}
+
 	async def check_permission(
 		self, user_id: str, required_permission: Permission, context: Optional[PermissionContext] = None
 	) -> AccessControlResult:
@@ -282,47 +386,9 @@ class RBACService:
 		    AccessControlResult with decision and details
 		"""
 		try:
-			# Get user permissions
-			user_permissions = await self.get_user_permissions(user_id)
-
-			# Check direct permission
-			has_permission = required_permission in user_permissions
-
-			# Check implied permissions through hierarchy
-			if not has_permission:
-				for perm in user_permissions:
-					if perm in self.permission_hierarchy:
-						implied_permissions = self.permission_hierarchy[perm]
-						if required_permission in implied_permissions:
-							has_permission = True
-							break
-
-			# Check security level if context provided
-			security_level_met = True
-			if context and context.resource_type:
-				user_security_level = await self.get_user_security_level(user_id)
-				required_security_level = self._get_required_security_level(context.resource_type, context.action)
-				security_level_met = self._check_security_level(user_security_level, required_security_level)
-
-			# Validate context-specific rules
-			context_validated = True
-			if context:
-				context_validated = await self._validate_context_rules(user_id, required_permission, context)
-
-			# Final decision
-			allowed = has_permission and security_level_met and context_validated
-
-			# Log access attempt
-			await self._log_access_attempt(user_id, required_permission, allowed, context)
-
-			return AccessControlResult(
-				allowed=allowed,
-				reason=self._get_access_reason(has_permission, security_level_met, context_validated),
-				required_permissions=[required_permission],
-				user_permissions=user_permissions,
-				security_level_met=security_level_met,
-				context_validated=context_validated,
-			)
+			authorization = await self._get_authorization(user_id)
+			security_level_met = await self._check_context_security_level(user_id, authorization, context)
+			return await self._evaluate_permission(user_id, authorization, required_permission, context, security_level_met)
 
 		except Exception as e:
 			logger.error(f"Error checking permission: {e}")
@@ -351,9 +417,16 @@ class RBACService:
 		    AccessControlResult with decision and details
 		"""
 		try:
+			# Permissions, security level and resource ownership are resolved once for all checks
+			authorization = await self._get_authorization(user_id)
+			security_level_met = await self._check_context_security_level(user_id, authorization, context)
+			owns_resource = None
+			if context and context.resource_type and context.resource_id:
+				owns_resource = await self._check_resource_ownership(user_id, context.resource_type, context.resource_id)
+
 			results = []
 			for permission in required_permissions:
-				result = await self.check_permission(user_id, permission, context)
+				result = await self._evaluate_permission(user_id, authorization, permission, context, security_level_met, owns_resource)
 				results.append(result)
 
 			if require_all:
@@ -390,6 +463,46 @@ class RBACService:
 				context_validated=False,
 			)
 
+	async def _check_context_security_level(self, user_id: str, authorization: _UserAuthorization, context: Optional[PermissionContext]) -> bool:
+		"""Check security clearance when the context names a resource."""
+		if not (context and context.resource_type):
+			return True
+		user_security_level = await self._get_cached_security_level(user_id, authorization)
+		required_security_level = self._get_required_security_level(context.resource_type, context.action)
+		return self._check_security_level(user_security_level, required_security_level)
+
+	async def _evaluate_permission(
+		self,
+		user_id: str,
+		authorization: _UserAuthorization,
+		required_permission: Permission,
+		context: Optional[PermissionContext],
+		security_level_met: bool,
+		owns_resource: Optional[bool] = None,
+	) -> AccessControlResult:
+		# Granted and implied permissions are both in the mask
+		has_permission = bool(authorization.mask & PERMISSION_BITS[required_permission])
+
+		# Validate context-specific rules
+		context_validated = True
+		if context:
+			context_validated = await self._validate_context_rules(user_id, required_permission, context, owns_resource)
+
+		# Final decision
+		allowed = has_permission and security_level_met and context_validated
+
+		# Log access attempt
+		self._log_access_attempt(user_id, required_permission, allowed, context)
+
+		return AccessControlResult(
+			allowed=allowed,
+			reason=self._get_access_reason(has_permission, security_level_met, context_validated),
+			required_permissions=[required_permission],
+			user_permissions=authorization.permissions,
+			security_level_met=security_level_met,
+			context_validated=context_validated,
+		)
+
 	async def get_user_roles(self, user_id: str) -> List[str]:
 		"""
 		Get active roles for a user.
@@ -442,52 +555,55 @@ class RBACService:
 		    List of effective permissions
 		"""
 		try:
-			permissions = set()
-
-			# Get permissions from roles
-			user_roles = await self.get_user_roles(user_id)
-			for role_name in user_roles:
-				if role_name in self.role_definitions:
-					role_def = self.role_definitions[role_name]
-					permissions.update(role_def.permissions)
-
-			# Get direct permission grants
-			db_manager = await get_database_manager()
-			async with db_manager.get_session() as session:
-				from sqlalchemy import select, and_, or_
+			return (await self._get_authorization(user_id)).permissions
+		except Exception as e:
+			logger.error(f"Error getting user permissions: {e}")
+			return []
 
-				result = await session.execute(
-					select(PermissionGrant.permission).where(
-						and_(
-							PermissionGrant.user_id == user_id,
-							PermissionGrant.is_active == True,
-							or_(PermissionGrant.expires_at.is_(None), PermissionGrant.expires_at > datetime.now(timezone.utc)),
-						)
+	async def _load_user_permissions(self, user_id: str) -> List[Permission]:
+		"""Load permissions granted to a user directly or through roles from the database."""
+		permissions = set()
+
+		# Get permissions from roles
+		user_roles = await self.get_user_roles(user_id)
+		for role_name in user_roles:
+			if role_name in self.role_definitions:
+				role_def = self.role_definitions[role_name]
+				permissions.update(role_def.permissions)
+
+		# Get direct permission grants
+		db_manager = await get_database_manager()
+		async with db_manager.get_session() as session:
+			from sqlalchemy import select, and_, or_
+
+			result = await session.execute(
+				select(PermissionGrant.permission).where(
+					and_(
+						PermissionGrant.user_id == user_id,
+						PermissionGrant.is_active == True,
+						or_(PermissionGrant.expires_at.is_(None), PermissionGrant.expires_at > datetime.now(timezone.utc)),
 					)
 				)
+			)
 
-				direct_permissions = [row[0] for row in result.fetchall()]
-				permissions.update(direct_permissions)
-
-				# Also get permissions from user table
-				user_result = await session.execute(select(User.permissions).where(User.id == user_id))
-				user_permissions = user_result.scalar_one_or_none() or []
-				permissions.update(user_permissions)
+			direct_permissions = [row[0] for row in result.fetchall()]
+			permissions.update(direct_permissions)
 
-			# Convert to Permission enum values
-			valid_permissions = []
-			for perm in permissions:
-				try:
-					valid_permissions.append(Permission(perm))
-				except ValueError:
-					logger.warning(f"Invalid permission found: {perm}")
+			# Also get permissions from user table
+			user_result = await session.execute(select(User.permissions).where(User.id == user_id))
+			user_permissions = user_result.scalar_one_or_none() or []
+			permissions.update(user_permissions)
 
-			logger.debug(f"User {user_id} has permissions: {valid_permissions}")
-			return valid_permissions
+		# Convert to Permission enum values
+		valid_permissions = []
+		for perm in permissions:
+			try:
+				valid_permissions.append(Permission(perm))
+			except ValueError:
+				logger.warning(f"Invalid permission found: {perm}")
 
-		except Exception as e:
-			logger.error(f"Error getting user permissions: {e}")
-			return []
+		logger.debug(f"User {user_id} has permissions: {valid_permissions}")
+		return valid_permissions
 
 	async def get_user_security_level(self, user_id: str) -> SecurityLevel:
 		"""
@@ -555,6 +671,7 @@ class RBACService:
 
 				session.add(role_assignment)
 				await session.commit()
+				self.invalidate_user_permissions(user_id)
 
 				# Log role assignment
 				audit_logger.log_event(
@@ -602,6 +719,7 @@ class RBACService:
 				)
 
 				await session.commit()
+				self.invalidate_user_permissions(user_id)
 
 				# Log role revocation
 				audit_logger.log_event(
@@ -659,6 +777,7 @@ class RBACService:
 
 				session.add(permission_grant)
 				await session.commit()
+				self.invalidate_user_permissions(user_id)
 
 				# Log permission grant
 				audit_logger.log_event(
@@ -742,12 +861,16 @@ class RBACService:
 
 		return user_clearance >= required_clearance
 
-	async def _validate_context_rules(self, user_id: str, permission: Permission, context: PermissionContext) -> bool:
-		"""Validate context-specific access rules."""
+	async def _validate_context_rules(
+		self, user_id: str, permission: Permission, context: PermissionContext, owns_resource: Optional[bool] = None
+	) -> bool:
+		"""Validate context-specific access rules; owns_resource skips the ownership lookup when already known."""
 		try:
 			# Resource ownership check
 			if context.resource_type and context.resource_id:
-				if await self._check_resource_ownership(user_id, context.resource_type, context.resource_id):
+				if owns_resource is None:
+					owns_resource = await self._check_resource_ownership(user_id, context.resource_type, context.resource_id)
+				if owns_resource:
 					return True
 
 			# Time-based restrictions
@@ -796,30 +919,62 @@ class RBACService:
 		# For example, admin access only from certain IP ranges
 		return True
 
-	async def _log_access_attempt(self, user_id: str, permission: Permission, allowed: bool, context: Optional[PermissionContext]) -> None:
-		"""Log access attempt for audit purposes."""
-		try:
-			event_type = AuditEventType.UNAUTHORIZED_ACCESS if not allowed else AuditEventType.FILE_ACCESS
-			severity = AuditSeverity.HIGH if not allowed else AuditSeverity.LOW
-
-			audit_logger.log_event(
-				event_type=event_type,
-				action=f"Permission check: {permission.value}",
-				result="denied" if not allowed else "granted",
-				severity=severity,
-				user_id=user_id,
-				ip_address=context.ip_address if context else None,
-				user_agent=context.user_agent if context else None,
-				details={
+	def _log_access_attempt(self, user_id: str, permission: Permission, allowed: bool, context: Optional[PermissionContext]) -> None:
+		"""Queue an access attempt for the audit log; events are written in batches off the request path."""
+		if len(self._access_log_buffer) == self._access_log_buffer.maxlen:
+			# The oldest event is pushed out of the bounded buffer
+			self.stats["access_logs_dropped"] += 1
+		self._access_log_buffer.append(
+			{
+				"event_type": AuditEventType.UNAUTHORIZED_ACCESS if not allowed else AuditEventType.FILE_ACCESS,
+				"action": f"Permission check: {permission.value}",
+				"result": "denied" if not allowed else "granted",
+				"severity": AuditSeverity.HIGH if not allowed else AuditSeverity.LOW,
+				"user_id": user_id,
+				"ip_address": context.ip_address if context else None,
+				"user_agent": context.user_agent if context else None,
+				"details": {
 					"permission": permission.value,
 					"resource_type": context.resource_type if context else None,
 					"resource_id": context.resource_id if context else None,
 					"action": context.action if context else None,
 				},
-			)
-
-		except Exception as e:
-			logger.error(f"Error logging access attempt: {e}")
+			}
+		)
+
+		if self._access_log_task is None or self._access_log_task.done():
+			try:
+				self._access_log_task = asyncio.get_running_loop().create_task(self._run_access_log_flusher())
+			except RuntimeError:
+				# No event loop (sync caller): write inline
+				self._write_access_log(self._drain_access_log())
+
+	async def _run_access_log_flusher(self) -> None:
+		"""Flush buffered access logs every access_log_flush_interval (sooner when a batch fills) until idle."""
+		while self._access_log_buffer:
+			deadline = time.monotonic() + self.access_log_flush_interval
+			while len(self._access_log_buffer) < self.access_log_batch_size and time.monotonic() < deadline:
+				await asyncio.sleep(min(0.05, self.access_log_flush_interval))
+			await self.flush_access_log()
+
+	async def flush_access_log(self) -> None:
+		"""Write all buffered access-log events."""
+		batch = self._drain_access_log()
+		if batch:
+			await asyncio.to_thread(self._write_access_log, batch)
+
+	def _drain_access_log(self) -> List[Dict[str, Any]]:
+		batch = list(self._access_log_buffer)
+		self._access_log_buffer.clear()
+		return batch
+
+	def _write_access_log(self, batch: List[Dict[str, Any]]) -> None:
+		for event in batch:
+			try:
+				audit_logger.log_event(**event)
+				self.stats["access_logs_written"] += 1
+			except Exception as e:
+				logger.error(f"Error logging access attempt: {e}")
 
 	def _get_access_reason(self, has_permission: bool, security_level_met: bool, context_validated: bool) -> str:
 		"""Get human-readable reason for access decision."""
@@ -4,8 +4,15 @@ Recommendation Engine - ML-based job recommendation system
 
 import logging
 from collections import Counter
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+try:
+	import numpy as np
+except ImportError:
+	# Fallback to per-job scoring when numpy is not available
+	np = None
 
 from app.models.application import Application
 from app.models.job import Job
@@ -15,16 +22,49 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = logging.getLogger(__name__)
 
+# Candidate caps for per-job and vectorized scoring
+SCALAR_CANDIDATE_LIMIT = 100
+BATCH_CANDIDATE_LIMIT = 5000
+
+
+@dataclass(frozen=True)
+class UserScoringProfile:
+	"""User attributes used for scoring, normalized once per request"""
+
+	skills: FrozenSet[str]
+	locations: Tuple[str, ...]
+	has_experience: bool
+
+	@classmethod
+	def from_user(cls, user: User) -> "UserScoringProfile":
+		return cls(
+			skills=frozenset(s.lower() for s in user.skills or []),
+			locations=tuple(loc.lower() for loc in user.preferred_locations or []),
+			has_experience=bool(user.experience_level),
+		)
+
+	def matches_location(self, location: str) -> bool:
+		location = location.lower()
+		return any(loc in location for loc in self.locations)
+
 
 class RecommendationEngine:
 	"""ML-based job recommendation engine using collaborative filtering and content-based approaches"""
 
-	def __init__(self):
-		"""Initialize the recommendation engine"""
+	def __init__(self, batch_scoring: bool = True, max_candidates: int = BATCH_CANDIDATE_LIMIT):
+		"""
+		Initialize the recommendation engine
+
+		Args:
+		    batch_scoring: Score all candidates in one vectorized pass (requires numpy)
+		    max_candidates: Candidate cap when batch scoring is active
+		"""
 		self.weights = {"skills_match": 0.4, "location_match": 0.2, "experience_match": 0.2, "industry_match": 0.1, "recency": 0.1}
-		logger.info("Recommendation engine initialized with weighted scoring")
+		self.batch_scoring = batch_scoring and np is not None
+		self.max_candidates = max_candidates if self.batch_scoring else SCALAR_CANDIDATE_LIMIT
+		logger.info(f"Recommendation engine initialized with weighted scoring (batch_scoring={self.batch_scoring})")
 
-	async def get_recommendations(self, db: AsyncSession, user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+	async def get_recommendations(self, db: AsyncSession, user_id: int, limit: int = 10, include_jobs: bool = False) -> List[Dict[str, Any]]:
 		"""
 		Get personalized job recommendations for a user.
 
@@ -37,87 +77,206 @@ class RecommendationEngine:
 		    db: Database session
 		    user_id: User ID to get recommendations for
 		    limit: Maximum number of recommendations
+		    include_jobs: Attach the loaded Job under "job" when full rows were fetched
+		        (per-job scoring); batch scoring only loads scoring columns
 
 		Returns:
-		    List of recommended jobs with scores
+		    List of recommended jobs with scores, or an empty list on error
 		"""
 		try:
-			logger.info(f"Getting recommendations for user {user_id}, limit={limit}")
-			# Get user
-			result = await db.execute(select(User).filter(User.id == user_id))
-			user = result.scalar_one_or_none()
-			if not user:
-				logger.warning(f"User {user_id} not found")
-				return []
-
-			logger.info(f"Found user {user.id}: {user.username}")
-
-			# Get user's applied jobs to exclude
-			applied_result = await db.execute(select(Application.job_id).filter(Application.user_id == user_id))
-			applied_ids = [row[0] for row in applied_result.all()]
-			logger.info(f"User has applied to {len(applied_ids)} jobs: {applied_ids}")
-
-			# Get available jobs (not applied, active, recent)
-			# Use timezone-naive datetime to match database
-			thirty_days_ago = datetime.now() - timedelta(days=30)
-			query = select(Job).filter(Job.created_at >= thirty_days_ago)
-
-			if applied_ids:
-				query = query.filter(Job.id.notin_(applied_ids))
-
-			query = query.limit(100)
-			jobs_result = await db.execute(query)
-			available_jobs = jobs_result.scalars().all()
-			logger.info(f"Found {len(available_jobs)} available jobs")
-
-			# Score each job
-			scored_jobs = []
-			for job in available_jobs:
-				score = self._calculate_job_score(user, job)
-				scored_jobs.append(
-					{
-						"job_id": job.id,
-						"title": job.title,
-						"company": job.company,
-						"location": job.location,
-						"score": round(score, 2),
-						"match_reasons": self._get_match_reasons(user, job, score),
-					}
-				)
-
-			# Sort by score and return top N
-			scored_jobs.sort(key=lambda x: x["score"], reverse=True)
-			return scored_jobs[:limit]
-
+			return await self.compute_recommendations(db, user_id, limit=limit, include_jobs=include_jobs)
 		except Exception as e:
 			logger.error(f"Error getting recommendations: {e}")
 			return []
 
+	async def compute_recommendations(self, db: AsyncSession, user_id: int, limit: int = 10, include_jobs: bool = False) -> List[Dict[str, Any]]:
+		"""
+		Same as get_recommendations, but database and scoring errors are raised.
+
+		Used where an empty result must not be mistaken for "no matches", e.g. when storing it.
+		"""
+		logger.info(f"Getting recommendations for user {user_id}, limit={limit}")
+		# Get user
+		result = await db.execute(select(User).filter(User.id == user_id))
+		user = result.scalar_one_or_none()
+		if not user:
+			logger.warning(f"User {user_id} not found")
+			return []
+
+		logger.info(f"Found user {user.id}: {user.username}")
+
+		# Get user's applied jobs to exclude
+		applied_result = await db.execute(select(Application.job_id).filter(Application.user_id == user_id))
+		applied_ids = [row[0] for row in applied_result.all()]
+		logger.info(f"User has applied to {len(applied_ids)} jobs: {applied_ids}")
+
+		# Get available jobs (not applied, active, recent)
+		# Use timezone-naive datetime to match database
+		thirty_days_ago = datetime.now() - timedelta(days=30)
+		if self.batch_scoring:
+			# Only the columns used for scoring and the result schema
+			query = select(Job.id, Job.title, Job.company, Job.location, Job.tech_stack, Job.created_at)
+		else:
+			query = select(Job)
+		query = query.filter(Job.created_at >= thirty_days_ago)
+
+		if applied_ids:
+			query = query.filter(Job.id.notin_(applied_ids))
+
+		query = query.limit(self.max_candidates)
+		jobs_result = await db.execute(query)
+		available_jobs = jobs_result.all() if self.batch_scoring else jobs_result.scalars().all()
+		logger.info(f"Found {len(available_jobs)} available jobs")
+
+		if self.batch_scoring:
+			return self.score_jobs_batch(user, available_jobs, limit)
+
+		return self.score_jobs(user, available_jobs, limit, include_jobs=include_jobs)
+
+	def score_jobs(self, user: User, jobs: Sequence[Job], limit: Optional[int] = None, include_jobs: bool = False) -> List[Dict[str, Any]]:
+		"""
+		Score already-loaded Job rows one by one, best first
+
+		Args:
+		    user: User to score for
+		    jobs: Job objects to score
+		    limit: Maximum number of results (all when None)
+		    include_jobs: Attach each Job under "job"
+		"""
+		profile = UserScoringProfile.from_user(user)
+		scored_jobs = []
+		for job in jobs:
+			score = self._score_with_profile(profile, job)
+			scored_jobs.append(
+				{
+					"job_id": job.id,
+					"title": job.title,
+					"company": job.company,
+					"location": job.location,
+					"score": round(score, 2),
+					"match_reasons": self._match_reasons_with_profile(profile, job, score),
+				}
+			)
+			if include_jobs:
+				scored_jobs[-1]["job"] = job
+
+		# Sort by score and return top N
+		scored_jobs.sort(key=lambda x: x["score"], reverse=True)
+		return scored_jobs[:limit]
+
+	def score_jobs_batch(self, user: User, jobs: Sequence[Any], limit: int) -> List[Dict[str, Any]]:
+		"""
+		Score all candidate jobs in one vectorized pass
+
+		Tech stacks are encoded as sparse rows over a shared skill vocabulary so skill
+		overlap, location match and recency are computed with array operations.
+		Produces the same scores, ordering and result schema as per-job scoring.
+		"""
+		if not jobs:
+			return []
+
+		profile = UserScoringProfile.from_user(user)
+
+		# Sparse (CSR-style) encoding of each job's distinct, lowercased tech stack
+		vocabulary: Dict[str, int] = {}
+		indices: List[int] = []
+		row_lengths = np.zeros(len(jobs), dtype=np.int64)
+		for row, job in enumerate(jobs):
+			job_skills = {s.lower() for s in job.tech_stack} if job.tech_stack else ()
+			row_lengths[row] = len(job_skills)
+			indices.extend(vocabulary.setdefault(skill, len(vocabulary)) for skill in job_skills)
+
+		user_mask = np.zeros(len(vocabulary), dtype=np.int64)
+		for skill in profile.skills:
+			if skill in vocabulary:
+				user_mask[vocabulary[skill]] = 1
+
+		# Per-row overlap = number of the row's vocabulary entries present in the user mask
+		row_ids = np.repeat(np.arange(len(jobs)), row_lengths)
+		overlap = np.bincount(row_ids, weights=user_mask[np.asarray(indices, dtype=np.int64)], minlength=len(jobs))
+
+		scores = np.zeros(len(jobs), dtype=np.float64)
+		if profile.skills:
+			skills_match = np.divide(overlap, row_lengths, out=np.zeros(len(jobs), dtype=np.float64), where=row_lengths > 0)
+			scores += skills_match * self.weights["skills_match"]
+
+		# Locations repeat heavily across postings, so each distinct string is matched once
+		location_cache: Dict[str, bool] = {}
+		location_match = np.zeros(len(jobs), dtype=bool)
+		if profile.locations:
+			for row, job in enumerate(jobs):
+				if job.location:
+					matched = location_cache.get(job.location)
+					if matched is None:
+						matched = location_cache[job.location] = profile.matches_location(job.location)
+					location_match[row] = matched
+			scores += location_match.astype(np.float64) * self.weights["location_match"]
+
+		if profile.has_experience:
+			scores += 0.5 * self.weights["experience_match"]
+
+		# Recency boost, linear decay over 30 days (timezone-naive like the database)
+		created_at = np.array([job.created_at for job in jobs], dtype="datetime64[us]")
+		days_old = (np.datetime64(datetime.now(), "us") - created_at) // np.timedelta64(1, "D")
+		scores += np.maximum(0, 1 - days_old / 30) * self.weights["recency"]
+
+		scores = np.minimum(scores, 1.0)
+		rounded = np.round(scores, 2)
+
+		# Stable descending order matches list.sort(reverse=True) tie handling
+		top = np.argsort(-rounded, kind="stable")[:limit]
+
+		results = []
+		for row in top:
+			job = jobs[row]
+			score = float(rounded[row])
+			reasons = []
+			if overlap[row] and profile.skills:
+				reasons.append(f"Matches {int(overlap[row])} of your skills")
+			if location_match[row]:
+				reasons.append("Matches your preferred location")
+			if scores[row] > 0.7:
+				reasons.append("Highly recommended based on your profile")
+			elif scores[row] > 0.5:
+				reasons.append("Good match for your background")
+
+			results.append(
+				{
+					"job_id": job.id,
+					"title": job.title,
+					"company": job.company,
+					"location": job.location,
+					"score": score,
+					"match_reasons": reasons,
+				}
+			)
+
+		return results
+
 	def _calculate_job_score(self, user: User, job: Job) -> float:
 		"""Calculate recommendation score for a job based on available fields"""
+		return self._score_with_profile(UserScoringProfile.from_user(user), job)
+
+	def _score_with_profile(self, profile: UserScoringProfile, job: Job) -> float:
 		score = 0.0
 
 		# Skills match (comparing user.skills with job.tech_stack)
-		if user.skills and job.tech_stack:
-			user_skills = set([s.lower() for s in user.skills])
-			job_skills = set([s.lower() for s in job.tech_stack])
-			skills_overlap = len(user_skills & job_skills)
+		if profile.skills and job.tech_stack:
+			job_skills = {s.lower() for s in job.tech_stack}
+			skills_overlap = len(profile.skills & job_skills)
 			skills_match = skills_overlap / len(job_skills) if job_skills else 0
 			score += skills_match * self.weights["skills_match"]
 
 		# Location match
-		if user.preferred_locations and job.location:
-			location_match = any(loc.lower() in job.location.lower() for loc in user.preferred_locations)
-			score += (1.0 if location_match else 0.0) * self.weights["location_match"]
+		if profile.locations and job.location:
+			score += (1.0 if profile.matches_location(job.location) else 0.0) * self.weights["location_match"]
 
 		# Experience level match - simplified since we don't have job.experience_level
 		# Award a base score for having experience specified
-		if user.experience_level:
+		if profile.has_experience:
 			score += 0.5 * self.weights["experience_match"]
 
 		# Industry match - skip since Job model doesn't have industry field
-		# Using company name similarity instead
-		# score += 0.0  # Placeholder
 
 		# Recency boost (newer jobs scored higher)
 		# Use timezone-naive datetime
@@ -129,18 +288,18 @@ class RecommendationEngine:
 
 	def _get_match_reasons(self, user: User, job: Job, score: float) -> List[str]:
 		"""Generate human-readable match reasons based on available fields"""
+		return self._match_reasons_with_profile(UserScoringProfile.from_user(user), job, score)
+
+	def _match_reasons_with_profile(self, profile: UserScoringProfile, job: Job, score: float) -> List[str]:
 		reasons = []
 
-		if user.skills and job.tech_stack:
-			user_skills = set([s.lower() for s in user.skills])
-			job_skills = set([s.lower() for s in job.tech_stack])
-			matching_skills = user_skills & job_skills
+		if profile.skills and job.tech_stack:
+			matching_skills = profile.skills & {s.lower() for s in job.tech_stack}
 			if matching_skills:
 				reasons.append(f"Matches {len(matching_skills)} of your skills")
 
-		if user.preferred_locations and job.location:
-			if any(loc.lower() in job.location.lower() for loc in user.preferred_locations):
-				reasons.append("Matches your preferred location")
+		if profile.locations and job.location and profile.matches_location(job.location):
+			reasons.append("Matches your preferred location")
 
 		if score > 0.7:
 			reasons.append("Highly recommended based on your profile")
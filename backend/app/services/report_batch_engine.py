@@ -0,0 +1,299 @@
+"""
+Batch engine for the scheduled weekly and monthly analytics reports
+
+Users are read a page at a time, keyed on id. For each page, success rates, funnels, benchmarks
+and predictions are derived from a few grouped queries over all of the page's applications, not
+from a cluster of queries per user. Weekly reports also prefetch the page's recent jobs for the
+market section. The rendered emails are handed to an async send queue, where a small pool of
+workers delivers them over SMTP from worker threads while the next page is being prepared.
+
+Progress is checkpointed to a JSON file per report period (e.g. weekly-2026-W11.json) each time
+every email of a page has been handled. A run restarted in the same period after a crash resumes
+after the last finished page. A run that already completed returns its recorded results without
+sending anything again, unless it is forced, as the admin endpoints can ask for.
+
+A run holds an exclusive lock on a file next to its checkpoint (weekly-2026-W11.lock) from start
+to finish, so a second run of the same period, from another request, the scheduler or another
+worker process, fails with ReportRunInProgress instead of emailing every user twice. The
+operating system drops the lock if the process dies, so a crashed run never blocks its resume.
+"""
+
+import asyncio
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+
+try:
+	import fcntl
+except ImportError:  # pragma: no cover - Windows
+	fcntl = None
+	import msvcrt
+
+from app.core.config import get_settings
+from app.core.database import get_database_manager
+from app.core.logging import get_logger
+from app.models.job import Job
+from app.models.user import User
+from app.services.advanced_user_analytics_service import advanced_user_analytics_service
+from app.services.market_analysis_service import market_analysis_service
+
+logger = get_logger(__name__)
+
+# Analysis window in days per report type
+REPORT_WINDOWS = {"weekly": 7, "monthly": 30}
+
+BACKEND_DIR = Path(__file__).parent.parent.parent
+
+
+class ReportRunInProgress(Exception):
+	"""Another run of the same report period holds its lock"""
+
+
+def default_checkpoint_dir() -> Path:
+	"""The configured report checkpoint directory, anchored at the backend directory when relative."""
+	path = Path(get_settings().report_checkpoint_dir)
+	return path if path.is_absolute() else BACKEND_DIR / path
+
+
+def _empty_results() -> Dict[str, Any]:
+	return {"total_users": 0, "reports_generated": 0, "emails_sent": 0, "errors": []}
+
+
+@dataclass
+class _Page:
+	"""A prepared page of reports and the results of handling it"""
+
+	last_user_id: int
+	messages: List[Tuple[str, Any]] = field(default_factory=list)
+	results: Dict[str, Any] = field(default_factory=_empty_results)
+	pending: int = 0
+	done: Optional[asyncio.Event] = None
+
+
+class ReportBatchEngine:
+	"""Generates and sends one report type for every user, page by page, resumably"""
+
+	def __init__(self, reports_service, page_size: int = 200, send_concurrency: int = 4, checkpoint_dir: Optional[str] = None, max_errors: int = 100):
+		# ScheduledAnalyticsReportsService, which assembles and delivers each report
+		self.reports_service = reports_service
+		self.page_size = page_size
+		self.send_concurrency = send_concurrency
+		self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir is not None else default_checkpoint_dir()
+		self.max_errors = max_errors
+
+	async def run(self, report_type: str, now: Optional[datetime] = None, force: bool = False) -> Dict[str, Any]:
+		"""
+		Generate and send report_type ("weekly" or "monthly") for all users, resuming an interrupted run.
+
+		A run that already completed this period is not repeated unless force is set; then every
+		report is sent again from the first user. Raises ReportRunInProgress if this period is
+		already being run.
+		"""
+		now = now or datetime.now()
+		checkpoint_path = self.checkpoint_path(report_type, now)
+		with self._run_lock(checkpoint_path):
+			return await self._run(report_type, checkpoint_path, force)
+
+	async def _run(self, report_type: str, checkpoint_path: Path, force: bool) -> Dict[str, Any]:
+		checkpoint = self._read_checkpoint(checkpoint_path)
+		if checkpoint.get("completed"):
+			if not force:
+				logger.info(f"{report_type.title()} reports for this period already completed; see {checkpoint_path}")
+				return checkpoint["results"]
+			logger.info(f"Re-running {report_type} reports for this period on request")
+			checkpoint = {}
+
+		results = checkpoint.get("results") or _empty_results()
+		last_user_id = checkpoint.get("last_user_id", 0)
+		if last_user_id:
+			logger.info(f"Resuming {report_type} reports after user {last_user_id}")
+
+		# Room for one page: the next page is prepared while the current one is sent
+		queue: asyncio.Queue = asyncio.Queue(maxsize=self.page_size)
+		workers = [asyncio.create_task(self._send_worker(queue)) for _ in range(self.send_concurrency)]
+		try:
+			sending: Optional[_Page] = None
+			while True:
+				page = await asyncio.to_thread(self._prepare_page, report_type, last_user_id)
+				if page is None:
+					break
+				last_user_id = page.last_user_id
+				page.pending = len(page.messages)
+				page.done = asyncio.Event()
+				if not page.pending:
+					page.done.set()
+				for message in page.messages:
+					await queue.put((page, message))
+				page.messages = []
+
+				if sending is not None:
+					await self._finish_page(sending, results, checkpoint_path, report_type)
+				sending = page
+
+			if sending is not None:
+				await self._finish_page(sending, results, checkpoint_path, report_type)
+		finally:
+			for worker in workers:
+				worker.cancel()
+			await asyncio.gather(*workers, return_exceptions=True)
+
+		self._write_checkpoint(checkpoint_path, {"report_type": report_type, "last_user_id": last_user_id, "results": results, "completed": True})
+		return results
+
+	def is_running(self, report_type: str, now: Optional[datetime] = None) -> bool:
+		"""Whether a run of this period currently holds its lock, in this or another process."""
+		try:
+			with self._run_lock(self.checkpoint_path(report_type, now or datetime.now())):
+				return False
+		except ReportRunInProgress:
+			return True
+
+	def completed_results(self, report_type: str, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+		"""Results of this period's run if it already completed, else None."""
+		checkpoint = self._read_checkpoint(self.checkpoint_path(report_type, now or datetime.now()))
+		return checkpoint["results"] if checkpoint.get("completed") else None
+
+	def checkpoint_path(self, report_type: str, now: datetime) -> Path:
+		period = now.strftime("%G-W%V") if report_type == "weekly" else now.strftime("%Y-%m")
+		return self.checkpoint_dir / f"{report_type}-{period}.json"
+
+	# -------- Preparation (worker thread) --------
+	def _prepare_page(self, report_type: str, after_user_id: int) -> Optional[_Page]:
+		"""Build and render the reports of the next page of users after after_user_id."""
+		analytics = advanced_user_analytics_service
+		days = REPORT_WINDOWS[report_type]
+
+		with get_database_manager().get_sync_session() as db:
+			users = db.execute(select(User.id, User.username, User.email).where(User.id > after_user_id).order_by(User.id).limit(self.page_size)).all()
+			if not users:
+				return None
+
+			user_ids = [user.id for user in users]
+			stats = analytics.load_application_stats(db, user_ids, days)
+			if report_type == "weekly":
+				recent_jobs = self._load_recent_jobs(db, user_ids, days)
+			else:
+				optimal_job_types = analytics.load_optimal_job_types(db, user_ids)
+
+			page = _Page(last_user_id=users[-1].id)
+			page.results["total_users"] = len(users)
+			for user in users:
+				try:
+					success_rates = analytics.success_rates_from_stats(stats[user.id], days)
+					conversion_funnel = analytics.conversion_funnel_from_stats(stats[user.id], days)
+					benchmarks = analytics.benchmarks_from_success_rates(success_rates, user.id, days)
+					if report_type == "weekly":
+						market_analysis = market_analysis_service.analyze_job_list_patterns(recent_jobs.get(user.id, []), days)
+						report = self.reports_service.build_weekly_report(user.id, user.username, success_rates, conversion_funnel, benchmarks, market_analysis)
+					else:
+						predictive = analytics.predictive_from_success_rates(success_rates, optimal_job_types[user.id], user.id, days)
+						# Salary trends and opportunity alerts have no set-based form yet; one dashboard per user
+						market_dashboard = market_analysis_service.create_market_dashboard_data(db, user.id)
+						report = self.reports_service.build_monthly_report(
+							user.id, user.username, success_rates, conversion_funnel, benchmarks, predictive, market_dashboard
+						)
+				except Exception as e:
+					logger.error(f"Failed to generate {report_type} report for user {user.id}: {e!s}")
+					self._record_error(page.results, f"Failed to generate report for {user.username}: {e!s}")
+					continue
+
+				page.results["reports_generated"] += 1
+				if not user.email:
+					self._record_error(page.results, f"No email address for user {user.username}")
+					continue
+				try:
+					page.messages.append((user.username, self.reports_service.build_report_message(report, user.email)))
+				except Exception as e:
+					self._record_error(page.results, f"Error processing user {user.username}: {e!s}")
+
+		return page
+
+	def _load_recent_jobs(self, db, user_ids: List[int], days: int) -> Dict[int, List[Job]]:
+		cutoff_date = datetime.now() - timedelta(days=days)
+		jobs: Dict[int, List[Job]] = {}
+		for job in db.query(Job).filter(Job.user_id.in_(user_ids), Job.created_at >= cutoff_date):
+			jobs.setdefault(job.user_id, []).append(job)
+		return jobs
+
+	# -------- Sending --------
+	async def _send_worker(self, queue: asyncio.Queue):
+		while True:
+			page, (username, message) = await queue.get()
+			try:
+				if await asyncio.to_thread(self.reports_service.deliver_report_message, message):
+					page.results["emails_sent"] += 1
+				else:
+					self._record_error(page.results, f"Failed to send email to {username}")
+			except Exception as e:
+				self._record_error(page.results, f"Error processing user {username}: {e!s}")
+			finally:
+				page.pending -= 1
+				if page.pending == 0:
+					page.done.set()
+				queue.task_done()
+
+	async def _finish_page(self, page: _Page, results: Dict[str, Any], checkpoint_path: Path, report_type: str):
+		"""Wait for a page's emails, fold its results into the run and checkpoint past it."""
+		await page.done.wait()
+		for key in ("total_users", "reports_generated", "emails_sent"):
+			results[key] += page.results[key]
+		for error in page.results["errors"]:
+			self._record_error(results, error)
+		self._write_checkpoint(checkpoint_path, {"report_type": report_type, "last_user_id": page.last_user_id, "results": results, "completed": False})
+
+	def _record_error(self, results: Dict[str, Any], error: str):
+		if len(results["errors"]) < self.max_errors:
+			results["errors"].append(error)
+
+	# -------- Checkpoints --------
+	@contextmanager
+	def _run_lock(self, checkpoint_path: Path) -> Iterator[None]:
+		"""Hold the period's lock file exclusively, or raise ReportRunInProgress without waiting."""
+		lock_path = checkpoint_path.with_suffix(".lock")
+		lock_path.parent.mkdir(parents=True, exist_ok=True)
+		# Locks belong to the open file, so a second open in this process conflicts as well
+		handle = open(lock_path, "a+b")
+		try:
+			try:
+				if fcntl is not None:
+					fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+				else:
+					handle.seek(0)
+					msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+			except OSError as e:
+				raise ReportRunInProgress(f"A run for {checkpoint_path.stem} is already in progress") from e
+			try:
+				yield
+			finally:
+				if fcntl is not None:
+					fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+				else:
+					handle.seek(0)
+					msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+		finally:
+			handle.close()
+
+	def _read_checkpoint(self, path: Path) -> Dict[str, Any]:
+		try:
+			with open(path) as handle:
+				return json.load(handle)
+		except FileNotFoundError:
+			return {}
+		except (OSError, ValueError) as e:
+			logger.error(f"Ignoring unreadable report checkpoint {path}: {e}")
+			return {}
+
+	def _write_checkpoint(self, path: Path, checkpoint: Dict[str, Any]):
+		path.parent.mkdir(parents=True, exist_ok=True)
+		temp_path = path.with_suffix(".tmp")
+		with open(temp_path, "w") as handle:
+			json.dump({**checkpoint, "updated_at": datetime.now().isoformat()}, handle)
+			handle.flush()
+			os.fsync(handle.fileno())
+		os.replace(temp_path, path)
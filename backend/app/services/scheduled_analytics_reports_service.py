@@ -4,7 +4,7 @@ Generates and sends automated analytics reports via email
 """
 
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from sqlalchemy.orm import Session
 import json
 import logging
@@ -51,31 +51,34 @@ class ScheduledAnalyticsReportsService:
 
 			market_analysis = market_analysis_service.analyze_job_market_patterns(db, user_id, days=7)
 
-			# Create report structure
-			report = {
-				"report_type": "weekly",
-				"generated_at": datetime.now().isoformat(),
-				"user_id": user_id,
-				"username": user.username,
-				"period": "Last 7 days",
-				"summary": self._create_weekly_summary(success_rates, conversion_funnel, benchmarks),
-				"detailed_analytics": {
-					"success_rates": success_rates,
-					"conversion_funnel": conversion_funnel,
-					"performance_benchmarks": benchmarks,
-					"market_analysis": market_analysis,
-				},
-				"key_insights": self._generate_weekly_insights(success_rates, benchmarks, market_analysis),
-				"recommendations": self._generate_weekly_recommendations(success_rates, benchmarks),
-				"next_week_goals": self._suggest_next_week_goals(success_rates, benchmarks),
-			}
-
-			return report
+			return self.build_weekly_report(user_id, user.username, success_rates, conversion_funnel, benchmarks, market_analysis)
 
 		except Exception as e:
 			logger.error(f"Failed to generate weekly report for user {user_id}: {e!s}")
 			return {"error": f"Failed to generate report: {e!s}"}
 
+	def build_weekly_report(
+		self, user_id: int, username: str, success_rates: Dict, conversion_funnel: Dict, benchmarks: Dict, market_analysis: Dict
+	) -> Dict[str, Any]:
+		"""Assemble the weekly report from already computed analytics"""
+		return {
+			"report_type": "weekly",
+			"generated_at": datetime.now().isoformat(),
+			"user_id": user_id,
+			"username": username,
+			"period": "Last 7 days",
+			"summary": self._create_weekly_summary(success_rates, conversion_funnel, benchmarks),
+			"detailed_analytics": {
+				"success_rates": success_rates,
+				"conversion_funnel": conversion_funnel,
+				"performance_benchmarks": benchmarks,
+				"market_analysis": market_analysis,
+			},
+			"key_insights": self._generate_weekly_insights(success_rates, benchmarks, market_analysis),
+			"recommendations": self._generate_weekly_recommendations(success_rates, benchmarks),
+			"next_week_goals": self._suggest_next_week_goals(success_rates, benchmarks),
+		}
+
 	def generate_monthly_report(self, db: Session, user_id: int) -> Dict[str, Any]:
 		"""Generate comprehensive monthly analytics report"""
 		try:
@@ -94,62 +97,85 @@ class ScheduledAnalyticsReportsService:
 
 			market_dashboard = market_analysis_service.create_market_dashboard_data(db, user_id)
 
-			# Create comprehensive monthly report
-			report = {
-				"report_type": "monthly",
-				"generated_at": datetime.now().isoformat(),
-				"user_id": user_id,
-				"username": user.username,
-				"period": "Last 30 days",
-				"executive_summary": self._create_monthly_executive_summary(success_rates, benchmarks, predictive, market_dashboard),
-				"detailed_analytics": {
-					"success_rates": success_rates,
-					"conversion_funnel": conversion_funnel,
-					"performance_benchmarks": benchmarks,
-					"predictive_analytics": predictive,
-					"market_dashboard": market_dashboard,
-				},
-				"trends_analysis": self._analyze_monthly_trends(success_rates),
-				"competitive_position": self._analyze_competitive_position(benchmarks),
-				"market_insights": market_dashboard.get("market_patterns", {}).get("market_insights", []),
-				"strategic_recommendations": self._generate_strategic_recommendations(benchmarks, predictive, market_dashboard),
-				"next_month_strategy": self._create_next_month_strategy(predictive, benchmarks),
-			}
-
-			return report
+			return self.build_monthly_report(user_id, user.username, success_rates, conversion_funnel, benchmarks, predictive, market_dashboard)
 
 		except Exception as e:
 			logger.error(f"Failed to generate monthly report for user {user_id}: {e!s}")
 			return {"error": f"Failed to generate report: {e!s}"}
 
+	def build_monthly_report(
+		self,
+		user_id: int,
+		username: str,
+		success_rates: Dict,
+		conversion_funnel: Dict,
+		benchmarks: Dict,
+		predictive: Dict,
+		market_dashboard: Dict,
+	) -> Dict[str, Any]:
+		"""Assemble the monthly report from already computed analytics"""
+		return {
+			"report_type": "monthly",
+			"generated_at": datetime.now().isoformat(),
+			"user_id": user_id,
+			"username": username,
+			"period": "Last 30 days",
+			"executive_summary": self._create_monthly_executive_summary(success_rates, benchmarks, predictive, market_dashboard),
+			"detailed_analytics": {
+				"success_rates": success_rates,
+				"conversion_funnel": conversion_funnel,
+				"performance_benchmarks": benchmarks,
+				"predictive_analytics": predictive,
+				"market_dashboard": market_dashboard,
+			},
+			"trends_analysis": self._analyze_monthly_trends(success_rates),
+			"competitive_position": self._analyze_competitive_position(benchmarks),
+			"market_insights": market_dashboard.get("market_patterns", {}).get("market_insights", []),
+			"strategic_recommendations": self._generate_strategic_recommendations(benchmarks, predictive, market_dashboard),
+			"next_month_strategy": self._create_next_month_strategy(predictive, benchmarks),
+		}
+
 	def send_report_email(self, report: Dict[str, Any], recipient_email: str) -> bool:
 		"""Send analytics report via email"""
+		try:
+			return self.deliver_report_message(self.build_report_message(report, recipient_email))
+
+		except Exception as e:
+			logger.error(f"Failed to send report email: {e!s}")
+			return False
+
+	def build_report_message(self, report: Dict[str, Any], recipient_email: str) -> MIMEMultipart:
+		"""Render a report into an email with the full analytics attached as JSON"""
+		# Create email message
+		msg = MIMEMultipart("alternative")
+		msg["Subject"] = f"Career Copilot {report['report_type'].title()} Analytics Report"
+		msg["From"] = self.smtp_settings["username"]
+		msg["To"] = recipient_email
+
+		# Create HTML email content
+		html_content = self._create_html_email_content(report)
+		html_part = MIMEText(html_content, "html")
+		msg.attach(html_part)
+
+		# Create JSON attachment
+		json_content = json.dumps(report, indent=2, default=str)
+		json_attachment = MIMEBase("application", "json")
+		json_attachment.set_payload(json_content.encode())
+		encoders.encode_base64(json_attachment)
+		json_attachment.add_header(
+			"Content-Disposition", f'attachment; filename="analytics_report_{report["report_type"]}_{datetime.now().strftime("%Y%m%d")}.json"'
+		)
+		msg.attach(json_attachment)
+
+		return msg
+
+	def deliver_report_message(self, msg: MIMEMultipart) -> bool:
+		"""Send a rendered report email over SMTP; blocking"""
 		try:
 			if not all([self.smtp_settings["host"], self.smtp_settings["username"], self.smtp_settings["password"]]):
 				logger.warning("SMTP settings not configured, skipping email send")
 				return False
 
-			# Create email message
-			msg = MIMEMultipart("alternative")
-			msg["Subject"] = f"Career Copilot {report['report_type'].title()} Analytics Report"
-			msg["From"] = self.smtp_settings["username"]
-			msg["To"] = recipient_email
-
-			# Create HTML email content
-			html_content = self._create_html_email_content(report)
-			html_part = MIMEText(html_content, "html")
-			msg.attach(html_part)
-
-			# Create JSON attachment
-			json_content = json.dumps(report, indent=2)
-			json_attachment = MIMEBase("application", "json")
-			json_attachment.set_payload(json_content.encode())
-			encoders.encode_base64(json_attachment)
-			json_attachment.add_header(
-				"Content-Disposition", f'attachment; filename="analytics_report_{report["report_type"]}_{datetime.now().strftime("%Y%m%d")}.json"'
-			)
-			msg.attach(json_attachment)
-
 			# Send email
 			with smtplib.SMTP(self.smtp_settings["host"], self.smtp_settings["port"]) as server:
 				if self.smtp_settings["use_tls"]:
@@ -157,90 +183,44 @@ class ScheduledAnalyticsReportsService:
 				server.login(self.smtp_settings["username"], self.smtp_settings["password"])
 				server.send_message(msg)
 
-			logger.info(f"Successfully sent {report['report_type']} report to {recipient_email}")
+			logger.info(f"Successfully sent {msg['Subject']} to {msg['To']}")
 			return True
 
 		except Exception as e:
 			logger.error(f"Failed to send report email: {e!s}")
 			return False
 
-	def schedule_weekly_reports(self, db: Session) -> Dict[str, Any]:
-		"""Generate and send weekly reports for all users"""
-		results = {"total_users": 0, "reports_generated": 0, "emails_sent": 0, "errors": []}
+	async def schedule_weekly_reports(self, force: bool = False) -> Dict[str, Any]:
+		"""Generate and send weekly reports for all users; force repeats a run already completed this period"""
+		return await self._run_bulk_reports("weekly", force)
+
+	async def schedule_monthly_reports(self, force: bool = False) -> Dict[str, Any]:
+		"""Generate and send monthly reports for all users; force repeats a run already completed this period"""
+		return await self._run_bulk_reports("monthly", force)
+
+	async def _run_bulk_reports(self, report_type: str, force: bool) -> Dict[str, Any]:
+		from app.services.report_batch_engine import ReportBatchEngine, ReportRunInProgress
 
 		try:
-			# Get all active users
-			users = db.query(User).all()
-			results["total_users"] = len(users)
-
-			for user in users:
-				try:
-					# Generate weekly report
-					report = self.generate_weekly_report(db, user.id)
-
-					if "error" not in report:
-						results["reports_generated"] += 1
-
-						# Send email if user has email
-						if user.email:
-							if self.send_report_email(report, user.email):
-								results["emails_sent"] += 1
-							else:
-								results["errors"].append(f"Failed to send email to {user.username}")
-						else:
-							results["errors"].append(f"No email address for user {user.username}")
-					else:
-						results["errors"].append(f"Failed to generate report for {user.username}: {report['error']}")
-
-				except Exception as e:
-					results["errors"].append(f"Error processing user {user.username}: {e!s}")
-
-			logger.info(f"Weekly reports completed: {results}")
-			return results
+			results = await ReportBatchEngine(self).run(report_type, force=force)
+		except ReportRunInProgress as e:
+			# Started while another run of the period was going; that run sends every report
+			logger.warning(f"Skipping {report_type} reports: {e}")
+			return {"status": "already_running"}
+		logger.info(f"{report_type.title()} reports completed: {results}")
+		return results
 
-		except Exception as e:
-			logger.error(f"Failed to schedule weekly reports: {e!s}")
-			results["errors"].append(f"Scheduling error: {e!s}")
-			return results
+	def get_completed_report_run(self, report_type: str) -> Optional[Dict[str, Any]]:
+		"""Results of this period's bulk report_type run if it already completed"""
+		from app.services.report_batch_engine import ReportBatchEngine
 
-	def schedule_monthly_reports(self, db: Session) -> Dict[str, Any]:
-		"""Generate and send monthly reports for all users"""
-		results = {"total_users": 0, "reports_generated": 0, "emails_sent": 0, "errors": []}
+		return ReportBatchEngine(self).completed_results(report_type)
 
-		try:
-			# Get all active users
-			users = db.query(User).all()
-			results["total_users"] = len(users)
-
-			for user in users:
-				try:
-					# Generate monthly report
-					report = self.generate_monthly_report(db, user.id)
-
-					if "error" not in report:
-						results["reports_generated"] += 1
-
-						# Send email if user has email
-						if user.email:
-							if self.send_report_email(report, user.email):
-								results["emails_sent"] += 1
-							else:
-								results["errors"].append(f"Failed to send email to {user.username}")
-						else:
-							results["errors"].append(f"No email address for user {user.username}")
-					else:
-						results["errors"].append(f"Failed to generate report for {user.username}: {report['error']}")
-
-				except Exception as e:
-					results["errors"].append(f"Error processing user {user.username}: {e!s}")
-
-			logger.info(f"Monthly reports completed: {results}")
-			return results
+	def is_report_run_in_progress(self, report_type: str) -> bool:
+		"""Whether this period's bulk report_type run is going on right now, in any process"""
+		from app.services.report_batch_engine import ReportBatchEngine
 
-		except Exception as e:
-			logger.error(f"Failed to schedule monthly reports: {e!s}")
-			results["errors"].append(f"Scheduling error: {e!s}")
-			return results
+		return ReportBatchEngine(self).is_running(report_type)
 
 	# Helper methods
 
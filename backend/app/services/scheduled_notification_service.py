@@ -10,7 +10,6 @@ Consolidation note (Phase 1):
 	to a per-request instance of `ScheduledNotificationService`.
 """
 
-import asyncio
 from datetime import datetime, time, timedelta
 from typing import Any, Dict, List
 
@@ -198,84 +197,25 @@ class ScheduledNotificationService:
 
 	async def send_bulk_morning_briefings(self, db: Session) -> Dict[str, Any]:
 		"""Send morning briefings to all eligible users"""
-
-		# Get all active users who should receive morning briefings
-		eligible_users = self._get_eligible_users_for_morning_briefing(db)
-
-		results = {"total_eligible": len(eligible_users), "sent": 0, "failed": 0, "opted_out": 0, "errors": []}
-
-		# Send briefings concurrently (but with rate limiting)
-		semaphore = asyncio.Semaphore(5)  # Limit concurrent sends
-
-		async def send_briefing_with_semaphore(user_id: int):
-			async with semaphore:
-				result = await self.send_morning_briefing(user_id, db)
-				return result
-
-		# Create tasks for all users
-		tasks = [send_briefing_with_semaphore(user.id) for user in eligible_users]
-
-		# Execute all tasks
-		briefing_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-		# Process results
-		for i, result in enumerate(briefing_results):
-			if isinstance(result, Exception):
-				results["failed"] += 1
-				results["errors"].append({"user_id": eligible_users[i].id, "error": str(result)})
-			elif result["success"]:
-				results["sent"] += 1
-			elif result.get("error") == "user_opted_out":
-				results["opted_out"] += 1
-			else:
-				results["failed"] += 1
-				results["errors"].append({"user_id": result["user_id"], "error": result.get("message", "Unknown error")})
-
+		results = await self._get_bulk_pipeline(db).run("morning_briefing")
 		logger.info(f"Bulk morning briefings completed: {results['sent']} sent, {results['failed']} failed, {results['opted_out']} opted out")
 		return results
 
 	async def send_bulk_evening_updates(self, db: Session) -> Dict[str, Any]:
 		"""Send evening updates to all eligible users"""
-
-		# Get all active users who should receive evening updates
-		eligible_users = self._get_eligible_users_for_evening_update(db)
-
-		results = {"total_eligible": len(eligible_users), "sent": 0, "failed": 0, "opted_out": 0, "no_activity": 0, "errors": []}
-
-		# Send updates concurrently (but with rate limiting)
-		semaphore = asyncio.Semaphore(5)  # Limit concurrent sends
-
-		async def send_update_with_semaphore(user_id: int):
-			async with semaphore:
-				result = await self.send_evening_update(user_id, db)
-				return result
-
-		# Create tasks for all users
-		tasks = [send_update_with_semaphore(user.id) for user in eligible_users]
-
-		# Execute all tasks
-		update_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-		# Process results
-		for i, result in enumerate(update_results):
-			if isinstance(result, Exception):
-				results["failed"] += 1
-				results["errors"].append({"user_id": eligible_users[i].id, "error": str(result)})
-			elif result["success"]:
-				results["sent"] += 1
-			elif result.get("error") == "user_opted_out":
-				results["opted_out"] += 1
-			elif result.get("error") == "no_activity_today":
-				results["no_activity"] += 1
-			else:
-				results["failed"] += 1
-				results["errors"].append({"user_id": result["user_id"], "error": result.get("message", "Unknown error")})
-
+		results = await self._get_bulk_pipeline(db).run("evening_update")
 		logger.info(
 			f"Bulk evening updates completed: {results['sent']} sent, {results['failed']} failed, {results['opted_out']} opted out, {results['no_activity']} no activity"
 		)
 		return results
 
+	def _get_bulk_pipeline(self, db: Session):
+		from .bulk_notification_pipeline import BulkNotificationPipeline
+		from .email_service import email_service
+
+		# The shared EmailService keeps one rate-limit window and compiled template cache across runs
+		return BulkNotificationPipeline(self, db, email_service)
+
 	def _should_send_morning_briefing(self, user: User) -> bool:
 		"""Check if user should receive morning briefing based on preferences"""
 		notifications = user.settings.get("notifications", {})
@@ -295,6 +235,7 @@ class ScheduledNotificationService:
 
 			# Allow sending within 2 hours of preferred time
 			time_diff = abs((current_time.hour * 60 + current_time.minute) - (preferred_time_obj.hour * 60 + preferred_time_obj.minute))
+			time_diff = min(time_diff, 24 * 60 - time_diff)  # Across midnight
 
 			if time_diff > 120:	 # More than 2 hours difference
 				return False
@@ -342,6 +283,7 @@ class ScheduledNotificationService:
 
 			# Allow sending within 2 hours of preferred time
 			time_diff = abs((current_time.hour * 60 + current_time.minute) - (preferred_time_obj.hour * 60 + preferred_time_obj.minute))
+			time_diff = min(time_diff, 24 * 60 - time_diff)  # Across midnight
 
 			if time_diff > 120:	 # More than 2 hours difference
 				return False
@@ -370,32 +312,6 @@ class ScheduledNotificationService:
 
 		return True
 
-	def _get_eligible_users_for_morning_briefing(self, db: Session) -> List[User]:
-		"""Get all users eligible for morning briefing"""
-		# Get all active users
-		users = db.query(User).filter(User.is_active == True).all()
-
-		# Filter based on preferences
-		eligible_users = []
-		for user in users:
-			if self._should_send_morning_briefing(user):
-				eligible_users.append(user)
-
-		return eligible_users
-
-	def _get_eligible_users_for_evening_update(self, db: Session) -> List[User]:
-		"""Get all users eligible for evening update"""
-		# Get all active users
-		users = db.query(User).filter(User.is_active == True).all()
-
-		# Filter based on preferences
-		eligible_users = []
-		for user in users:
-			if self._should_send_evening_update(user):
-				eligible_users.append(user)
-
-		return eligible_users
-
 	def _get_user_name(self, user: User) -> str:
 		"""Extract user name from profile or email"""
 		profile = user.profile or {}
@@ -413,30 +329,27 @@ class ScheduledNotificationService:
 			# Use the recommendation service to get top recommendations
 			recommendations = await self._get_recommendation_service(db).get_recommendations(db=db, user_id=user_id, limit=5)
 			# Format recommendations for email template
-			formatted_recommendations = []
-			for rec in recommendations:
-				formatted_recommendations.append(
-					{
-						"id": rec.get("job_id"),
-						"title": rec.get("title", "Unknown Position"),
-						"company": rec.get("company", "Unknown Company"),
-						"location": rec.get("location", "Location not specified"),
-						"match_score": rec.get("match_score", 0.75),
-						"skills": rec.get("required_skills", [])[:5],
-						"description": rec.get("description", "")[:200] + "..."
-						if len(rec.get("description", "")) > 200
-						else rec.get("description", ""),
-						"explanation": rec.get("match_explanation", "This job matches your skills and preferences"),
-						"application_url": rec.get("application_url"),
-					}
-				)
-
-			return formatted_recommendations
+			return [self._format_recommendation(rec) for rec in recommendations]
 
 		except Exception as e:
 			logger.error(f"Error getting morning recommendations for user {user_id}: {e}")
 			return []
 
+	def _format_recommendation(self, rec: Dict[str, Any]) -> Dict[str, Any]:
+		"""Format one recommendation for the email template"""
+		description = rec.get("description") or ""
+		return {
+			"id": rec.get("job_id"),
+			"title": rec.get("title", "Unknown Position"),
+			"company": rec.get("company", "Unknown Company"),
+			"location": rec.get("location") or "Location not specified",
+			"match_score": rec.get("match_score", 0.75),
+			"skills": (rec.get("required_skills") or [])[:5],
+			"description": description[:200] + "..." if len(description) > 200 else description,
+			"explanation": rec.get("match_explanation", "This job matches your skills and preferences"),
+			"application_url": rec.get("application_url"),
+		}
+
 	async def _get_user_progress(self, user_id: int, db: Session) -> Dict[str, Any]:
 		"""Get user progress data for morning briefing"""
 		try:
@@ -453,23 +366,27 @@ class ScheduledNotificationService:
 				db.query(Application).filter(and_(Application.user_id == user_id, Application.status.in_(["interview", "offer", "rejected"]))).count()
 			)
 
-			response_rate = (responses / total_applications * 100) if total_applications > 0 else 0
-
-			# Calculate goal completion (assume weekly goal of 5 applications)
-			weekly_goal = 5
-			goal_completion = min((applications_this_week / weekly_goal) * 100, 100)
-
-			return {
-				"applications_this_week": applications_this_week,
-				"interviews_scheduled": 0,	# Placeholder - would need interview tracking
-				"response_rate": round(response_rate, 1),
-				"goal_completion": round(goal_completion, 1),
-			}
+			return self._build_progress(applications_this_week, total_applications, responses)
 
 		except Exception as e:
 			logger.error(f"Error getting user progress for user {user_id}: {e}")
 			return {}
 
+	def _build_progress(self, applications_this_week: int, total_applications: int, responses: int) -> Dict[str, Any]:
+		"""Progress section of the morning briefing from application counts"""
+		response_rate = (responses / total_applications * 100) if total_applications > 0 else 0
+
+		# Calculate goal completion (assume weekly goal of 5 applications)
+		weekly_goal = 5
+		goal_completion = min((applications_this_week / weekly_goal) * 100, 100)
+
+		return {
+			"applications_this_week": applications_this_week,
+			"interviews_scheduled": 0,	# Placeholder - would need interview tracking
+			"response_rate": round(response_rate, 1),
+			"goal_completion": round(goal_completion, 1),
+		}
+
 	async def _get_daily_goals(self, user_id: int, db: Session) -> Dict[str, Any]:
 		"""Get daily goals for user"""
 		try:
@@ -480,19 +397,23 @@ class ScheduledNotificationService:
 				.count()
 			)
 
-			# Suggest goals based on recent activity
-			daily_target = max(1, recent_applications // 7 + 1)
-
-			return {
-				"applications_target": daily_target,
-				"networking_target": 2,
-				"skill_focus": "Python",  # Would be personalized based on skill gaps
-			}
+			return self._build_daily_goals(recent_applications)
 
 		except Exception as e:
 			logger.error(f"Error getting daily goals for user {user_id}: {e}")
 			return {}
 
+	def _build_daily_goals(self, recent_applications: int) -> Dict[str, Any]:
+		"""Daily goals from the number of applications in the last 7 days"""
+		# Suggest goals based on recent activity
+		daily_target = max(1, recent_applications // 7 + 1)
+
+		return {
+			"applications_target": daily_target,
+			"networking_target": 2,
+			"skill_focus": "Python",  # Would be personalized based on skill gaps
+		}
+
 	async def _get_market_insights(self, user_id: int, db: Session) -> Dict[str, Any]:
 		"""Get market insights for user's field"""
 		try:
@@ -501,21 +422,23 @@ class ScheduledNotificationService:
 			if not user:
 				return {}
 
-			user_skills = user.profile.get("skills", [])
-
-			# Mock market insights - in real implementation, this would come from market analysis service
-			trending_skills = ["Python", "React", "AWS", "Docker", "Kubernetes", "TypeScript", "GraphQL", "MongoDB"]
-
-			return {
-				"trending_skills": trending_skills[:6],
-				"salary_trend": "Software engineer salaries increased by 8% this quarter in your area",
-				"job_market_activity": "Job postings in tech increased by 15% this week",
-			}
+			return self._build_market_insights()
 
 		except Exception as e:
 			logger.error(f"Error getting market insights for user {user_id}: {e}")
 			return {}
 
+	def _build_market_insights(self) -> Dict[str, Any]:
+		"""Market insights; not yet personalized, so the same for every user"""
+		# Mock market insights - in real implementation, this would come from market analysis service
+		trending_skills = ["Python", "React", "AWS", "Docker", "Kubernetes", "TypeScript", "GraphQL", "MongoDB"]
+
+		return {
+			"trending_skills": trending_skills[:6],
+			"salary_trend": "Software engineer salaries increased by 8% this quarter in your area",
+			"job_market_activity": "Job postings in tech increased by 15% this week",
+		}
+
 	async def _get_daily_activity(self, user_id: int, db: Session) -> Dict[str, Any]:
 		"""Get user's daily activity for evening update"""
 		try:
@@ -524,15 +447,6 @@ class ScheduledNotificationService:
 			# Get today's applications
 			applications_today = db.query(Application).filter(and_(Application.user_id == user_id, Application.applied_date == today)).all()
 
-			# Get jobs viewed today (would need view tracking)
-			jobs_viewed = 0	 # Placeholder
-
-			# Get profiles updated (would need update tracking)
-			profiles_updated = 0  # Placeholder
-
-			# Calculate time spent (would need activity tracking)
-			time_spent_minutes = len(applications_today) * 15  # Estimate 15 min per application
-
 			# Get application details
 			applications_details = []
 			for app in applications_today:
@@ -548,25 +462,38 @@ class ScheduledNotificationService:
 				db.query(Application).filter(and_(Application.user_id == user_id, Application.applied_date >= week_start.date())).count()
 			)
 
-			return {
-				"applications_sent": len(applications_today),
-				"jobs_viewed": jobs_viewed,
-				"profiles_updated": profiles_updated,
-				"time_spent_minutes": time_spent_minutes,
-				"goal_achievement": min((len(applications_today) / 2) * 100, 100),	# Assume daily goal of 2
-				"applications_details": applications_details,
-				"weekly_progress": {
-					"applications": weekly_applications,
-					"responses": 0,	 # Placeholder
-					"interviews": 0,  # Placeholder
-					"streak_days": min(7, weekly_applications),	 # Simplified streak calculation
-				},
-			}
+			return self._build_daily_activity(len(applications_today), applications_details, weekly_applications)
 
 		except Exception as e:
 			logger.error(f"Error getting daily activity for user {user_id}: {e}")
 			return {}
 
+	def _build_daily_activity(self, applications_sent: int, applications_details: List[Dict[str, Any]], weekly_applications: int) -> Dict[str, Any]:
+		"""Daily activity section of the evening update"""
+		# Get jobs viewed today (would need view tracking)
+		jobs_viewed = 0	 # Placeholder
+
+		# Get profiles updated (would need update tracking)
+		profiles_updated = 0  # Placeholder
+
+		# Calculate time spent (would need activity tracking)
+		time_spent_minutes = applications_sent * 15  # Estimate 15 min per application
+
+		return {
+			"applications_sent": applications_sent,
+			"jobs_viewed": jobs_viewed,
+			"profiles_updated": profiles_updated,
+			"time_spent_minutes": time_spent_minutes,
+			"goal_achievement": min((applications_sent / 2) * 100, 100),	# Assume daily goal of 2
+			"applications_details": applications_details,
+			"weekly_progress": {
+				"applications": weekly_applications,
+				"responses": 0,	 # Placeholder
+				"interviews": 0,  # Placeholder
+				"streak_days": min(7, weekly_applications),	 # Simplified streak calculation
+			},
+		}
+
 	def _has_meaningful_activity(self, daily_activity: Dict[str, Any]) -> bool:
 		"""Check if user had meaningful activity today"""
 		applications_sent = daily_activity.get("applications_sent", 0)
@@ -579,42 +506,47 @@ class ScheduledNotificationService:
 	async def _get_daily_achievements(self, user_id: int, db: Session) -> List[Dict[str, Any]]:
 		"""Get user's achievements for today"""
 		try:
-			achievements = []
 			today = datetime.now().date()
 
 			# Check for application milestones
 			applications_today = db.query(Application).filter(and_(Application.user_id == user_id, Application.applied_date == today)).count()
 
-			if applications_today >= 3:
-				achievements.append(
-					{
-						"title": "Application Streak! 🔥",
-						"description": f"You applied to {applications_today} jobs today",
-						"impact": "Increased visibility to potential employers",
-					}
-				)
-
 			# Check for weekly milestones
 			week_start = datetime.now() - timedelta(days=datetime.now().weekday())
 			weekly_applications = (
 				db.query(Application).filter(and_(Application.user_id == user_id, Application.applied_date >= week_start.date())).count()
 			)
 
-			if weekly_applications >= 5:
-				achievements.append(
-					{
-						"title": "Weekly Goal Achieved! 🎯",
-						"description": f"You've applied to {weekly_applications} jobs this week",
-						"impact": "On track for strong job search momentum",
-					}
-				)
-
-			return achievements
+			return self._build_achievements(applications_today, weekly_applications)
 
 		except Exception as e:
 			logger.error(f"Error getting daily achievements for user {user_id}: {e}")
 			return []
 
+	def _build_achievements(self, applications_today: int, weekly_applications: int) -> List[Dict[str, Any]]:
+		"""Achievements unlocked by today's and this week's application counts"""
+		achievements = []
+
+		if applications_today >= 3:
+			achievements.append(
+				{
+					"title": "Application Streak! 🔥",
+					"description": f"You applied to {applications_today} jobs today",
+					"impact": "Increased visibility to potential employers",
+				}
+			)
+
+		if weekly_applications >= 5:
+			achievements.append(
+				{
+					"title": "Weekly Goal Achieved! 🎯",
+					"description": f"You've applied to {weekly_applications} jobs this week",
+					"impact": "On track for strong job search momentum",
+				}
+			)
+
+		return achievements
+
 	async def _get_tomorrow_plan(self, user_id: int, db: Session) -> Dict[str, Any]:
 		"""Get tomorrow's action plan for user"""
 		try:
@@ -641,22 +573,25 @@ class ScheduledNotificationService:
 
 			# Get priority applications (new jobs that match well)
 			priority_jobs = await self._get_morning_recommendations(user_id, db)
-			priority_applications = priority_jobs[:3] if priority_jobs else []
-
-			return {
-				"priority_applications": priority_applications,
-				"follow_ups": follow_ups,
-				"skill_development": {"activity": "Complete online course module", "skill": "React", "resource": "FreeCodeCamp React Course"},
-				"networking": {
-					"activity": "Connect with 2 professionals in your field",
-					"suggestions": ["Comment on LinkedIn posts in your industry", "Join a relevant professional group discussion"],
-				},
-			}
+
+			return self._build_tomorrow_plan(follow_ups, priority_jobs)
 
 		except Exception as e:
 			logger.error(f"Error getting tomorrow plan for user {user_id}: {e}")
 			return {}
 
+	def _build_tomorrow_plan(self, follow_ups: List[Dict[str, Any]], priority_jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+		"""Tomorrow's plan from pending follow-ups and the user's top recommendations"""
+		return {
+			"priority_applications": priority_jobs[:3] if priority_jobs else [],
+			"follow_ups": follow_ups,
+			"skill_development": {"activity": "Complete online course module", "skill": "React", "resource": "FreeCodeCamp React Course"},
+			"networking": {
+				"activity": "Connect with 2 professionals in your field",
+				"suggestions": ["Comment on LinkedIn posts in your industry", "Join a relevant professional group discussion"],
+			},
+		}
+
 	def _get_motivational_message(self, daily_activity: Dict[str, Any], achievements: List[Dict[str, Any]]) -> str:
 		"""Get personalized motivational message"""
 		applications_sent = daily_activity.get("applications_sent", 0)
@@ -673,22 +608,26 @@ class ScheduledNotificationService:
 	async def _update_last_notification_time(self, user: User, notification_type: str, db: Session):
 		"""Update user's last notification timestamp"""
 		try:
-			settings = user.settings.copy()
-			notifications = settings.get("notifications", {})
-
-			if notification_type == "morning_briefing":
-				notifications["last_morning_briefing"] = datetime.now().isoformat()
-			elif notification_type == "evening_update":
-				notifications["last_evening_update"] = datetime.now().isoformat()
-
-			settings["notifications"] = notifications
-			user.settings = settings
+			user.settings = self._with_last_notification_time(user.settings, notification_type, datetime.now())
 			db.commit()
 
 		except Exception as e:
 			logger.error(f"Error updating last notification time for user {user.id}: {e}")
 			db.rollback()
 
+	def _with_last_notification_time(self, settings: Dict[str, Any], notification_type: str, sent_at: datetime) -> Dict[str, Any]:
+		"""Copy of the user's settings with the last sent time of a notification type set"""
+		settings = dict(settings or {})
+		notifications = dict(settings.get("notifications", {}))
+
+		if notification_type == "morning_briefing":
+			notifications["last_morning_briefing"] = sent_at.isoformat()
+		elif notification_type == "evening_update":
+			notifications["last_evening_update"] = sent_at.isoformat()
+
+		settings["notifications"] = notifications
+		return settings
+
 	# User preference management methods
 
 	async def update_user_notification_preferences(self, user_id: int, preferences: Dict[str, Any], db: Session) -> Dict[str, Any]:
@@ -0,0 +1,150 @@
+"""
+Shared Scrape Query Planner
+
+Plans one cross-user scrape instead of one scrape per user:
+- Canonicalizes every user's keywords and locations into (keywords, location, source) queries
+- Deduplicates the queries so each distinct search hits the job boards once
+- Caches raw query results with a TTL so overlapping runs reuse them
+- Fans each query's postings out to every user who asked for it
+
+Outbound HTTP calls scale with the number of distinct queries rather than the number of users.
+"""
+
+import asyncio
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.logging import get_logger
+from app.models.user import User
+from app.services.job_scraping_service import JobScrapingService
+
+logger = get_logger(__name__)
+
+# Cache key prefix and default TTL for raw query results
+SCRAPE_QUERY_CACHE_PREFIX = "scrape_query"
+SCRAPE_QUERY_CACHE_TTL = 6 * 3600
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def canonicalize_term(term: Optional[str]) -> str:
+	"""Lowercase, trim and collapse whitespace so equivalent search terms compare equal"""
+	return _WHITESPACE_RE.sub(" ", (term or "").strip().lower())
+
+
+@dataclass(frozen=True)
+class ScrapeQuery:
+	"""A single canonical search shared by every user who needs it"""
+
+	keywords: str
+	location: str
+	source: str
+
+	@property
+	def cache_key(self) -> str:
+		digest = hashlib.md5(f"{self.source}|{self.keywords}|{self.location}".encode()).hexdigest()
+		return f"{SCRAPE_QUERY_CACHE_PREFIX}:{digest}"
+
+
+class ScrapeQueryPlanner:
+	"""Plans, executes and fans out deduplicated scrape queries across users"""
+
+	def __init__(
+		self,
+		scraping_service: JobScrapingService,
+		cache_service: Any,
+		cache_ttl: int = SCRAPE_QUERY_CACHE_TTL,
+		max_keywords_per_user: int = 3,
+		max_results_per_query: int = 25,
+		max_concurrent_queries: int = 2,
+	):
+		self.scraping_service = scraping_service
+		self.cache_service = cache_service
+		self.cache_ttl = cache_ttl
+		self.max_keywords_per_user = max_keywords_per_user
+		self.max_results_per_query = max_results_per_query
+		self.max_concurrent_queries = max_concurrent_queries
+		self.stats = {"distinct_queries": 0, "user_queries": 0, "cache_hits": 0, "queries_executed": 0, "query_errors": 0}
+
+	@property
+	def source(self) -> str:
+		"""Identify the enabled scraper set so cached results never mix configurations"""
+		return "+".join(sorted(self.scraping_service._get_scraper_manager().get_available_scrapers())) or "none"
+
+	def queries_for_user(self, user: User, source: str) -> Set[ScrapeQuery]:
+		"""Canonical queries for one user, derived the same way as per-user ingestion"""
+		search_params = self.scraping_service._extract_search_params(user)
+
+		keywords: List[str] = []
+		for keyword in search_params.get("keywords", []):
+			canonical = canonicalize_term(keyword)
+			if canonical and canonical not in keywords:
+				keywords.append(canonical)
+
+		locations = {canonicalize_term(location) for location in search_params.get("locations", [])} or {""}
+
+		return {ScrapeQuery(keywords=k, location=loc, source=source) for k in keywords[: self.max_keywords_per_user] for loc in locations}
+
+	def plan(self, users: Iterable[User]) -> Dict[ScrapeQuery, Set[int]]:
+		"""Map each distinct query to the ids of the users who need it"""
+		source = self.source
+		plan: Dict[ScrapeQuery, Set[int]] = {}
+
+		for user in users:
+			user_queries = self.queries_for_user(user, source)
+			self.stats["user_queries"] += len(user_queries)
+			for query in user_queries:
+				plan.setdefault(query, set()).add(user.id)
+
+		self.stats["distinct_queries"] = len(plan)
+		logger.info(f"Planned {len(plan)} distinct scrape queries from {self.stats['user_queries']} per-user queries")
+		return plan
+
+	async def execute(self, queries: Iterable[ScrapeQuery]) -> Dict[ScrapeQuery, List[Dict[str, Any]]]:
+		"""Run each query once, serving repeats from the TTL cache"""
+		semaphore = asyncio.Semaphore(self.max_concurrent_queries)
+
+		async def run(query: ScrapeQuery) -> Tuple[ScrapeQuery, List[Dict[str, Any]]]:
+			cached = self.cache_service.get(query.cache_key)
+			if cached is not None:
+				self.stats["cache_hits"] += 1
+				return query, cached
+
+			async with semaphore:
+				try:
+					jobs = await self.scraping_service._get_scraper_manager().search_all_sites(
+						keywords=query.keywords, location=query.location, max_total_results=self.max_results_per_query
+					)
+				except Exception as e:
+					logger.error(f"Error executing scrape query '{query.keywords}' in '{query.location}': {e!r}")
+					self.stats["query_errors"] += 1
+					return query, []
+
+			self.stats["queries_executed"] += 1
+			raw_jobs = [job.model_dump(mode="json") if hasattr(job, "model_dump") else job for job in jobs]
+			self.cache_service.set(query.cache_key, raw_jobs, ttl=self.cache_ttl)
+			return query, raw_jobs
+
+		return dict(await asyncio.gather(*(run(query) for query in queries)))
+
+	def fan_out(self, plan: Dict[ScrapeQuery, Set[int]], results: Dict[ScrapeQuery, List[Dict[str, Any]]]) -> Dict[int, List[Dict[str, Any]]]:
+		"""Collect each user's postings from their queries, dropping cross-query repeats"""
+		jobs_by_user: Dict[int, List[Dict[str, Any]]] = {}
+		seen_by_user: Dict[int, Set[Tuple[str, str, str]]] = {}
+
+		for query, user_ids in plan.items():
+			for job in results.get(query, []):
+				key = (
+					canonicalize_term(job.get("application_url") or job.get("url")),
+					canonicalize_term(job.get("title")),
+					canonicalize_term(job.get("company")),
+				)
+				for user_id in user_ids:
+					seen = seen_by_user.setdefault(user_id, set())
+					if key not in seen:
+						seen.add(key)
+						jobs_by_user.setdefault(user_id, []).append(job)
+
+		return jobs_by_user
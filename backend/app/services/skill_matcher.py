@@ -0,0 +1,131 @@
+"""
+Compiled Skill Matcher
+
+Finds every vocabulary term in a text with a single compiled regex pass instead
+of one re.search per term:
+- One alternation (longest surface first) inside a lookahead, so overlapping
+  terms such as "unit testing" and "testing" are all reported
+- Shorter terms that are prefixes of a longer match are checked directly
+- Aliases/synonyms map to their canonical vocabulary term
+- A batch API scans many documents in one pass
+
+Terms match on word boundaries: the characters on either side of a term must
+not be word characters, which also works for terms like "c++" and "c#".
+"""
+
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+# Common alternative spellings, keyed by alias and mapped to the canonical term
+SKILL_ALIASES: Dict[str, str] = {
+	"golang": "go",
+	"k8s": "kubernetes",
+	"postgres": "postgresql",
+	"nodejs": "node.js",
+	"reactjs": "react",
+	"react.js": "react",
+	"vuejs": "vue",
+	"vue.js": "vue",
+	"angularjs": "angular",
+	"nextjs": "next.js",
+	"sklearn": "scikit-learn",
+	"scikit learn": "scikit-learn",
+	"tf.keras": "keras",
+	"pyspark": "spark",
+	"amazon web services": "aws",
+	"google cloud platform": "gcp",
+	"microsoft azure": "azure",
+	"sql server": "mssql",
+	"powerbi": "power bi",
+	"cicd": "ci/cd",
+	"ci-cd": "ci/cd",
+	"elastic search": "elasticsearch",
+	"dotnet": "asp.net",
+	"gitlab ci": "gitlab",
+}
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+class SkillMatcher:
+	"""Single-pass matcher for a fixed skill vocabulary"""
+
+	def __init__(self, vocabulary: Iterable[str], aliases: Optional[Dict[str, str]] = None):
+		"""
+		Build the matcher once from a vocabulary
+
+		Args:
+		    vocabulary: Canonical terms; matching is case-insensitive and results use these spellings
+		    aliases: Alternative spellings mapped to canonical terms; aliases whose target is not in
+		        the vocabulary are ignored
+		"""
+		self.canonical: Dict[str, str] = {}
+		for term in vocabulary:
+			if term and term.strip():
+				self.canonical.setdefault(term.strip().lower(), term)
+
+		for alias, target in (aliases or {}).items():
+			canonical = self.canonical.get(target.lower())
+			if canonical is not None:
+				self.canonical.setdefault(alias.lower(), canonical)
+
+		surfaces = sorted(self.canonical, key=len, reverse=True)
+
+		# Longer surfaces that begin with a shorter one, e.g. "google cloud platform" -> ["google cloud"]
+		self._prefixes: Dict[str, List[str]] = {}
+		for surface in surfaces:
+			prefixes = [other for other in surfaces if len(other) < len(surface) and surface.startswith(other)]
+			if prefixes:
+				self._prefixes[surface] = prefixes
+
+		self._pattern = (
+			re.compile(r"(?<!\w)(?=(" + "|".join(re.escape(surface) for surface in surfaces) + r")(?!\w))") if surfaces else None
+		)
+
+	def _boundary_after(self, text: str, end: int) -> bool:
+		return end >= len(text) or not _WORD_CHAR.match(text[end])
+
+	def _scan(self, text: str):
+		"""Yield (start, surface) for every term occurrence in already-lowercased text"""
+		if self._pattern is None:
+			return
+
+		for match in self._pattern.finditer(text):
+			start, surface = match.start(), match.group(1)
+			yield start, surface
+			for prefix in self._prefixes.get(surface, ()):
+				if self._boundary_after(text, start + len(prefix)):
+					yield start, prefix
+
+	def extract(self, text: Optional[str]) -> Set[str]:
+		"""Canonical terms found in a text"""
+		if not text:
+			return set()
+		return {self.canonical[surface] for _, surface in self._scan(text.lower())}
+
+	def extract_many(self, texts: Iterable[Optional[str]]) -> List[Set[str]]:
+		"""Canonical terms found in each text, scanning all of them in one pass"""
+		texts = list(texts)
+		results: List[Set[str]] = [set() for _ in texts]
+		if not texts:
+			return results
+
+		# Newline separators are non-word characters, so no match can span two documents
+		starts: List[int] = []
+		offset = 0
+		for text in texts:
+			starts.append(offset)
+			offset += len(text or "") + 1
+		corpus = "\n".join((text or "").lower() for text in texts)
+
+		for start, surface in self._scan(corpus):
+			results[bisect_right(starts, start) - 1].add(self.canonical[surface])
+		return results
+
+
+@lru_cache(maxsize=32)
+def get_skill_matcher(vocabulary: FrozenSet[str], use_aliases: bool = True) -> SkillMatcher:
+	"""Get a compiled matcher for a vocabulary, built once per distinct vocabulary"""
+	return SkillMatcher(vocabulary, SKILL_ALIASES if use_aliases else None)
@@ -3,12 +3,13 @@ Skill Matching Service
 Comprehensive skill extraction, matching, and recommendation service
 """
 import logging
-import re
 from collections import Counter
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 from sqlalchemy.orm import Session
 
+from app.services.skill_matcher import get_skill_matcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,6 +41,12 @@ TECH_SKILLS = {
     "testing", "unit testing", "pytest", "jest", "selenium", "automation"
 }
 
+SOFT_SKILLS = {
+    "leadership", "communication", "teamwork", "problem solving",
+    "critical thinking", "time management", "adaptability", "creativity",
+    "attention to detail", "collaboration", "analytical", "strategic thinking"
+}
+
 # Role-specific skill requirements
 ROLE_SKILLS = {
     "data scientist": {
@@ -82,6 +89,8 @@ class SkillMatchingService:
         """Initialize the skill matching service"""
         self.tech_skills = TECH_SKILLS
         self.role_skills = ROLE_SKILLS
+        self.tech_matcher = get_skill_matcher(frozenset(TECH_SKILLS))
+        self.soft_matcher = get_skill_matcher(frozenset(SOFT_SKILLS))
         logger.info("Skill matching service initialized")
     
     def match_skills(
@@ -152,29 +161,33 @@ class SkillMatchingService:
         if not text:
             return []
         
-        text_lower = text.lower()
-        extracted = set()
+        extracted = self.tech_matcher.extract(text)
+        if include_soft_skills:
+            extracted |= self.soft_matcher.extract(text)
         
-        # Extract technical skills
-        for skill in self.tech_skills:
-            # Use word boundaries for better matching
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text_lower):
-                extracted.add(skill)
+        return sorted(extracted)
+    
+    def extract_skills_batch(
+        self,
+        texts: List[str],
+        include_soft_skills: bool = False
+    ) -> List[List[str]]:
+        """
+        Extract technical skills from many texts in one pass
         
-        # Extract soft skills if requested
+        Args:
+            texts: Texts to extract skills from
+            include_soft_skills: Whether to include soft skills
+            
+        Returns:
+            Extracted skills for each text, in input order
+        """
+        extracted = self.tech_matcher.extract_many(texts)
         if include_soft_skills:
-            soft_skills = {
-                "leadership", "communication", "teamwork", "problem solving",
-                "critical thinking", "time management", "adaptability", "creativity",
-                "attention to detail", "collaboration", "analytical", "strategic thinking"
-            }
-            for skill in soft_skills:
-                pattern = r'\b' + re.escape(skill) + r'\b'
-                if re.search(pattern, text_lower):
-                    extracted.add(skill)
+            for skills, soft in zip(extracted, self.soft_matcher.extract_many(texts)):
+                skills |= soft
         
-        return sorted(list(extracted))
+        return [sorted(skills) for skills in extracted]
     
     def suggest_skills(
         self,
@@ -392,9 +405,8 @@ class SkillMatchingService:
             
             # Extract and count skills
             all_skills = []
-            for job in jobs:
-                text = f"{job.title} {job.description} {job.requirements or ''}"
-                skills = self.extract_skills(text)
+            texts = [f"{job.title} {job.description} {job.requirements or ''}" for job in jobs]
+            for skills in self.extract_skills_batch(texts):
                 all_skills.extend(skills)
             
             # Count skill frequencies
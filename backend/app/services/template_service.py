@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from app.core.config import settings
+from app.core.template_cache import get_template_cache, render_many
 from app.models.job import Job
 from app.models.template import DocumentTemplate, GeneratedDocument
 from app.models.user import User
@@ -28,6 +29,13 @@ from sqlalchemy import and_, desc, or_
 from sqlalchemy.orm import Session
 
 
+# Initialize Jinja2 sandboxed environment for secure template rendering
+# Using SandboxedEnvironment to prevent code injection attacks
+_document_jinja_env = SandboxedEnvironment(
+	loader=BaseLoader(), autoescape=select_autoescape(enabled_extensions=("html", "xml"), default_for_string=True)
+)
+
+
 class TemplateService:
 	"""Service for managing document templates and generation"""
 
@@ -38,11 +46,10 @@ class TemplateService:
 		self.templates_dir.mkdir(parents=True, exist_ok=True)
 		self.generated_dir.mkdir(parents=True, exist_ok=True)
 
-		# Initialize Jinja2 sandboxed environment for secure template rendering
-		# Using SandboxedEnvironment to prevent code injection attacks
-		self.jinja_env = SandboxedEnvironment(
-			loader=BaseLoader(), autoescape=select_autoescape(enabled_extensions=("html", "xml"), default_for_string=True)
-		)
+		# Jinja2 sandboxed environment for secure template rendering, shared across instances
+		# so templates compiled into the shared cache stay valid
+		self.jinja_env = _document_jinja_env
+		self.compiled_templates = get_template_cache()
 
 	def create_template(self, user_id: Optional[int], template_data: DocumentTemplateCreate) -> DocumentTemplate:
 		"""Create a new document template"""
@@ -146,6 +153,7 @@ class TemplateService:
 
 		self.db.commit()
 		self.db.refresh(template)
+		self.compiled_templates.invalidate("document", str(template.id))
 
 		return template
 
@@ -166,6 +174,7 @@ class TemplateService:
 		template.updated_at = datetime.now(timezone.utc)
 
 		self.db.commit()
+		self.compiled_templates.invalidate("document", str(template.id))
 
 		return True
 
@@ -364,28 +373,35 @@ class TemplateService:
 
 	def _render_template(self, template: DocumentTemplate, data: Dict[str, Any]) -> str:
 		"""Render template with provided data"""
+		return self.render_template_bulk(template, [data])[0]
+
+	def render_template_bulk(self, template: DocumentTemplate, data_list: List[Dict[str, Any]]) -> List[str]:
+		"""Render one template against each data dict, compiling it once"""
 
 		try:
-			# Create Jinja2 template
-			jinja_template = self.jinja_env.from_string(template.template_content)
-
-			# Prepare template context
-			context = {
-				"user": data.get("user_data", {}),
-				"job": data.get("job_data", {}),
-				"tailored": data.get("tailored_content", {}),
-				"customizations": data.get("customizations", {}),
-				"template_structure": template.template_structure,
-			}
+			# Compiled Jinja2 template, from the shared cache
+			jinja_template = self.compiled_templates.get_template(self.jinja_env, "document", str(template.id), template.template_content)
+
+			# Prepare template contexts
+			contexts = [
+				{
+					"user": data.get("user_data", {}),
+					"job": data.get("job_data", {}),
+					"tailored": data.get("tailored_content", {}),
+					"customizations": data.get("customizations", {}),
+					"template_structure": template.template_structure,
+				}
+				for data in data_list
+			]
 
 			# Render template
-			rendered_html = jinja_template.render(**context)
+			rendered = render_many(jinja_template, contexts)
 
 			# Add CSS styles if provided
 			if template.template_styles:
-				rendered_html = f"<style>{template.template_styles}</style>\n{rendered_html}"
+				rendered = [f"<style>{template.template_styles}</style>\n{rendered_html}" for rendered_html in rendered]
 
-			return rendered_html
+			return rendered
 
 		except Exception as e:
 			raise HTTPException(status_code=500, detail=f"Template rendering failed: {e!s}")
@@ -6,6 +6,9 @@ This service provides comprehensive functionality for:
 - Similarity search for legal precedents
 - Metadata filtering for search results
 - Batch embedding operations for performance
+
+Chroma calls run on a bounded thread pool through ChromaExecutor, which merges concurrent
+searches into multi-query calls and concurrent stores into large add batches.
 """
 
 from __future__ import annotations
@@ -26,6 +29,7 @@ from ..core.config import get_settings
 from ..core.exceptions import VectorStoreError
 from ..core.logging import get_logger
 from .chroma_client import get_chroma_client
+from .chroma_executor import ChromaExecutor
 
 logger = get_logger(__name__)
 
@@ -165,6 +169,8 @@ class VectorStoreService:
 		self.settings = get_settings()
 		self.chroma_client = None
 		self.collections: dict[str, Collection] = {}
+		# Every collection call goes through the executor, off the event loop
+		self.executor = ChromaExecutor()
 
 		# Collection names
 		self.contracts_collection = "contract_embeddings"
@@ -387,8 +393,8 @@ class VectorStoreService:
 					)
 				)
 
-			# Store in ChromaDB (embeddings are generated automatically)
-			collection.add(ids=ids, documents=documents, metadatas=metadatas)
+			# Store in ChromaDB (embeddings are generated automatically); concurrent stores share one add call
+			await self.executor.add(collection, ids=ids, documents=documents, metadatas=metadatas)
 
 			processing_time = (time.time() - start_time) * 1000
 			self._embedding_times.append(processing_time)
@@ -440,8 +446,9 @@ class VectorStoreService:
 				where_clause["created_at"] = {"$gte": start_date.isoformat(), "$lte": end_date.isoformat()}
 
 			# Perform similarity search
-			results = collection.query(
-				query_texts=[query.query_text],
+			results = await self.executor.query(
+				collection,
+				query.query_text,
 				n_results=query.max_results,
 				where=where_clause if where_clause else None,
 				include=["documents", "metadatas", "distances"],
@@ -499,8 +506,8 @@ class VectorStoreService:
 				where_clause = {"jurisdiction": jurisdiction}
 
 			# Perform similarity search
-			results = collection.query(
-				query_texts=[query_text], n_results=max_results, where=where_clause, include=["documents", "metadatas", "distances"]
+			results = await self.executor.query(
+				collection, query_text, n_results=max_results, where=where_clause, include=["documents", "metadatas", "distances"]
 			)
 
 			# Process results
@@ -557,7 +564,7 @@ class VectorStoreService:
 					task = self._process_single_contract(contract_data, request.chunk_size, request.overlap_size)
 					batch_tasks.append(task)
 
-				# Execute batch concurrently
+				# Execute batch concurrently; the executor writes the chunks of the whole batch in large add calls
 				batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
 
 				# Process batch results
@@ -615,11 +622,11 @@ class VectorStoreService:
 			collection = self.collections[self.contracts_collection]
 
 			# Find all embeddings for this contract
-			results = collection.get(where={"contract_id": contract_id}, include=["metadatas"])
+			results = await self.executor.run("get", collection.get, where={"contract_id": contract_id}, include=["metadatas"])
 
 			if results["ids"]:
 				# Delete the embeddings
-				collection.delete(ids=results["ids"])
+				await self.executor.run("delete", collection.delete, batch_size=len(results["ids"]), ids=results["ids"])
 
 				logger.info(f"Deleted {len(results['ids'])} embeddings for contract {contract_id}")
 				return True
@@ -641,7 +648,7 @@ class VectorStoreService:
 
 			# Get collection statistics
 			for collection_name, collection in self.collections.items():
-				count = collection.count()
+				count = await self.executor.run("count", collection.count)
 				stats.collections[collection_name] = count
 
 				if collection_name == self.contracts_collection:
@@ -649,7 +656,7 @@ class VectorStoreService:
 
 					# Get unique contracts count
 					if count > 0:
-						results = collection.get(include=["metadatas"])
+						results = await self.executor.run("get", collection.get, include=["metadatas"])
 						unique_contracts = set()
 						for metadata in results["metadatas"]:
 							unique_contracts.add(metadata["contract_id"])
@@ -669,6 +676,9 @@ class VectorStoreService:
 			total_requests = self._cache_hits + self._cache_misses
 			if total_requests > 0:
 				stats.cache_hit_rate = self._cache_hits / total_requests
+			embedding_cache = getattr(self.chroma_client, "embedding_cache", None)
+			if embedding_cache is not None:
+				stats.cache_hit_rate = embedding_cache.get_stats()["hit_rate"]
 
 			# Estimate storage size (rough calculation)
 			# Assuming 1536 dimensions * 4 bytes per float + metadata overhead
@@ -710,6 +720,7 @@ class VectorStoreService:
 				"average_search_time_ms": stats.average_search_time_ms,
 				"cache_hit_rate": stats.cache_hit_rate,
 				"storage_size_mb": stats.total_storage_size_mb,
+				"executor": self.executor.get_stats(),
 				"timestamp": datetime.now(timezone.utc).isoformat(),
 			}
 
@@ -12,6 +12,7 @@ from app.models.job import Job
 from app.models.user import User
 from app.services.cache_service import get_cache_service
 from app.services.job_scraping_service import JobScrapingService
+from app.services.scrape_query_planner import ScrapeQueryPlanner
 
 logger = get_logger(__name__)
 
@@ -171,7 +172,11 @@ def scrape_jobs_for_user_async(self, user_id: int) -> Dict[str, Any]:
 @celery_app.task(name="app.tasks.job_scraping_tasks.scrape_jobs_for_all_users")
 def scrape_jobs_for_all_users() -> Dict[str, Any]:
 	"""
-	Scrape jobs for all active users
+	Scrape jobs for all active users with one shared scrape
+
+	Every user's skills/locations are planned into a deduplicated set of queries,
+	each query is executed once (or served from cache), and the postings are fanned
+	out to the users who asked for them.
 
 	Returns:
 	    Dictionary with scraping results for all users
@@ -186,35 +191,54 @@ def scrape_jobs_for_all_users() -> Dict[str, Any]:
 			logger.info("No users found with complete profiles for job scraping")
 			return {"status": "success", "users_processed": 0, "message": "No users to process"}
 
+		scraping_service = JobScrapingService(db)
+		planner = ScrapeQueryPlanner(scraping_service, cache_service)
+		plan = planner.plan(users)
+
 		processed_count = 0
-		successful_count = 0
 		failed_count = 0
+		jobs_saved = 0
 
-		for user in users:
-			try:
-				# Submit scraping task for each user
-				result = scrape_jobs_for_user_async.delay(user.id)
+		loop = asyncio.new_event_loop()
+		asyncio.set_event_loop(loop)
+		try:
+			query_results = loop.run_until_complete(planner.execute(plan))
+			jobs_by_user = planner.fan_out(plan, query_results)
 
-				# Don't wait for results to avoid blocking
-				# Results will be processed asynchronously
+			for user in users:
+				try:
+					user_result = loop.run_until_complete(
+						scraping_service.ingest_prefetched_jobs_for_user(user.id, jobs_by_user.get(user.id, []), ["scraper_manager"])
+					)
 
-				processed_count += 1
-				logger.info(f"Submitted job scraping task for user {user.id}")
+					processed_count += 1
+					jobs_saved += user_result["jobs_saved"]
 
-			except Exception as e:
-				logger.error(f"Error submitting scraping task for user {user.id}: {e}")
-				failed_count += 1
+					# Invalidate user cache since new jobs were added
+					if user_result["jobs_saved"] > 0:
+						cache_service.invalidate_user_cache(user.id)
 
-		successful_count = processed_count - failed_count
+					logger.info(f"Fanned out {user_result['jobs_found']} shared jobs to user {user.id}: {user_result['jobs_saved']} new jobs added")
 
-		logger.info(f"Job scraping tasks submitted: {successful_count} successful, {failed_count} failed")
+				except Exception as e:
+					logger.error(f"Error ingesting shared scrape results for user {user.id}: {e}")
+					db.rollback()
+					failed_count += 1
+		finally:
+			loop.close()
+
+		logger.info(
+			f"Shared job scraping completed: {planner.stats['queries_executed']} queries executed, {planner.stats['cache_hits']} served from cache "
+			f"for {len(users)} users ({jobs_saved} jobs saved, {failed_count} users failed)"
+		)
 
 		return {
 			"status": "success",
 			"users_processed": processed_count,
-			"tasks_submitted": successful_count,
 			"failed": failed_count,
 			"total_users": len(users),
+			"jobs_saved": jobs_saved,
+			"query_stats": planner.stats,
 		}
 
 	except Exception as e:
@@ -116,6 +116,11 @@ def run_scrape_jobs():
 	run_async(scrape_jobs())
 
 
+def run_flush_cost_ledger():
+	"""Wrapper function for flush_cost_ledger task"""
+	run_async(flush_cost_ledger())
+
+
 def _get_sync_jobstore_url(database_url: str) -> str:
 	"""Convert async-style URLs to synchronous equivalents for APScheduler."""
 	if database_url.startswith("postgresql+asyncpg"):
@@ -461,6 +466,24 @@ async def record_health_snapshot():
 		logger.error(f"Failed to record health snapshot: {e}", exc_info=True)
 
 
+async def flush_cost_ledger():
+	"""
+	Persist the cost ledger's hourly rollups to llm_cost_rollups.
+	Runs every 15 minutes; the previous hour is re-flushed so its final totals land.
+	"""
+	from ..core.cost_tracker import get_cost_tracker
+
+	db = SessionLocal()
+	try:
+		rows = await get_cost_tracker().ledger.flush(db)
+		logger.info(f"Flushed {rows} LLM cost rollup rows")
+	except Exception as e:
+		logger.error(f"Failed to flush cost ledger: {e}", exc_info=True)
+		db.rollback()
+	finally:
+		db.close()
+
+
 # ============================================================================
 # SCHEDULER MANAGEMENT FUNCTIONS
 # ============================================================================
@@ -518,6 +541,16 @@ def start_scheduler():
 		)
 		logger.info("Registered task: record_health_snapshot (cron: 0 */6 * * *)")
 
+		# Register cost ledger flush - runs every 15 minutes
+		scheduler.add_job(
+			func=run_flush_cost_ledger,
+			trigger=CronTrigger(minute="*/15", timezone=utc),
+			id="flush_cost_ledger",
+			name="LLM Cost Ledger Flush",
+			replace_existing=True,
+		)
+		logger.info("Registered task: flush_cost_ledger (cron: */15 * * * *)")
+
 		# Start the scheduler
 		scheduler.start()
 		logger.info("✅ APScheduler started successfully with all tasks registered.")
@@ -2,7 +2,9 @@
 """
 Backfill Job Fingerprints
 
-This script generates fingerprints for existing jobs that don't have them.
+This script generates fingerprints for existing jobs that don't have them,
+along with the normalized URL and company blocking key used by
+JobDeduplicationService.deduplicate_against_db.
 Useful for migrating existing data to use the new deduplication system.
 """
 
@@ -18,7 +20,7 @@ from datetime import datetime, timezone
 from app.core.database import SessionLocal
 from app.models.job import Job
 from app.services.job_deduplication_service import JobDeduplicationService
-from sqlalchemy import func
+from sqlalchemy import func, or_
 
 
 def backfill_fingerprints(batch_size: int = 1000, dry_run: bool = False):
@@ -42,12 +44,12 @@ def backfill_fingerprints(batch_size: int = 1000, dry_run: bool = False):
 			print("🔍 DRY RUN MODE - No changes will be made")
 			print()
 
-		# Count jobs without fingerprints
-		total_without_fp = db.query(func.count(Job.id)).filter(Job.job_fingerprint.is_(None)).scalar()
+		# Count jobs without fingerprints or dedup lookup keys
+		missing_keys = or_(Job.job_fingerprint.is_(None), Job.dedup_company_key.is_(None))
+		total_jobs = db.query(func.count(Job.id)).scalar()
+		total_without_fp = db.query(func.count(Job.id)).filter(missing_keys).scalar()
 
-		total_with_fp = db.query(func.count(Job.id)).filter(Job.job_fingerprint.isnot(None)).scalar()
-
-		total_jobs = total_without_fp + total_with_fp
+		total_with_fp = total_jobs - total_without_fp
 
 		print(f"📊 Current Status:")
 		print(f"  • Total jobs: {total_jobs:,}")
@@ -64,7 +66,7 @@ def backfill_fingerprints(batch_size: int = 1000, dry_run: bool = False):
 			print()
 
 			# Show sample of jobs that would be updated
-			sample_jobs = db.query(Job).filter(Job.job_fingerprint.is_(None)).limit(5).all()
+			sample_jobs = db.query(Job).filter(missing_keys).limit(5).all()
 
 			print("Sample jobs that would be updated:")
 			for job in sample_jobs:
@@ -82,11 +84,11 @@ def backfill_fingerprints(batch_size: int = 1000, dry_run: bool = False):
 		processed = 0
 		updated = 0
 		errors = 0
-		offset = 0
+		last_id = 0
 
-		while offset < total_without_fp:
-			# Get batch
-			batch = db.query(Job).filter(Job.job_fingerprint.is_(None)).limit(batch_size).offset(offset).all()
+		while processed < total_without_fp:
+			# Get batch (keyset pagination: updated rows drop out of the filter, so OFFSET would skip rows)
+			batch = db.query(Job).filter(missing_keys, Job.id > last_id).order_by(Job.id).limit(batch_size).all()
 
 			if not batch:
 				break
@@ -95,10 +97,8 @@ def backfill_fingerprints(batch_size: int = 1000, dry_run: bool = False):
 
 			for job in batch:
 				try:
-					# Generate fingerprint
-					fingerprint = dedup_service.create_job_fingerprint(job.title, job.company, job.location)
-
-					job.job_fingerprint = fingerprint
+					# Generate fingerprint, normalized URL and company blocking key
+					dedup_service.assign_dedup_keys(job)
 					batch_updated += 1
 
 				except Exception as e:
@@ -120,7 +120,7 @@ def backfill_fingerprints(batch_size: int = 1000, dry_run: bool = False):
 				print(f"❌ Error committing batch: {e}")
 				errors += len(batch)
 
-			offset += batch_size
+			last_id = batch[-1].id
 
 		print()
 		print("=" * 70)
@@ -134,7 +134,7 @@ def backfill_fingerprints(batch_size: int = 1000, dry_run: bool = False):
 		print()
 
 		# Verify
-		remaining = db.query(func.count(Job.id)).filter(Job.job_fingerprint.is_(None)).scalar()
+		remaining = db.query(func.count(Job.id)).filter(missing_keys).scalar()
 
 		if remaining == 0:
 			print("✓ All jobs now have fingerprints!")
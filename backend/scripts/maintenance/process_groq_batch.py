@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Run a GROQ batch request file through the local stand-in
+
+Reads a JSONL file in the OpenAI/GROQ batch format (see app/services/groq_batch.py),
+processes it through the micro-batching scheduler and writes the response JSONL.
+
+Usage:
+    python scripts/maintenance/process_groq_batch.py requests.jsonl responses.jsonl --batch-size 10
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+import argparse
+import asyncio
+
+from app.services.groq_batch import process_batch_file
+from app.services.groq_optimizer import GROQBatchProcessor, GROQOptimizationConfig
+from app.services.groq_service import GROQService
+
+
+async def run(args) -> int:
+	config = GROQOptimizationConfig(batch_size=args.batch_size, batch_timeout=args.batch_timeout, max_pending_requests=args.max_pending)
+	service = GROQService()
+	try:
+		counts = await process_batch_file(args.input, args.output, GROQBatchProcessor(config, service), chunk_size=args.chunk_size)
+	finally:
+		await service.close()
+	print(f"{counts['succeeded']}/{counts['total']} succeeded, {counts['failed']} failed -> {args.output}")
+	return 0 if counts["failed"] == 0 else 1
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Process a GROQ batch JSONL file locally")
+	parser.add_argument("input", help="Request JSONL file")
+	parser.add_argument("output", help="Response JSONL file to write")
+	parser.add_argument("--batch-size", type=int, default=10, help="Requests per micro-batch")
+	parser.add_argument("--batch-timeout", type=float, default=0.5, help="Seconds to wait for a micro-batch to fill")
+	parser.add_argument("--max-pending", type=int, default=200, help="Queued requests before submitters wait")
+	parser.add_argument("--chunk-size", type=int, default=200, help="Request lines read per chunk")
+	args = parser.parse_args()
+
+	sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+	main()
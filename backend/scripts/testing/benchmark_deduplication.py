@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Job Deduplication Strategies
+
+Compares JobDeduplicationService.filter_duplicate_jobs using the
+"pairwise" reference path against the "indexed" (blocked MinHash-LSH)
+engine on synthetic scrape batches:
+1. Generates N jobs with exact, URL and near-duplicate postings mixed in
+2. Indexes a slice of them as pre-existing database jobs
+3. Times both strategies and reports how closely their outputs agree
+
+The pairwise path is quadratic, so it is skipped above --pairwise-max.
+
+Usage:
+    python scripts/testing/benchmark_deduplication.py --sizes 1000 10000 100000
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.job_deduplication_service import DEDUP_STRATEGY_INDEXED, DEDUP_STRATEGY_PAIRWISE, JobDeduplicationService
+
+COMPANY_SYLLABLES = ["ab", "ze", "lan", "do", "ri", "vo", "tek", "sa", "mo", "qu", "in", "fy", "ber", "na", "lux", "or", "pi", "ka", "te", "um"]
+COMPANY_SUFFIXES = ["", " Inc", " GmbH", " Ltd", " SE", " AB", " B.V.", " Technologies", " Labs"]
+SENIORITIES = ["", "Senior ", "Junior ", "Lead ", "Staff ", "Principal "]
+ROLES = [
+	"Software Engineer",
+	"Data Scientist",
+	"Machine Learning Engineer",
+	"Data Engineer",
+	"Backend Developer",
+	"Frontend Developer",
+	"DevOps Engineer",
+	"Product Manager",
+	"Site Reliability Engineer",
+	"Security Engineer",
+]
+SPECIALTIES = ["", " - Backend", " - Payments", " - Platform", " (Remote)", " - Search", " - Growth", " - Infrastructure"]
+LOCATIONS = ["Berlin, Germany", "Amsterdam, Netherlands", "London, UK", "Dublin, Ireland", "Paris, France", "Remote - EU", "Munich, Germany"]
+
+
+def generate_jobs(count: int, duplicate_rate: float = 0.2, seed: int = 42) -> List[Dict[str, Any]]:
+	"""Generate synthetic scraped jobs with a share of duplicates"""
+	rng = random.Random(seed)
+	jobs: List[Dict[str, Any]] = []
+
+	for i in range(count):
+		if jobs and rng.random() < duplicate_rate:
+			original = rng.choice(jobs)
+			kind = rng.choice(("exact", "url", "fuzzy"))
+			if kind == "exact":
+				job = dict(original)
+			elif kind == "url":
+				job = dict(original, title=f"{original['title']} ", application_url=f"{original['application_url']}?utm_source=feed")
+			else:
+				job = dict(original, title=original["title"].replace(" - ", " "), application_url=f"https://jobs.example.com/mirror/{i}")
+		else:
+			company = "".join(rng.choice(COMPANY_SYLLABLES) for _ in range(3)).capitalize() + rng.choice(COMPANY_SUFFIXES)
+			title = f"{rng.choice(SENIORITIES)}{rng.choice(ROLES)}{rng.choice(SPECIALTIES)}"
+			job = {
+				"title": title,
+				"company": company,
+				"location": rng.choice(LOCATIONS),
+				"application_url": f"https://jobs.example.com/{i}",
+			}
+		jobs.append(job)
+
+	rng.shuffle(jobs)
+	return jobs
+
+
+def as_existing_jobs(jobs: List[Dict[str, Any]]) -> List[SimpleNamespace]:
+	"""Wrap job dicts as objects exposing the Job attributes used by the deduplicator"""
+	return [SimpleNamespace(title=j["title"], company=j["company"], location=j["location"], application_url=j["application_url"]) for j in jobs]
+
+
+def run_strategy(
+	service: JobDeduplicationService, strategy: str, jobs: List[Dict[str, Any]], existing: List[SimpleNamespace]
+) -> Tuple[float, List[Dict[str, Any]], Dict[str, Any]]:
+	start = time.perf_counter()
+	unique_jobs, stats = service.filter_duplicate_jobs(jobs, existing, strict_mode=False, strategy=strategy)
+	return time.perf_counter() - start, unique_jobs, stats
+
+
+def benchmark(sizes: List[int], pairwise_max: int, existing_ratio: float) -> None:
+	service = JobDeduplicationService(db=None)
+
+	print(f"{'jobs':>8} {'existing':>9} {'pairwise (s)':>13} {'indexed (s)':>12} {'speedup':>8} {'unique p/i':>15} {'agreement':>10}")
+	print("-" * 82)
+
+	for size in sizes:
+		existing_count = int(size * existing_ratio)
+		pool = generate_jobs(size + existing_count)
+		existing = as_existing_jobs(pool[:existing_count])
+		jobs = pool[existing_count:]
+
+		indexed_time, indexed_unique, _ = run_strategy(service, DEDUP_STRATEGY_INDEXED, jobs, existing)
+
+		pairwise_time: Optional[float] = None
+		pairwise_unique: Optional[List[Dict[str, Any]]] = None
+		if size <= pairwise_max:
+			pairwise_time, pairwise_unique, _ = run_strategy(service, DEDUP_STRATEGY_PAIRWISE, jobs, existing)
+
+		if pairwise_unique is not None:
+			pairwise_ids = {id(j) for j in pairwise_unique}
+			indexed_ids = {id(j) for j in indexed_unique}
+			agreement = f"{len(pairwise_ids & indexed_ids) / max(1, len(pairwise_ids | indexed_ids)):.2%}"
+			speedup = f"{pairwise_time / indexed_time:.1f}x"
+			pairwise_col = f"{pairwise_time:.2f}"
+			unique_col = f"{len(pairwise_unique)}/{len(indexed_unique)}"
+		else:
+			agreement = speedup = pairwise_col = "skipped"
+			unique_col = f"-/{len(indexed_unique)}"
+
+		print(f"{size:>8} {existing_count:>9} {pairwise_col:>13} {indexed_time:>12.2f} {speedup:>8} {unique_col:>15} {agreement:>10}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Benchmark pairwise vs indexed job deduplication")
+	parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="Batch sizes to benchmark")
+	parser.add_argument("--pairwise-max", type=int, default=1_000, help="Largest batch to run through the quadratic pairwise path")
+	parser.add_argument("--existing-ratio", type=float, default=0.5, help="Existing DB jobs as a fraction of the batch size")
+	args = parser.parse_args()
+
+	benchmark(args.sizes, args.pairwise_max, args.existing_ratio)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Skill Extraction
+
+Compares the legacy per-term extractor (one regex search per vocabulary entry)
+against the compiled SkillMatcher on synthetic job descriptions:
+1. Generates N realistic multi-paragraph job descriptions
+2. Times the legacy loop, SkillMatcher.extract and SkillMatcher.extract_many
+3. Reports how closely the compiled matcher agrees with the legacy output
+
+Usage:
+    python scripts/testing/benchmark_skill_extraction.py --sizes 100 1000 10000
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+import argparse
+import random
+import re
+import time
+from typing import List, Set
+
+from app.services.skill_matcher import SkillMatcher
+from app.services.skill_matching_service import SOFT_SKILLS, TECH_SKILLS
+
+ROLES = ["Senior Backend Engineer", "Data Scientist", "Machine Learning Engineer", "Full Stack Developer", "DevOps Engineer", "Data Analyst"]
+INTROS = [
+	"We are a fast-growing fintech company based in Berlin, building the payment infrastructure for thousands of merchants across Europe.",
+	"Our mission is to make healthcare data accessible. Join a distributed team of engineers, clinicians and designers.",
+	"We're looking for a {role} to join our platform team and help us scale our product to millions of users.",
+	"As a {role}, you will work closely with product managers and designers to ship features end to end.",
+]
+RESPONSIBILITIES = [
+	"Design, build and maintain services written in {a} and {b}",
+	"Own our data pipelines running on {a}, orchestrated with {b}",
+	"Improve observability and reliability of systems deployed with {a} on {b}",
+	"Collaborate with stakeholders and mentor junior engineers; strong {soft} expected",
+	"Write clean, well-tested code ({a}, {b}) and take part in code reviews",
+	"Build dashboards in {a} and automate reporting with {b}",
+]
+REQUIREMENTS = [
+	"3+ years of professional experience with {a}",
+	"Hands-on experience with {a} or {b} in production",
+	"Familiarity with {a}, {b} and modern CI/CD practices",
+	"Excellent {soft} and {soft2} skills",
+	"Nice to have: {a}, {b}",
+]
+BENEFITS = "We offer 30 days of vacation, a learning budget, flexible working hours and a hybrid setup with an office in the city centre."
+
+
+def generate_descriptions(count: int, seed: int = 7) -> List[str]:
+	"""Generate synthetic job descriptions mentioning a random mix of skills"""
+	rng = random.Random(seed)
+	skills = sorted(TECH_SKILLS)
+	soft = sorted(SOFT_SKILLS)
+
+	def fill(template: str, role: str) -> str:
+		a, b = rng.sample(skills, 2)
+		s1, s2 = rng.sample(soft, 2)
+		# Mix capitalisation the way real postings do
+		a = a.upper() if rng.random() < 0.2 else a.title() if rng.random() < 0.5 else a
+		return template.format(role=role, a=a, b=b, soft=s1, soft2=s2)
+
+	descriptions = []
+	for _ in range(count):
+		role = rng.choice(ROLES)
+		lines = [role, fill(rng.choice(INTROS), role), "", "What you'll do:"]
+		lines += [f"- {fill(t, role)}" for t in rng.sample(RESPONSIBILITIES, 4)]
+		lines += ["", "What we're looking for:"]
+		lines += [f"- {fill(t, role)}" for t in rng.sample(REQUIREMENTS, 4)]
+		lines += ["", BENEFITS]
+		descriptions.append("\n".join(lines))
+	return descriptions
+
+
+def legacy_extract(text: str, vocabulary: Set[str]) -> Set[str]:
+	"""Reference per-term extractor, one regex search per vocabulary entry (same boundary rule as SkillMatcher)"""
+	text_lower = text.lower()
+	return {skill for skill in vocabulary if re.search(r"(?<!\w)" + re.escape(skill) + r"(?!\w)", text_lower)}
+
+
+def benchmark(sizes: List[int]) -> None:
+	vocabulary = TECH_SKILLS | SOFT_SKILLS
+	matcher = SkillMatcher(vocabulary)
+
+	print(f"{'docs':>7} {'legacy (s)':>11} {'extract (s)':>12} {'batch (s)':>10} {'speedup':>8} {'agreement':>10}")
+	print("-" * 64)
+
+	for size in sizes:
+		descriptions = generate_descriptions(size)
+
+		start = time.perf_counter()
+		legacy = [legacy_extract(text, vocabulary) for text in descriptions]
+		legacy_time = time.perf_counter() - start
+
+		start = time.perf_counter()
+		single = [matcher.extract(text) for text in descriptions]
+		extract_time = time.perf_counter() - start
+
+		start = time.perf_counter()
+		batch = matcher.extract_many(descriptions)
+		batch_time = time.perf_counter() - start
+
+		agreement = sum(1 for expected, got, got_batch in zip(legacy, single, batch) if expected == got == got_batch) / max(1, size)
+		print(f"{size:>7} {legacy_time:>11.3f} {extract_time:>12.3f} {batch_time:>10.3f} {legacy_time / batch_time:>7.1f}x {agreement:>10.2%}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Benchmark per-term vs compiled skill extraction")
+	parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000], help="Number of job descriptions to process")
+	args = parser.parse_args()
+
+	benchmark(args.sizes)
+
+
+if __name__ == "__main__":
+	main()
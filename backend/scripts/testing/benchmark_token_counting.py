@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark token counting: len(text)//4 heuristic vs the tokenizer layer
+
+1. Builds a corpus of job-description style prompts (prose, skills lists, numbers, markup)
+2. Measures throughput of the heuristic, the calibrated estimator and the memoized TokenCounter
+   (cold and with repeated prompt templates)
+3. Reports mean absolute percentage error of the heuristic and the estimator against a reference
+   tiktoken encoding, when that encoding can be loaded
+
+Usage:
+    python scripts/testing/benchmark_token_counting.py --texts 2000 --reference cl100k_base
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+import argparse
+import random
+import time
+from typing import Callable, List, Optional
+
+from app.core.tokenizer import CalibratedEstimator, TiktokenTokenizer, TokenCounter
+
+SENTENCES = [
+	"We are looking for a Senior Python Developer to join our platform team.",
+	"You will design, build and operate FastAPI services backed by PostgreSQL and Redis.",
+	"Requirements: 5+ years of experience, Kubernetes, Docker, CI/CD (GitHub Actions), AWS.",
+	"Compensation: $140,000 - $175,000 per year, 401(k) matching and 25 days PTO.",
+	"Nice to have: experience with LLM integrations, LangChain, vector databases and RAG pipelines.",
+	"## Responsibilities\n- Own the ingestion pipeline\n- Mentor engineers\n- Improve observability",
+	"Apply before 2024-11-30; interviews run in 3 stages (screen, technical, onsite).",
+	"Our mission is to help every job seeker find meaningful work faster.",
+	"Das Team arbeitet remote-first; Kenntnisse in Französisch sind von Vorteil.",
+]
+
+
+def build_corpus(count: int, seed: int = 5) -> List[str]:
+	rng = random.Random(seed)
+	return ["\n".join(rng.choice(SENTENCES) for _ in range(rng.randint(2, 30))) for _ in range(count)]
+
+
+def heuristic(text: str) -> int:
+	return max(1, len(text) // 4)
+
+
+def throughput(fn: Callable[[List[str]], List[int]], texts: List[str]) -> float:
+	start = time.perf_counter()
+	fn(texts)
+	return len(texts) / (time.perf_counter() - start)
+
+
+def mape(predicted: List[int], reference: List[int]) -> float:
+	return 100 * sum(abs(p - r) / max(r, 1) for p, r in zip(predicted, reference)) / len(reference)
+
+
+def load_reference(encoding: str) -> Optional[TiktokenTokenizer]:
+	try:
+		return TiktokenTokenizer(encoding)
+	except Exception as e:
+		print(f"Reference encoding {encoding} unavailable ({e}); accuracy columns skipped\n")
+		return None
+
+
+def benchmark(count: int, repeats: int, reference_encoding: str) -> None:
+	texts = build_corpus(count)
+	# Repeated prompt templates: the same texts counted again, as in retries and budget checks
+	repeated = texts * repeats
+	estimator = CalibratedEstimator()
+	reference = load_reference(reference_encoding)
+	reference_counts = reference.count_batch(texts) if reference else None
+
+	rows = [
+		("len//4 heuristic", lambda batch: [heuristic(t) for t in batch]),
+		("calibrated estimator", estimator.count_batch),
+		("TokenCounter (memoized)", TokenCounter(CalibratedEstimator(), memo_size=count).count_tokens),
+	]
+	if reference:
+		rows.append((f"tiktoken {reference_encoding}", reference.count_batch))
+		rows.append((f"TokenCounter tiktoken", TokenCounter(reference, memo_size=count).count_tokens))
+
+	print(f"{'counter':<26} {'texts/s cold':>14} {'texts/s repeated':>17} {'MAPE %':>8}")
+	print("-" * 68)
+	for name, fn in rows:
+		cold = throughput(fn, texts)
+		warm = throughput(fn, repeated)
+		error = f"{mape(fn(texts), reference_counts):.1f}" if reference_counts else "n/a"
+		print(f"{name:<26} {cold:>14,.0f} {warm:>17,.0f} {error:>8}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Benchmark token counting accuracy and throughput")
+	parser.add_argument("--texts", type=int, default=2_000, help="Distinct texts in the corpus")
+	parser.add_argument("--repeats", type=int, default=5, help="Times each text is recounted in the repeated workload")
+	parser.add_argument("--reference", default="cl100k_base", help="tiktoken encoding used as ground truth")
+	args = parser.parse_args()
+
+	benchmark(args.texts, args.repeats, args.reference)
+
+
+if __name__ == "__main__":
+	main()
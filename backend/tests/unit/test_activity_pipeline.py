@@ -0,0 +1,94 @@
+"""
+Unit Tests for the activity pipeline and ActivityTrackingMiddleware sampling
+"""
+
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pytest
+from app.middleware.activity_tracking_middleware import ActivityTrackingMiddleware
+from app.models.analytics import Analytics
+from app.services import activity_pipeline as pipeline_module
+from app.services.activity_pipeline import ACTIVITY_MINUTE_TYPE, ActivityPipeline
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+# A minute a few minutes ahead, so the background roller leaves it to the explicit roll() calls
+MINUTE = (int(time.time()) // 60 + 5) * 60
+
+
+class _SqliteManager:
+	def __init__(self):
+		# One shared connection: rows are inserted from a worker thread
+		self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+		Analytics.__table__.create(self.engine)
+		self.session_factory = sessionmaker(self.engine)
+
+	@contextmanager
+	def get_sync_session(self):
+		session = self.session_factory()
+		try:
+			yield session
+			session.commit()
+		finally:
+			session.close()
+
+
+@pytest.mark.asyncio
+async def test_events_are_persisted_as_per_minute_counters(monkeypatch):
+	manager = _SqliteManager()
+	monkeypatch.setattr(pipeline_module, "get_database_manager", lambda: manager)
+	pipeline = ActivityPipeline(spill_path=None)
+
+	pipeline.record(7, "job_view", 10.0, timestamp=MINUTE + 1)
+	pipeline.record(7, "job_view", 20.0, timestamp=MINUTE + 30)
+	pipeline.record(7, "dashboard_view", 5.0, weight=10, timestamp=MINUTE + 59)
+	pipeline.record(7, "job_view", 1.0, timestamp=MINUTE + 61)
+	pipeline.record(8, "job_view", 1.0, timestamp=MINUTE + 2)
+
+	# Only minutes past their grace period are emitted
+	assert pipeline.roll(now=MINUTE + 62) == 0
+	assert pipeline.roll(now=MINUTE + 66) == 2
+	await pipeline.writer.flush()
+
+	session = manager.session_factory()
+	rows = {row.user_id: row for row in session.query(Analytics).all()}
+	assert set(rows) == {7, 8}
+	assert rows[7].type == ACTIVITY_MINUTE_TYPE and rows[7].generated_at == datetime.fromtimestamp(MINUTE, timezone.utc).replace(tzinfo=None)
+	assert rows[7].data["activity_count"] == 12
+	assert rows[7].data["activity_types"] == {"job_view": 2, "dashboard_view": 10}
+	assert rows[7].data["total_duration_ms"] == 80.0
+
+	await pipeline.close()
+	assert session.query(Analytics).count() == 3
+
+
+def test_middleware_only_records_sampled_events():
+	class _Recorder:
+		def __init__(self):
+			self.events = []
+
+		def record(self, user_id, activity_type, duration_ms=0.0, weight=1.0):
+			self.events.append((user_id, activity_type, weight))
+
+	async def endpoint(request):
+		request.state.user_id = 7
+		return PlainTextResponse("ok")
+
+	recorder = _Recorder()
+	app = Starlette(routes=[Route("/api/v1/jobs", endpoint), Route("/api/v1/dashboard", endpoint)])
+	app.add_middleware(ActivityTrackingMiddleware, sample_rates={"/api/v1/jobs": 0.0, "/api/v1": 0.5}, pipeline=recorder)
+
+	with TestClient(app) as client:
+		client.get("/api/v1/jobs")
+		for _ in range(200):
+			client.get("/api/v1/dashboard")
+
+	assert all(event == (7, "dashboard_view", 2.0) for event in recorder.events)
+	assert 50 < len(recorder.events) < 150
@@ -0,0 +1,97 @@
+"""
+Unit Tests for the buffered background batch writer
+"""
+
+import asyncio
+import json
+
+import pytest
+from app.core.batch_writer import BatchWriter, close_batch_writers
+
+
+class _Target:
+	"""Records written batches; fails while `down` is set"""
+
+	def __init__(self):
+		self.batches = []
+		self.down = False
+		self.written_ids = set()
+
+	async def write(self, rows):
+		if self.down:
+			raise ConnectionError("database unavailable")
+		if any(row.get("id") in self.written_ids for row in rows):
+			raise ValueError("duplicate key")
+		self.written_ids.update(row["id"] for row in rows if "id" in row)
+		self.batches.append(list(rows))
+
+
+@pytest.mark.asyncio
+async def test_rows_are_written_in_batches_off_the_caller():
+	target = _Target()
+	writer = BatchWriter("test", target.write, batch_size=3, flush_interval=0.05)
+
+	writer.submit({"n": 0})
+	# submit never writes inline; a partial batch waits for the flush interval
+	await asyncio.sleep(0.01)
+	assert target.batches == []
+	await asyncio.sleep(0.1)
+	assert target.batches == [[{"n": 0}]]
+
+	# A full batch is written without waiting; whatever queued with it goes in the same flush
+	assert all(writer.submit({"n": n}) for n in range(1, 5))
+	await asyncio.sleep(0.01)
+	assert target.batches[1:] == [[{"n": 1}, {"n": 2}, {"n": 3}], [{"n": 4}]]
+	assert writer.get_stats()["written"] == 5 and writer.get_stats()["batches"] == 3
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_and_counts():
+	target = _Target()
+	writer = BatchWriter("test", target.write, batch_size=10, flush_interval=10, max_queue_size=2)
+
+	assert writer.submit({"n": 1}) and writer.submit({"n": 2})
+	assert not writer.submit({"n": 3})
+	await writer.close()
+	assert target.batches == [[{"n": 1}, {"n": 2}]]
+	assert writer.get_stats()["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_spill_and_replay_after_recovery(tmp_path):
+	target = _Target()
+	spill_path = tmp_path / "spill.jsonl"
+	writer = BatchWriter("test", target.write, batch_size=2, flush_interval=10, spill_path=spill_path)
+
+	target.down = True
+	writer.submit({"n": 1})
+	writer.submit({"n": 2})
+	await writer.flush()
+	assert [json.loads(line) for line in spill_path.read_text().splitlines()] == [{"n": 1}, {"n": 2}]
+
+	target.down = False
+	writer.submit({"n": 3})
+	await close_batch_writers()
+	assert target.batches == [[{"n": 3}], [{"n": 1}, {"n": 2}]]
+	assert not spill_path.exists() and not (tmp_path / "spill.jsonl.replay").exists()
+	assert writer.get_stats()["spilled"] == 2 and writer.get_stats()["replayed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_replay_quarantines_rows_that_fail_on_their_own(tmp_path):
+	target = _Target()
+	spill_path = tmp_path / "spill.jsonl"
+	writer = BatchWriter("test", target.write, batch_size=4, flush_interval=10, spill_path=spill_path)
+
+	# Rows 1 and 3 were already inserted before a crash, so replaying them conflicts
+	target.written_ids.update({1, 3})
+	spill_path.write_text("".join(json.dumps({"id": n}) + "\n" for n in range(1, 6)))
+
+	writer.submit({"id": 10})
+	await writer.flush()
+	assert sorted(target.written_ids) == [1, 2, 3, 4, 5, 10]
+	assert not spill_path.exists() and not (tmp_path / "spill.jsonl.replay").exists()
+
+	rejected = [json.loads(line) for line in (tmp_path / "spill.jsonl.rejected").read_text().splitlines()]
+	assert [entry["row"] for entry in rejected] == [{"id": 1}, {"id": 3}] and rejected[0]["error"] == "duplicate key"
+	assert writer.get_stats()["replayed"] == 3 and writer.get_stats()["rejected"] == 2
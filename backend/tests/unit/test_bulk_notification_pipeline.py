@@ -0,0 +1,198 @@
+"""
+Unit Tests for the bulk notification pipeline's recipient selection, prefetch, send path and time-window matching
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from app.core.database import Base
+from app.models.application import Application
+from app.models.job import Job
+from app.models.user import User
+from app.services import bulk_notification_pipeline as pipeline_module
+from app.services.bulk_notification_pipeline import BulkNotificationPipeline, ProviderRateLimiter, allowed_times
+from app.services.email_service import EmailProvider, UnifiedEmailMessage
+from app.services.scheduled_notification_service import ScheduledNotificationService
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# A Monday evening: weekly morning subscribers are due, weekly evening subscribers are not
+NOW = datetime(2026, 3, 9, 19, 30)
+
+
+class _EmailService:
+	"""Records sends; fails for addresses starting with "bounce" """
+
+	def __init__(self):
+		self.config = SimpleNamespace(primary_provider=EmailProvider.AUTO)
+		self.in_flight = 0
+		self.max_in_flight = 0
+		self.sent = []
+
+	async def send_email(self, message, user_id="default_user"):
+		self.in_flight += 1
+		self.max_in_flight = max(self.max_in_flight, self.in_flight)
+		await asyncio.sleep(0.01)
+		self.in_flight -= 1
+		if message.to[0].startswith("bounce"):
+			return {"success": False, "message": "mailbox unavailable"}
+		self.sent.append(user_id)
+		return {"success": True}
+
+
+def test_allowed_times_cover_the_window_across_midnight():
+	times = allowed_times(datetime(2026, 3, 10, 8, 0))
+	assert "06:00" in times and "6:00" in times and "10:00" in times and "08:00" in times
+	assert "05:59" not in times and "10:01" not in times
+
+	late = allowed_times(datetime(2026, 3, 10, 23, 30))
+	assert "21:30" in late and "23:59" in late and "00:10" in late and "0:10" in late and "01:30" in late
+	assert "01:31" not in late and "21:29" not in late
+	assert len(late) == len(set(late))
+
+
+class _Service:
+	"""The ScheduledNotificationService helpers the selection and prefetch paths call"""
+
+	_with_last_notification_time = ScheduledNotificationService._with_last_notification_time
+
+	def _format_recommendation(self, rec):
+		return {"title": rec["title"], "company": rec["company"], "match_score": rec["match_score"]}
+
+
+@pytest.fixture
+def db():
+	engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+	for model in (User, Job, Application):
+		model.__table__.create(engine)
+	session = sessionmaker(engine)()
+	try:
+		yield session
+	finally:
+		session.close()
+		Base.metadata.drop_all(engine, tables=[Application.__table__, Job.__table__, User.__table__])
+
+
+def _add_users(db):
+	yesterday = (NOW - timedelta(days=1)).isoformat()
+	preferences = {
+		"default": None,
+		"evening": {"notifications": {"evening_time": "19:00"}},
+		"late-pref": {"notifications": {"evening_time": "0:30", "morning_time": "21:00"}},
+		"opted-out": {"notifications": {"evening_update": False, "morning_briefing": False}},
+		"never": {"notifications": {"frequency": "never"}},
+		"weekly": {"notifications": {"frequency": "weekly", "morning_time": "19:00", "evening_time": "19:00"}},
+		"recent": {"notifications": {"last_evening_update": (NOW - timedelta(hours=2)).isoformat(), "evening_time": "19:00"}},
+		"stale": {"notifications": {"last_evening_update": yesterday, "evening_time": "20:00", "morning_briefing": True, "morning_time": "18:00"}},
+	}
+	users = {}
+	for name, settings in preferences.items():
+		users[name] = User(username=name, email=f"{name}@example.com", settings=settings, profile={"name": name.title()}, skills=["python"])
+	users["inactive"] = User(username="inactive", email="inactive@example.com", is_active=False, settings={"notifications": {"evening_time": "19:00"}})
+	db.add_all(users.values())
+	db.flush()
+
+	owner = users["default"]
+	jobs = [Job(user_id=owner.id, company=f"Company {i}", title=f"Engineer {i}", location="Remote") for i in range(3)]
+	db.add_all(jobs)
+	db.flush()
+	today, old = NOW.date(), NOW.date() - timedelta(days=10)
+	db.add_all(
+		[
+			Application(user_id=users["evening"].id, job_id=jobs[0].id, status="applied", applied_date=today),
+			Application(user_id=users["evening"].id, job_id=jobs[1].id, status="applied", applied_date=old),
+			Application(user_id=users["evening"].id, job_id=jobs[2].id, status="interview", applied_date=old),
+			Application(user_id=users["stale"].id, job_id=jobs[0].id, status="applied", applied_date=today),
+			Application(user_id=users["recent"].id, job_id=jobs[0].id, status="applied", applied_date=today),
+			Application(user_id=users["inactive"].id, job_id=jobs[0].id, status="applied", applied_date=today),
+		]
+	)
+	db.commit()
+	return users, jobs
+
+
+def _names(page):
+	return [user.email.split("@")[0] for user in page.users]
+
+
+def test_selects_eligible_users_in_sql_and_prefetches_their_data(db):
+	users, jobs = _add_users(db)
+	pipeline = BulkNotificationPipeline(_Service(), db, SimpleNamespace(config=SimpleNamespace(primary_provider=EmailProvider.SMTP)), page_size=2)
+
+	def materialized(profile_stamps):
+		return {user_id: [{"job_id": jobs[0].id, "score": 0.9}, {"job_id": jobs[1].id, "score": 0.8}] for user_id in profile_stamps}
+
+	with patch.object(pipeline_module.job_recommendation_cache, "get_materialized_many", side_effect=materialized):
+		# Evening: in the time window, due, active, and applied to something today
+		page = pipeline._load_page("evening_update", NOW, 0)
+		assert _names(page) == ["evening", "stale"]
+		evening = users["evening"].id
+		assert page.counts[evening].total == 3 and page.counts[evening].today == 1 and page.counts[evening].responses == 1
+		assert [app["company"] for app in page.applications_today[evening]] == ["Company 0"]
+		assert [follow_up["company"] for follow_up in page.follow_ups[evening]] == ["Company 1"]
+		# Jobs the user already applied to are dropped from their recommendations
+		assert [rec["title"] for rec in page.recommendations[evening]] == []
+		assert [rec["title"] for rec in page.recommendations[users["stale"].id]] == ["Engineer 1"]
+
+		assert pipeline._load_page("evening_update", NOW, page.users[-1].id).users == []
+		# "default" is due and in its window but did nothing today
+		assert pipeline._count_without_activity(NOW) == 1
+
+		# Morning preferences within two hours of 19:30, daily or weekly on a Monday
+		morning = []
+		last_id = 0
+		while page := pipeline._load_page("morning_briefing", NOW, last_id):
+			if not page.users:
+				break
+			morning += _names(page)
+			last_id = page.users[-1].id
+		assert morning == ["late-pref", "weekly", "stale"]
+
+	# Stamping the last-sent time takes the user out of the next selection
+	pipeline._update_last_sent("evening_update", NOW, [(evening, users["evening"].settings)])
+	assert _names(pipeline._load_page("evening_update", NOW, 0)) == ["stale"]
+	stored = db.execute(select(User.settings).where(User.id == evening)).scalar_one()
+	assert stored["notifications"] == {"evening_time": "19:00", "last_evening_update": NOW.isoformat()}
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_throttles_each_provider_separately():
+	limiter = ProviderRateLimiter({"smtp": 20.0})
+
+	start = time.monotonic()
+	for _ in range(25):
+		await limiter.acquire("smtp")
+	# 20 sends of burst, then 5 more at 20 per second
+	assert 0.2 <= time.monotonic() - start < 0.5
+
+	start = time.monotonic()
+	for _ in range(100):
+		await limiter.acquire("unthrottled")
+	assert time.monotonic() - start < 0.05
+
+
+@pytest.mark.asyncio
+async def test_send_workers_are_bounded_and_collect_results():
+	email_service = _EmailService()
+	pipeline = BulkNotificationPipeline(None, None, email_service, concurrency=4, provider_rates={}, max_errors=1)
+	assert pipeline.provider == "smtp"
+
+	queue = asyncio.Queue(maxsize=8)
+	results = {"sent": 0, "failed": 0, "errors": []}
+	workers = [asyncio.create_task(pipeline._send_worker(queue, results)) for _ in range(pipeline.concurrency)]
+	for user_id in range(20):
+		address = f"bounce{user_id}@example.com" if user_id % 10 == 0 else f"user{user_id}@example.com"
+		await queue.put((user_id, {}, UnifiedEmailMessage(to=[address], subject="Hi")))
+	await queue.join()
+	for worker in workers:
+		worker.cancel()
+
+	assert email_service.max_in_flight == 4
+	assert results["sent"] == 18 and results["failed"] == 2
+	assert results["errors"] == [{"user_id": 0, "error": "mailbox unavailable"}]
+	assert sorted(user_id for user_id, _ in pipeline._sent) == [user_id for user_id in range(20) if user_id % 10]
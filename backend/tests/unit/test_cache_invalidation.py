@@ -0,0 +1,115 @@
+"""
+Unit Tests for non-blocking Redis cache invalidation
+"""
+
+import fnmatch
+
+import pytest
+from app.core.cache_invalidation import (
+	LEGACY_SWEEP_SECONDS,
+	TAGGING_SINCE_KEY,
+	invalidate_tags,
+	queue_tag_updates,
+	scan_unlink,
+	tag_key,
+	tags_for_key,
+	user_tag,
+)
+
+
+class _FakeRedis:
+	"""Minimal sync Redis stand-in covering the commands used by the helpers"""
+
+	def __init__(self):
+		self.data = {}
+		self.sets = {}
+		self.unlink_calls = []
+
+	def scan_iter(self, match="*", count=None):
+		return iter([key for key in list(self.data) if fnmatch.fnmatchcase(key, match)])
+
+	def keys(self, pattern="*"):
+		raise AssertionError("KEYS must not be used")
+
+	def unlink(self, *keys):
+		self.unlink_calls.append(keys)
+		return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+	def sadd(self, key, *members):
+		self.sets.setdefault(key, set()).update(members)
+
+	def expire(self, key, ttl):
+		return True
+
+	def spop(self, key, count):
+		members = self.sets.get(key, set())
+		popped = [members.pop() for _ in range(min(count, len(members)))]
+		return popped
+
+
+def test_scan_unlink_deletes_matches_in_batches():
+	client = _FakeRedis()
+	client.data = {f"recommendations:1:{i}": "x" for i in range(7)}
+	client.data["recommendations:2:0"] = "x"
+
+	assert scan_unlink(client, "recommendations:1:*", batch_size=3) == 7
+	assert [len(call) for call in client.unlink_calls] == [3, 3, 1]
+	assert list(client.data) == ["recommendations:2:0"]
+
+
+def test_user_scoped_keys_are_tagged_automatically():
+	assert tags_for_key("recommendations:42:5:adaptive_True") == [user_tag(42)]
+	assert tags_for_key("resume_parsing:7:abc", ["docs"]) == ["docs", user_tag(7)]
+	assert tags_for_key("llm_response:default:abc") == []
+
+
+def test_invalidate_tags_only_touches_tagged_keys():
+	client = _FakeRedis()
+	for key in ("recommendations:1:5", "analytics:1:summary", "recommendations:2:5"):
+		client.data[key] = "x"
+		queue_tag_updates(client, key, tags_for_key(key))
+	client.sets[tag_key(user_tag(1))].add("recommendations:1:expired")
+
+	assert invalidate_tags(client, [user_tag(1)], batch_size=2) == 2
+	assert list(client.data) == ["recommendations:2:5"]
+	assert not client.sets[tag_key(user_tag(1))]
+
+
+@pytest.fixture
+def cache_service(monkeypatch):
+	fakeredis = pytest.importorskip("fakeredis")
+	from app.services import cache_service as cache_module
+
+	server = fakeredis.FakeServer()
+	monkeypatch.setattr(cache_module.redis, "from_url", lambda url, **kwargs: fakeredis.FakeRedis(server=server, decode_responses=True))
+	monkeypatch.setattr(cache_module.aioredis, "from_url", lambda url, **kwargs: fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+	monkeypatch.setattr(type(cache_module.get_settings()), "enable_redis_caching", True, raising=False)
+	return cache_module.CacheService()
+
+
+@pytest.mark.asyncio
+async def test_untagged_user_keys_are_swept_until_they_have_expired(cache_service):
+	client = cache_service.redis_client
+	# Written before tagging existed: in no tag set
+	client.set("recommendations:1:legacy", "x")
+	client.set("recommendations:2:legacy", "x")
+	cache_service.set("analytics:1:summary", {"total": 3})
+
+	assert cache_service.invalidate_user_cache(1) == 2
+	assert client.keys("*:1:*") == [] and client.exists("recommendations:2:legacy")
+
+	client.set("skill_gap:2:legacy", "x")
+	assert await cache_service.ainvalidate_user_cache(2) == 2
+
+	# A later process keeps the original start time
+	started = float(client.get(TAGGING_SINCE_KEY))
+	cache_service._initialize_clients()
+	assert float(cache_service.redis_client.get(TAGGING_SINCE_KEY)) == started
+
+	# Once every untagged key has expired, invalidation relies on tags alone
+	cache_service.redis_client.set(TAGGING_SINCE_KEY, str(started - LEGACY_SWEEP_SECONDS - 1))
+	cache_service._legacy_sweep_until = None
+	cache_service.redis_client.set("recommendations:3:untagged", "x")
+	cache_service.set("recommendations:3:tagged", [1])
+	assert cache_service.invalidate_user_cache(3) == 1
+	assert cache_service.redis_client.exists("recommendations:3:untagged")
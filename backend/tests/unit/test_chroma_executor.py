@@ -0,0 +1,104 @@
+"""
+Unit Tests for the Chroma execution layer
+"""
+
+import asyncio
+import threading
+
+import pytest
+from app.services.chroma_executor import ChromaExecutor
+
+
+class _Collection:
+	"""Stands in for a Chroma collection; documents containing "bad" are rejected"""
+
+	def __init__(self, name="contracts"):
+		self.name = name
+		self.query_calls = []
+		self.add_calls = []
+		self.rows = {}
+		self.threads = set()
+
+	def query(self, query_texts, n_results, where=None, include=None):
+		self.threads.add(threading.current_thread().name)
+		self.query_calls.append(list(query_texts))
+		return {
+			"ids": [[f"{text}-{i}" for i in range(n_results)] for text in query_texts],
+			"documents": [[text] * n_results for text in query_texts],
+			"metadatas": [[{"where": where}] * n_results for text in query_texts],
+			"distances": [[0.1] * n_results for _ in query_texts],
+			"embeddings": None,
+			"included": include,
+		}
+
+	def add(self, ids, documents, metadatas):
+		self.threads.add(threading.current_thread().name)
+		self.add_calls.append(list(ids))
+		if any("bad" in document for document in documents):
+			raise ValueError("rejected document")
+		self.rows.update(zip(ids, documents))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_are_merged_and_split_back():
+	executor = ChromaExecutor(max_workers=2, query_window=0.01)
+	collection = _Collection()
+
+	results = await asyncio.gather(
+		executor.query(collection, "alpha", n_results=2),
+		executor.query(collection, "beta", n_results=2),
+		executor.query(collection, "gamma", n_results=2, where={"jurisdiction": "US"}),
+	)
+
+	# Same options share one call; a different where filter gets its own
+	assert sorted(collection.query_calls) == [["alpha", "beta"], ["gamma"]]
+	assert results[0]["ids"] == [["alpha-0", "alpha-1"]] and results[1]["documents"] == [["beta", "beta"]]
+	assert results[2]["metadatas"][0][0] == {"where": {"jurisdiction": "US"}}
+	assert results[0]["embeddings"] is None and results[0]["included"] == ["documents", "metadatas", "distances"]
+	assert all(name.startswith("chroma") for name in collection.threads)
+
+	stats = executor.get_stats()
+	assert stats["queries"] == 3 and stats["query_calls"] == 2 and stats["average_queries_per_call"] == 1.5
+	await executor.close()
+
+
+@pytest.mark.asyncio
+async def test_adds_are_batched_and_a_failed_batch_is_retried_per_caller():
+	executor = ChromaExecutor(add_window=0.01, add_batch_size=4)
+	collection = _Collection()
+
+	async def store(contract, chunks):
+		ids = [f"{contract}-{i}" for i in range(chunks)]
+		await executor.add(collection, ids=ids, documents=[f"{contract} text"] * chunks, metadatas=[{}] * chunks)
+
+	await asyncio.gather(store("a", 1), store("b", 2))
+	assert collection.add_calls == [["a-0", "b-0", "b-1"]]
+
+	# A contract larger than the batch size is written in pieces
+	collection.add_calls.clear()
+	await store("c", 6)
+	assert collection.add_calls == [["c-0", "c-1", "c-2", "c-3"], ["c-4", "c-5"]]
+
+	collection.add_calls.clear()
+	outcomes = await asyncio.gather(store("d", 1), store("bad", 1), store("e", 1), return_exceptions=True)
+	assert outcomes[0] is None and isinstance(outcomes[1], ValueError) and outcomes[2] is None
+	assert collection.add_calls == [["d-0", "bad-0", "e-0"], ["d-0"], ["bad-0"], ["e-0"]]
+	assert "d-0" in collection.rows and "e-0" in collection.rows and "bad-0" not in collection.rows
+	assert executor.get_stats()["add_fallbacks"] == 1
+	await executor.close()
+
+
+def test_a_closed_executor_starts_a_new_pool_when_used_again():
+	executor = ChromaExecutor(max_workers=1, add_window=0.01)
+	collection = _Collection()
+
+	async def lifespan(document_id):
+		# Like an app lifespan: use the shared executor, then close it on shutdown
+		await executor.add(collection, [document_id], ["text"], [{}])
+		await executor.close()
+
+	asyncio.run(lifespan("first"))
+	asyncio.run(lifespan("second"))
+
+	assert collection.rows == {"first": "text", "second": "text"}
+	assert executor._executor is None
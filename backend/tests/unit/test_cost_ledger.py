@@ -0,0 +1,120 @@
+"""
+Unit Tests for the cost ledger and ledger-backed budget checks
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from app.core.cost_ledger import CostLedger, budget_scope
+from app.core.cost_tracker import BudgetLimit, BudgetPeriod, CostCategory, CostTracker
+from app.models.llm_cost_rollup import LLMCostRollup
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+class _FakePipeline:
+	def __init__(self, redis):
+		self.redis = redis
+		self.commands = []
+
+	def __getattr__(self, name):
+		return lambda *args: self.commands.append((name, args))
+
+	async def execute(self):
+		return [getattr(self.redis, name)(*args) for name, args in self.commands]
+
+
+class _FakeAsyncRedis:
+	"""Hash commands of a Redis shared by several ledgers (one per simulated worker)"""
+
+	def __init__(self):
+		self.hashes = {}
+
+	def pipeline(self, transaction=True):
+		return _FakePipeline(self)
+
+	def hincrby(self, key, field, amount):
+		counters = self.hashes.setdefault(key, {})
+		counters[field] = str(int(counters.get(field, 0)) + amount)
+
+	def hincrbyfloat(self, key, field, amount):
+		counters = self.hashes.setdefault(key, {})
+		counters[field] = repr(float(counters.get(field, 0)) + amount)
+
+	def expire(self, key, ttl):
+		return True
+
+	def hget(self, key, field):
+		return self.hashes.get(key, {}).get(field)
+
+	def hgetall(self, key):
+		return dict(self.hashes.get(key, {}))
+
+
+class _Cache:
+	def __init__(self, client=None):
+		self.client = client
+
+	async def _get_async_client(self):
+		return self.client
+
+
+NOW = datetime(2026, 3, 10, 14, 30, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_workers_share_spend_counters():
+	redis = _FakeAsyncRedis()
+	worker_a, worker_b = CostLedger(_Cache(redis)), CostLedger(_Cache(redis))
+
+	await worker_a.record(NOW, "negotiation", "7", "openai", "gpt-4", Decimal("0.5000"), 100, 20)
+	await worker_b.record(NOW, "negotiation", None, "groq", "llama-3.1-8b-instant", Decimal("0.2500"), 50, 10)
+
+	spends = await worker_a.get_spends(
+		[("daily", budget_scope()), ("daily", budget_scope("negotiation")), ("monthly", budget_scope(user_id="7")), ("daily", budget_scope("general"))],
+		NOW,
+	)
+	assert spends == [Decimal("0.75"), Decimal("0.75"), Decimal("0.5"), Decimal("0")]
+
+	rollups = {row["provider"]: row for row in await worker_b.get_rollups(NOW, NOW)}
+	assert rollups["openai"]["user_id"] == "7" and rollups["openai"]["prompt_tokens"] == 100 and rollups["openai"]["requests"] == 1
+	assert rollups["groq"]["cost"] == Decimal("0.25")
+
+
+@pytest.mark.asyncio
+async def test_budget_checks_read_ledger_counters_without_redis():
+	tracker = CostTracker()
+	tracker.ledger = CostLedger(_Cache())
+	tracker.budget_limits = [
+		BudgetLimit(category=None, period=BudgetPeriod.DAILY, limit=Decimal("1.00")),
+		BudgetLimit(category=CostCategory.NEGOTIATION, period=BudgetPeriod.DAILY, limit=Decimal("10.00"), user_id="7"),
+	]
+
+	await tracker.record_cost("openai", "gpt-4", CostCategory.NEGOTIATION, 100, 20, 0.85, user_id="7")
+
+	statuses = await tracker.check_budget_limits(CostCategory.NEGOTIATION, 0.2, user_id="7")
+	assert [status.current_spend for status in statuses] == [Decimal("0.85"), Decimal("0.85")]
+	assert statuses[0].limit_exceeded and statuses[0].alert_triggered
+	assert not statuses[1].limit_exceeded
+
+	summary = await tracker.get_cost_summary(category=CostCategory.NEGOTIATION)
+	assert summary["summary"]["request_count"] == 1 and summary["by_provider"]["openai"]["tokens"] == 120
+
+
+@pytest.mark.asyncio
+async def test_flush_upserts_hourly_rollups():
+	engine = create_engine("sqlite://")
+	LLMCostRollup.__table__.create(engine)
+	db = sessionmaker(engine)()
+	ledger = CostLedger(_Cache(_FakeAsyncRedis()))
+
+	await ledger.record(NOW, "general", None, "openai", "gpt-4", Decimal("0.1000"), 10, 5)
+	assert await ledger.flush(db, now=NOW) == 1
+	await ledger.record(NOW, "general", None, "openai", "gpt-4", Decimal("0.1000"), 10, 5)
+	await ledger.flush(db, now=NOW)
+
+	rows = db.query(LLMCostRollup).all()
+	assert len(rows) == 1
+	assert rows[0].request_count == 2 and rows[0].prompt_tokens == 20 and rows[0].cost == Decimal("0.2")
+	assert rows[0].period_start == datetime(2026, 3, 10, 14)
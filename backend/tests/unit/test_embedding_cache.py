@@ -0,0 +1,46 @@
+"""
+Unit Tests for the content-addressed embedding cache
+"""
+
+from app.services.embedding_cache import CachedEmbeddingFunction, EmbeddingCache
+
+
+class _CountingEmbedder:
+	def __init__(self):
+		self.embedded = []
+
+	def __call__(self, input):
+		self.embedded.extend(input)
+		return [[float(len(text)), 0.5, -1.25] for text in input]
+
+
+def test_repeat_ingestion_only_embeds_new_chunks(tmp_path):
+	embedder = _CountingEmbedder()
+	embed = CachedEmbeddingFunction(embedder, EmbeddingCache(tmp_path / "cache.sqlite3"), "test/model")
+
+	first = embed(["clause one", "clause two", "clause one"])
+	assert embedder.embedded == ["clause one", "clause two"]
+	assert first[0] == first[2] == [10.0, 0.5, -1.25]
+
+	# Survives a restart; only the changed chunk is embedded again
+	embed = CachedEmbeddingFunction(embedder, EmbeddingCache(tmp_path / "cache.sqlite3"), "test/model")
+	assert embed(["clause one", "clause two", "clause three"])[:2] == first[:2]
+	assert embedder.embedded == ["clause one", "clause two", "clause three"]
+	assert embed.cache.get_stats()["hit_rate"] == round(2 / 3, 4)
+
+	# Another model never reuses these vectors
+	CachedEmbeddingFunction(embedder, embed.cache, "other/model")(["clause one"])
+	assert embedder.embedded[-1] == "clause one"
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+	cache = EmbeddingCache(tmp_path / "cache.sqlite3", max_entries=10)
+	cache.put_many({f"key{i}": [float(i)] for i in range(10)})
+	# Touch the oldest keys so they outlive the rest
+	cache._conn.execute("UPDATE embeddings SET last_used = last_used - 100 WHERE key NOT IN ('key0', 'key1')")
+	cache.get_many(["key0", "key1"])
+
+	cache.put_many({"key10": [10.0]})
+	stats = cache.get_stats()
+	assert stats["entries"] == 9 and stats["evictions"] == 2 and stats["writes"] == 11
+	assert set(cache.get_many(["key0", "key1", "key10", "key2", "key3"])) == {"key0", "key1", "key10"}
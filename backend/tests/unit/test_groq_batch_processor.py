@@ -0,0 +1,120 @@
+"""
+Unit Tests for the GROQ micro-batching scheduler and offline batch files
+"""
+
+import asyncio
+
+import pytest
+from app.services.groq_batch import build_batch_request, process_batch_file, read_batch_results, write_batch_requests
+from app.services.groq_optimizer import GROQBatchProcessor, GROQOptimizationConfig
+from app.services.groq_service import GROQModel, GROQRateLimiter
+
+
+class _FakeGROQService:
+	"""Records completion calls; every request costs 10 estimated tokens"""
+
+	def __init__(self, tokens_per_minute=10_000):
+		self.rate_limiters = {GROQModel.LLAMA3_1_8B.value: GROQRateLimiter(1000, tokens_per_minute)}
+		self.calls = []
+
+	def estimate_request_tokens(self, messages):
+		return 10
+
+	async def generate_completion(self, messages, model=None, rate_limit=True, **kwargs):
+		self.calls.append({"prompt": messages[0]["content"], "model": model, "rate_limit": rate_limit, **kwargs})
+		await asyncio.sleep(0.01)
+		if messages[0]["content"] == "boom":
+			raise RuntimeError("provider error")
+		return {"content": f"parsed {messages[0]['content']}", "model": getattr(model, "value", model), "usage": {"total_tokens": 10}}
+
+
+def _request(prompt, model=GROQModel.LLAMA3_1_8B, temperature=0.1):
+	return {"messages": [{"role": "user", "content": prompt}], "model": model, "temperature": temperature}
+
+
+@pytest.mark.asyncio
+async def test_groups_by_parameters_and_coalesces_duplicates():
+	service = _FakeGROQService()
+	processor = GROQBatchProcessor(GROQOptimizationConfig(batch_size=3, batch_timeout=0.05), service)
+
+	results = await asyncio.gather(
+		processor.add_request(_request("a")),
+		processor.add_request(_request("b")),
+		processor.add_request(_request("a")),
+		processor.add_request(_request("c", temperature=0.7)),
+		processor.add_request(_request("d")),
+	)
+
+	assert [r["content"] for r in results] == ["parsed a", "parsed b", "parsed a", "parsed c", "parsed d"]
+	assert sorted(call["prompt"] for call in service.calls) == ["a", "b", "c", "d"]
+	# Budget was reserved by the scheduler, so the service skips its own limiter
+	assert all(call["rate_limit"] is False for call in service.calls)
+	stats = processor.get_stats()
+	assert stats["coalesced"] == 1 and stats["batches"] == 2 and stats["pending"] == 0
+	assert not processor.inflight and processor.capacity._value == processor.config.max_pending_requests
+
+
+@pytest.mark.asyncio
+async def test_waits_for_token_budget_instead_of_failing():
+	service = _FakeGROQService(tokens_per_minute=20)
+	processor = GROQBatchProcessor(GROQOptimizationConfig(batch_size=5, batch_timeout=0.05), service)
+
+	pending = asyncio.gather(*(processor.add_request(_request(p)) for p in "abc"))
+	await asyncio.sleep(0.2)
+	assert len(service.calls) == 2 and processor.stats["rate_limit_waits"] >= 1
+
+	# Budget frees up: the held-back request goes out without the caller seeing an error
+	service.rate_limiters[GROQModel.LLAMA3_1_8B.value] = GROQRateLimiter(1000, 10_000)
+	results = await pending
+	assert [r["content"] for r in results] == ["parsed a", "parsed b", "parsed c"]
+
+
+@pytest.mark.asyncio
+async def test_backpressure_bounds_queued_requests():
+	service = _FakeGROQService()
+	processor = GROQBatchProcessor(GROQOptimizationConfig(batch_size=2, batch_timeout=0.01, max_pending_requests=2), service)
+
+	results = await asyncio.gather(*(processor.add_request(_request(str(i))) for i in range(6)))
+
+	assert len(results) == 6 and len(service.calls) == 6
+	assert processor.capacity._value == 2
+
+
+@pytest.mark.asyncio
+async def test_estimator_error_does_not_leave_a_stuck_request():
+	service = _FakeGROQService()
+	processor = GROQBatchProcessor(GROQOptimizationConfig(batch_size=2, batch_timeout=0.01, max_pending_requests=2), service)
+
+	def broken_estimate(messages):
+		raise ValueError("cannot tokenize")
+
+	service.estimate_request_tokens = broken_estimate
+	for _ in range(3):
+		with pytest.raises(ValueError):
+			await asyncio.wait_for(processor.add_request(_request("a")), timeout=1)
+	assert not processor.inflight and processor.capacity._value == 2
+
+	# Once the estimator works again the same request goes through
+	del service.estimate_request_tokens
+	result = await asyncio.wait_for(processor.add_request(_request("a")), timeout=1)
+	assert result["content"] == "parsed a"
+
+
+@pytest.mark.asyncio
+async def test_offline_jsonl_round_trip(tmp_path):
+	service = _FakeGROQService()
+	processor = GROQBatchProcessor(GROQOptimizationConfig(batch_size=4, batch_timeout=0.01), service)
+	requests_path, responses_path = tmp_path / "requests.jsonl", tmp_path / "responses.jsonl"
+	write_batch_requests(
+		requests_path,
+		[build_batch_request(f"job-{i}", [{"role": "user", "content": prompt}], GROQModel.LLAMA3_1_8B, max_tokens=256) for i, prompt in enumerate(["x", "boom", "y"])],
+	)
+
+	counts = await process_batch_file(requests_path, responses_path, processor, chunk_size=2)
+	results = read_batch_results(responses_path)
+
+	assert counts == {"total": 3, "succeeded": 2, "failed": 1}
+	assert list(results) == ["job-0", "job-1", "job-2"]
+	assert results["job-0"]["content"] == "parsed x" and results["job-2"]["model"] == GROQModel.LLAMA3_1_8B.value
+	assert results["job-1"]["error"] == {"code": "RuntimeError", "message": "provider error"}
+	assert service.calls[0]["max_tokens"] == 256
@@ -0,0 +1,113 @@
+"""
+Unit Tests for the GROQ token-bucket rate limiter
+"""
+
+import math
+import time
+
+import pytest
+from app.services.groq_service import GROQRateLimiter, RedisGROQRateLimiter
+
+
+class _FakeAsyncRedis:
+	"""Returns scripted bucket decisions and records the script arguments"""
+
+	def __init__(self, waits):
+		self.waits = list(waits)
+		self.calls = []
+
+	async def eval(self, script, numkeys, key, *args):
+		self.calls.append((key, args))
+		return str(self.waits.pop(0))
+
+
+@pytest.mark.asyncio
+async def test_buckets_admit_up_to_capacity_then_report_exact_wait():
+	limiter = GROQRateLimiter(requests_per_minute=60, tokens_per_minute=600, burst_allowance=0)
+
+	assert await limiter.reserve(300) == 0
+	assert await limiter.reserve(300) == 0
+	# Tokens refill at 10/s, so 50 more tokens are 5 seconds away
+	wait = await limiter.reserve(50)
+	assert wait == pytest.approx(5.0, abs=0.05)
+	assert limiter.get_wait_time(50) == pytest.approx(5.0, abs=0.05)
+	assert math.isinf(await limiter.reserve(601))
+
+
+@pytest.mark.asyncio
+async def test_acquire_sleeps_until_budget_refills():
+	limiter = GROQRateLimiter(requests_per_minute=600, tokens_per_minute=6000, burst_allowance=0)
+	assert await limiter.acquire(6000)
+
+	start = time.monotonic()
+	assert await limiter.acquire(20)
+	# 20 tokens at 100 tokens/s
+	assert 0.15 <= time.monotonic() - start < 0.5
+	stats = limiter.get_stats()
+	assert stats["acquired"] == 2 and stats["waits"] == 1 and stats["max_wait_time"] >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_acquire_gives_up_when_wait_exceeds_max_wait():
+	limiter = GROQRateLimiter(requests_per_minute=1, tokens_per_minute=1000, burst_allowance=0)
+	assert await limiter.acquire(10, max_wait=0)
+
+	assert not await limiter.acquire(10, max_wait=0)
+	assert not await limiter.acquire(5000)
+	assert limiter.get_stats()["rejected"] == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_limiter_uses_redis_bucket_and_falls_back_locally():
+	redis = _FakeAsyncRedis([0, 2.5])
+
+	async def client_factory():
+		return redis
+
+	limiter = RedisGROQRateLimiter(30, 6000, "llama-3.1-8b-instant", client_factory=client_factory)
+	assert await limiter.acquire(100, max_wait=0)
+	assert not await limiter.acquire(100, max_wait=1)
+	assert limiter.get_wait_time() == 2.5
+	assert redis.calls[0][0] == "groq:rate_limit:llama-3.1-8b-instant" and redis.calls[0][1][-1] == 100
+
+	async def unavailable():
+		return None
+
+	fallback = RedisGROQRateLimiter(30, 6000, "llama-3.1-8b-instant", client_factory=unavailable)
+	assert await fallback.acquire(100, max_wait=0)
+	assert fallback.get_stats()["local_fallbacks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_bucket_script_refills_and_debits_in_redis():
+	fakeredis = pytest.importorskip("fakeredis")
+	pytest.importorskip("lupa")
+	server = fakeredis.FakeServer()
+
+	async def client_factory():
+		return fakeredis.FakeAsyncRedis(server=server)
+
+	# Two workers' limiters for the same model draw from one bucket
+	first = RedisGROQRateLimiter(60, 600, "llama-3.1-8b-instant", burst_allowance=0, client_factory=client_factory)
+	second = RedisGROQRateLimiter(60, 600, "llama-3.1-8b-instant", burst_allowance=0, client_factory=client_factory)
+	assert await first.get_shared_state() == {"available_requests": 60.0, "available_tokens": 600.0}
+
+	assert await first.reserve(300) == 0
+	assert await second.reserve(300) == 0
+	# Tokens refill at 10/s, so 50 more tokens are 5 seconds away for either worker
+	assert float(await second.reserve(50)) == pytest.approx(5.0, abs=0.05)
+	state = await first.get_shared_state()
+	assert state["available_requests"] == pytest.approx(58.0, abs=0.05) and state["available_tokens"] == pytest.approx(0.0, abs=0.5)
+
+	# Three seconds later: 30 tokens and 3 requests have come back, requests capped at 60
+	redis = await client_factory()
+	updated_at = float(await redis.hget(first.key, "updated_at"))
+	await redis.hset(first.key, "updated_at", str(updated_at - 3))
+	assert await first.reserve(20) == 0
+	state = await first.get_shared_state()
+	assert state["available_tokens"] == pytest.approx(10.0, abs=1.0) and state["available_requests"] == pytest.approx(59.0, abs=0.05)
+	assert 0 < await redis.ttl(first.key) <= 120
+
+	# Counters only: the local buckets are not what the shared limiter admits against
+	stats = first.get_stats()
+	assert stats["shared"] and "available_tokens" not in stats and stats["local_fallbacks"] == 0
@@ -0,0 +1,123 @@
+"""
+Unit Tests for the IntelligentCacheService in-process cache layers
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app.services.intelligent_cache_service import CacheEntry, IntelligentCacheService, L1MemoryCache, SortedKeyIndex
+
+
+def _entry(key, size_bytes=10, access_count=1):
+	now = datetime.now(timezone.utc)
+	return CacheEntry(key=key, value=key, created_at=now, last_accessed=now, access_count=access_count, ttl=3600, size_bytes=size_bytes)
+
+
+class TestL1MemoryCache:
+	"""Test the bounded LRU structure"""
+
+	def test_evicts_least_recently_used(self):
+		cache = L1MemoryCache(max_entries=3, max_memory=1000)
+		for key in ("a", "b", "c"):
+			cache.put(key, _entry(key))
+
+		cache.get("a")
+		evicted = cache.put("d", _entry("d"))
+
+		assert [e.key for e in evicted] == ["b"]
+		assert list(cache) == ["c", "a", "d"]
+
+	def test_enforces_memory_budget(self):
+		cache = L1MemoryCache(max_entries=100, max_memory=100)
+		for key in ("a", "b", "c"):
+			cache.put(key, _entry(key, size_bytes=30))
+
+		evicted = cache.put("d", _entry("d", size_bytes=50))
+
+		assert [e.key for e in evicted] == ["a", "b"]
+		assert cache.memory_bytes == 80
+		assert cache.put("huge", _entry("huge", size_bytes=101))[0].key == "huge"
+		assert "huge" not in cache and cache.memory_bytes == 80
+
+	def test_replace_and_pop_keep_memory_accounting(self):
+		cache = L1MemoryCache(max_entries=10, max_memory=1000)
+		cache.put("a", _entry("a", size_bytes=40))
+		cache.put("a", _entry("a", size_bytes=15))
+		cache.put("b", _entry("b", size_bytes=5))
+
+		assert len(cache) == 2 and cache.memory_bytes == 20
+		assert cache.pop("a").size_bytes == 15
+		assert cache.pop("missing") is None
+		assert cache.memory_bytes == 5
+
+
+class TestIntelligentCacheServiceL1:
+	"""Test L1 integration in the service"""
+
+	@pytest.fixture
+	def service(self):
+		with patch("app.services.intelligent_cache_service.get_cache_service", return_value=MagicMock()):
+			service = IntelligentCacheService()
+		service.l2_cache = MagicMock(aset=AsyncMock(return_value=True), aget=AsyncMock(return_value=None))
+		return service
+
+	@pytest.mark.asyncio
+	async def test_entries_are_sized_by_serialized_bytes(self, service):
+		service.compression_threshold = 10**9
+		await service.set("key", {"payload": "x" * 500})
+
+		entry = service.l1_cache.peek("key")
+		assert 500 < entry.size_bytes < 600
+		assert service.l1_cache.memory_bytes == entry.size_bytes
+
+	@pytest.mark.asyncio
+	async def test_memory_budget_evicts_and_demotes_to_l2(self, service):
+		service.l1_cache = L1MemoryCache(max_entries=100, max_memory=50)
+		await service._store_in_l1("hot", _entry("hot", size_bytes=30, access_count=5))
+		await service._store_in_l1("new", _entry("new", size_bytes=30))
+
+		assert "hot" not in service.l1_cache and "new" in service.l1_cache
+		service.l2_cache.aset.assert_awaited_once_with("hot", "hot", 3600)
+		assert service.stats.evictions == 1
+
+
+class TestSortedKeyIndex:
+	"""Test prefix-indexed pattern lookups"""
+
+	def test_match_visits_literal_prefix_range(self):
+		index = SortedKeyIndex()
+		for key in ("recommendations:1:a", "recommendations:1:b", "recommendations:10:a", "analytics:1:x", "recommendations:2:a"):
+			index.add(key)
+		index.add("recommendations:1:a")
+
+		assert index.match("recommendations:1:*") == ["recommendations:1:a", "recommendations:1:b"]
+		assert index.match("*:1:*") == ["analytics:1:x", "recommendations:1:a", "recommendations:1:b"]
+		assert index.match("analytics:1:x") == ["analytics:1:x"]
+
+		index.discard("recommendations:1:a")
+		assert len(index) == 4
+
+	def test_sorted_view_follows_adds_and_discards_between_matches(self):
+		index = SortedKeyIndex()
+		index.add("user:1:a")
+		assert index.match("user:1:*") == ["user:1:a"]
+
+		index.discard("user:1:a")
+		index.add("user:1:b")
+		assert index.match("user:1:*") == ["user:1:b"]
+
+		index.discard("user:1:b")
+		assert index.match("user:*") == [] and len(index) == 0
+		index.add("user:1:b")
+		assert index.match("user:*") == ["user:1:b"]
+
+	@pytest.mark.asyncio
+	async def test_l3_pattern_invalidation_uses_index(self):
+		with patch("app.services.intelligent_cache_service.get_cache_service", return_value=MagicMock()):
+			service = IntelligentCacheService()
+		for key in ("user:1:a", "user:1:b", "user:2:a"):
+			await service._set_in_l3(key, "v", 60)
+
+		assert await service._invalidate_l3_pattern("user:1:*") == 2
+		assert list(service.l3_cache) == ["user:2:a"] and len(service.l3_index) == 1
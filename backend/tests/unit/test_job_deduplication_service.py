@@ -2,11 +2,14 @@
 Tests for Job Deduplication Service
 """
 
+import json
 from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
 from app.models.job import Job
+from app.services.job_deduplication_index import TitleMinHasher
 from app.services.job_deduplication_service import JobDeduplicationService
 
 
@@ -257,6 +260,63 @@ class TestFilterDuplicateJobs:
 		assert stats["unique_output"] == 0
 
 
+class TestIndexedDeduplicationStrategy:
+	"""Test the blocked/indexed strategy against the pairwise reference"""
+
+	@pytest.fixture
+	def sample_jobs(self):
+		return [
+			{"title": "Software Engineer Backend", "company": "Google Inc", "location": "San Francisco"},
+			{"title": "Software Engineer - Backend", "company": "Google", "location": "San Francisco, CA"},  # Fuzzy duplicate
+			{"title": "Software Engineer", "company": "Google", "location": "San Francisco"},
+			{"title": "Software Engineer", "company": "Google", "location": "San Francisco"},  # Exact duplicate
+			{"title": "Software Engineer", "company": "Google", "location": "London"},  # Different location
+			{"title": "Data Scientist", "company": "Microsoft", "location": "Seattle", "url": "https://example.com/job/9"},
+			{"title": "ML Engineer", "company": "Meta", "location": "Menlo Park", "url": "https://example.com/job/9?ref=x"},  # Same URL
+		]
+
+	def test_rejects_unknown_strategy(self, mock_db):
+		with pytest.raises(ValueError):
+			JobDeduplicationService(mock_db, strategy="quadratic")
+
+	def test_matches_pairwise_output(self, dedup_service, sample_jobs):
+		pairwise_unique, pairwise_stats = dedup_service.filter_duplicate_jobs(sample_jobs, None, strategy="pairwise")
+		indexed_unique, indexed_stats = dedup_service.filter_duplicate_jobs(sample_jobs, None, strategy="indexed")
+
+		assert indexed_unique == pairwise_unique
+		assert indexed_stats == pairwise_stats
+		assert indexed_stats["duplicates_by_fuzzy"] == 1
+		assert indexed_stats["duplicates_by_fingerprint"] == 1
+		assert indexed_stats["duplicates_by_url"] == 1
+
+	def test_matches_pairwise_against_existing_jobs(self, dedup_service, sample_jobs):
+		existing_jobs = [
+			Job(id=1, user_id=1, title="Data Scientist", company="Microsoft Corp", location="Seattle, WA", application_url=None),
+			Job(id=2, user_id=1, title="Product Manager", company="Stripe", location="Dublin", application_url=None),
+		]
+
+		pairwise_unique, pairwise_stats = dedup_service.filter_duplicate_jobs(sample_jobs, existing_jobs, strategy="pairwise")
+		indexed_unique, indexed_stats = dedup_service.filter_duplicate_jobs(sample_jobs, existing_jobs, strategy="indexed")
+
+		assert indexed_unique == pairwise_unique
+		assert indexed_stats == pairwise_stats
+		assert indexed_stats["duplicates_against_db"] == 1
+
+	def test_strict_mode_skips_fuzzy(self, dedup_service, sample_jobs):
+		_unique_jobs, stats = dedup_service.filter_duplicate_jobs(sample_jobs, None, strict_mode=True, strategy="indexed")
+
+		assert stats["duplicates_by_fuzzy"] == 0
+		assert stats["unique_output"] == 5
+
+	def test_minhash_buckets_similar_titles_together(self):
+		minhasher = TitleMinHasher()
+		similar = set(minhasher.band_keys("senior software engineer backend")) & set(minhasher.band_keys("senior software engineer - backend"))
+		unrelated = set(minhasher.band_keys("senior software engineer")) & set(minhasher.band_keys("registered nurse"))
+
+		assert similar
+		assert not unrelated
+
+
 class TestDeduplicateAgainstDB:
 	"""Test deduplication against database"""
 
@@ -304,9 +364,80 @@ class TestDeduplicateAgainstDB:
 		assert mock_query.filter.called
 
 
+class TestIndexedDBLookup:
+	"""Test the indexed deduplicate_against_db path backed by dedup columns"""
+
+	@staticmethod
+	def _query_router(rows_by_column):
+		"""Return a db.query side effect answering each column lookup with its own rows"""
+
+		def query(*columns):
+			mock_query = MagicMock()
+			mock_query.filter.return_value = mock_query
+			mock_query.all.return_value = next((rows for column, rows in rows_by_column if columns[0] is column), [])
+			return mock_query
+
+		return query
+
+	def test_assign_dedup_keys(self, dedup_service):
+		job = Job(title="Software Engineer (Remote)", company="Google Inc.", location="San Francisco, CA", application_url="https://Example.com/job/1?ref=x")
+
+		dedup_service.assign_dedup_keys(job)
+
+		assert job.job_fingerprint == dedup_service.create_job_fingerprint("Software Engineer", "Google", "San Francisco CA")
+		assert job.normalized_url == dedup_service.normalize_url("https://example.com/job/1")
+		assert job.dedup_company_key == "google"
+
+	def test_probes_dedup_columns_instead_of_loading_jobs(self, mock_db):
+		dedup_service = JobDeduplicationService(mock_db, strategy="indexed")
+		fingerprint = dedup_service.create_job_fingerprint("Software Engineer", "Google", "San Francisco")
+		mock_db.query.side_effect = self._query_router(
+			[
+				(Job.job_fingerprint, [SimpleNamespace(job_fingerprint=fingerprint)]),
+				(Job.normalized_url, [SimpleNamespace(normalized_url=dedup_service.normalize_url("https://example.com/job/7"))]),
+			]
+		)
+
+		jobs = [
+			{"title": "Software Engineer", "company": "Google", "location": "San Francisco"},  # Fingerprint exists
+			{"title": "Data Scientist", "company": "Microsoft", "location": "Seattle", "application_url": "https://example.com/job/7"},  # URL exists
+			{"title": "Product Manager", "company": "Stripe", "location": "Dublin"},
+		]
+
+		unique_jobs, stats = dedup_service.deduplicate_against_db(jobs, user_id=1)
+
+		assert [job["title"] for job in unique_jobs] == ["Product Manager"]
+		assert stats["duplicates_by_fingerprint"] == 1
+		assert stats["duplicates_by_url"] == 1
+		assert all(call.args[0] is not Job for call in mock_db.query.call_args_list)
+
+	def test_fuzzy_candidates_from_company_blocks(self, mock_db):
+		dedup_service = JobDeduplicationService(mock_db, strategy="indexed")
+		mock_db.query.side_effect = self._query_router(
+			[(Job.id, [SimpleNamespace(id=1, title="Software Engineer - Backend", company="Google", location="San Francisco, CA", application_url=None)])]
+		)
+
+		jobs = [{"title": "Software Engineer Backend", "company": "Google Inc", "location": "San Francisco"}]
+
+		unique_jobs, stats = dedup_service.deduplicate_against_db(jobs, user_id=1)
+
+		assert unique_jobs == []
+		assert stats["duplicates_against_db"] == 1
+
+
 class TestBulkDatabaseDeduplication:
 	"""Test bulk deduplication of existing database jobs"""
 
+	@staticmethod
+	def _streaming_query(*pages):
+		"""Mock query whose chained filter/order_by/limit calls return one keyset page per .all()"""
+		mock_query = MagicMock()
+		mock_query.filter.return_value = mock_query
+		mock_query.order_by.return_value = mock_query
+		mock_query.limit.return_value = mock_query
+		mock_query.all.side_effect = [*pages, []]
+		return mock_query
+
 	def test_finds_duplicates_in_database(self, mock_db, dedup_service):
 		# Mock database jobs with duplicates
 		jobs = [
@@ -339,14 +470,7 @@ class TestBulkDatabaseDeduplication:
 			),
 		]
 
-		# Setup mock query chain - use a fresh instance for the dedup service
-		mock_query = MagicMock()
-		mock_query_filtered = MagicMock()
-
-		mock_db.query.return_value = mock_query
-		mock_query.order_by.return_value = mock_query
-		mock_query.filter.return_value = mock_query_filtered  # Return filtered query
-		mock_query_filtered.all.return_value = jobs  # The filtered query returns jobs
+		mock_db.query.return_value = self._streaming_query(jobs)
 
 		results = dedup_service.bulk_deduplicate_database_jobs(user_id=1)
 
@@ -375,13 +499,38 @@ class TestBulkDatabaseDeduplication:
 			),
 		]
 
-		mock_query = MagicMock()
-		mock_db.query.return_value = mock_query
-		mock_query.order_by.return_value = mock_query
-		mock_query.all.return_value = jobs
+		mock_db.query.return_value = self._streaming_query(jobs)
 
 		results = dedup_service.bulk_deduplicate_database_jobs(user_id=1)
 
 		assert results["duplicates_found"] == 0
 		assert results["duplicates_removed"] == 0
 		assert results["duplicates_removed"] == 0
+
+	def test_deletes_in_batches_and_resumes_from_checkpoint(self, mock_db, dedup_service, tmp_path):
+		checkpoint_path = tmp_path / "bulk_dedup.json"
+		checkpoint_path.write_text(
+			json.dumps(
+				{
+					"user_id": 1,
+					"before_id": 3,
+					"results": {"total_jobs": 10, "duplicates_found": 4, "duplicates_removed": 4, "duplicates_by_type": {"url": 1, "fingerprint": 3}},
+				}
+			)
+		)
+
+		already_checked = [Job(id=3, title="Software Engineer", company="Google", location="SF", application_url="https://example.com/job/1")]
+		remaining = [
+			Job(id=2, title="Backend Engineer", company="Google", location="SF", application_url="https://example.com/job/1"),  # Duplicate by URL
+			Job(id=1, title="Data Scientist", company="Microsoft", location="Seattle", application_url="https://example.com/job/2"),
+		]
+		mock_db.query.return_value = self._streaming_query(already_checked, remaining)
+
+		results = dedup_service.bulk_deduplicate_database_jobs(user_id=1, batch_size=1, checkpoint_path=str(checkpoint_path))
+
+		assert results["total_jobs"] == 12
+		assert results["duplicates_found"] == 5
+		assert results["duplicates_removed"] == 5
+		assert results["duplicates_by_type"]["url"] == 2
+		assert mock_db.commit.call_count == 1
+		assert not checkpoint_path.exists()
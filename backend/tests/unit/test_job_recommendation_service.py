@@ -3,10 +3,12 @@ Unit Tests for Job Recommendation Service
 Tests the consolidated job recommendation service (matching + feedback + source management)
 """
 
-from datetime import datetime, timezone
-from unittest.mock import MagicMock, patch
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from app.core.cache import MATERIALIZED_RECOMMENDATIONS_VERSION, JobRecommendationCache
 from app.models.feedback import JobRecommendationFeedback
 from app.models.job import Job
 from app.models.user import User
@@ -472,6 +474,165 @@ class TestJobRecommendationServiceRealTimeMatching:
 				assert result is not None or mock_ws.called
 
 
+class TestJobRecommendationServicePersonalized:
+	"""Test hydration of engine results for the recommendations endpoint"""
+
+	@pytest.fixture
+	def service(self):
+		"""Create JobRecommendationService instance"""
+		return JobRecommendationService(db=MagicMock(spec=Session))
+
+	@pytest.mark.asyncio
+	async def test_reuses_jobs_loaded_by_engine(self, service):
+		"""Jobs carried on engine results are returned without another query"""
+		jobs = [Job(id=i, title=f"Engineer {i}", company="Tech Corp", user_id=1) for i in (1, 2)]
+		service.recommendation_engine.get_recommendations = AsyncMock(
+			return_value=[{"job_id": job.id, "score": 0.9, "match_reasons": [], "job": job} for job in jobs]
+		)
+		db = MagicMock()
+		db.execute = AsyncMock()
+
+		result = await service.get_personalized_recommendations(db=db, user_id=1, limit=2)
+
+		assert [rec["job"] for rec in result] == jobs
+		db.execute.assert_not_called()
+		assert service.recommendation_engine.get_recommendations.call_args.kwargs["include_jobs"] is True
+
+	@pytest.mark.asyncio
+	async def test_hydrates_scored_ids_with_single_query(self, service):
+		"""Scored ids without jobs are loaded in one IN query, keeping score order"""
+		service.recommendation_engine.get_recommendations = AsyncMock(
+			return_value=[{"job_id": job_id, "score": score, "match_reasons": []} for job_id, score in ((3, 0.9), (1, 0.8), (2, 0.2))]
+		)
+		rows = [SimpleNamespace(id=i, title=f"Engineer {i}") for i in (1, 2, 3)]
+		execute_result = MagicMock()
+		execute_result.all.return_value = rows
+		db = MagicMock()
+		db.execute = AsyncMock(return_value=execute_result)
+
+		result = await service.get_personalized_recommendations(db=db, user_id=1, limit=5, min_score=0.5, projection=True)
+
+		assert [rec["job"].id for rec in result] == [3, 1]
+		assert [rec["match_score"] for rec in result] == [0.9, 0.8]
+		db.execute.assert_awaited_once()
+		statement = str(db.execute.call_args.args[0])
+		assert " IN " in statement
+		assert "jobs.source_url" in statement and "jobs.user_id" not in statement
+
+
+class _DictCache:
+	"""In-memory stand-in for the Redis CacheService"""
+
+	def __init__(self):
+		self.store = {}
+
+	def get(self, key):
+		return self.store.get(key)
+
+	def set(self, key, value, ttl=3600):
+		self.store[key] = value
+		return True
+
+	def delete(self, key):
+		return self.store.pop(key, None) is not None
+
+
+class TestJobRecommendationServiceMaterialized:
+	"""Test the materialized per-user top-K recommendation store"""
+
+	@pytest.fixture
+	def rec_cache(self):
+		"""Dict-backed JobRecommendationCache patched into the service"""
+		rec_cache = JobRecommendationCache(_DictCache())
+		with patch("app.services.job_recommendation_service.job_recommendation_cache", rec_cache):
+			yield rec_cache
+
+	@pytest.fixture
+	def service(self):
+		"""Create JobRecommendationService instance"""
+		return JobRecommendationService(db=MagicMock(spec=Session))
+
+	@pytest.fixture
+	def user(self):
+		return User(id=1, skills=["Python", "SQL"], preferred_locations=["Berlin"], experience_level="senior")
+
+	@staticmethod
+	def _db(job_rows, applied_ids=()):
+		"""Async session returning projected job rows, then applied job ids"""
+		jobs_result, applied_result = MagicMock(), MagicMock()
+		jobs_result.all.return_value = job_rows
+		applied_result.all.return_value = [(job_id,) for job_id in applied_ids]
+		db = MagicMock()
+		db.execute = AsyncMock(side_effect=[jobs_result, applied_result])
+		return db
+
+	@pytest.mark.asyncio
+	async def test_fresh_entry_is_served_without_scoring(self, service, rec_cache, user):
+		"""A fresh materialized list skips the engine and drops applied jobs"""
+		stamp = rec_cache.profile_stamp(user)
+		rec_cache.set_materialized(user.id, stamp, [{"job_id": 2, "score": 0.9}, {"job_id": 1, "score": 0.7}, {"job_id": 3, "score": 0.4}])
+		service.recommendation_engine.compute_recommendations = AsyncMock()
+		db = self._db([SimpleNamespace(id=i) for i in (1, 2, 3)], applied_ids=[2])
+
+		result = await service.get_materialized_recommendations(db=db, user=user, limit=5, projection=True)
+
+		service.recommendation_engine.compute_recommendations.assert_not_called()
+		assert [rec["job"].id for rec in result] == [1, 3]
+		assert db.execute.await_count == 2
+
+	@pytest.mark.asyncio
+	async def test_profile_edit_falls_back_to_on_demand_scoring(self, service, rec_cache, user):
+		"""Changing skills invalidates the stamp, so the list is rebuilt on read"""
+		rec_cache.set_materialized(user.id, rec_cache.profile_stamp(user), [{"job_id": 1, "score": 0.9}])
+		user.skills = ["Go"]
+		service.recommendation_engine.compute_recommendations = AsyncMock(return_value=[{"job_id": 4, "score": 0.6, "match_reasons": []}])
+
+		result = await service.get_materialized_recommendations(db=self._db([SimpleNamespace(id=4)]), user=user, projection=True)
+
+		service.recommendation_engine.compute_recommendations.assert_awaited_once()
+		assert [rec["job"].id for rec in result] == [4]
+		assert rec_cache.get_materialized(user.id, rec_cache.profile_stamp(user)) == [{"job_id": 4, "score": 0.6, "match_reasons": []}]
+
+	@pytest.mark.asyncio
+	async def test_scoring_failure_or_empty_result_is_not_stored(self, service, rec_cache, user):
+		"""A failed or empty rebuild leaves nothing fresh behind, so the next read scores again"""
+		stamp = rec_cache.profile_stamp(user)
+		service.recommendation_engine.compute_recommendations = AsyncMock(side_effect=RuntimeError("database unavailable"))
+
+		with pytest.raises(RuntimeError):
+			await service.materialize_recommendations(MagicMock(), user)
+		assert await service.get_materialized_recommendations(db=MagicMock(), user=user) == []
+		assert rec_cache.get_materialized(user.id, stamp) is None
+
+		service.recommendation_engine.compute_recommendations = AsyncMock(return_value=[])
+		assert await service.materialize_recommendations(MagicMock(), user) == []
+		assert rec_cache.get_materialized(user.id, stamp) is None
+
+	def test_stale_version_and_age_are_rejected(self, rec_cache, user):
+		"""Entries from another layout version or past max age read as missing"""
+		stamp = rec_cache.profile_stamp(user)
+		rec_cache.set_materialized(user.id, stamp, [{"job_id": 1, "score": 0.9}])
+		entry = rec_cache.cache.store[rec_cache._materialized_key(user.id)]
+
+		entry["version"] = -1
+		assert rec_cache.get_materialized(user.id, stamp) is None
+
+		entry["version"] = MATERIALIZED_RECOMMENDATIONS_VERSION
+		entry["generated_at"] = (datetime.now(timezone.utc) - timedelta(seconds=rec_cache.materialized_max_age + 1)).isoformat()
+		assert rec_cache.get_materialized(user.id, stamp) is None
+
+	@pytest.mark.asyncio
+	async def test_new_job_matches_merge_into_top_k(self, service, rec_cache, user):
+		"""check_job_matches_for_user folds new jobs into the fresh list in score order"""
+		stamp = rec_cache.profile_stamp(user)
+		rec_cache.set_materialized(user.id, stamp, [{"job_id": 1, "score": 0.5}])
+		new_job = Job(id=9, user_id=1, title="Data Engineer", company="Acme", location="Berlin", tech_stack=["Python"], created_at=datetime.now())
+
+		await service.check_job_matches_for_user(user, [new_job])
+
+		assert [rec["job_id"] for rec in rec_cache.get_materialized(user.id, stamp)] == [9, 1]
+
+
 class TestJobRecommendationServicePreferences:
 	"""Test user preferences and personalization"""
 
@@ -0,0 +1,64 @@
+"""
+Unit Tests for the pooled LLM client registry
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from app.services.llm_client_pool import LLMClientPool
+
+
+def test_clients_are_reused_per_model_parameters():
+	pool = LLMClientPool()
+	factory = MagicMock(side_effect=lambda: object())
+
+	first = pool.get(("openai", "gpt-3.5-turbo", 0.2, 2000), factory)
+	assert pool.get(("openai", "gpt-3.5-turbo", 0.2, 2000), factory) is first
+	assert pool.get(("openai", "gpt-3.5-turbo", 0.7, 2000), factory) is not first
+	pool.get(("groq", "mixtral-8x7b-32768", 0.3, 2000), factory)
+
+	assert factory.call_count == 3
+	stats = pool.get_stats()
+	assert (stats["openai"]["clients"], stats["openai"]["created"], stats["openai"]["reused"]) == (2, 2, 1)
+	assert stats["groq"]["clients"] == 1 and not stats["groq"]["http_pool_open"]
+
+
+@pytest.mark.asyncio
+async def test_http_pool_is_shared_per_provider_and_closed_on_shutdown():
+	pool = LLMClientPool(max_connections=10, max_keepalive_connections=5)
+	openai_http = pool.http_client("openai")
+
+	assert pool.http_client("openai") is openai_http
+	assert pool.http_client("groq") is not openai_http
+	assert pool.provider_stats("openai")["http_pool_open"] and pool.provider_stats("openai")["max_keepalive_connections"] == 5
+
+	pool.get(("openai", "gpt-4", 0.1, 4000), object)
+	await pool.aclose()
+
+	assert openai_http.is_closed and pool.get_stats()["openai"]["clients"] == 0
+	assert pool.http_client("openai") is not openai_http
+
+
+def test_each_event_loop_gets_its_own_clients():
+	pool = LLMClientPool()
+	factory = MagicMock(side_effect=lambda: object())
+
+	async def use_pool():
+		return pool.get(("openai", "gpt-4", 0.1, 4000), factory), pool.http_client("openai"), pool.provider_stats("openai")
+
+	# Like scheduled jobs and Celery tasks: a fresh asyncio.run per call
+	first_client, first_http, _ = asyncio.run(use_pool())
+	second_client, second_http, stats = asyncio.run(use_pool())
+
+	assert second_client is not first_client and second_http is not first_http
+	assert factory.call_count == 2
+	# By the second run the first loop had closed, so its clients were dropped
+	assert stats["event_loops"] == 1 and stats["clients"] == 1
+
+	async def reuse_within_one_loop():
+		first = await use_pool()
+		return first, await use_pool()
+
+	first, again = asyncio.run(reuse_within_one_loop())
+	assert first[0] is again[0] and first[1] is again[1]
@@ -0,0 +1,78 @@
+"""
+Unit Tests for the content-addressed LLM response cache
+"""
+
+import fnmatch
+
+import pytest
+from app.services.llm_response_cache import LLM_CACHE_PREFIX, LLMResponseCache, build_cache_key, decode_payload
+
+
+class _DictCache:
+	"""In-memory stand-in for the async CacheService methods used by the LLM cache"""
+
+	def __init__(self):
+		self.data = {}
+		self.ttls = {}
+
+	async def aget(self, key):
+		return self.data.get(key)
+
+	async def aset(self, key, value, ttl=3600, tags=None):
+		self.data[key] = value
+		self.ttls[key] = ttl
+		return True
+
+	async def adelete(self, key):
+		return self.data.pop(key, None) is not None
+
+	async def adelete_pattern(self, pattern):
+		matches = [key for key in self.data if fnmatch.fnmatchcase(key, pattern)]
+		for key in matches:
+			del self.data[key]
+		return len(matches)
+
+
+def test_key_is_stable_and_covers_every_input():
+	base = dict(model_type="general", complexity="simple", prompt="Write a cover letter", context="You are helpful", temperature=0.2, max_tokens=2000)
+	key = build_cache_key(**base)
+
+	assert key == build_cache_key(**base)
+	assert key.startswith(f"{LLM_CACHE_PREFIX}:general:") and len(key.rsplit(":", 1)[1]) == 64
+	assert key == build_cache_key(**{**base, "temperature": 0.20000001})
+	for field, value in (("complexity", "complex"), ("prompt", "Write a CV"), ("context", None), ("temperature", 0.3), ("max_tokens", 1000)):
+		assert build_cache_key(**{**base, field: value}) != key, field
+
+
+@pytest.mark.asyncio
+async def test_round_trip_is_compressed_and_uses_model_type_ttl():
+	backend = _DictCache()
+	cache = LLMResponseCache(backend, ttls={"general": 120})
+	payload = {"content": "Dear hiring manager, " * 50, "token_usage": {"total_tokens": 30}}
+
+	assert await cache.get("k") is None
+	assert await cache.set("k", "general", payload)
+	assert await cache.get("k") == payload
+
+	assert decode_payload(backend.data["k"]) == payload
+	assert len(backend.data["k"]) < len(payload["content"]) / 4
+	assert backend.ttls["k"] == 120
+	stats = cache.get_stats()
+	assert (stats["hits"], stats["misses"], stats["writes"]) == (1, 1, 1)
+	assert stats["hit_rate"] == 0.5 and 0 < stats["compression_ratio"] < 1
+
+
+@pytest.mark.asyncio
+async def test_corrupt_entries_are_dropped_and_purge_is_scoped():
+	backend = _DictCache()
+	cache = LLMResponseCache(backend)
+	general = build_cache_key("general", "simple", "a")
+	negotiation = build_cache_key("negotiation", "simple", "a")
+	await cache.set(general, "general", {"content": "x"})
+	await cache.set(negotiation, "negotiation", {"content": "y"})
+	backend.data["bad"] = "not-base64!"
+
+	assert await cache.get("bad") is None and "bad" not in backend.data
+	assert await cache.purge("general") == 1
+	assert list(backend.data) == [negotiation]
+	assert await cache.purge() == 1 and not backend.data
@@ -211,6 +211,39 @@ class TestLLMService:
 			assert isinstance(result, str)
 			assert result == "Test response"
 
+	@pytest.mark.asyncio
+	async def test_repeated_prompt_served_from_shared_cache(self, llm_service):
+		"""A repeated prompt is answered from the content-addressed cache, even by another service instance."""
+		from app.services.llm_response_cache import LLMResponseCache
+
+		shared = MagicMock(data={})
+		shared.aget = AsyncMock(side_effect=lambda key: shared.data.get(key))
+		shared.aset = AsyncMock(side_effect=lambda key, value, ttl: shared.data.__setitem__(key, value) or True)
+		llm_service.response_cache = LLMResponseCache(shared)
+		llm_service.models[ModelType.GENERAL] = [
+			ModelConfig(
+				provider=ModelProvider.OPENAI,
+				model_name="gpt-3.5-turbo",
+				temperature=0.2,
+				max_tokens=2000,
+				cost_per_token=0.000002,
+				capabilities=["generation"],
+				priority=3,
+				complexity_level=TaskComplexity.SIMPLE,
+			)
+		]
+
+		first = await llm_service.analyze_with_fallback(model_type=ModelType.GENERAL, prompt="Write a cover letter", context="Be brief")
+		llm_service.response_cache = LLMResponseCache(shared)
+		second = await llm_service.analyze_with_fallback(model_type=ModelType.GENERAL, prompt="Write a cover letter", context="Be brief")
+		other_context = await llm_service.analyze_with_fallback(model_type=ModelType.GENERAL, prompt="Write a cover letter")
+
+		assert llm_service._create_llm_instance.await_count == 2
+		assert second.content == first.content and second.provider == ModelProvider.OPENAI
+		assert second.complexity_used == TaskComplexity.SIMPLE and second.metadata["cache_hit"] is True
+		assert "cache_hit" not in other_context.metadata
+		assert len(shared.data) == 2
+
 	def test_get_service_health(self, llm_service):
 		"""Test service health status."""
 		health = llm_service.get_service_health()
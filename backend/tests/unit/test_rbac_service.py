@@ -0,0 +1,143 @@
+"""
+Unit Tests for RBAC permission resolution, caching and access logging
+"""
+
+import importlib
+import sys
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app import services
+from app.models import database_models
+
+_MODULE = "app.services.rbac_service"
+
+
+@pytest.fixture(scope="module")
+def rbac_module():
+	"""rbac_service imported against stand-ins for the RBAC models, which are not defined in this tree.
+
+	The stand-ins and the module are removed again afterwards so other tests never see them.
+	"""
+	with pytest.MonkeyPatch.context() as mp:
+		for model in ("User", "RoleAssignment", "PermissionGrant"):
+			if not hasattr(database_models, model):
+				mp.setattr(database_models, model, MagicMock(name=model), raising=False)
+		sys.modules.pop(_MODULE, None)
+		try:
+			yield importlib.import_module(_MODULE)
+		finally:
+			sys.modules.pop(_MODULE, None)
+			if hasattr(services, "rbac_service"):
+				delattr(services, "rbac_service")
+
+
+@pytest.fixture
+def service(rbac_module):
+	service = rbac_module.RBACService(permission_cache_ttl=60.0)
+	service._load_user_permissions = AsyncMock(return_value=[rbac_module.Permission.CONTRACT_DELETE])
+	return service
+
+
+def test_permission_closure_is_transitive(rbac_module, service):
+	PERMISSION_BITS, Permission = rbac_module.PERMISSION_BITS, rbac_module.Permission
+	closure = service.permission_closure
+	assert closure[Permission.CONTRACT_DELETE] & PERMISSION_BITS[Permission.CONTRACT_READ]
+	assert closure[Permission.AUDIT_DELETE] & PERMISSION_BITS[Permission.AUDIT_READ]
+	assert not closure[Permission.CONTRACT_READ] & PERMISSION_BITS[Permission.CONTRACT_WRITE]
+	assert all(closure[Permission.SYSTEM_ADMIN] & PERMISSION_BITS[permission] for permission in Permission)
+
+
+@pytest.mark.asyncio
+async def test_checks_use_the_cached_mask_until_it_expires(rbac_module, service):
+	Permission = rbac_module.Permission
+	with patch.object(service, "_log_access_attempt"):
+		assert (await service.check_permission(1, Permission.CONTRACT_READ)).allowed
+		assert not (await service.check_permission("1", Permission.USER_READ)).allowed
+		assert (await service.check_multiple_permissions("1", [Permission.CONTRACT_WRITE, Permission.CONTRACT_DELETE])).allowed
+
+		# int and str ids share one entry
+		assert service._load_user_permissions.await_count == 1
+		assert service.get_cache_stats()["cached_users"] == 1 and service.stats["cache_hits"] == 2
+
+		service._authorization_cache["1"].expires_at = 0
+		await service.check_permission("1", Permission.CONTRACT_READ)
+		assert service._load_user_permissions.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded_lru(rbac_module):
+	service = rbac_module.RBACService(permission_cache_size=2)
+	service._load_user_permissions = AsyncMock(return_value=[])
+	for user_id in ("a", "b", "a", "c"):
+		await service.get_user_permissions(user_id)
+	assert list(service._authorization_cache) == ["a", "c"]
+
+
+class _Session:
+	def __init__(self):
+		self.added = []
+
+	async def execute(self, statement):
+		result = MagicMock()
+		result.scalar_one_or_none.return_value = None
+		result.rowcount = 1
+		return result
+
+	def add(self, row):
+		self.added.append(row)
+
+	async def commit(self):
+		pass
+
+
+@pytest.mark.asyncio
+async def test_role_and_permission_changes_invalidate_the_user(rbac_module, service):
+	Permission, Role = rbac_module.Permission, rbac_module.Role
+	manager = MagicMock()
+
+	@asynccontextmanager
+	async def get_session():
+		yield _Session()
+
+	manager.get_session = get_session
+	role_assignment = MagicMock(name="RoleAssignment")
+	role_assignment.__table__ = MagicMock()
+	with (
+		patch.object(rbac_module, "get_database_manager", AsyncMock(return_value=manager)),
+		patch("sqlalchemy.select", MagicMock()),
+		patch("sqlalchemy.and_", MagicMock()),
+		patch.object(rbac_module, "RoleAssignment", role_assignment),
+		patch.object(rbac_module, "audit_logger"),
+	):
+		for change in (
+			lambda: service.assign_role(7, Role.ANALYST, assigned_by="admin"),
+			lambda: service.revoke_role(7, Role.ANALYST, revoked_by="admin"),
+			lambda: service.grant_permission(7, Permission.AUDIT_READ, granted_by="admin"),
+		):
+			await service.get_user_permissions(7)
+			assert "7" in service._authorization_cache
+			assert await change()
+			assert "7" not in service._authorization_cache
+
+	assert service.stats["invalidations"] == 3
+
+
+@pytest.mark.asyncio
+async def test_access_attempts_are_written_in_batches(rbac_module, service):
+	Permission = rbac_module.Permission
+	service.access_log_flush_interval = 0.05
+	written = []
+	with patch.object(rbac_module, "audit_logger") as audit_logger:
+		audit_logger.log_event.side_effect = lambda **event: written.append(event)
+		for _ in range(3):
+			await service.check_permission("1", Permission.CONTRACT_READ)
+		await service.check_permission("1", Permission.SYSTEM_ADMIN)
+
+		# Nothing is written on the request path
+		assert written == [] and service.get_cache_stats()["pending_access_logs"] == 4
+		await service._access_log_task
+
+	assert [event["result"] for event in written] == ["granted"] * 3 + ["denied"]
+	assert service.stats["access_logs_written"] == 4 and service.get_cache_stats()["pending_access_logs"] == 0
@@ -204,3 +204,56 @@ def test_get_recommendations_empty_result(engine, mock_db_session, mock_user):
 	mock_db_session.query.return_value.filter.return_value.all.return_value = []
 	recommendations = engine.get_recommendations(mock_user, skip=0, limit=10)
 	assert len(recommendations) == 0
+
+
+def _scalar_recommendations(engine, user, jobs, limit):
+	scored = []
+	for job in jobs:
+		score = engine._calculate_job_score(user, job)
+		scored.append(
+			{
+				"job_id": job.id,
+				"title": job.title,
+				"company": job.company,
+				"location": job.location,
+				"score": round(score, 2),
+				"match_reasons": engine._get_match_reasons(user, job, score),
+			}
+		)
+	scored.sort(key=lambda x: x["score"], reverse=True)
+	return scored[:limit]
+
+
+def test_score_jobs_batch_matches_per_job_scoring(mock_user):
+	pytest.importorskip("numpy")
+	from datetime import datetime, timedelta
+
+	batch_engine = RecommendationEngine(batch_scoring=True)
+	stacks = [["Python", "FastAPI", "SQL", "Docker"], ["Python", "Spark"], ["JavaScript", "React"], [], None, ["python", "PYTHON", "Go"]]
+	locations = ["Remote", "New York, NY", "Los Angeles", None, "Berlin (remote)"]
+	jobs = [
+		Job(
+			id=i,
+			user_id=1,
+			company=f"Company {i}",
+			title=f"Engineer {i}",
+			location=locations[i % len(locations)],
+			tech_stack=stacks[i % len(stacks)],
+			created_at=datetime.now() - timedelta(days=i % 35, hours=i % 7),
+		)
+		for i in range(1, 200)
+	]
+
+	assert batch_engine.score_jobs_batch(mock_user, jobs, limit=50) == _scalar_recommendations(batch_engine, mock_user, jobs, limit=50)
+
+
+def test_score_jobs_batch_handles_user_without_skills(mock_user):
+	pytest.importorskip("numpy")
+	from datetime import datetime
+
+	mock_user.skills = []
+	mock_user.preferred_locations = []
+	jobs = [Job(id=1, user_id=1, company="A", title="B", location="Remote", tech_stack=["Python"], created_at=datetime.now())]
+
+	engine = RecommendationEngine(batch_scoring=True)
+	assert engine.score_jobs_batch(mock_user, jobs, limit=10) == _scalar_recommendations(engine, mock_user, jobs, limit=10)
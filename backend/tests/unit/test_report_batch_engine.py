@@ -0,0 +1,168 @@
+"""
+Unit Tests for the batch analytics report engine
+"""
+
+import asyncio
+import json
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from app.models.application import Application
+from app.models.job import Job
+from app.models.user import User
+from app.services import report_batch_engine as engine_module
+from app.services.advanced_user_analytics_service import advanced_user_analytics_service
+from app.services.report_batch_engine import ReportBatchEngine, ReportRunInProgress
+from app.services.scheduled_analytics_reports_service import ScheduledAnalyticsReportsService
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+
+class _SqliteManager:
+	def __init__(self):
+		# One shared connection: pages are prepared from a worker thread
+		self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+		for table in (User.__table__, Job.__table__, Application.__table__):
+			table.create(self.engine)
+		self.session_factory = sessionmaker(self.engine)
+
+	@contextmanager
+	def get_sync_session(self):
+		session = self.session_factory()
+		try:
+			yield session
+			session.commit()
+		finally:
+			session.close()
+
+
+class _ReportsService(ScheduledAnalyticsReportsService):
+	"""Records delivered reports instead of talking to SMTP; refuses addresses in `bounce`"""
+
+	def __init__(self, bounce=()):
+		super().__init__()
+		self.delivered = []
+		self.bounce = set(bounce)
+
+	def deliver_report_message(self, msg):
+		if msg["To"] in self.bounce:
+			return False
+		self.delivered.append(msg["To"])
+		return True
+
+
+@pytest.fixture
+def manager(monkeypatch):
+	manager = _SqliteManager()
+	monkeypatch.setattr(engine_module, "get_database_manager", lambda: manager)
+
+	session = manager.session_factory()
+	for user_id in range(1, 6):
+		session.add(User(id=user_id, username=f"user{user_id}", email=f"user{user_id}@example.com" if user_id != 4 else ""))
+	session.add(Job(id=1, user_id=1, company="Acme", title="Engineer"))
+	session.add(Job(id=2, user_id=1, company="Globex", title="Analyst"))
+	recent = datetime.now() - timedelta(days=1)
+	for job_id, status in ((1, "interview"), (1, "offer"), (2, "rejected"), (2, "applied")):
+		session.add(Application(user_id=1, job_id=job_id, status=status, created_at=recent))
+	# Outside the weekly window
+	session.add(Application(user_id=1, job_id=1, status="interview", created_at=datetime.now() - timedelta(days=20)))
+	session.commit()
+	session.close()
+	return manager
+
+
+def test_grouped_stats_match_per_user_analytics(manager):
+	session = manager.session_factory()
+	stats = advanced_user_analytics_service.load_application_stats(session, [1, 2], days=7)
+
+	success_rates = advanced_user_analytics_service.success_rates_from_stats(stats[1], days=7)
+	assert success_rates["total_applications"] == 4
+	assert success_rates["success_rates"]["application_to_interview"] == 25.0
+	assert success_rates["status_breakdown"] == {"pending": 1, "interviews": 1, "offers": 1, "rejections": 1}
+	assert success_rates["company_performance"]["Acme"] == {"applications": 2, "interview_rate": 50.0, "success_rate": 50.0}
+	assert "error" in advanced_user_analytics_service.success_rates_from_stats(stats[2], days=7)
+
+	funnel = advanced_user_analytics_service.conversion_funnel_from_stats(stats[1], days=7)
+	assert [stage["count"] for stage in funnel["funnel_stages"]] == [4, 4, 1, 1, 0]
+	assert advanced_user_analytics_service.calculate_detailed_success_rates(session, 1, days=7)["success_rates"] == success_rates["success_rates"]
+	assert advanced_user_analytics_service.load_optimal_job_types(session, [1, 2]) == {1: ["Engineer"], 2: ["Software Engineer", "Data Analyst", "Product Manager"]}
+
+
+@pytest.mark.asyncio
+async def test_reports_are_sent_page_by_page_and_completed_runs_are_not_repeated(manager, tmp_path):
+	service = _ReportsService(bounce={"user3@example.com"})
+	engine = ReportBatchEngine(service, page_size=2, checkpoint_dir=tmp_path)
+
+	results = await engine.run("weekly")
+	assert results["total_users"] == 5 and results["reports_generated"] == 5 and results["emails_sent"] == 3
+	assert sorted(results["errors"]) == ["Failed to send email to user3", "No email address for user user4"]
+	assert sorted(service.delivered) == ["user1@example.com", "user2@example.com", "user5@example.com"]
+
+	checkpoint = json.loads(engine.checkpoint_path("weekly", datetime.now()).read_text())
+	assert checkpoint["completed"] and checkpoint["last_user_id"] == 5
+
+	assert await engine.run("weekly") == results
+	assert len(service.delivered) == 3
+	assert engine.completed_results("weekly") == results
+
+	# A forced run sends the period's reports again from the first user
+	forced = await engine.run("weekly", force=True)
+	assert forced["emails_sent"] == 3 and len(service.delivered) == 6
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run_resumes_after_the_last_finished_page(manager, tmp_path):
+	service = _ReportsService()
+	engine = ReportBatchEngine(service, page_size=2, checkpoint_dir=tmp_path)
+	path = engine.checkpoint_path("monthly", datetime.now())
+	path.write_text(
+		json.dumps(
+			{"report_type": "monthly", "last_user_id": 2, "completed": False, "results": {"total_users": 2, "reports_generated": 2, "emails_sent": 2, "errors": []}}
+		)
+	)
+
+	results = await engine.run("monthly")
+	assert sorted(service.delivered) == ["user3@example.com", "user5@example.com"]
+	assert results["total_users"] == 5 and results["emails_sent"] == 4
+
+
+@pytest.mark.asyncio
+async def test_a_period_cannot_be_run_twice_at_once(manager, tmp_path, monkeypatch):
+	service = _ReportsService()
+	engine = ReportBatchEngine(service, page_size=2, checkpoint_dir=tmp_path)
+	started, release = asyncio.Event(), asyncio.Event()
+	prepare_page = engine._prepare_page
+
+	def held_first_page(report_type, after_user_id):
+		if after_user_id == 0:
+			loop.call_soon_threadsafe(started.set)
+			asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+		return prepare_page(report_type, after_user_id)
+
+	loop = asyncio.get_running_loop()
+	monkeypatch.setattr(engine, "_prepare_page", held_first_page)
+	first = asyncio.create_task(engine.run("weekly"))
+	await started.wait()
+
+	# A second engine, as another request or the scheduler would build, sees the held lock
+	other = ReportBatchEngine(service, page_size=2, checkpoint_dir=tmp_path)
+	assert other.is_running("weekly") and not other.is_running("monthly")
+	with pytest.raises(ReportRunInProgress):
+		await other.run("weekly", force=True)
+	monkeypatch.setattr(engine_module, "default_checkpoint_dir", lambda: tmp_path)
+	assert await service.schedule_weekly_reports(force=True) == {"status": "already_running"}
+
+	release.set()
+	results = await first
+	assert results["emails_sent"] == 4 and len(service.delivered) == 4
+	assert not other.is_running("weekly")
+	assert await other.run("weekly") == results
+
+
+def test_relative_checkpoint_dir_is_anchored_at_the_backend_directory(monkeypatch):
+	settings = engine_module.get_settings()
+	monkeypatch.setattr(type(settings), "report_checkpoint_dir", "logs/report_runs", raising=False)
+	path = engine_module.default_checkpoint_dir()
+	assert path.is_absolute() and path == engine_module.BACKEND_DIR / "logs" / "report_runs"
@@ -0,0 +1,99 @@
+"""
+Tests for the shared cross-user scrape query planner
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.services.scrape_query_planner import ScrapeQuery, ScrapeQueryPlanner, canonicalize_term
+
+
+class DictCache:
+	"""Minimal in-memory stand-in for CacheService.get/set"""
+
+	def __init__(self):
+		self.store = {}
+
+	def get(self, key):
+		return self.store.get(key)
+
+	def set(self, key, value, ttl=3600):
+		self.store[key] = value
+		return True
+
+
+@pytest.fixture
+def scraping_service():
+	service = MagicMock()
+	service._extract_search_params.side_effect = lambda user: user.search_params
+
+	manager = MagicMock()
+	manager.get_available_scrapers.return_value = ["arbeitnow", "adzuna"]
+
+	async def search_all_sites(keywords, location="", max_total_results=100):
+		return [
+			SimpleNamespace(model_dump=lambda mode=None: {"title": f"{keywords} developer", "company": "Acme", "url": f"https://jobs.example.com/{keywords}/{location}"})
+		]
+
+	manager.search_all_sites = AsyncMock(side_effect=search_all_sites)
+	service._get_scraper_manager.return_value = manager
+	return service
+
+
+@pytest.fixture
+def users():
+	return [
+		SimpleNamespace(id=1, search_params={"keywords": ["Python", "SQL"], "locations": ["Berlin"]}),
+		SimpleNamespace(id=2, search_params={"keywords": [" python ", "Go"], "locations": ["berlin"]}),
+		SimpleNamespace(id=3, search_params={"keywords": ["SQL"], "locations": ["BERLIN"]}),
+	]
+
+
+def test_canonicalize_term():
+	assert canonicalize_term("  Machine   Learning ") == "machine learning"
+	assert canonicalize_term(None) == ""
+
+
+def test_plan_deduplicates_queries_across_users(scraping_service, users):
+	planner = ScrapeQueryPlanner(scraping_service, DictCache())
+
+	plan = planner.plan(users)
+
+	source = "adzuna+arbeitnow"
+	assert plan == {
+		ScrapeQuery("python", "berlin", source): {1, 2},
+		ScrapeQuery("sql", "berlin", source): {1, 3},
+		ScrapeQuery("go", "berlin", source): {2},
+	}
+	assert planner.stats["user_queries"] == 5
+	assert planner.stats["distinct_queries"] == 3
+
+
+def test_execute_runs_each_query_once_and_caches(scraping_service, users):
+	cache = DictCache()
+	planner = ScrapeQueryPlanner(scraping_service, cache)
+	plan = planner.plan(users)
+
+	results = asyncio.run(planner.execute(plan))
+	manager = scraping_service._get_scraper_manager()
+	assert manager.search_all_sites.await_count == 3
+	assert all(len(jobs) == 1 for jobs in results.values())
+
+	# A second run within the TTL is served entirely from the cache
+	rerun = ScrapeQueryPlanner(scraping_service, cache)
+	asyncio.run(rerun.execute(rerun.plan(users)))
+	assert manager.search_all_sites.await_count == 3
+	assert rerun.stats["cache_hits"] == 3
+
+
+def test_fan_out_delivers_each_users_postings(scraping_service, users):
+	planner = ScrapeQueryPlanner(scraping_service, DictCache())
+	plan = planner.plan(users)
+
+	jobs_by_user = planner.fan_out(plan, asyncio.run(planner.execute(plan)))
+
+	assert sorted(job["title"] for job in jobs_by_user[1]) == ["python developer", "sql developer"]
+	assert sorted(job["title"] for job in jobs_by_user[2]) == ["go developer", "python developer"]
+	assert [job["title"] for job in jobs_by_user[3]] == ["sql developer"]
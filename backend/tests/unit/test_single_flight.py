@@ -0,0 +1,172 @@
+"""
+Unit Tests for single-flight request coalescing
+"""
+
+import asyncio
+
+import pytest
+from app.core.single_flight import SingleFlight, request_fingerprint
+
+
+class _FakePubSub:
+	def __init__(self, redis):
+		self.redis = redis
+		self.queue = asyncio.Queue()
+		self.channels = []
+
+	async def subscribe(self, channel):
+		self.channels.append(channel)
+		self.redis.subscribers.setdefault(channel, []).append(self.queue)
+
+	async def get_message(self, ignore_subscribe_messages=True, timeout=None):
+		try:
+			return await asyncio.wait_for(self.queue.get(), timeout)
+		except asyncio.TimeoutError:
+			return None
+
+	async def unsubscribe(self):
+		for channel in self.channels:
+			self.redis.subscribers[channel].remove(self.queue)
+
+	async def aclose(self):
+		pass
+
+
+class _FakeAsyncRedis:
+	"""Async Redis stand-in shared by several SingleFlight instances (one per simulated worker)"""
+
+	def __init__(self):
+		self.data = {}
+		self.subscribers = {}
+
+	async def set(self, key, value, nx=False, px=None, ex=None):
+		if nx and key in self.data:
+			return None
+		self.data[key] = value
+		return True
+
+	async def get(self, key):
+		return self.data.get(key)
+
+	async def exists(self, key):
+		return int(key in self.data)
+
+	async def publish(self, channel, message):
+		for queue in self.subscribers.get(channel, []):
+			queue.put_nowait({"type": "message", "data": message})
+		return len(self.subscribers.get(channel, []))
+
+	async def eval(self, script, numkeys, key, token):
+		if self.data.get(key) == token:
+			del self.data[key]
+			return 1
+		return 0
+
+	def pubsub(self):
+		return _FakePubSub(self)
+
+
+def test_fingerprint_is_canonical():
+	assert request_fingerprint("m", [{"role": "user", "content": "hi"}], {"b": 1, "a": 2}) == request_fingerprint(
+		"m", [{"content": "hi", "role": "user"}], {"a": 2, "b": 1}
+	)
+	assert request_fingerprint("m", "hi", 0.1) != request_fingerprint("m", "hi", 0.2)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_in_process_share_one_execution():
+	flight = SingleFlight()
+	calls = []
+
+	async def call():
+		calls.append(1)
+		await asyncio.sleep(0.01)
+		return {"content": "parsed"}
+
+	results = await asyncio.gather(*(flight.do("k", call) for _ in range(5)))
+
+	assert len(calls) == 1 and all(result == {"content": "parsed"} for result in results)
+	assert flight.stats["local_coalesced"] == 4 and flight.get_stats()["inflight"] == 0
+
+	await flight.do("k", call)
+	assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_leader_failure_propagates_to_local_followers():
+	flight = SingleFlight()
+
+	async def call():
+		await asyncio.sleep(0.01)
+		raise RuntimeError("provider down")
+
+	results = await asyncio.gather(*(flight.do("k", call) for _ in range(3)), return_exceptions=True)
+
+	assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_hands_the_call_to_a_follower():
+	flight = SingleFlight()
+	calls = []
+
+	async def call():
+		calls.append(1)
+		await asyncio.sleep(0.05)
+		return "parsed"
+
+	leader = asyncio.create_task(flight.do("k", call))
+	await asyncio.sleep(0)
+	followers = [asyncio.create_task(flight.do("k", call)) for _ in range(3)]
+	await asyncio.sleep(0.01)
+	leader.cancel()
+
+	assert await asyncio.gather(*followers) == ["parsed"] * 3
+	assert leader.cancelled() and len(calls) == 2
+	assert flight.get_stats()["inflight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_workers_coalesce_through_redis():
+	redis = _FakeAsyncRedis()
+
+	async def client_factory():
+		return redis
+
+	worker_a, worker_b = SingleFlight(client_factory, wait_timeout=2), SingleFlight(client_factory, wait_timeout=2)
+	calls = []
+
+	async def call():
+		calls.append(1)
+		await asyncio.sleep(0.05)
+		return {"content": "skill gap"}
+
+	results = await asyncio.gather(worker_a.do("k", call, encode=dict, decode=dict), worker_b.do("k", call, encode=dict, decode=dict))
+
+	assert len(calls) == 1 and results[0] == results[1] == {"content": "skill gap"}
+	assert worker_b.stats["remote_coalesced"] == 1
+	assert not any(key.startswith("single_flight:default:lock:") for key in redis.data)
+
+
+@pytest.mark.asyncio
+async def test_remote_leader_failure_falls_back_to_own_call():
+	redis = _FakeAsyncRedis()
+
+	async def client_factory():
+		return redis
+
+	worker_a, worker_b = SingleFlight(client_factory, wait_timeout=2), SingleFlight(client_factory, wait_timeout=2)
+
+	async def failing():
+		await asyncio.sleep(0.05)
+		raise RuntimeError("provider down")
+
+	async def succeeding():
+		return {"content": "ok"}
+
+	results = await asyncio.gather(
+		worker_a.do("k", failing, encode=dict, decode=dict), worker_b.do("k", succeeding, encode=dict, decode=dict), return_exceptions=True
+	)
+
+	assert isinstance(results[0], RuntimeError) and results[1] == {"content": "ok"}
+	assert worker_b.stats["remote_fallbacks"] == 1
@@ -0,0 +1,57 @@
+"""
+Unit Tests for the compiled SkillMatcher
+"""
+
+import random
+import re
+
+from app.services.skill_matcher import SkillMatcher, get_skill_matcher
+from app.services.skill_matching_service import SOFT_SKILLS, TECH_SKILLS
+
+
+def _per_term_extract(text, vocabulary):
+	"""Reference extractor: one boundary-checked search per term"""
+	text_lower = text.lower()
+	return {term for term in vocabulary if re.search(r"(?<!\w)" + re.escape(term) + r"(?!\w)", text_lower)}
+
+
+def test_matches_per_term_search_on_random_text():
+	vocabulary = TECH_SKILLS | SOFT_SKILLS
+	matcher = SkillMatcher(vocabulary)
+	rng = random.Random(3)
+	words = [*sorted(vocabulary), "experience", "with", "and", "the", "team", "sqlx", "gopher", "reacts", "c", "++", "/"]
+
+	for _ in range(300):
+		text = rng.choice([" ", ", ", "\n", "(", ""]).join(rng.choice(words) for _ in range(rng.randint(0, 25)))
+		assert matcher.extract(text) == _per_term_extract(text, vocabulary), text
+
+
+def test_reports_overlapping_and_prefix_terms():
+	matcher = SkillMatcher({"unit testing", "testing", "google cloud", "google cloud platform", "c++", "c"})
+
+	assert matcher.extract("Unit Testing on Google Cloud Platform in C++.") == {
+		"unit testing",
+		"testing",
+		"google cloud",
+		"google cloud platform",
+		"c++",
+		"c",
+	}
+	assert matcher.extract("cloudy googles, cpp") == set()
+
+
+def test_aliases_map_to_canonical_terms():
+	matcher = get_skill_matcher(frozenset({"go", "kubernetes", "postgresql"}))
+
+	assert matcher.extract("Golang services on K8s backed by Postgres") == {"go", "kubernetes", "postgresql"}
+	# Aliases for terms outside the vocabulary are ignored
+	assert matcher.extract("ReactJS") == set()
+	assert get_skill_matcher(frozenset({"go", "kubernetes", "postgresql"})) is matcher
+
+
+def test_extract_many_matches_single_extraction():
+	matcher = SkillMatcher(TECH_SKILLS)
+	texts = ["Python and SQL", "", None, "docker", "Kubernetes\nterraform", "power", "bi and power bi"]
+
+	assert matcher.extract_many(texts) == [matcher.extract(text) for text in texts]
+	assert matcher.extract_many([]) == []
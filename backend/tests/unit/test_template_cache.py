@@ -0,0 +1,46 @@
+"""
+Unit Tests for the compiled Jinja template cache
+"""
+
+from app.core.template_cache import CompiledTemplateCache, render_many
+from jinja2 import Environment
+
+
+class _CountingEnvironment(Environment):
+	def __init__(self):
+		super().__init__()
+		self.compiles = 0
+
+	def from_string(self, source, *args, **kwargs):
+		self.compiles += 1
+		return super().from_string(source, *args, **kwargs)
+
+
+def test_templates_compile_once_per_content_version():
+	env = _CountingEnvironment()
+	cache = CompiledTemplateCache()
+
+	first = cache.get_template(env, "email", "briefing", "Hi {{ name }}")
+	assert cache.get_template(env, "email", "briefing", "Hi {{ name }}") is first
+	assert env.compiles == 1
+
+	# An edited template is a new key, never the stale compiled version
+	assert cache.get_template(env, "email", "briefing", "Hello {{ name }}").render(name="Ada") == "Hello Ada"
+	assert env.compiles == 2
+	assert cache.invalidate("email", "briefing") == 2
+	assert cache.get_stats()["size"] == 0
+
+
+def test_lru_eviction_and_bulk_render():
+	env = _CountingEnvironment()
+	cache = CompiledTemplateCache(max_size=2)
+
+	a = cache.get_template(env, "document", "1", "A {{ x }}")
+	cache.get_template(env, "document", "2", "B {{ x }}")
+	cache.get_template(env, "document", "1", "A {{ x }}")
+	cache.get_template(env, "document", "3", "C {{ x }}")
+
+	# Template 2 was least recently used
+	assert cache.get_stats()["evictions"] == 1
+	assert cache.get_template(env, "document", "1", "A {{ x }}") is a
+	assert render_many(a, [{"x": 1}, {"x": 2}]) == ["A 1", "A 2"]
@@ -0,0 +1,94 @@
+"""
+Unit Tests for pluggable token counting
+"""
+
+import hashlib
+from unittest.mock import MagicMock, patch
+
+from app.core import tokenizer as tokenizer_module
+from app.core.token_optimizer import OptimizationResult, TokenOptimizer
+from app.core.tokenizer import TIKTOKEN_ENCODING_URLS, CalibratedEstimator, TokenCounter, build_tokenizer
+
+
+class _CountingTokenizer(CalibratedEstimator):
+	def __init__(self):
+		super().__init__()
+		self.batches = []
+
+	def count_batch(self, texts):
+		self.batches.append(list(texts))
+		return super().count_batch(texts)
+
+
+def test_estimator_tracks_bpe_splits_better_than_char_heuristic():
+	estimator = CalibratedEstimator()
+
+	# Reference counts from cl100k_base
+	assert estimator.count("hello world") == 2
+	assert estimator.count("The quick brown fox jumps over the lazy dog.") == 10
+	assert estimator.count("2024-10-16 12345678") in range(9, 12)
+	assert estimator.count("") == 0
+	assert CalibratedEstimator(calibration=1.1).count("word " * 100) == 110
+
+
+def test_counter_batches_unseen_texts_and_memoizes_lru():
+	inner = _CountingTokenizer()
+	counter = TokenCounter(inner, memo_size=2)
+
+	assert counter.count_tokens(["system prompt", "job a", "system prompt"]) == [2, 2, 2]
+	assert inner.batches == [["system prompt", "job a"]]
+
+	counter.count("system prompt")
+	counter.count("job b")
+	assert list(counter._memo) == ["system prompt", "job b"]
+	assert counter.get_stats()["hits"] == 2 and counter.get_stats()["misses"] == 3
+
+
+def test_memo_is_bounded_by_total_text_size():
+	counter = TokenCounter(CalibratedEstimator(), memo_size=100, memo_max_bytes=40)
+
+	counter.count_tokens(["a" * 10, "b" * 10, "c" * 10, "d" * 10])
+	counter.count("é" * 3)
+	assert list(counter._memo) == ["b" * 10, "c" * 10, "d" * 10, "é" * 3]
+	assert counter.get_stats()["memo_bytes"] == 36
+
+	# Too large to be worth memoizing at all
+	counter.count("f" * 11)
+	assert "f" * 11 not in counter._memo and counter.get_stats()["memo_bytes"] == 36
+
+
+def test_only_loads_tiktoken_encodings_that_are_cached_locally(tmp_path, monkeypatch):
+	monkeypatch.setenv("TIKTOKEN_CACHE_DIR", str(tmp_path))
+	monkeypatch.setattr(tokenizer_module, "tiktoken", MagicMock())
+	loaded = MagicMock(name="tokenizer")
+	with patch.object(tokenizer_module, "TiktokenTokenizer", return_value=loaded) as tiktoken_tokenizer:
+		# Not cached: never handed to tiktoken, which would download it
+		assert isinstance(build_tokenizer("openai", "gpt-4"), CalibratedEstimator)
+		tiktoken_tokenizer.assert_not_called()
+
+		(tmp_path / hashlib.sha1(TIKTOKEN_ENCODING_URLS["cl100k_base"].encode()).hexdigest()).write_bytes(b"")
+		assert build_tokenizer("openai", "gpt-4") is loaded
+		tiktoken_tokenizer.assert_called_once_with("cl100k_base")
+		assert isinstance(build_tokenizer("openai", "gpt-4o"), CalibratedEstimator)
+
+
+def test_falls_back_to_estimator_when_encoding_unavailable():
+	with (
+		patch.object(tokenizer_module, "tiktoken_encoding_cached", return_value=True),
+		patch.object(tokenizer_module, "TiktokenTokenizer", side_effect=OSError("corrupt cache file")),
+	):
+		assert isinstance(build_tokenizer("openai", "gpt-4"), CalibratedEstimator)
+	assert build_tokenizer("anthropic").calibration == 1.1
+
+
+def test_optimization_cache_evicts_least_recently_used():
+	optimizer = TokenOptimizer()
+	optimizer.max_cache_entries = 2
+	result = OptimizationResult(10, 8, 20.0, [], 1.0, 0.0, {})
+	optimizer._cache_optimization("a", result)
+	optimizer._cache_optimization("b", result)
+
+	assert optimizer._get_cached_optimization("a") is result
+	optimizer._cache_optimization("c", result)
+
+	assert list(optimizer.optimization_cache) == ["a", "c"]